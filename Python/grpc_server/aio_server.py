@@ -0,0 +1,323 @@
+"""Asyncio (grpc.aio) hosting for the PythonML service.
+
+The asyncio server keeps connections and streams on the event loop and
+offloads the CPU-bound work of the regular ``PythonMLServicer`` to thread
+pools: one for inference and metadata calls, and a separate one for
+training so long training runs never starve short scoring calls.
+"""
+
+import asyncio
+import logging
+import signal
+import time
+from concurrent import futures
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+import grpc
+
+from metrics import AsyncMetricsInterceptor, CountingThreadPoolExecutor
+from pythonml_pb2 import ProcessSessionResponse
+from training_jobs import FINISHED_STATES
+from pythonml_pb2_grpc import (
+    PythonMLServiceServicer,
+    add_PythonMLServiceServicer_to_server
+)
+
+logger = logging.getLogger("gRPC_Server")
+
+# Marks the end of an iterator or request queue driven from the event loop
+_END_OF_STREAM = object()
+
+# How often StreamTrainingJob checks a job for changes, and the longest it
+# goes without sending a status (keeps the ETA fresh)
+JOB_POLL_INTERVAL = 0.1
+JOB_STATUS_INTERVAL = 1.0
+
+
+class _DeferredContext:
+    """Records status changes made by a servicer running on a worker thread.
+
+    grpc.aio contexts belong to the event loop, so the recorded code and
+    details are applied on the loop once the worker call has finished.
+    """
+
+    def __init__(self, context: grpc.aio.ServicerContext):
+        self._context = context
+        self._code: Optional[grpc.StatusCode] = None
+        self._details: Optional[str] = None
+
+    def set_code(self, code: grpc.StatusCode) -> None:
+        self._code = code
+
+    def set_details(self, details: str) -> None:
+        self._details = details
+
+    def is_active(self) -> bool:
+        return not self._context.done()
+
+    def time_remaining(self) -> Optional[float]:
+        return self._context.time_remaining()
+
+    def invocation_metadata(self) -> Any:
+        return self._context.invocation_metadata()
+
+    def peer(self) -> str:
+        return self._context.peer()
+
+    def apply(self) -> None:
+        """Copy the recorded status to the real context."""
+        if self._code is not None:
+            self._context.set_code(self._code)
+        if self._details is not None:
+            self._context.set_details(self._details)
+
+
+class AsyncPythonMLServicer(PythonMLServiceServicer):
+    """grpc.aio adapter around the synchronous ``PythonMLServicer``.
+
+    All request handling logic (and the ``ModelManager``) is shared with the
+    threaded server; this class only moves the work off the event loop.
+    Client streams are read on the loop, so a slow client never holds an
+    executor thread; only the CPU-bound steps run on the executors.
+    """
+
+    def __init__(self, servicer: Any, inference_executor: futures.Executor,
+                 training_executor: futures.Executor):
+        """Initialize the adapter.
+
+        Args:
+            servicer: The synchronous PythonMLServicer to delegate to
+            inference_executor: Executor for scoring and metadata calls
+            training_executor: Executor for training calls
+        """
+        self.servicer = servicer
+        self.inference_executor = inference_executor
+        self.training_executor = training_executor
+
+    async def _call(self, executor: futures.Executor, method: Callable[..., Any],
+                    request: Any, context: grpc.aio.ServicerContext) -> Any:
+        """Run a unary servicer method on an executor."""
+        loop = asyncio.get_running_loop()
+        deferred = _DeferredContext(context)
+        try:
+            return await loop.run_in_executor(executor, method, request, deferred)
+        finally:
+            deferred.apply()
+
+    async def _stream(self, executor: futures.Executor, method: Callable[..., Iterator[Any]],
+                      request: Any, context: grpc.aio.ServicerContext) -> AsyncIterator[Any]:
+        """Drive a server-streaming servicer method one item at a time on an executor.
+
+        Only for methods whose items are computed, not waited for: every
+        ``next`` occupies an executor thread until the item is ready.
+        """
+        loop = asyncio.get_running_loop()
+        deferred = _DeferredContext(context)
+        iterator = await loop.run_in_executor(executor, method, request, deferred)
+        try:
+            while True:
+                item = await loop.run_in_executor(executor, next, iterator, _END_OF_STREAM)
+                if item is _END_OF_STREAM:
+                    break
+                yield item
+        finally:
+            deferred.apply()
+
+    async def ProcessData(self, request, context):
+        return await self._call(self.inference_executor, self.servicer.ProcessData, request, context)
+
+    async def ProcessDataStream(self, request, context):
+        async for chunk in self._stream(self.inference_executor, self.servicer.ProcessDataStream,
+                                        request, context):
+            yield chunk
+
+    async def ProcessDataSession(self, request_iterator, context):
+        loop = asyncio.get_running_loop()
+        servicer = self.servicer
+        requests = request_iterator.__aiter__()
+        try:
+            first = await requests.__anext__()
+        except StopAsyncIteration:
+            return
+
+        start_time = time.time()
+        parameters = dict(first.parameters)
+        logger.info(f"Opening scoring session with model: {first.model_name}")
+        try:
+            session, max_in_flight = await loop.run_in_executor(
+                self.inference_executor, servicer._open_session, first, parameters)
+        except Exception as e:
+            logger.error(f"Error opening scoring session: {str(e)}")
+            yield ProcessSessionResponse(batch_id=first.batch_id, success=False, error_message=str(e))
+            return
+
+        # Requests are read ahead on the loop into a bounded queue; when it is
+        # full reading stops and gRPC flow control pushes back on the client
+        pending: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_in_flight)
+
+        async def read_requests() -> None:
+            try:
+                async for request in requests:
+                    await pending.put(request)
+            except Exception as e:
+                # Broken stream: nothing more will arrive
+                logger.info(f"Scoring session request stream ended: {str(e)}")
+            await pending.put(_END_OF_STREAM)
+
+        reader = asyncio.ensure_future(read_requests())
+        try:
+            request = first
+            while request is not _END_OF_STREAM:
+                yield await loop.run_in_executor(
+                    self.inference_executor, servicer._score_session_batch,
+                    session, request, parameters, pending.qsize())
+                request = await pending.get()
+
+            logger.info(f"Closed scoring session with model {first.model_name} after "
+                        f"{session.batches} batches in {time.time() - start_time:.2f}s")
+        finally:
+            reader.cancel()
+
+    async def TrainModel(self, request, context):
+        return await self._call(self.training_executor, self.servicer.TrainModel, request, context)
+
+    async def TrainModelStream(self, request_iterator, context):
+        loop = asyncio.get_running_loop()
+        servicer = self.servicer
+        start_time = time.time()
+        logger.info("Training model with streaming data")
+
+        framework = "unknown"
+        stream = None
+        try:
+            # Chunks are awaited on the loop; a training thread is only
+            # taken to parse a chunk that has arrived and to fit the model
+            async for chunk in request_iterator:
+                if stream is None:
+                    framework = chunk.framework if chunk.framework else "scikit-learn"
+                    stream = await loop.run_in_executor(
+                        self.training_executor, servicer.model_manager.open_training_stream, chunk)
+                if await loop.run_in_executor(self.training_executor, stream.feed, chunk):
+                    break
+            if stream is None:
+                raise ValueError("Incomplete streaming data: no chunks received")
+            result = await loop.run_in_executor(self.training_executor, stream.finish)
+        except Exception as e:
+            logger.error(f"Error in train_model_stream: {str(e)}")
+            result = (False, "", {"error": str(e)}, "", "")
+        finally:
+            if stream is not None:
+                stream.close()
+
+        return servicer._train_stream_response(framework, result, start_time)
+
+    async def SubmitTrainingJob(self, request, context):
+        return await self._call(self.inference_executor, self.servicer.SubmitTrainingJob, request, context)
+
+    async def GetTrainingJob(self, request, context):
+        return await self._call(self.inference_executor, self.servicer.GetTrainingJob, request, context)
+
+    async def StreamTrainingJob(self, request, context):
+        # Polled from the loop: the blocking TrainingJobScheduler.watch would
+        # hold an inference thread for as long as the job runs
+        training_jobs = self.servicer.training_jobs
+        if training_jobs is None:
+            self.servicer._training_jobs_disabled(context)
+            return
+
+        loop = asyncio.get_running_loop()
+        revision = -1
+        last_sent = 0.0
+        while not context.done():
+            try:
+                job = training_jobs.get(request.job_id)
+            except ValueError as e:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details(str(e))
+                return
+
+            now = loop.time()
+            if job["revision"] != revision or now - last_sent >= JOB_STATUS_INTERVAL:
+                revision = job["revision"]
+                last_sent = now
+                yield self.servicer._job_status(job)
+                if job["state"] in FINISHED_STATES:
+                    return
+
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+
+    async def CancelTrainingJob(self, request, context):
+        return await self._call(self.inference_executor, self.servicer.CancelTrainingJob, request, context)
+
+    async def SearchHyperparameters(self, request, context):
+        async for update in self._stream(self.training_executor, self.servicer.SearchHyperparameters,
+                                         request, context):
+            yield update
+
+    async def GetModelInfo(self, request, context):
+        return await self._call(self.inference_executor, self.servicer.GetModelInfo, request, context)
+
+    async def ListModels(self, request, context):
+        return await self._call(self.inference_executor, self.servicer.ListModels, request, context)
+
+    async def ChangeModelStage(self, request, context):
+        return await self._call(self.inference_executor, self.servicer.ChangeModelStage, request, context)
+
+    async def CheckHealth(self, request, context):
+        return await self._call(self.inference_executor, self.servicer.CheckHealth, request, context)
+
+    async def GetStats(self, request, context):
+        return await self._call(self.inference_executor, self.servicer.GetStats, request, context)
+
+
+async def serve_async(servicer: Any, port: int, options: List[Tuple[str, Any]],
+                      inference_workers: int = 10, training_workers: int = 2,
+                      metrics: Optional[Any] = None) -> None:
+    """Run the service on a grpc.aio server until it is terminated.
+
+    Args:
+        servicer: The synchronous PythonMLServicer to host
+        port: The port to listen on
+        options: gRPC channel options
+        inference_workers: Threads for scoring and metadata calls
+        training_workers: Threads for training calls
+        metrics: Optional ServerMetrics recording per-RPC counters and latencies
+    """
+    inference_executor = CountingThreadPoolExecutor(
+        max_workers=inference_workers, thread_name_prefix="inference")
+    training_executor = CountingThreadPoolExecutor(
+        max_workers=training_workers, thread_name_prefix="training")
+
+    interceptors = []
+    if metrics is not None:
+        metrics.watch_executor("inference", inference_executor)
+        metrics.watch_executor("training", training_executor)
+        interceptors.append(AsyncMetricsInterceptor(metrics))
+
+    server = grpc.aio.server(options=options, interceptors=interceptors)
+    add_PythonMLServiceServicer_to_server(
+        AsyncPythonMLServicer(servicer, inference_executor, training_executor), server)
+
+    server_address = f"[::]:{port}"
+    server.add_insecure_port(server_address)
+
+    await server.start()
+    logger.info(f"Async server started, listening on {server_address} "
+                f"({inference_workers} inference / {training_workers} training workers)")
+
+    # Stop gracefully on SIGINT/SIGTERM
+    loop = asyncio.get_running_loop()
+
+    async def graceful_shutdown() -> None:
+        logger.info("Received shutdown signal, stopping server...")
+        await server.stop(grace=5)  # 5 seconds grace period
+        logger.info("Server stopped")
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, lambda: asyncio.ensure_future(graceful_shutdown()))
+
+    try:
+        await server.wait_for_termination()
+    finally:
+        inference_executor.shutdown(wait=False)
+        training_executor.shutdown(wait=False)
@@ -0,0 +1,173 @@
+"""Conversion between NumPy arrays and Arrow IPC streams.
+
+Clients holding typed columns (e.g. the C# DailyActions summaries) can send
+them as an Arrow IPC stream of record batches instead of JSON text. Numeric
+columns without nulls are read as zero-copy NumPy views over the request
+bytes; the feature matrix is then built with one column stack, or with no
+copy at all when the features are sent as a single fixed-size list column
+(one list of values per row). Predictions go back as an Arrow IPC stream
+with a ``prediction`` column.
+
+pyarrow is an optional package, imported on first use.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from frameworks import import_framework
+
+# Hyperparameter naming the target column of Arrow training data
+TARGET_COLUMN_PARAMETER = "target_column"
+DEFAULT_TARGET_COLUMN = "target"
+
+# Name of the column holding the predictions of an Arrow result
+PREDICTION_COLUMN = "prediction"
+
+
+def read_table(data: bytes) -> Any:
+    """Read an Arrow IPC stream.
+
+    Args:
+        data: Serialized IPC stream with one or more record batches
+
+    Returns:
+        pyarrow.Table referencing the stream bytes
+
+    Raises:
+        ValueError: If pyarrow is not installed or the stream is invalid
+    """
+    pa = import_framework("pyarrow")
+    try:
+        return pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+    except pa.ArrowException as e:
+        raise ValueError(f"Invalid Arrow IPC stream: {e}")
+
+
+def column_to_array(column: Any) -> np.ndarray:
+    """Convert a table column to a NumPy array.
+
+    Args:
+        column: pyarrow ChunkedArray
+
+    Returns:
+        Array viewing the Arrow buffers for single-chunk numeric columns
+        without nulls; otherwise a copy (nulls become NaN, strings objects)
+    """
+    pa = import_framework("pyarrow")
+    if column.num_chunks == 1:
+        column = column.chunk(0)
+    elif column.num_chunks == 0:
+        column = pa.array([], type=column.type)
+    else:
+        column = column.combine_chunks()
+
+    if pa.types.is_fixed_size_list(column.type):
+        # One list of values per row: the flat child values are row-major already
+        if column.null_count:
+            raise ValueError("Fixed-size list feature columns must not contain nulls")
+        width = column.type.list_size
+        return column_to_array(pa.chunked_array([column.flatten()])).reshape(-1, width)
+
+    return column.to_numpy(zero_copy_only=False)
+
+
+def table_to_features(table: Any, columns: Optional[List[str]] = None) -> np.ndarray:
+    """Build the feature matrix of a table.
+
+    Args:
+        table: pyarrow.Table
+        columns: Feature columns, in model input order (default: all columns)
+
+    Returns:
+        2D array with one row per table row; a single fixed-size list
+        column is returned without copying
+
+    Raises:
+        ValueError: If a column is missing or not numeric
+    """
+    pa = import_framework("pyarrow")
+    names = columns if columns is not None else table.column_names
+    if not names:
+        raise ValueError("Arrow input has no feature columns")
+
+    arrays = []
+    for name in names:
+        if name not in table.column_names:
+            raise ValueError(f"Arrow input has no column '{name}'")
+        column_type = table.schema.field(name).type
+        value_type = column_type.value_type if pa.types.is_fixed_size_list(column_type) else column_type
+        if not (pa.types.is_integer(value_type) or pa.types.is_floating(value_type)
+                or pa.types.is_boolean(value_type)):
+            raise ValueError(f"Feature column '{name}' has non-numeric type {column_type}")
+        arrays.append(column_to_array(table.column(name)))
+
+    if len(arrays) == 1:
+        array = arrays[0]
+        return array if array.ndim == 2 else array.reshape(-1, 1)
+
+    # Row-major input for the models: the one unavoidable copy of the columns
+    dtype = np.result_type(*arrays)
+    return np.column_stack([array.astype(dtype, copy=False) for array in arrays])
+
+
+def read_features(data: bytes) -> np.ndarray:
+    """Decode the input of a scoring request.
+
+    Args:
+        data: Arrow IPC stream whose columns are the model features, in input order
+
+    Returns:
+        2D feature array
+
+    Raises:
+        ValueError: If pyarrow is not installed or the stream is invalid
+    """
+    return table_to_features(read_table(data))
+
+
+def read_training_data(data: bytes, target_column: str = DEFAULT_TARGET_COLUMN) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode the data of a training request.
+
+    Args:
+        data: Arrow IPC stream with the target column and the feature columns
+        target_column: Name of the target column; every other column is a feature
+
+    Returns:
+        Tuple of (features, target)
+
+    Raises:
+        ValueError: If pyarrow is not installed, the stream is invalid or
+            the target column is missing
+    """
+    table = read_table(data)
+    if target_column not in table.column_names:
+        raise ValueError(f"Arrow training data has no target column '{target_column}'")
+
+    features = [name for name in table.column_names if name != target_column]
+    return table_to_features(table, features), column_to_array(table.column(target_column))
+
+
+def write_predictions(y_pred: Any) -> bytes:
+    """Encode predictions as an Arrow IPC stream.
+
+    Args:
+        y_pred: Predictions array (1D, or 2D for multi-output models)
+
+    Returns:
+        Serialized IPC stream with one record batch and a ``prediction``
+        column (a fixed-size list column for 2D predictions)
+    """
+    pa = import_framework("pyarrow")
+    y_pred = np.asarray(y_pred)
+    if y_pred.ndim == 2:
+        values = pa.array(np.ascontiguousarray(y_pred).ravel())
+        column = pa.FixedSizeListArray.from_arrays(values, y_pred.shape[1])
+    else:
+        column = pa.array(y_pred.ravel())
+
+    batch = pa.record_batch([column], names=[PREDICTION_COLUMN])
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,196 @@
+"""Dynamic micro-batching of prediction requests.
+
+Concurrent requests for the same model version are collected for a short
+window and scored with a single vectorized predict call. The first request
+of a window acts as the batch leader: it waits until the window expires or
+the batch is full, runs the prediction for everyone and scatters the rows
+back to the waiting callers.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+# Upper bounds (in rows) of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+PredictFn = Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+
+class _PendingRequest:
+    """A single caller waiting for its slice of a batch."""
+
+    __slots__ = ("X", "enqueued_at", "done", "y_pred", "row_confidence", "error", "info")
+
+    def __init__(self, X: np.ndarray):
+        self.X = X
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.y_pred: Optional[np.ndarray] = None
+        self.row_confidence: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+        self.info: Dict[str, str] = {}
+
+
+class _Batch:
+    """Requests collected for one model within one batching window."""
+
+    __slots__ = ("requests", "rows", "closed")
+
+    def __init__(self):
+        self.requests: List[_PendingRequest] = []
+        self.rows = 0
+        self.closed = threading.Event()
+
+
+class MicroBatcher:
+    """Collects concurrent prediction requests into vectorized batches.
+
+    Supports:
+    - Configurable maximum batch size (rows) and maximum wait window
+    - Per-key batching (one open batch per model version and input shape)
+    - Queue depth, batch size histogram and added wait time statistics
+    """
+
+    def __init__(self, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        """Initialize the batcher.
+
+        Args:
+            max_batch_size: Maximum number of rows scored in one batch
+            max_wait_ms: Maximum time the first request of a batch waits for others
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._open: Dict[Hashable, _Batch] = {}
+        self._lock = threading.Lock()
+
+        # Statistics
+        self._queue_depth = 0
+        self._batches = 0
+        self._requests = 0
+        self._batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+
+    def submit(self, key: Hashable, X: np.ndarray,
+               predict_fn: PredictFn) -> Tuple[np.ndarray, np.ndarray, Dict[str, str]]:
+        """Score rows as part of a batch.
+
+        Args:
+            key: Batching key; only requests with equal keys are combined
+            X: Input rows (first axis is the row axis)
+            predict_fn: Callable scoring a stacked array, returning (y_pred, row_confidence)
+
+        Returns:
+            Tuple of (y_pred, row_confidence, batch metadata) for this caller's rows
+
+        Raises:
+            Exception: Whatever predict_fn raised for the batch
+        """
+        request = _PendingRequest(X)
+
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = _Batch()
+                self._open[key] = batch
+
+            batch.requests.append(request)
+            batch.rows += len(X)
+            self._queue_depth += 1
+
+            # Close a full batch so later callers start a new one
+            if batch.rows >= self.max_batch_size:
+                del self._open[key]
+                batch.closed.set()
+
+        if leader:
+            batch.closed.wait(self.max_wait_ms / 1000.0)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+                self._queue_depth -= len(batch.requests)
+            self._run_batch(batch, predict_fn)
+        else:
+            request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+        return request.y_pred, request.row_confidence, request.info
+
+    def _run_batch(self, batch: _Batch, predict_fn: PredictFn) -> None:
+        """Run one vectorized prediction and scatter the results."""
+        requests = batch.requests
+        started_at = time.perf_counter()
+
+        try:
+            if len(requests) == 1:
+                X = requests[0].X
+            else:
+                X = np.concatenate([request.X for request in requests], axis=0)
+
+            y_pred, row_confidence = predict_fn(X)
+            y_pred = np.asarray(y_pred)
+            row_confidence = np.asarray(row_confidence)
+
+            offset = 0
+            for request in requests:
+                rows = len(request.X)
+                request.y_pred = y_pred[offset:offset + rows]
+                request.row_confidence = row_confidence[offset:offset + rows]
+                offset += rows
+        except BaseException as e:
+            for request in requests:
+                request.error = e
+
+        wait_times = []
+        for request in requests:
+            wait_ms = (started_at - request.enqueued_at) * 1000.0
+            wait_times.append(wait_ms)
+            request.info = {
+                "batch_size": str(batch.rows),
+                "batch_requests": str(len(requests)),
+                "batch_wait_ms": f"{wait_ms:.3f}",
+            }
+
+        self._record(batch.rows, wait_times)
+
+        for request in requests:
+            request.done.set()
+
+    def _record(self, rows: int, wait_times: List[float]) -> None:
+        """Record statistics for a completed batch."""
+        with self._lock:
+            self._batches += 1
+            self._requests += len(wait_times)
+            self._batch_size_counts[bisect.bisect_left(BATCH_SIZE_BUCKETS, rows)] += 1
+            self._wait_ms_total += sum(wait_times)
+            self._wait_ms_max = max(self._wait_ms_max, max(wait_times))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batching statistics.
+
+        Returns:
+            Dictionary with queue depth, batch size histogram and wait times
+        """
+        with self._lock:
+            histogram = {}
+            for bound, count in zip(BATCH_SIZE_BUCKETS, self._batch_size_counts):
+                histogram[f"le_{bound}"] = count
+            histogram["gt_{}".format(BATCH_SIZE_BUCKETS[-1])] = self._batch_size_counts[-1]
+
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "queue_depth": self._queue_depth,
+                "batches": self._batches,
+                "requests": self._requests,
+                "avg_requests_per_batch": (self._requests / self._batches) if self._batches else 0.0,
+                "batch_size_histogram": histogram,
+                "avg_wait_ms": (self._wait_ms_total / self._requests) if self._requests else 0.0,
+                "max_wait_ms_observed": self._wait_ms_max,
+            }
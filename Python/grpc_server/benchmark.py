@@ -0,0 +1,518 @@
+"""Load-testing and latency benchmark for the Python ML gRPC server.
+
+Starts the server (in this process or as a subprocess on a local port)
+with a temporary models directory, trains synthetic models through
+TrainModel and drives ProcessData, ProcessDataStream and TrainModelStream
+at the requested concurrency levels and payload sizes. Results (latency
+percentiles, QPS, payload bytes and peak RSS) are printed as JSON and can
+be compared against a stored baseline:
+
+    python benchmark.py --rows 1,100,1000 --concurrency 1,8 --output current.json
+    python benchmark.py --baseline baseline.json --tolerance 0.15
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent import futures
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import grpc
+import numpy as np
+
+from pythonml_pb2 import (
+    ProcessRequest,
+    TrainRequest,
+    TrainRequestChunk,
+    HealthCheckRequest
+)
+from pythonml_pb2_grpc import PythonMLServiceStub
+
+SCENARIOS = ["process_data", "process_data_stream", "train_model_stream"]
+
+# Metrics compared against a baseline and the direction that is better
+COMPARED_METRICS = {"qps": "higher", "p50_ms": "lower", "p95_ms": "lower", "p99_ms": "lower"}
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_mb(kilobytes: int) -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    if sys.platform == "darwin":
+        return kilobytes / (1024 * 1024)
+    return kilobytes / 1024
+
+
+class BenchmarkServer:
+    """The server under test, running in this process or as a subprocess."""
+
+    def __init__(self, mode: str, port: int, models_dir: str, server_args: List[str]):
+        """Start the server.
+
+        Args:
+            mode: "inprocess" or "subprocess"
+            port: Port to listen on
+            models_dir: Working directory for models (the subprocess runs in its parent)
+            server_args: Extra server.py command line arguments (subprocess mode)
+        """
+        self.mode = mode
+        self.port = port
+        self.address = f"localhost:{port}"
+        self._server = None
+        self._process: Optional[subprocess.Popen] = None
+        self._model_manager = None
+
+        if mode == "inprocess":
+            # Imported here so subprocess mode does not load ML frameworks in the client
+            from model_manager import ModelManager
+            from pythonml_pb2_grpc import add_PythonMLServiceServicer_to_server
+            from server import PythonMLServicer
+
+            # Per-request log lines would dominate the measurements
+            logging.getLogger("gRPC_Server").setLevel(logging.WARNING)
+            self._model_manager = ModelManager(models_dir=models_dir)
+            self._server = grpc.server(
+                futures.ThreadPoolExecutor(max_workers=16),
+                options=[("grpc.max_send_message_length", 100 * 1024 * 1024),
+                         ("grpc.max_receive_message_length", 100 * 1024 * 1024)]
+            )
+            add_PythonMLServiceServicer_to_server(PythonMLServicer(self._model_manager), self._server)
+            self._server.add_insecure_port(f"[::]:{port}")
+            self._server.start()
+        else:
+            self._process = subprocess.Popen(
+                [sys.executable, os.path.join(SERVER_DIR, "server.py"), "--port", str(port)] + server_args,
+                cwd=os.path.dirname(models_dir),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+
+    def wait_ready(self, timeout: float = 60.0) -> None:
+        """Wait until CheckHealth answers.
+
+        Raises:
+            RuntimeError: If the server does not come up in time
+        """
+        channel = grpc.insecure_channel(self.address)
+        try:
+            grpc.channel_ready_future(channel).result(timeout=timeout)
+            PythonMLServiceStub(channel).CheckHealth(HealthCheckRequest(), timeout=timeout)
+        except Exception as e:
+            raise RuntimeError(f"Server did not start on {self.address}: {e}")
+        finally:
+            channel.close()
+
+    def peak_rss_mb(self) -> Optional[float]:
+        """Peak resident memory of the server process in MB (None if unknown)."""
+        if self._process is None:
+            return round(_rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss), 1)
+
+        try:
+            with open(f"/proc/{self._process.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return round(int(line.split()[1]) / 1024, 1)
+        except OSError:
+            pass
+        return None
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.stop(grace=1)
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+
+
+def make_dataset(rows: int, features: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Create a synthetic binary classification dataset.
+
+    Args:
+        rows: Number of rows
+        features: Number of features
+        seed: Random seed
+
+    Returns:
+        Tuple of (features, labels)
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, features))
+    y = (X[:, 0] + 0.5 * X[:, 1] + rng.normal(scale=0.5, size=rows) > 0).astype(int)
+    return X, y
+
+
+def _training_document(X: np.ndarray, y: np.ndarray) -> str:
+    return json.dumps({"features": np.round(X, 6).tolist(), "target": y.tolist()})
+
+
+def train_models(stub: PythonMLServiceStub, features: int, training_rows: int) -> Dict[str, str]:
+    """Train one synthetic model per available framework through TrainModel.
+
+    Args:
+        stub: Service stub
+        features: Number of input features
+        training_rows: Training set size
+
+    Returns:
+        Mapping of framework to trained model name
+    """
+    X, y = make_dataset(training_rows, features)
+    candidates = {
+        "scikit-learn": {"model_type": "classification", "algorithm": "random_forest", "n_estimators": "100"},
+        "pytorch": {"model_type": "classification", "epochs": "5", "hidden_units": "32"},
+    }
+
+    models = {}
+    for framework, hyperparameters in candidates.items():
+        model_name = f"bench_{framework.replace('-', '_')}"
+        response = stub.TrainModel(TrainRequest(
+            training_data=_training_document(X, y),
+            model_name=model_name,
+            hyperparameters=hyperparameters,
+            validate=False,
+            framework=framework,
+            initial_stage="development"
+        ))
+        if response.success:
+            models[framework] = model_name
+        else:
+            print(f"Skipping {framework}: {response.error_message}", file=sys.stderr)
+    return models
+
+
+class Recorder:
+    """Thread-safe collector of per-request measurements."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.first_chunk: List[float] = []
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+
+    def add(self, latency: float, sent: int, received: int, ok: bool, first_chunk: Optional[float] = None) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            self.bytes_sent += sent
+            self.bytes_received += received
+            if not ok:
+                self.errors += 1
+            if first_chunk is not None:
+                self.first_chunk.append(first_chunk)
+
+
+def _process_data_call(stub: PythonMLServiceStub, model_name: str, payload: str) -> Callable[[Recorder], None]:
+    request = ProcessRequest(input_data=payload, model_name=model_name)
+    sent = request.ByteSize()
+
+    def call(recorder: Recorder) -> None:
+        start = time.perf_counter()
+        try:
+            response = stub.ProcessData(request)
+            ok, received = response.success, response.ByteSize()
+        except grpc.RpcError:
+            ok, received = False, 0
+        recorder.add(time.perf_counter() - start, sent, received, ok)
+    return call
+
+
+def _process_data_stream_call(stub: PythonMLServiceStub, model_name: str, payload: str,
+                              chunk_rows: int) -> Callable[[Recorder], None]:
+    request = ProcessRequest(input_data=payload, model_name=model_name,
+                             parameters={"chunk_size": str(chunk_rows)})
+    sent = request.ByteSize()
+
+    def call(recorder: Recorder) -> None:
+        start = time.perf_counter()
+        first_chunk = None
+        received = 0
+        ok = True
+        try:
+            for chunk in stub.ProcessDataStream(request):
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+                received += chunk.ByteSize()
+                ok = ok and chunk.success
+        except grpc.RpcError:
+            ok = False
+        recorder.add(time.perf_counter() - start, sent, received, ok, first_chunk)
+    return call
+
+
+def _train_model_stream_call(stub: PythonMLServiceStub, framework: str, document: str,
+                             chunk_bytes: int) -> Callable[[Recorder], None]:
+    pieces = [document[i:i + chunk_bytes] for i in range(0, len(document), chunk_bytes)]
+
+    def chunks(run: int) -> Iterator[TrainRequestChunk]:
+        for i, piece in enumerate(pieces):
+            chunk = TrainRequestChunk(training_data_chunk=piece, chunk_id=i, total_chunks=len(pieces),
+                                      is_last_chunk=i == len(pieces) - 1)
+            if i == 0:
+                # Separate models, so concurrent runs never write the same version
+                chunk.model_name = f"bench_stream_{framework.replace('-', '_')}_{run}"
+                chunk.framework = framework
+                chunk.initial_stage = "development"
+                chunk.hyperparameters["n_estimators"] = "20"
+            yield chunk
+
+    sent = sum(TrainRequestChunk(training_data_chunk=piece).ByteSize() for piece in pieces)
+    runs = itertools.count()
+
+    def call(recorder: Recorder) -> None:
+        start = time.perf_counter()
+        try:
+            response = stub.TrainModelStream(chunks(next(runs)))
+            ok, received = response.success, response.ByteSize()
+        except grpc.RpcError:
+            ok, received = False, 0
+        recorder.add(time.perf_counter() - start, sent, received, ok)
+    return call
+
+
+def run_load(call: Callable[[Recorder], None], requests: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    """Run a call repeatedly from concurrent client threads.
+
+    Args:
+        call: Function issuing one request and recording it
+        requests: Number of measured requests
+        concurrency: Number of client threads
+        warmup: Requests issued (and discarded) before measuring
+
+    Returns:
+        Summary statistics
+    """
+    discard = Recorder()
+    for _ in range(warmup):
+        call(discard)
+
+    recorder = Recorder()
+    counter = iter(range(requests))
+    counter_lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            with counter_lock:
+                if next(counter, None) is None:
+                    return
+            call(recorder)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.asarray(recorder.latencies) * 1000
+    summary = {
+        "requests": len(recorder.latencies),
+        "errors": recorder.errors,
+        "elapsed_s": round(elapsed, 3),
+        "qps": round(len(recorder.latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+        "mean_ms": round(float(latencies_ms.mean()), 3),
+        "max_ms": round(float(latencies_ms.max()), 3),
+        "bytes_sent": recorder.bytes_sent,
+        "bytes_received": recorder.bytes_received,
+    }
+    if recorder.first_chunk:
+        summary["p50_first_chunk_ms"] = round(float(np.percentile(np.asarray(recorder.first_chunk) * 1000, 50)), 3)
+    return summary
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """Identify a benchmark cell for baseline comparison."""
+    return f"{result['scenario']}/{result['framework']}/rows={result['rows']}/concurrency={result['concurrency']}"
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """Compare results against a baseline report.
+
+    Args:
+        results: Current results
+        baseline: A previous report written by this tool
+        tolerance: Relative change allowed before a metric counts as a regression
+
+    Returns:
+        Comparison with the per-metric changes and the list of regressions
+    """
+    previous = {result_key(r): r for r in baseline.get("results", [])}
+    changes = []
+    regressions = []
+
+    for result in results:
+        key = result_key(result)
+        if key not in previous:
+            continue
+        for metric, better in COMPARED_METRICS.items():
+            old, new = previous[key].get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            entry = {"key": key, "metric": metric, "baseline": old, "current": new, "change": round(change, 4)}
+            changes.append(entry)
+            if (better == "higher" and change < -tolerance) or (better == "lower" and change > tolerance):
+                regressions.append(entry)
+
+    return {"tolerance": tolerance, "changes": changes, "regressions": regressions}
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Start a server, run every requested scenario and build the report.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        The benchmark report
+    """
+    work_dir = tempfile.mkdtemp(prefix="pythonml-bench-")
+    models_dir = os.path.join(work_dir, "models")
+    port = args.port or _free_port()
+    server = BenchmarkServer(args.mode, port, models_dir, args.server_args.split())
+
+    try:
+        server.wait_ready()
+        channel = grpc.insecure_channel(server.address, options=[
+            ("grpc.max_send_message_length", 100 * 1024 * 1024),
+            ("grpc.max_receive_message_length", 100 * 1024 * 1024)
+        ])
+        stub = PythonMLServiceStub(channel)
+
+        models = train_models(stub, args.features, args.training_rows)
+        frameworks = [f for f in args.frameworks.split(",") if f in models]
+        scenarios = args.scenarios.split(",")
+        row_counts = [int(r) for r in args.rows.split(",")]
+        concurrency_levels = [int(c) for c in args.concurrency.split(",")]
+
+        results = []
+        for scenario in scenarios:
+            for framework in frameworks:
+                for rows in row_counts:
+                    X, y = make_dataset(rows, args.features, seed=1)
+                    if scenario == "process_data":
+                        call = _process_data_call(stub, models[framework], json.dumps(X.tolist()))
+                        requests, warmup = args.requests, args.warmup
+                    elif scenario == "process_data_stream":
+                        call = _process_data_stream_call(stub, models[framework], json.dumps(X.tolist()),
+                                                         args.chunk_rows)
+                        requests, warmup = args.requests, args.warmup
+                    elif scenario == "train_model_stream":
+                        # Training is expensive; one request per client thread
+                        call = _train_model_stream_call(stub, framework, _training_document(X, y),
+                                                        args.chunk_bytes)
+                        requests, warmup = None, 0
+                    else:
+                        raise ValueError(f"Unknown scenario: {scenario}. Supported scenarios: {SCENARIOS}")
+
+                    for concurrency in concurrency_levels:
+                        summary = run_load(call, requests or concurrency, concurrency, warmup)
+                        result = {"scenario": scenario, "framework": framework, "rows": rows,
+                                  "concurrency": concurrency, **summary}
+                        results.append(result)
+                        print(f"{result_key(result)}: {summary['qps']} qps, p50 {summary['p50_ms']} ms, "
+                              f"p99 {summary['p99_ms']} ms, {summary['errors']} errors", file=sys.stderr)
+
+        channel.close()
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "mode": args.mode,
+                "server_args": args.server_args,
+            },
+            "config": {
+                "features": args.features,
+                "training_rows": args.training_rows,
+                "requests": args.requests,
+                "warmup": args.warmup,
+                "chunk_rows": args.chunk_rows,
+                "chunk_bytes": args.chunk_bytes,
+            },
+            "results": results,
+            "server_peak_rss_mb": server.peak_rss_mb(),
+            "client_peak_rss_mb": round(_rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss), 1),
+        }
+    finally:
+        server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="PythonML gRPC server benchmark")
+    parser.add_argument("--mode", choices=["inprocess", "subprocess"], default="subprocess",
+                        help="Run the server in this process or as server.py on a local port")
+    parser.add_argument("--port", type=int, default=0, help="Server port (0 picks a free port)")
+    parser.add_argument("--server-args", default="",
+                        help="Extra server.py arguments in subprocess mode, e.g. \"--inference-processes 2\"")
+    parser.add_argument("--scenarios", default="process_data,process_data_stream,train_model_stream",
+                        help=f"Comma-separated scenarios ({', '.join(SCENARIOS)})")
+    parser.add_argument("--frameworks", default="scikit-learn,pytorch",
+                        help="Comma-separated frameworks to benchmark (unavailable ones are skipped)")
+    parser.add_argument("--rows", default="1,100,1000", help="Comma-separated rows per request")
+    parser.add_argument("--concurrency", default="1,8", help="Comma-separated numbers of concurrent clients")
+    parser.add_argument("--features", type=int, default=20, help="Number of input features")
+    parser.add_argument("--training-rows", type=int, default=2000, help="Rows used to train the benchmark models")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per inference cell")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests before each inference cell")
+    parser.add_argument("--chunk-rows", type=int, default=256, help="chunk_size for ProcessDataStream")
+    parser.add_argument("--chunk-bytes", type=int, default=64 * 1024, help="Bytes per TrainModelStream chunk")
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Compare against a report written by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Relative change allowed before a metric counts as a regression")
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report["results"], json.load(f), args.tolerance)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    # A non-zero exit code lets CI fail on regressions
+    if args.baseline and report["comparison"]["regressions"]:
+        print(f"{len(report['comparison']['regressions'])} metrics regressed beyond "
+              f"{args.tolerance:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""Training datasets read from files on the server.
+
+Instead of sending the rows in the request, a training request can
+reference a Parquet, CSV or NPY file under one of the server's dataset
+directories (a local path or a shared volume). The file is read in chunks
+of rows: Parquet files with pyarrow (only the requested columns are read
+from disk), CSV files with pandas and NPY files through a memory map. Each
+chunk is optionally sampled and then appended to ``ArraySpool`` buffers,
+which spill to a memory-mapped file above the spool threshold, so peak
+memory is bounded by the threshold and one chunk rather than by the size
+of the dataset.
+"""
+
+import os
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from arrow_codec import DEFAULT_TARGET_COLUMN, column_to_array, table_to_features
+from frameworks import import_framework
+from training_stream import ArraySpool, DEFAULT_SPOOL_THRESHOLD
+
+# Supported file formats by extension
+DATASET_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".csv": "csv",
+    ".csv.gz": "csv",
+    ".npy": "npy",
+}
+
+# Rows read from the file per chunk
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def resolve_dataset_path(path: str, dataset_dirs: Sequence[str]) -> str:
+    """Find a dataset file within the dataset directories.
+
+    Args:
+        path: Path relative to a dataset directory, or an absolute path inside one
+        dataset_dirs: Directories training datasets may be read from
+
+    Returns:
+        Absolute path of the file
+
+    Raises:
+        ValueError: If no dataset directory is configured or the file is not
+            found in one (paths escaping the directories are not followed)
+    """
+    if not dataset_dirs:
+        raise ValueError("Training from dataset files is disabled (no dataset directories configured)")
+    if not path:
+        raise ValueError("Dataset path is required")
+
+    for directory in dataset_dirs:
+        root = os.path.realpath(directory)
+        candidate = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([root, candidate]) == root and os.path.isfile(candidate):
+            return candidate
+    raise ValueError(f"Dataset '{path}' not found in the dataset directories")
+
+
+def detect_format(path: str) -> str:
+    """Get the format of a dataset file from its extension.
+
+    Args:
+        path: Path of the file
+
+    Returns:
+        "parquet", "csv" or "npy"
+
+    Raises:
+        ValueError: If the extension is not recognized
+    """
+    lower = path.lower()
+    for suffix, dataset_format in DATASET_FORMATS.items():
+        if lower.endswith(suffix):
+            return dataset_format
+    raise ValueError(f"Cannot tell the format of dataset '{path}'. Supported extensions: {sorted(DATASET_FORMATS)}")
+
+
+class DatasetSource:
+    """A training dataset file, with the columns and rows to read from it.
+
+    Instances are plain data, so they can be passed to training job processes.
+    """
+
+    def __init__(self, path: str, dataset_format: str = "", feature_columns: Optional[List[str]] = None,
+                 target_column: str = "", sample_fraction: float = 0.0, max_rows: int = 0,
+                 seed: int = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """Initialize the source.
+
+        Args:
+            path: Absolute path of the file (see resolve_dataset_path)
+            dataset_format: "parquet", "csv" or "npy" (default: from the file extension)
+            feature_columns: Feature columns in model input order (default: every
+                column but the target); column indices for NPY files
+            target_column: Target column (default "target"; for NPY files a
+                column index, default the last column)
+            sample_fraction: Fraction of rows sampled at random (0 or 1 reads every row)
+            max_rows: Maximum number of rows to read (0 for no limit)
+            seed: Seed of the row sampling
+            chunk_rows: Rows read from the file per chunk
+        """
+        self.path = path
+        self.format = dataset_format.lower() if dataset_format else detect_format(path)
+        if self.format not in DATASET_FORMATS.values():
+            raise ValueError(f"Unsupported dataset format: {dataset_format}")
+        self.feature_columns = list(feature_columns) if feature_columns else None
+        self.target_column = target_column
+        if not 0.0 <= sample_fraction <= 1.0:
+            raise ValueError(f"sample_fraction must be between 0 and 1, got {sample_fraction}")
+        self.sample_fraction = sample_fraction
+        self.max_rows = max(0, max_rows)
+        self.seed = seed
+        self.chunk_rows = chunk_rows if chunk_rows > 0 else DEFAULT_CHUNK_ROWS
+
+    def describe(self) -> str:
+        """Short description of the source for logs."""
+        return f"{self.format} dataset {self.path}"
+
+    def read(self, feature_dtype: Any = np.float64,
+             spool_threshold: int = DEFAULT_SPOOL_THRESHOLD) -> Tuple[ArraySpool, ArraySpool]:
+        """Read the sampled rows of the dataset.
+
+        Args:
+            feature_dtype: dtype the features are stored in
+            spool_threshold: In-memory size in bytes above which rows are spooled to disk
+
+        Returns:
+            Tuple of (features, target) spools; the caller closes them
+
+        Raises:
+            ValueError: If the file or the requested columns cannot be read
+        """
+        capacity = self._expected_rows()
+        features = ArraySpool(feature_dtype, capacity, spool_threshold)
+        target = ArraySpool(None, capacity, spool_threshold)
+        rng = np.random.default_rng(self.seed)
+        sampled = 0.0 < self.sample_fraction < 1.0
+
+        try:
+            for X, y in self._iter_chunks():
+                if sampled:
+                    keep = rng.random(len(X)) < self.sample_fraction
+                    X, y = X[keep], y[keep]
+                if self.max_rows:
+                    X, y = X[:self.max_rows - features.rows], y[:self.max_rows - features.rows]
+
+                features.append(X)
+                target.append(y)
+                if self.max_rows and features.rows >= self.max_rows:
+                    break
+        except Exception:
+            features.close()
+            target.close()
+            raise
+
+        if features.rows == 0:
+            features.close()
+            target.close()
+            raise ValueError(f"No rows read from {self.describe()}")
+        return features, target
+
+    def _expected_rows(self) -> int:
+        """Rows the spools are preallocated for (0 if unknown before reading)."""
+        if self.format == "csv" or (0.0 < self.sample_fraction < 1.0):
+            return self.max_rows
+        if self.format == "parquet":
+            rows = self._parquet_file().metadata.num_rows
+        else:
+            rows = len(np.load(self.path, mmap_mode="r"))
+        return min(rows, self.max_rows) if self.max_rows else rows
+
+    def _iter_chunks(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield (features, target) blocks of consecutive rows."""
+        if self.format == "parquet":
+            return self._iter_parquet()
+        if self.format == "csv":
+            return self._iter_csv()
+        return self._iter_npy()
+
+    def _select_columns(self, names: List[str]) -> Tuple[List[str], str]:
+        """Resolve the feature and target columns against the columns of the file."""
+        target = self.target_column or DEFAULT_TARGET_COLUMN
+        if target not in names:
+            raise ValueError(f"{self.describe()} has no target column '{target}'")
+
+        features = self.feature_columns or [name for name in names if name != target]
+        missing = [name for name in features if name not in names]
+        if missing:
+            raise ValueError(f"{self.describe()} has no columns {missing}")
+        return features, target
+
+    def _parquet_file(self) -> Any:
+        import_framework("pyarrow")
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(self.path)
+
+    def _iter_parquet(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        pa = import_framework("pyarrow")
+        parquet_file = self._parquet_file()
+        features, target = self._select_columns(parquet_file.schema_arrow.names)
+
+        # Column projection: only the selected columns are read from disk
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_rows, columns=features + [target]):
+            table = pa.Table.from_batches([batch])
+            yield table_to_features(table, features), column_to_array(table.column(target))
+
+    def _iter_csv(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        header = pd.read_csv(self.path, nrows=0).columns.tolist()
+        features, target = self._select_columns(header)
+
+        for chunk in pd.read_csv(self.path, usecols=features + [target], chunksize=self.chunk_rows):
+            try:
+                X = chunk[features].to_numpy(dtype=np.float64)
+            except ValueError as e:
+                raise ValueError(f"Non-numeric feature values in {self.describe()}: {e}")
+            yield X, chunk[target].to_numpy()
+
+    def _iter_npy(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        array = np.load(self.path, mmap_mode="r")
+        if array.ndim != 2 or array.dtype.kind not in "biuf":
+            raise ValueError(f"{self.describe()} must hold a 2D numeric array, got shape {array.shape} and dtype {array.dtype}")
+
+        n_columns = array.shape[1]
+        try:
+            target = int(self.target_column) if self.target_column else -1
+            features = [int(column) for column in self.feature_columns or []]
+        except ValueError:
+            raise ValueError("Columns of NPY datasets are selected by index")
+        out_of_range = [column for column in features + [target] if not -n_columns <= column < n_columns]
+        if out_of_range:
+            raise ValueError(f"{self.describe()} has {n_columns} columns, got indices {out_of_range}")
+
+        target %= n_columns
+        if not features:
+            features = [column for column in range(n_columns) if column != target]
+
+        # Pages of the memory map are only read as the chunks are copied out
+        for start in range(0, len(array), self.chunk_rows):
+            block = array[start:start + self.chunk_rows]
+            yield block[:, features], block[:, target]
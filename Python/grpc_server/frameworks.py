@@ -0,0 +1,156 @@
+"""On-demand imports of the optional ML frameworks.
+
+TensorFlow and PyTorch take seconds and hundreds of MB to import, so they
+are only imported when a model of that framework is first loaded or
+trained. Whether they are installed is detected from the installed
+package metadata, without importing them. Import durations are recorded
+for the startup report and the metrics endpoint. The packages of the
+optional ONNX backend (ONNX Runtime and the converters) and pyarrow, used
+for Arrow IPC requests, are imported the same way.
+"""
+
+import importlib
+import importlib.metadata
+import importlib.util
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger("gRPC_Server")
+
+# Framework name -> (module, display name, distributions providing the module)
+OPTIONAL_FRAMEWORKS = {
+    "tensorflow": ("tensorflow", "TensorFlow",
+                   ("tensorflow", "tensorflow-cpu", "tensorflow-gpu", "tensorflow-macos", "tf-nightly")),
+    "pytorch": ("torch", "PyTorch", ("torch",)),
+}
+
+# Packages of the optional ONNX backend and Arrow IPC support, in the same format
+OPTIONAL_PACKAGES = {
+    "onnx": ("onnx", "ONNX", ("onnx",)),
+    "onnxruntime": ("onnxruntime", "ONNX Runtime", ("onnxruntime", "onnxruntime-openmp")),
+    "skl2onnx": ("skl2onnx", "skl2onnx", ("skl2onnx",)),
+    "tf2onnx": ("tf2onnx", "tf2onnx", ("tf2onnx",)),
+    "pyarrow": ("pyarrow", "pyarrow", ("pyarrow",)),
+}
+
+# Heavy modules imported by every server, timed for the startup report
+CORE_MODULES = ["numpy", "pandas", "sklearn", "grpc"]
+
+_import_lock = threading.Lock()
+_framework_lock = threading.Lock()
+_import_times: Dict[str, float] = {}
+
+
+def _package_info(name: str) -> Tuple[str, str, Tuple[str, ...]]:
+    """Get the (module, display name, distributions) entry of a framework or package."""
+    if name in OPTIONAL_FRAMEWORKS:
+        return OPTIONAL_FRAMEWORKS[name]
+    return OPTIONAL_PACKAGES[name]
+
+
+def is_installed(framework: str) -> bool:
+    """Check whether an optional framework is installed, without importing it.
+
+    Args:
+        framework: Framework name ("tensorflow" or "pytorch") or a key of OPTIONAL_PACKAGES
+
+    Returns:
+        True if a distribution providing the framework is installed
+    """
+    module, _, distributions = _package_info(framework)
+    for distribution in distributions:
+        try:
+            importlib.metadata.distribution(distribution)
+            return True
+        except importlib.metadata.PackageNotFoundError:
+            continue
+
+    # Installed without package metadata (e.g. from a source tree)
+    return importlib.util.find_spec(module) is not None
+
+
+def detect_frameworks() -> List[str]:
+    """Get the frameworks models can be trained and served with.
+
+    Returns:
+        "scikit-learn" followed by the installed optional frameworks
+    """
+    return ["scikit-learn"] + [framework for framework in OPTIONAL_FRAMEWORKS if is_installed(framework)]
+
+
+def timed_import(module_name: str) -> ModuleType:
+    """Import a module and record how long the import took.
+
+    Args:
+        module_name: Module to import
+
+    Returns:
+        The module
+    """
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - start
+    with _import_lock:
+        # A module imported earlier took no time here; keep its first measurement
+        _import_times.setdefault(module_name, elapsed)
+    return module
+
+
+def import_framework(framework: str) -> ModuleType:
+    """Import an optional framework on first use.
+
+    Args:
+        framework: Framework name ("tensorflow" or "pytorch") or a key of OPTIONAL_PACKAGES
+
+    Returns:
+        The framework's top-level module
+
+    Raises:
+        ValueError: If the framework is not installed or fails to import
+    """
+    module_name, display_name, _ = _package_info(framework)
+
+    # Serialized so concurrent model loads never see a half-imported module
+    with _framework_lock:
+        first = module_name not in _import_times
+        try:
+            module = timed_import(module_name)
+        except ImportError as e:
+            raise ValueError(f"{display_name} is not available: {str(e)}")
+
+    if first:
+        logger.info(f"Imported {display_name} in {_import_times[module_name]:.2f}s")
+    return module
+
+
+def import_times() -> Dict[str, float]:
+    """Get the recorded import durations.
+
+    Returns:
+        Dictionary of module name to import time in seconds
+    """
+    with _import_lock:
+        return dict(_import_times)
+
+
+def format_import_report() -> str:
+    """Describe where import time went.
+
+    Returns:
+        One-line summary of the recorded imports and the deferred frameworks
+    """
+    times = import_times()
+    timed: List[Tuple[str, float]] = sorted(times.items(), key=lambda item: item[1], reverse=True)
+    parts = [f"{name} {seconds:.2f}s" for name, seconds in timed]
+    report = f"Import time {sum(times.values()):.2f}s"
+    if parts:
+        report += f" ({', '.join(parts)})"
+
+    deferred = [OPTIONAL_FRAMEWORKS[framework][1] for framework in OPTIONAL_FRAMEWORKS
+                if OPTIONAL_FRAMEWORKS[framework][0] not in times and is_installed(framework)]
+    if deferred:
+        report += f"; deferred until first use: {', '.join(deferred)}"
+    return report
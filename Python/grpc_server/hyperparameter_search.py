@@ -0,0 +1,406 @@
+"""Parallel hyperparameter search with cross-validation.
+
+A search evaluates candidate hyperparameter sets of the scikit-learn
+models TrainModel builds (see ``model_manager.create_sklearn_model``).
+The training rows are copied once into shared memory blocks; a pool of
+worker processes attaches to them at startup, so candidates are fitted on
+every core without pickling the dataset per task. Each (candidate, fold)
+pair is one task, and a candidate is reported as soon as all of its folds
+are scored, so the leaderboard can be streamed while the search runs.
+
+Strategies:
+- grid: every combination of the listed values
+- random: ``n_candidates`` samples from value lists and distributions
+- halving: successive halving; all candidates are scored on a subsample
+  of the rows and the best third continues on three times as many rows,
+  until at most three candidates are scored on the full dataset
+"""
+
+import json
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Search strategies
+STRATEGIES = ("grid", "random", "halving")
+
+DEFAULT_CV_FOLDS = 5
+DEFAULT_CANDIDATES = 10
+DEFAULT_LEADERBOARD_SIZE = 10
+
+# Fraction of candidates kept (and growth of the rows) per halving round
+HALVING_FACTOR = 3
+
+# Smallest halving subsample, per cross-validation fold
+MIN_ROWS_PER_FOLD = 20
+
+# Default scorer per model type
+DEFAULT_SCORING = {"classification": "accuracy", "regression": "r2"}
+
+# Distributions accepted in search spaces: name -> scipy.stats factory over [low, high]
+_DISTRIBUTIONS = {
+    "uniform": lambda stats, low, high: stats.uniform(low, high - low),
+    "loguniform": lambda stats, low, high: stats.loguniform(low, high),
+    "randint": lambda stats, low, high: stats.randint(int(low), int(high) + 1),
+}
+
+# State of a search worker process (set by _init_worker)
+_worker: Dict[str, Any] = {}
+
+
+def parse_search_space(search_space: Dict[str, str]) -> Dict[str, Any]:
+    """Decode the searched hyperparameters of a request.
+
+    Args:
+        search_space: Hyperparameter -> JSON list of values, or a distribution
+            such as ``{"uniform": [0.1, 10]}``, ``{"loguniform": [1e-4, 1]}``
+            or ``{"randint": [2, 20]}`` (both bounds inclusive)
+
+    Returns:
+        Hyperparameter -> list of values or scipy.stats distribution
+
+    Raises:
+        ValueError: If the search space is empty or a value is invalid
+    """
+    if not search_space:
+        raise ValueError("search_space must name at least one hyperparameter")
+
+    from scipy import stats
+
+    space: Dict[str, Any] = {}
+    for name, text in search_space.items():
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            raise ValueError(f"Search space of '{name}' is not valid JSON: {text}")
+
+        if isinstance(value, list) and value:
+            space[name] = value
+        elif isinstance(value, dict) and len(value) == 1 and next(iter(value)) in _DISTRIBUTIONS:
+            kind, bounds = next(iter(value.items()))
+            if not (isinstance(bounds, list) and len(bounds) == 2 and bounds[0] < bounds[1]):
+                raise ValueError(f"Distribution of '{name}' needs [low, high] bounds with low < high")
+            space[name] = _DISTRIBUTIONS[kind](stats, *bounds)
+        else:
+            raise ValueError(f"Search space of '{name}' must be a non-empty list or one of the "
+                             f"distributions {sorted(_DISTRIBUTIONS)}")
+    return space
+
+
+def _format_value(value: Any) -> str:
+    """Format a sampled value as a hyperparameter string."""
+    if value is None:
+        return "none"
+    if isinstance(value, (bool, np.bool_)):
+        return str(bool(value)).lower()
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value))
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    return str(value)
+
+
+def build_candidates(space: Dict[str, Any], strategy: str, n_candidates: int = DEFAULT_CANDIDATES,
+                     seed: int = 0) -> List[Dict[str, str]]:
+    """Build the candidate hyperparameter sets of a search.
+
+    Args:
+        space: Parsed search space (see parse_search_space)
+        strategy: "grid", "random" or "halving"
+        n_candidates: Candidates sampled by random search (and by halving
+            search if the space has distributions)
+        seed: Seed of the sampling
+
+    Returns:
+        Distinct candidate hyperparameter sets with string values
+
+    Raises:
+        ValueError: If the strategy is unknown or grid search is given distributions
+    """
+    from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unsupported search strategy: {strategy}. Supported strategies: {list(STRATEGIES)}")
+
+    only_lists = all(isinstance(values, list) for values in space.values())
+    if strategy == "grid" and not only_lists:
+        raise ValueError("Grid search needs a list of values for every hyperparameter")
+
+    if strategy == "grid" or (strategy == "halving" and only_lists):
+        candidates = list(ParameterGrid(space))
+    else:
+        # Lists only: ParameterSampler samples the grid without replacement
+        n_candidates = n_candidates if n_candidates > 0 else DEFAULT_CANDIDATES
+        if only_lists:
+            n_candidates = min(n_candidates, len(ParameterGrid(space)))
+        candidates = list(ParameterSampler(space, n_candidates, random_state=seed))
+
+    # Distributions are sampled with replacement; duplicates would only repeat the same work
+    unique: Dict[Tuple[Tuple[str, str], ...], Dict[str, str]] = {}
+    for candidate in candidates:
+        formatted = {name: _format_value(value) for name, value in candidate.items()}
+        unique.setdefault(tuple(sorted(formatted.items())), formatted)
+    return list(unique.values())
+
+
+class SharedDataset:
+    """Training rows copied into shared memory blocks for the search workers.
+
+    Non-numeric targets (e.g. string class labels) are stored as class
+    indices; scores do not depend on how the classes are named.
+    """
+
+    def __init__(self, X: Any, y: Any):
+        """Copy the rows into shared memory.
+
+        Args:
+            X: Features (2D)
+            y: Target (1D)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y)
+        if X.ndim != 2:
+            raise ValueError(f"Features must be a 2D array, got shape {X.shape}")
+        if y.ndim != 1 or len(y) != len(X):
+            raise ValueError(f"Target must be a 1D array with one value per row, got shape {y.shape}")
+        if y.dtype.kind not in "biuf":
+            _, y = np.unique(y, return_inverse=True)
+
+        self.blocks: List[shared_memory.SharedMemory] = []
+        self.specs = [self._share(X), self._share(y)]
+
+    def _share(self, array: np.ndarray) -> Tuple[str, Tuple[int, ...], str]:
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        self.blocks.append(block)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        return block.name, array.shape, array.dtype.str
+
+    def close(self) -> None:
+        """Release and remove the shared memory blocks."""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def _init_worker(specs: List[Tuple[str, Tuple[int, ...], str]], model_type: str,
+                 cv_folds: int, scoring: str, seed: int) -> None:
+    """Attach a search worker process to the shared dataset."""
+    blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in specs]
+    X, y = [np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            for block, (_, shape, dtype) in zip(blocks, specs)]
+    _worker.update(blocks=blocks, X=X, y=y, model_type=model_type, cv_folds=cv_folds,
+                   scoring=scoring, seed=seed, splits={})
+
+
+def _splits(n_samples: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Cross-validation folds over the first n_samples rows of a seeded permutation.
+
+    Every worker derives the same folds from the seed, so fold indices are
+    never sent between processes.
+    """
+    from sklearn.model_selection import KFold, StratifiedKFold
+
+    splits = _worker["splits"].get(n_samples)
+    if splits is None:
+        y = _worker["y"]
+        seed = _worker["seed"]
+        if n_samples >= len(y):
+            rows = np.arange(len(y))
+        else:
+            rows = np.sort(np.random.default_rng(seed).permutation(len(y))[:n_samples])
+
+        if _worker["model_type"] == "classification":
+            splitter = StratifiedKFold(_worker["cv_folds"], shuffle=True, random_state=seed)
+        else:
+            splitter = KFold(_worker["cv_folds"], shuffle=True, random_state=seed)
+        splits = [(rows[train], rows[test]) for train, test in splitter.split(rows, y[rows])]
+        _worker["splits"][n_samples] = splits
+    return splits
+
+
+def _evaluate(hyperparameters: Dict[str, str], fold: int, n_samples: int) -> Tuple[float, float]:
+    """Fit a candidate on one training fold and score it on the held-out rows.
+
+    Returns:
+        Tuple of (score, fit time in seconds)
+    """
+    from sklearn.metrics import get_scorer
+    from model_manager import create_sklearn_model
+
+    train, test = _splits(n_samples)[fold]
+    X, y = _worker["X"], _worker["y"]
+    model = create_sklearn_model(_worker["model_type"],
+                                 hyperparameters.get("algorithm", "random_forest").lower(), hyperparameters)
+
+    start_time = time.time()
+    model.fit(X[train], y[train])
+    fit_time = time.time() - start_time
+    return float(get_scorer(_worker["scoring"])(model, X[test], y[test])), fit_time
+
+
+class HyperparameterSearch:
+    """Cross-validated evaluation of candidate hyperparameter sets in a process pool.
+
+    Supports:
+    - Grid, random and successive halving strategies (see build_candidates)
+    - Per-candidate results as soon as all folds are scored
+    - A leaderboard of the best candidates so far
+    - Stopping early when the caller goes away
+    """
+
+    def __init__(self, candidates: List[Dict[str, str]], hyperparameters: Dict[str, str],
+                 strategy: str = "grid", cv_folds: int = DEFAULT_CV_FOLDS, scoring: str = "",
+                 max_workers: int = 0, seed: int = 0):
+        """Initialize the search.
+
+        Args:
+            candidates: Searched hyperparameter sets
+            hyperparameters: Hyperparameters shared by every candidate (model_type, algorithm, ...)
+            strategy: "grid", "random" or "halving"
+            cv_folds: Cross-validation folds
+            scoring: scikit-learn scorer name (default: accuracy for classification, r2 for regression)
+            max_workers: Worker processes (0 uses every core)
+            seed: Seed of the fold assignment and of the halving subsamples
+        """
+        if not candidates:
+            raise ValueError("The search has no candidates")
+        self.model_type = hyperparameters.get("model_type", "classification").lower()
+        if self.model_type not in DEFAULT_SCORING:
+            raise ValueError(f"Unsupported model type: {self.model_type}")
+
+        self.hyperparameters = hyperparameters
+        self.strategy = strategy
+        self.cv_folds = max(2, cv_folds)
+        self.scoring = scoring or DEFAULT_SCORING[self.model_type]
+        self.max_workers = max_workers if max_workers > 0 else (os.cpu_count() or 1)
+        self.seed = seed
+
+        from sklearn.metrics import get_scorer
+        get_scorer(self.scoring)  # Raises ValueError for unknown scorers before any work starts
+
+        self.results = [{"candidate_id": i, "hyperparameters": candidate, "mean_score": float("nan"),
+                         "std_score": 0.0, "fit_time": 0.0, "n_samples": 0, "round": 0, "error": ""}
+                        for i, candidate in enumerate(candidates)]
+
+        # Candidates evaluated per round; halving keeps the best third until at most HALVING_FACTOR are left
+        self.round_sizes = [len(candidates)]
+        if strategy == "halving":
+            while self.round_sizes[-1] > HALVING_FACTOR:
+                self.round_sizes.append(math.ceil(self.round_sizes[-1] / HALVING_FACTOR))
+        self.total = sum(self.round_sizes)
+        self.evaluated = 0
+
+    def _round_rows(self, n_rows: int) -> List[int]:
+        """Rows every round is evaluated on: the last round uses all of them."""
+        n_rounds = len(self.round_sizes)
+        min_rows = min(n_rows, MIN_ROWS_PER_FOLD * self.cv_folds)
+        return [max(min_rows, n_rows // HALVING_FACTOR ** (n_rounds - 1 - i)) for i in range(n_rounds)]
+
+    def leaderboard(self, size: int = DEFAULT_LEADERBOARD_SIZE) -> List[Dict[str, Any]]:
+        """Get the best evaluated candidates.
+
+        Candidates are ranked by the last halving round they reached, then by
+        mean score; failed candidates are left out.
+
+        Args:
+            size: Maximum number of entries
+
+        Returns:
+            Candidate results, best first, with a "rank" entry
+        """
+        scored = [result for result in self.results if result["round"] and not result["error"]]
+        scored.sort(key=lambda result: (-result["round"], -result["mean_score"], result["candidate_id"]))
+        return [dict(result, rank=rank) for rank, result in enumerate(scored[:size], 1)]
+
+    def best(self) -> Optional[Dict[str, Any]]:
+        """Get the best candidate, or None if no candidate could be scored."""
+        leaderboard = self.leaderboard(1)
+        return leaderboard[0] if leaderboard else None
+
+    def run(self, X: Any, y: Any,
+            is_active: Optional[Callable[[], bool]] = None) -> Iterator[Dict[str, Any]]:
+        """Evaluate the candidates.
+
+        Args:
+            X: Training features
+            y: Training target
+            is_active: Optional callback; the search stops when it returns False
+
+        Yields:
+            The result of every candidate as soon as all of its folds are scored
+        """
+        dataset = SharedDataset(X, y)
+        context = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context,
+                                   initializer=_init_worker,
+                                   initargs=(dataset.specs, self.model_type, self.cv_folds,
+                                             self.scoring, self.seed))
+        try:
+            active = list(range(len(self.results)))
+            for round_index, (size, n_rows) in enumerate(zip(self.round_sizes, self._round_rows(len(X))), 1):
+                active = active[:size]
+                for result in self._run_round(pool, active, round_index, n_rows, is_active):
+                    yield result
+
+                # Halving: continue with the best candidates of this round
+                active = sorted((i for i in active if not self.results[i]["error"]),
+                                key=lambda i: -self.results[i]["mean_score"])
+                if not active or (is_active is not None and not is_active()):
+                    break
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            dataset.close()
+
+    def _run_round(self, pool: ProcessPoolExecutor, candidate_ids: List[int], round_index: int,
+                   n_rows: int, is_active: Optional[Callable[[], bool]]) -> Iterator[Dict[str, Any]]:
+        """Score candidates on n_rows rows, yielding each as its folds complete."""
+        pending: Dict[Future, Tuple[int, int]] = {}
+        fold_results: Dict[int, List[Tuple[float, float]]] = {i: [] for i in candidate_ids}
+        for i in candidate_ids:
+            for fold in range(self.cv_folds):
+                future = pool.submit(_evaluate, {**self.hyperparameters, **self.results[i]["hyperparameters"]},
+                                     fold, n_rows)
+                pending[future] = (i, fold)
+
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                if is_active is not None and not is_active():
+                    return
+                for future in done:
+                    i, _ = pending.pop(future)
+                    result = self.results[i]
+                    if result["error"] and result["round"] == round_index:
+                        continue
+
+                    error = future.exception()
+                    if error is not None:
+                        # A failed fold fails the candidate; its other folds are dropped
+                        result.update(error=str(error) or type(error).__name__, round=round_index, n_samples=n_rows)
+                        for other, (j, _) in list(pending.items()):
+                            if j == i and other.cancel():
+                                del pending[other]
+                        self.evaluated += 1
+                        yield dict(result)
+                        continue
+
+                    fold_results[i].append(future.result())
+                    if len(fold_results[i]) == self.cv_folds:
+                        scores = np.array([score for score, _ in fold_results[i]])
+                        result.update(mean_score=float(scores.mean()), std_score=float(scores.std()),
+                                      fit_time=float(np.mean([fit for _, fit in fold_results[i]])),
+                                      n_samples=n_rows, round=round_index)
+                        self.evaluated += 1
+                        rank = next(entry["rank"] for entry in self.leaderboard(len(self.results))
+                                    if entry["candidate_id"] == i)
+                        yield dict(result, rank=rank)
+        finally:
+            for future in pending:
+                future.cancel()
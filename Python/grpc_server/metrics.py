@@ -0,0 +1,618 @@
+"""Metrics collection and Prometheus text exposition for the gRPC server.
+
+Counters and histograms are updated on the request path with a single
+lock acquisition each; gauges (cache sizes, queue depths, job counts) are
+computed from callbacks only when metrics are collected. The samples are
+served as Prometheus text on an optional HTTP port and through the
+GetStats RPC.
+"""
+
+import abc
+import bisect
+import logging
+import threading
+import time
+from concurrent import futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import grpc
+
+logger = logging.getLogger("gRPC_Server")
+
+# Prefix of every metric name
+NAMESPACE = "pythonml"
+
+# Histogram buckets in seconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TRAINING_BUCKETS = (0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric(abc.ABC):
+    """Base class of a named metric family with fixed label names."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = f"{NAMESPACE}_{name}"
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    @abc.abstractmethod
+    def samples(self) -> Iterator[Sample]:
+        """Get the current samples as (name, labels, value) tuples."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0) -> None:
+        """Increase the counter of a label set.
+
+        Args:
+            labels: Label values, in the order of labelnames
+            amount: Amount to add
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield self.name, self._labels(labels), value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets per label set."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: bucket counts (last one is +Inf), sum
+        self._values: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        """Record an observation.
+
+        Args:
+            labels: Label values, in the order of labelnames
+            value: Observed value
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = [(labels, list(entry[0]), entry[1]) for labels, entry in self._values.items()]
+        for labels, counts, total in values:
+            base = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", base, total
+            yield f"{self.name}_count", base, cumulative
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose values are computed by callbacks at collection time."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 type_name: str = "gauge"):
+        super().__init__(name, documentation, labelnames)
+        self.type_name = type_name
+        self._callbacks: List[Callable[[], Dict[Tuple[str, ...], float]]] = []
+
+    def add_callback(self, callback: Callable[[], Dict[Tuple[str, ...], float]]) -> None:
+        """Add a source of values.
+
+        Args:
+            callback: Function returning {label values: value}
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                values = callback()
+            except Exception as e:
+                logger.warning(f"Error collecting {self.name}: {e}")
+                continue
+            for labels, value in values.items():
+                yield self.name, self._labels(labels), value
+
+
+class InferenceTimer:
+    """Measures the phases of one inference request.
+
+    Each ``mark`` records the time since the previous mark (or since the
+    timer was created) under the given phase name.
+    """
+
+    __slots__ = ("start", "phases", "version", "rows", "_last")
+
+    def __init__(self):
+        self.start = self._last = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.version = ""
+        self.rows = 0
+
+    def mark(self, phase: str) -> None:
+        """Close the current phase.
+
+        Args:
+            phase: Name of the phase that just finished
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def set_result(self, version: str, rows: int) -> None:
+        """Record the resolved model version and the number of rows scored."""
+        self.version = version
+        self.rows = rows
+
+
+class _NullTimer:
+    """Timer used when metrics are disabled; records nothing."""
+
+    __slots__ = ()
+
+    def mark(self, phase: str) -> None:
+        pass
+
+    def set_result(self, version: str, rows: int) -> None:
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+class CountingThreadPoolExecutor(futures.ThreadPoolExecutor):
+    """ThreadPoolExecutor counting its queued and running calls.
+
+    Every submitted call is wrapped so the counts come from the calls
+    themselves rather than from the executor's private work queue.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._count_lock = threading.Lock()
+        self._submitted = 0
+        self._started = 0
+        self._finished = 0
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> futures.Future:
+        with self._count_lock:
+            self._submitted += 1
+        try:
+            future = super().submit(self._run, fn, *args, **kwargs)
+        except BaseException:
+            with self._count_lock:
+                self._submitted -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._count_lock:
+            self._started += 1
+        return fn(*args, **kwargs)
+
+    def _on_done(self, future: futures.Future) -> None:
+        with self._count_lock:
+            # Calls cancelled while queued never start
+            if future.cancelled():
+                self._started += 1
+            self._finished += 1
+
+    def counts(self) -> Dict[str, int]:
+        """Get the number of calls waiting for a thread ("queued") and running ("running")."""
+        with self._count_lock:
+            return {"queued": self._submitted - self._started,
+                    "running": self._started - self._finished}
+
+
+class ServerMetrics:
+    """Metrics of the gRPC server.
+
+    Covers:
+    - Per-RPC request counts by status code and latency histograms
+    - Per model version request counts, scored rows and phase latencies
+    - Model cache counters, hit ratio and loaded-model memory
+    - Thread pool queue depths and training job counts
+    - Training durations by framework and outcome
+    """
+
+    def __init__(self):
+        self.rpc_requests = Counter("grpc_requests_total", "gRPC requests handled", ("method", "code"))
+        self.rpc_latency = Histogram("grpc_request_duration_seconds", "gRPC request latency", ("method",))
+        self.inference_requests = Counter("inference_requests_total", "Inference requests per model version",
+                                          ("model", "version", "status"))
+        self.inference_rows = Counter("inference_rows_total", "Rows scored per model version",
+                                      ("model", "version"))
+        self.inference_phases = Histogram("inference_phase_duration_seconds",
+                                          "Inference latency per phase and model version",
+                                          ("model", "version", "phase"))
+        self.training_duration = Histogram("training_duration_seconds", "Training run durations",
+                                           ("framework", "status"), buckets=TRAINING_BUCKETS)
+
+        self._gauges: Dict[str, CallbackGauge] = {}
+        self._metrics: List[_Metric] = [self.rpc_requests, self.rpc_latency, self.inference_requests,
+                                        self.inference_rows, self.inference_phases, self.training_duration]
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+              type_name: str = "gauge") -> CallbackGauge:
+        """Get or create a callback gauge.
+
+        Args:
+            name: Metric name (without the namespace prefix)
+            documentation: Help text
+            labelnames: Label names
+            type_name: Exposition type ("gauge", or "counter" for monotonic values read from elsewhere)
+
+        Returns:
+            The gauge
+        """
+        if name not in self._gauges:
+            gauge = CallbackGauge(name, documentation, labelnames, type_name)
+            self._gauges[name] = gauge
+            self._metrics.append(gauge)
+        return self._gauges[name]
+
+    def observe_rpc(self, method: str, code: str, seconds: float) -> None:
+        """Record a finished RPC."""
+        self.rpc_requests.inc((method, code))
+        self.rpc_latency.observe((method,), seconds)
+
+    def observe_inference(self, model_name: str, timer: InferenceTimer, success: bool) -> None:
+        """Record a finished inference request.
+
+        Args:
+            model_name: Name of the model
+            timer: The request's timer (version and rows are read from it)
+            success: Whether the request succeeded
+        """
+        version = timer.version
+        self.inference_requests.inc((model_name, version, "success" if success else "error"))
+        if not success:
+            return
+
+        if timer.rows:
+            self.inference_rows.inc((model_name, version), timer.rows)
+        for phase, seconds in timer.phases:
+            self.inference_phases.observe((model_name, version, phase), seconds)
+        self.inference_phases.observe((model_name, version, "total"), time.perf_counter() - timer.start)
+
+    def observe_training(self, framework: str, status: str, seconds: float) -> None:
+        """Record a finished training run."""
+        self.training_duration.observe((framework, status), seconds)
+
+    def watch_model_manager(self, model_manager: Any) -> None:
+        """Expose the model cache, prediction cache and row deduplication statistics of a model manager.
+
+        Args:
+            model_manager: The ModelManager
+        """
+        def cache_stat(key: str) -> Callable[[], Dict[Tuple[str, ...], float]]:
+            return lambda: {(): model_manager.get_cache_stats()[key]}
+
+        self.gauge("model_cache_hits_total", "Model cache hits", type_name="counter") \
+            .add_callback(cache_stat("hits"))
+        self.gauge("model_cache_misses_total", "Model cache misses", type_name="counter") \
+            .add_callback(cache_stat("misses"))
+        self.gauge("model_cache_evictions_total", "Model cache evictions", type_name="counter") \
+            .add_callback(cache_stat("evictions"))
+        self.gauge("model_cache_hit_ratio", "Model cache hit ratio").add_callback(cache_stat("hit_ratio"))
+        self.gauge("model_cache_entries", "Loaded models").add_callback(cache_stat("entries"))
+        self.gauge("model_cache_bytes", "Estimated memory of loaded models").add_callback(cache_stat("bytes"))
+
+        def model_sizes() -> Dict[Tuple[str, ...], float]:
+            sizes = {}
+            for key, size in model_manager.models.sizes().items():
+                model_name, _, version = key.rpartition(":")
+                sizes[(model_name, version)] = size
+            return sizes
+
+        self.gauge("loaded_model_bytes", "Estimated memory of each loaded model version",
+                   ("model", "version")).add_callback(model_sizes)
+
+        if model_manager.batcher is not None:
+            self.gauge("batching_queue_depth", "Requests waiting for a micro-batch") \
+                .add_callback(lambda: {(): model_manager.get_batching_stats()["queue_depth"]})
+
+        if model_manager.prediction_cache is not None:
+            def prediction_cache_stat(key: str) -> Callable[[], Dict[Tuple[str, ...], float]]:
+                return lambda: {(): model_manager.prediction_cache.stats()[key]}
+
+            self.gauge("prediction_cache_hits_total", "Prediction cache hits", type_name="counter") \
+                .add_callback(prediction_cache_stat("hits"))
+            self.gauge("prediction_cache_misses_total", "Prediction cache misses", type_name="counter") \
+                .add_callback(prediction_cache_stat("misses"))
+            self.gauge("prediction_cache_expirations_total", "Prediction cache entries expired by the TTL",
+                       type_name="counter").add_callback(prediction_cache_stat("expirations"))
+            self.gauge("prediction_cache_evictions_total", "Prediction cache evictions", type_name="counter") \
+                .add_callback(prediction_cache_stat("evictions"))
+            self.gauge("prediction_cache_entries", "Cached prediction results") \
+                .add_callback(prediction_cache_stat("entries"))
+            self.gauge("prediction_cache_bytes", "Size of the cached prediction results") \
+                .add_callback(prediction_cache_stat("bytes"))
+
+        # Worker processes deduplicate rows with their own counters
+        if model_manager.row_dedup is not None and model_manager.worker_pool is None:
+            def row_stat(key: str) -> Callable[[], Dict[Tuple[str, ...], float]]:
+                return lambda: {(): model_manager.row_dedup.stats()[key]}
+
+            self.gauge("dedup_rows_total", "Rows of deduplicated inputs", type_name="counter") \
+                .add_callback(row_stat("rows"))
+            self.gauge("dedup_unique_rows_total", "Distinct rows of deduplicated inputs", type_name="counter") \
+                .add_callback(row_stat("unique_rows"))
+            self.gauge("dedup_scored_rows_total", "Distinct rows scored by the model", type_name="counter") \
+                .add_callback(row_stat("scored_rows"))
+            self.gauge("row_cache_hit_ratio", "Share of distinct rows served from the row cache") \
+                .add_callback(row_stat("hit_ratio"))
+            self.gauge("row_cache_rows", "Rows in the row caches").add_callback(row_stat("cached_rows"))
+
+    def watch_executor(self, name: str, executor: CountingThreadPoolExecutor) -> None:
+        """Expose the queued and running calls of an executor.
+
+        Args:
+            name: Label identifying the executor
+            executor: The executor
+        """
+        self.gauge("executor_queue_depth", "Calls waiting for a thread", ("executor",)) \
+            .add_callback(lambda: {(name,): executor.counts()["queued"]})
+        self.gauge("executor_running_calls", "Calls running on a thread", ("executor",)) \
+            .add_callback(lambda: {(name,): executor.counts()["running"]})
+
+    def watch_imports(self, import_times: Callable[[], Dict[str, float]]) -> None:
+        """Expose how long the heavy modules and frameworks took to import.
+
+        Args:
+            import_times: Callable returning module name -> import seconds
+        """
+        self.gauge("module_import_seconds", "Time spent importing modules", ("module",)) \
+            .add_callback(lambda: {(name,): seconds for name, seconds in import_times().items()})
+
+    def watch_training_jobs(self, scheduler: Any) -> None:
+        """Expose the queued and running job counts of a TrainingJobScheduler.
+
+        Args:
+            scheduler: The scheduler
+        """
+        def job_counts() -> Dict[Tuple[str, ...], float]:
+            stats = scheduler.stats()
+            return {("queued",): stats["queued"], ("running",): stats["running"]}
+
+        self.gauge("training_jobs", "Training jobs by state", ("state",)).add_callback(job_counts)
+
+    def collect(self, name_prefix: str = "") -> List[Tuple[_Metric, List[Sample]]]:
+        """Collect the current samples.
+
+        Args:
+            name_prefix: Only include metric families whose name starts with this prefix
+
+        Returns:
+            List of (metric family, samples)
+        """
+        result = []
+        for metric in self._metrics:
+            if name_prefix and not metric.name.startswith(name_prefix):
+                continue
+            result.append((metric, list(metric.samples())))
+        return result
+
+    def render(self, name_prefix: str = "") -> str:
+        """Render the samples in the Prometheus text exposition format.
+
+        Args:
+            name_prefix: Only include metric families whose name starts with this prefix
+
+        Returns:
+            The exposition text
+        """
+        return format_exposition(self.collect(name_prefix))
+
+
+def format_exposition(collected: List[Tuple[_Metric, List[Sample]]]) -> str:
+    """Format collected samples in the Prometheus text exposition format.
+
+    Args:
+        collected: Output of ServerMetrics.collect
+
+    Returns:
+        The exposition text
+    """
+    lines = []
+    for metric, samples in collected:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        for name, labels, value in samples:
+            if labels:
+                label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+            else:
+                lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# Status code names by numeric value
+_CODE_NAMES = {code.value[0]: code.name for code in grpc.StatusCode}
+
+
+def _status_code(context: Any) -> str:
+    code = context.code()
+    if code is None:
+        return "OK"
+    if isinstance(code, grpc.StatusCode):
+        return code.name
+    # The asyncio context reports the numeric code
+    return _CODE_NAMES.get(code, str(code))
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """Records request counts and latencies of every RPC on a threaded server."""
+
+    def __init__(self, metrics: ServerMetrics):
+        self.metrics = metrics
+
+    def intercept_service(self, continuation: Callable, handler_call_details: Any) -> Any:
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        metrics = self.metrics
+
+        def unary(behavior: Callable) -> Callable:
+            def wrapper(request: Any, context: grpc.ServicerContext) -> Any:
+                start = time.perf_counter()
+                code = "UNKNOWN"
+                try:
+                    response = behavior(request, context)
+                    code = _status_code(context)
+                    return response
+                finally:
+                    metrics.observe_rpc(method, code, time.perf_counter() - start)
+            return wrapper
+
+        def streaming(behavior: Callable) -> Callable:
+            def wrapper(request: Any, context: grpc.ServicerContext) -> Any:
+                start = time.perf_counter()
+                code = "UNKNOWN"
+                try:
+                    yield from behavior(request, context)
+                    code = _status_code(context)
+                finally:
+                    metrics.observe_rpc(method, code, time.perf_counter() - start)
+            return wrapper
+
+        if handler.unary_unary:
+            return handler._replace(unary_unary=unary(handler.unary_unary))
+        if handler.stream_unary:
+            return handler._replace(stream_unary=unary(handler.stream_unary))
+        if handler.unary_stream:
+            return handler._replace(unary_stream=streaming(handler.unary_stream))
+        if handler.stream_stream:
+            return handler._replace(stream_stream=streaming(handler.stream_stream))
+        return handler
+
+
+class AsyncMetricsInterceptor(grpc.aio.ServerInterceptor):
+    """Records request counts and latencies of every RPC on a grpc.aio server."""
+
+    def __init__(self, metrics: ServerMetrics):
+        self.metrics = metrics
+
+    async def intercept_service(self, continuation: Callable, handler_call_details: Any) -> Any:
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        metrics = self.metrics
+
+        def unary(behavior: Callable) -> Callable:
+            async def wrapper(request: Any, context: grpc.aio.ServicerContext) -> Any:
+                start = time.perf_counter()
+                code = "UNKNOWN"
+                try:
+                    response = await behavior(request, context)
+                    code = _status_code(context)
+                    return response
+                finally:
+                    metrics.observe_rpc(method, code, time.perf_counter() - start)
+            return wrapper
+
+        def streaming(behavior: Callable) -> Callable:
+            async def wrapper(request: Any, context: grpc.aio.ServicerContext) -> Any:
+                start = time.perf_counter()
+                code = "UNKNOWN"
+                try:
+                    async for response in behavior(request, context):
+                        yield response
+                    code = _status_code(context)
+                finally:
+                    metrics.observe_rpc(method, code, time.perf_counter() - start)
+            return wrapper
+
+        if handler.unary_unary:
+            return handler._replace(unary_unary=unary(handler.unary_unary))
+        if handler.stream_unary:
+            return handler._replace(stream_unary=unary(handler.stream_unary))
+        if handler.unary_stream:
+            return handler._replace(unary_stream=streaming(handler.unary_stream))
+        if handler.stream_stream:
+            return handler._replace(stream_stream=streaming(handler.stream_stream))
+        return handler
+
+
+def start_metrics_server(metrics: ServerMetrics, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve the metrics as Prometheus text on ``http://host:port/metrics``.
+
+    Args:
+        metrics: The server metrics
+        port: HTTP port
+        host: Interface to bind (loopback by default; the endpoint is unauthenticated)
+
+    Returns:
+        The running HTTP server (call shutdown() to stop it)
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Scrapes would otherwise be logged to stderr on every request
+            pass
+
+    http_server = ThreadingHTTPServer((host, port), MetricsHandler)
+    http_server.daemon_threads = True
+    threading.Thread(target=http_server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+    return http_server
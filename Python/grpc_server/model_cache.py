@@ -0,0 +1,265 @@
+"""Bounded in-memory cache for loaded model instances.
+
+Models are kept in least-recently-used order and evicted one at a time when
+either the entry budget or the byte budget is exceeded.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def estimate_artifact_size(path: str) -> int:
+    """Estimate the in-memory cost of a model from its artifact on disk.
+
+    Args:
+        path: Path to a model file or model directory
+
+    Returns:
+        Size of the artifact in bytes (0 if it does not exist)
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    total = 0
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+    return total
+
+
+class ModelCache:
+    """LRU cache of loaded models keyed by ``"name:version"``.
+
+    Supports:
+    - Entry and byte budgets (0 disables a budget)
+    - Invalidation of a single version or of every version of a model
+    - Hit, miss and eviction counters
+    - Thread-safe access with single-flight loading of missing models
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached models (0 for unlimited)
+            max_bytes: Maximum total estimated size in bytes (0 for unlimited)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced_loads = 0
+
+    @staticmethod
+    def make_key(model_name: str, version: str) -> str:
+        """Build the cache key for a model version."""
+        return f"{model_name}:{version}"
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached model and mark it as most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached model, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_or_load(self, key: str, loader: Callable[[], Tuple[Any, int]]) -> Any:
+        """Get a cached model, loading it at most once if it is missing.
+
+        Concurrent callers that miss on the same key wait for the first
+        caller's load instead of loading the artifact themselves.
+
+        Args:
+            key: Cache key
+            loader: Callable returning a tuple of (model, size_bytes)
+
+        Returns:
+            The cached or freshly loaded model
+
+        Raises:
+            Exception: Whatever the loader raised (re-raised in every waiting caller)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced_loads += 1
+                owner = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            model, size_bytes = loader()
+        except BaseException as e:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            # Skip caching if the key was invalidated while loading
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                self._put(key, model, size_bytes)
+        future.set_result(model)
+        return model
+
+    def put(self, key: str, model: Any, size_bytes: int = 0) -> None:
+        """Add a model to the cache, evicting older entries if needed.
+
+        Args:
+            key: Cache key
+            model: Loaded model instance
+            size_bytes: Estimated size of the model in bytes
+        """
+        with self._lock:
+            self._put(key, model, size_bytes)
+
+    def invalidate(self, key: str) -> bool:
+        """Remove a single entry from the cache.
+
+        A load of the same key that is in flight will not be cached.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if an entry was removed
+        """
+        with self._lock:
+            self._inflight.pop(key, None)
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def invalidate_model(self, model_name: str) -> int:
+        """Remove every cached version of a model.
+
+        Args:
+            model_name: Name of the model
+
+        Returns:
+            Number of entries removed
+        """
+        prefix = f"{model_name}:"
+        with self._lock:
+            for key in [key for key in self._inflight if key.startswith(prefix)]:
+                del self._inflight[key]
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._inflight.clear()
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def keys(self) -> List[str]:
+        """Get cached keys from least to most recently used."""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def sizes(self) -> Dict[str, int]:
+        """Get the estimated size in bytes of each cached model."""
+        with self._lock:
+            return {key: size_bytes for key, (_, size_bytes) in self._entries.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with sizes, budgets and hit/miss/eviction counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced_loads": self.coalesced_loads,
+                "loads_in_flight": len(self._inflight),
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def _put(self, key: str, model: Any, size_bytes: int) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (model, size_bytes)
+        self._total_bytes += size_bytes
+        self._evict(keep=key)
+
+    def _remove(self, key: str) -> None:
+        _, size_bytes = self._entries.pop(key)
+        self._total_bytes -= size_bytes
+
+    def _evict(self, keep: str) -> None:
+        """Evict least recently used entries until the budgets are met.
+
+        The entry that was just added is never evicted, so a single model
+        larger than the byte budget can still be served.
+        """
+        while self._over_budget():
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _over_budget(self) -> bool:
+        if self.max_entries and len(self._entries) > self.max_entries:
+            return True
+        if self.max_bytes and self._total_bytes > self.max_bytes:
+            return True
+        return False
@@ -4,50 +4,222 @@ Supports model versioning, staging, and multiple ML frameworks.
 """
 
 import os
+import re
+import copy
 import json
 import pickle
+import threading
 import time
 import uuid
 import shutil
-from typing import Dict, List, Optional, Any, Tuple, BinaryIO
+import contextlib
+from typing import Dict, List, Optional, Any, Tuple, BinaryIO, Callable, ContextManager, Iterator, Union
 from datetime import datetime
 import io
+import itertools
 import tempfile
 
+import joblib
 import numpy as np
 import pandas as pd
 
+from arrow_codec import DEFAULT_TARGET_COLUMN, TARGET_COLUMN_PARAMETER, read_training_data
+from batching import MicroBatcher
+from dataset_source import DatasetSource
+from frameworks import detect_frameworks, import_framework
+from hyperparameter_search import (DEFAULT_CANDIDATES, DEFAULT_CV_FOLDS, DEFAULT_LEADERBOARD_SIZE,
+                                   HyperparameterSearch, build_candidates, parse_search_space)
+from metrics import InferenceTimer, NULL_TIMER
+from model_cache import ModelCache, estimate_artifact_size
+from onnx_backend import (ONNX_SUFFIX, OnnxModel, OnnxRuntimeBackend, compare_outputs, convert_model,
+                          export_requested, parity_sample)
+from prediction_cache import (CACHE_METADATA_KEY, CacheKey, PredictionCache, cache_requested, fingerprint,
+                              result_metadata)
+from profiling import PROFILE_METADATA_KEY, ProfileSampler, format_breakdown, profile_requested
+from registry_store import RegistryStore, create_registry_store
+from row_dedup import RowDeduplicator, can_dedupe, dedupe_requested
+from training_stream import ArraySpool, TrainingDataParser, DEFAULT_BLOCK_ROWS
+from tree_engine import CompiledForest, compile_model
+
 # Import scikit-learn models
-from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.linear_model import LinearRegression, LogisticRegression, SGDClassifier, SGDRegressor
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.svm import SVC, SVR
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, r2_score, mean_squared_error
 
-# Import TensorFlow conditionally
-try:
-    import tensorflow as tf
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
-
-# Import PyTorch conditionally
-try:
-    import torch
-    import torch.nn as nn
-    PYTORCH_AVAILABLE = True
-except ImportError:
-    PYTORCH_AVAILABLE = False
-
-# Supported ML frameworks
-SUPPORTED_FRAMEWORKS = ["scikit-learn"]
-if TENSORFLOW_AVAILABLE:
-    SUPPORTED_FRAMEWORKS.append("tensorflow")
-if PYTORCH_AVAILABLE:
-    SUPPORTED_FRAMEWORKS.append("pytorch")
+# Supported ML frameworks (TensorFlow and PyTorch are imported on first use)
+SUPPORTED_FRAMEWORKS = detect_frameworks()
+TENSORFLOW_AVAILABLE = "tensorflow" in SUPPORTED_FRAMEWORKS
+PYTORCH_AVAILABLE = "pytorch" in SUPPORTED_FRAMEWORKS
 
 # Valid model stages
 VALID_STAGES = ["development", "staging", "production", "archived"]
 
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _iter_json_array(text: str):
+    """Lazily decode the elements of a top-level JSON array.
+    
+    Args:
+        text: JSON text
+        
+    Returns:
+        Iterator over the array elements, or None if the text is not an array
+        (element iteration raises json.JSONDecodeError on malformed input)
+    """
+    idx = _JSON_WHITESPACE.match(text, 0).end()
+    if text[idx:idx + 1] != "[":
+        return None
+    
+    def elements():
+        pos = _JSON_WHITESPACE.match(text, idx + 1).end()
+        if text[pos:pos + 1] == "]":
+            end = pos + 1
+        else:
+            while True:
+                value, pos = _JSON_DECODER.raw_decode(text, pos)
+                yield value
+                pos = _JSON_WHITESPACE.match(text, pos).end()
+                separator = text[pos:pos + 1]
+                if separator == ",":
+                    pos = _JSON_WHITESPACE.match(text, pos + 1).end()
+                elif separator == "]":
+                    end = pos + 1
+                    break
+                else:
+                    raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+        
+        if _JSON_WHITESPACE.match(text, end).end() != len(text):
+            raise json.JSONDecodeError("Extra data", text, end)
+    
+    return elements()
+
+
+def _new_version() -> str:
+    """Generate a version id for a newly trained model.
+    
+    Versions sort by creation time; the random suffix keeps versions of
+    the same model trained in parallel in the same microsecond distinct.
+    """
+    return f"{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
+
+
+def create_sklearn_model(model_type: str, algorithm: str, hyperparameters: Dict[str, str]) -> Any:
+    """Create an unfitted scikit-learn model from training hyperparameters.
+    
+    Shared by training and the hyperparameter search workers, so searched
+    candidates are exactly the models TrainModel would build.
+    
+    Args:
+        model_type: classification or regression
+        algorithm: random_forest, logistic_regression, svm, linear_regression,
+            svr or sgd (SGD models support partial_fit)
+        hyperparameters: Hyperparameters for the model
+        
+    Returns:
+        The unfitted model
+        
+    Raises:
+        ValueError: If the model type or algorithm is not supported
+    """
+    if algorithm == "sgd":
+        alpha = float(hyperparameters.get("alpha", "0.0001"))
+        if model_type == "classification":
+            # log_loss provides predict_proba for confidence scores
+            return SGDClassifier(loss=hyperparameters.get("loss", "log_loss"), alpha=alpha, random_state=42)
+        elif model_type == "regression":
+            return SGDRegressor(loss=hyperparameters.get("loss", "squared_error"), alpha=alpha, random_state=42)
+        raise ValueError(f"Unsupported model type: {model_type}")
+    
+    if model_type == "classification":
+        if algorithm == "random_forest":
+            n_estimators = int(hyperparameters.get("n_estimators", "100"))
+            max_depth = hyperparameters.get("max_depth")
+            max_depth = int(max_depth) if max_depth and max_depth.lower() != "none" else None
+            
+            return RandomForestClassifier(
+                n_estimators=n_estimators,
+                max_depth=max_depth,
+                random_state=42
+            )
+        elif algorithm == "logistic_regression":
+            C = float(hyperparameters.get("C", "1.0"))
+            return LogisticRegression(
+                C=C,
+                max_iter=1000,
+                random_state=42
+            )
+        elif algorithm == "svm":
+            C = float(hyperparameters.get("C", "1.0"))
+            kernel = hyperparameters.get("kernel", "rbf")
+            return SVC(
+                C=C,
+                kernel=kernel,
+                probability=True,
+                random_state=42
+            )
+        raise ValueError(f"Unsupported classification algorithm: {algorithm}")
+    
+    elif model_type == "regression":
+        if algorithm == "random_forest":
+            n_estimators = int(hyperparameters.get("n_estimators", "100"))
+            max_depth = hyperparameters.get("max_depth")
+            max_depth = int(max_depth) if max_depth and max_depth.lower() != "none" else None
+            
+            return RandomForestRegressor(
+                n_estimators=n_estimators,
+                max_depth=max_depth,
+                random_state=42
+            )
+        elif algorithm == "linear_regression":
+            return LinearRegression()
+        elif algorithm == "svr":
+            C = float(hyperparameters.get("C", "1.0"))
+            kernel = hyperparameters.get("kernel", "rbf")
+            return SVR(
+                C=C,
+                kernel=kernel
+            )
+        raise ValueError(f"Unsupported regression algorithm: {algorithm}")
+    
+    raise ValueError(f"Unsupported model type: {model_type}")
+
+class ModelHandle:
+    """Resolved model version, as stored in the resolution index.
+    
+    Handles are built when the registry changes and never modified, so the
+    predict path can use them without holding the registry lock.
+    """
+    
+    __slots__ = ("model_name", "version", "framework", "model_type", "stage",
+                 "model_key", "model_path", "onnx_path", "architecture")
+    
+    def __init__(self, model_name: str, version: str, framework: str, model_type: str,
+                 stage: str, model_path: str, architecture: Dict[str, Any], onnx_path: str = ""):
+        """Initialize the handle.
+        
+        Args:
+            model_name: Name of the model
+            version: Resolved version
+            framework: Framework the model was trained with
+            model_type: Type of the model (classification, regression, ...)
+            stage: Stage of the version
+            model_path: Path to the model artifact
+            architecture: PyTorch architecture description
+            onnx_path: Path of the version's ONNX artifact (exists only if it was exported)
+        """
+        self.model_name = model_name
+        self.version = version
+        self.framework = framework
+        self.model_type = model_type
+        self.stage = stage
+        self.model_key = ModelCache.make_key(model_name, version)
+        self.model_path = model_path
+        self.onnx_path = onnx_path
+        self.architecture = architecture
+
 class ModelManager:
     """Enhanced model manager for the gRPC server.
     
@@ -58,16 +230,44 @@ class ModelManager:
     - Streaming data processing
     """
     
-    def __init__(self, models_dir: str = "models"):
+    def __init__(self, models_dir: str = "models", cache_max_entries: int = 32,
+                 cache_max_bytes: int = 0, batcher: Optional[MicroBatcher] = None,
+                 worker_pool: Any = None, registry_backend: str = "sqlite",
+                 profiler: Optional[ProfileSampler] = None,
+                 onnx_backend: Optional[OnnxRuntimeBackend] = None,
+                 prediction_cache: Optional[PredictionCache] = None,
+                 row_dedup: Optional[RowDeduplicator] = None):
         """Initialize the model manager.
         
         Args:
             models_dir: Directory to store models
+            cache_max_entries: Maximum number of loaded models to keep in memory (0 for unlimited)
+            cache_max_bytes: Maximum estimated size of loaded models in bytes (0 for unlimited)
+            batcher: Optional micro-batcher used to combine concurrent predictions
+            worker_pool: Optional InferenceWorkerPool that runs predictions in worker processes
+            registry_backend: Registry storage backend ("sqlite" or "json")
+            profiler: Optional sampler capturing cProfile statistics of 1 in N requests
+            onnx_backend: Optional ONNX Runtime backend serving the versions exported to ONNX
+            prediction_cache: Optional cache of process_data results
+            row_dedup: Optional deduplicator scoring only the distinct, not yet cached rows of an input
         """
         self.models_dir = models_dir
-        self.models: Dict[str, Dict[str, Any]] = {}
+        self.registry_backend = registry_backend
+        self.profiler = profiler
+        self.onnx_backend = onnx_backend
+        self.prediction_cache = prediction_cache
+        self.row_dedup = row_dedup
+        self.models = ModelCache(max_entries=cache_max_entries, max_bytes=cache_max_bytes)
+        self.batcher = batcher
+        self.worker_pool = worker_pool
         self.model_registry: Dict[str, Dict[str, Any]] = {}
         
+        # Guards model_registry; re-entrant so public methods can call each other
+        self._registry_lock = threading.RLock()
+        
+        # (model_name, version, stage) -> ModelHandle; replaced as a whole on registry changes
+        self._resolution_index: Dict[Tuple[str, Optional[str], Optional[str]], ModelHandle] = {}
+        
         # Create models directory if it doesn't exist
         os.makedirs(self.models_dir, exist_ok=True)
         
@@ -75,31 +275,140 @@ class ModelManager:
         for framework in SUPPORTED_FRAMEWORKS:
             os.makedirs(os.path.join(self.models_dir, framework), exist_ok=True)
         
-        # Load model registry if it exists
+        # Open the registry store and load the registry
+        self.registry_store: RegistryStore = create_registry_store(registry_backend, self.models_dir)
         self._load_registry()
         
         print(f"Model Manager initialized with frameworks: {SUPPORTED_FRAMEWORKS}")
     
     def _load_registry(self) -> None:
-        """Load the model registry from disk."""
-        registry_path = os.path.join(self.models_dir, "model_registry.json")
-        if os.path.exists(registry_path):
+        """Load the model registry from the registry store."""
+        with self._registry_lock:
             try:
-                with open(registry_path, "r") as f:
-                    self.model_registry = json.load(f)
+                self.model_registry = self.registry_store.load()
                 print(f"Loaded {len(self.model_registry)} models from registry")
             except Exception as e:
                 print(f"Error loading model registry: {e}")
                 self.model_registry = {}
+            self._rebuild_index()
     
-    def _save_registry(self) -> None:
-        """Save the model registry to disk."""
-        registry_path = os.path.join(self.models_dir, "model_registry.json")
+    def _save_registry(self, model_name: str, versions: List[str]) -> None:
+        """Persist the changes to one model in a single transaction.
+        
+        If the store rejects the change, the in-memory entry is reloaded
+        from the store so the registry never serves an unsaved change.
+        
+        Args:
+            model_name: Name of the changed model
+            versions: Versions whose entries changed
+            
+        Raises:
+            Exception: Whatever the registry store raised
+        """
+        with self._registry_lock:
+            try:
+                self.registry_store.save_model(model_name, self.model_registry[model_name], versions)
+            except Exception as e:
+                print(f"Error saving model registry: {e}")
+                self._revert_model(model_name)
+                raise
+            self._rebuild_index()
+            
+            # Stages or versions of the model may now resolve differently
+            if self.prediction_cache is not None:
+                self.prediction_cache.invalidate_model(model_name)
+            if self.row_dedup is not None:
+                self.row_dedup.invalidate_model(model_name)
+    
+    def _revert_model(self, model_name: str) -> None:
+        """Replace a model's in-memory entry with the stored one (caller holds the registry lock)."""
         try:
-            with open(registry_path, "w") as f:
-                json.dump(self.model_registry, f, indent=2)
+            stored = self.registry_store.load().get(model_name)
         except Exception as e:
-            print(f"Error saving model registry: {e}")
+            print(f"Error reloading model registry: {e}")
+            stored = None
+        if stored is None:
+            self.model_registry.pop(model_name, None)
+        else:
+            self.model_registry[model_name] = stored
+        self._rebuild_index()
+    
+    def _rebuild_index(self) -> None:
+        """Rebuild the resolution index from the registry (caller holds the registry lock).
+        
+        Every way of addressing a model version (explicit version, stage or
+        latest) maps to a prebuilt handle, so resolving a request is a single
+        dictionary lookup. Readers never lock: the new index replaces the old
+        one in a single assignment.
+        """
+        index = {}
+        for model_name, info in self.model_registry.items():
+            framework = info.get("framework", "scikit-learn")
+            handles = {}
+            for version, version_info in info.get("versions", {}).items():
+                model_type = info.get("properties", {}).get("type") or \
+                    version_info.get("hyperparameters", {}).get("model_type", "classification")
+                handle = ModelHandle(
+                    model_name=model_name,
+                    version=version,
+                    framework=framework,
+                    model_type=model_type.lower(),
+                    stage=version_info.get("stage", ""),
+                    model_path=self._artifact_path(model_name, version, framework),
+                    architecture=copy.deepcopy(version_info.get("architecture", {})),
+                    onnx_path=os.path.join(self.models_dir, framework, f"{model_name}_{version}{ONNX_SUFFIX}")
+                )
+                handles[version] = handle
+                index[(model_name, version, None)] = handle
+            
+            for stage, version in info.get("stage_versions", {}).items():
+                if version in handles:
+                    index[(model_name, None, stage)] = handles[version]
+            
+            if info.get("latest_version") in handles:
+                index[(model_name, None, None)] = handles[info["latest_version"]]
+        
+        self._resolution_index = index
+    
+    def has_model(self, model_name: str) -> bool:
+        """Check whether a model is registered.
+        
+        Args:
+            model_name: Name of the model
+            
+        Returns:
+            True if the registry has an entry for the model
+        """
+        return model_name in self.model_registry
+    
+    def _resolve(self, model_name: str, version: str = None, stage: str = None) -> ModelHandle:
+        """Resolve a model version through the resolution index.
+        
+        Args:
+            model_name: Name of the model
+            version: Specific version (takes precedence over stage)
+            stage: Stage to resolve (default: latest version)
+            
+        Returns:
+            The model handle
+            
+        Raises:
+            ValueError: If model, stage or version does not exist
+        """
+        handle = self._resolution_index.get((model_name, version or None, None if version else stage or None))
+        if handle is not None:
+            return handle
+        
+        # Report why the lookup failed
+        with self._registry_lock:
+            if model_name not in self.model_registry:
+                raise ValueError(f"Model '{model_name}' does not exist")
+            info = self.model_registry[model_name]
+            if stage and not version and stage not in info.get("stage_versions", {}):
+                raise ValueError(f"No version found for stage '{stage}' of model '{model_name}'")
+            if not version and not stage:
+                version = info.get("latest_version")
+        raise ValueError(f"Version '{version}' does not exist for model '{model_name}'")
     
     def get_model_info(self, model_name: str, version: str = None, stage: str = None) -> Dict[str, Any]:
         """Get information about a model.
@@ -115,28 +424,17 @@ class ModelManager:
         Raises:
             ValueError: If model does not exist
         """
-        if model_name not in self.model_registry:
-            raise ValueError(f"Model '{model_name}' does not exist")
-        
-        info = self.model_registry[model_name].copy()
-        
-        # If stage is specified, get the version for that stage
-        if stage and not version:
-            if stage not in info["stage_versions"]:
-                raise ValueError(f"No version found for stage '{stage}' of model '{model_name}'")
-            version = info["stage_versions"][stage]
+        handle = self._resolve(model_name, version, stage)
         
-        # If no version is specified, use the latest
-        if not version:
-            version = info["latest_version"]
-        
-        # Get the specific version info
-        if version not in info["versions"]:
-            raise ValueError(f"Version '{version}' does not exist for model '{model_name}'")
+        with self._registry_lock:
+            # Deep copy so callers never observe concurrent registry updates
+            info = copy.deepcopy(self.model_registry[model_name])
         
         # Combine base info with version-specific info
-        result = {**info, **info["versions"][version]}
-        result["version"] = version
+        result = {**info, **info["versions"][handle.version]}
+        result["model_name"] = model_name
+        result["version"] = handle.version
+        result["model_type"] = handle.model_type
         
         return result
     
@@ -152,56 +450,7 @@ class ModelManager:
         Returns:
             List of model information dictionaries
         """
-        result = []
-        
-        for model_name, info in self.model_registry.items():
-            # Apply framework filter if specified
-            if framework_filter and info.get("framework") != framework_filter:
-                continue
-            
-            if include_all_versions:
-                # Include all versions
-                for version, version_info in info["versions"].items():
-                    # Skip if this version doesn't match the stage filter
-                    if stage_filter and version_info.get("stage") != stage_filter:
-                        continue
-                    
-                    model_summary = {
-                        "model_name": model_name,
-                        "version": version,
-                        "description": version_info.get("description", info.get("description", "")),
-                        "framework": info.get("framework", "unknown"),
-                        "stage": version_info.get("stage", "unknown"),
-                        "created_at": version_info.get("created_at", ""),
-                        "updated_at": version_info.get("updated_at", "")
-                    }
-                    result.append(model_summary)
-            else:
-                # Just include the latest version or the version for the requested stage
-                if stage_filter:
-                    # Check if there's a version for this stage
-                    if stage_filter not in info.get("stage_versions", {}):
-                        continue
-                    
-                    version = info["stage_versions"][stage_filter]
-                    version_info = info["versions"][version]
-                else:
-                    # Use the latest version
-                    version = info["latest_version"]
-                    version_info = info["versions"][version]
-                
-                model_summary = {
-                    "model_name": model_name,
-                    "version": version,
-                    "description": version_info.get("description", info.get("description", "")),
-                    "framework": info.get("framework", "unknown"),
-                    "stage": version_info.get("stage", "unknown"),
-                    "created_at": version_info.get("created_at", ""),
-                    "updated_at": version_info.get("updated_at", "")
-                }
-                result.append(model_summary)
-        
-        return result
+        return self.registry_store.list_versions(framework_filter, stage_filter, include_all_versions)
     
     def change_model_stage(self, model_name: str, version: str, 
                           current_stage: str, new_stage: str) -> Dict[str, Any]:
@@ -219,40 +468,45 @@ class ModelManager:
         Raises:
             ValueError: If model does not exist or stage change is invalid
         """
-        if model_name not in self.model_registry:
-            raise ValueError(f"Model '{model_name}' does not exist")
+        with self._registry_lock:
+            if model_name not in self.model_registry:
+                raise ValueError(f"Model '{model_name}' does not exist")
+        
+            info = self.model_registry[model_name]
         
-        info = self.model_registry[model_name]
+            if version not in info["versions"]:
+                raise ValueError(f"Version '{version}' does not exist for model '{model_name}'")
         
-        if version not in info["versions"]:
-            raise ValueError(f"Version '{version}' does not exist for model '{model_name}'")
+            if new_stage not in VALID_STAGES:
+                raise ValueError(f"Invalid stage '{new_stage}'. Valid stages are: {VALID_STAGES}")
         
-        if new_stage not in VALID_STAGES:
-            raise ValueError(f"Invalid stage '{new_stage}'. Valid stages are: {VALID_STAGES}")
+            version_info = info["versions"][version]
+            stage = version_info.get("stage", "development")
         
-        version_info = info["versions"][version]
-        stage = version_info.get("stage", "development")
+            # Verify current stage if specified
+            if current_stage and stage != current_stage:
+                raise ValueError(f"Version '{version}' is in stage '{stage}', not '{current_stage}'")
         
-        # Verify current stage if specified
-        if current_stage and stage != current_stage:
-            raise ValueError(f"Version '{version}' is in stage '{stage}', not '{current_stage}'")
+            # Update the stage for this version
+            previous_stage = stage
+            version_info["stage"] = new_stage
+            version_info["updated_at"] = datetime.now().isoformat()
         
-        # Update the stage for this version
-        previous_stage = stage
-        version_info["stage"] = new_stage
-        version_info["updated_at"] = datetime.now().isoformat()
+            # Update the stage_versions mapping
+            info["stage_versions"][new_stage] = version
         
-        # Update the stage_versions mapping
-        info["stage_versions"][new_stage] = version
+            # Remove from previous stage if different
+            if previous_stage != new_stage and previous_stage in info["stage_versions"]:
+                # Only remove if this version is still the one mapped to the previous stage
+                if info["stage_versions"][previous_stage] == version:
+                    del info["stage_versions"][previous_stage]
         
-        # Remove from previous stage if different
-        if previous_stage != new_stage and previous_stage in info["stage_versions"]:
-            # Only remove if this version is still the one mapped to the previous stage
-            if info["stage_versions"][previous_stage] == version:
-                del info["stage_versions"][previous_stage]
+            # Save the registry
+            self._save_registry(model_name, [version])
         
-        # Save the registry
-        self._save_registry()
+        # Worker processes hold their own copy of the registry
+        if self.worker_pool is not None:
+            self.worker_pool.invalidate(model_name)
         
         return {
             "success": True,
@@ -262,6 +516,49 @@ class ModelManager:
             "new_stage": new_stage
         }
     
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get statistics for the loaded model cache.
+        
+        Returns:
+            Dictionary with cache sizes and hit/miss/eviction counters
+        """
+        return self.models.stats()
+    
+    def get_batching_stats(self) -> Dict[str, Any]:
+        """Get statistics for micro-batched predictions.
+        
+        Returns:
+            Dictionary with batching statistics (empty if batching is disabled)
+        """
+        if self.batcher is None:
+            return {}
+        return self.batcher.stats()
+    
+    def _artifact_path(self, model_name: str, version: str, framework: str) -> str:
+        """Get the path of a model version's artifact.
+        
+        Args:
+            model_name: Name of the model
+            version: Version of the model
+            framework: Framework the model was trained with
+            
+        Returns:
+            The path to the model file or directory ("" for unknown frameworks)
+        """
+        model_id = f"{model_name}_{version}"
+        
+        if framework == "scikit-learn":
+            # Versions saved before the memory-mapped format are plain pickles
+            legacy_path = os.path.join(self.models_dir, framework, f"{model_id}.pkl")
+            if os.path.exists(legacy_path):
+                return legacy_path
+            return os.path.join(self.models_dir, framework, f"{model_id}.joblib")
+        elif framework == "tensorflow":
+            return os.path.join(self.models_dir, framework, model_id)
+        elif framework == "pytorch":
+            return os.path.join(self.models_dir, framework, f"{model_id}.pt")
+        return ""
+    
     def _get_model_path(self, model_name: str, version: str = None, stage: str = None) -> str:
         """Get the path to a model file.
         
@@ -276,39 +573,10 @@ class ModelManager:
         Raises:
             ValueError: If model does not exist
         """
-        if model_name not in self.model_registry:
-            raise ValueError(f"Model '{model_name}' does not exist")
-        
-        info = self.model_registry[model_name]
-        
-        # If stage is specified, get the version for that stage
-        if stage and not version:
-            if stage not in info["stage_versions"]:
-                raise ValueError(f"No version found for stage '{stage}' of model '{model_name}'")
-            version = info["stage_versions"][stage]
-        
-        # If no version is specified, use the latest
-        if not version:
-            version = info["latest_version"]
-        
-        # Get the specific version info
-        if version not in info["versions"]:
-            raise ValueError(f"Version '{version}' does not exist for model '{model_name}'")
-        
-        version_info = info["versions"][version]
-        framework = info.get("framework", "scikit-learn")
-        
-        # Get model filename
-        model_id = f"{model_name}_{version}"
-        
-        if framework == "scikit-learn":
-            return os.path.join(self.models_dir, framework, f"{model_id}.pkl")
-        elif framework == "tensorflow":
-            return os.path.join(self.models_dir, framework, model_id)
-        elif framework == "pytorch":
-            return os.path.join(self.models_dir, framework, f"{model_id}.pt")
-        else:
-            raise ValueError(f"Unsupported framework: {framework}")
+        handle = self._resolve(model_name, version, stage)
+        if not handle.model_path:
+            raise ValueError(f"Unsupported framework: {handle.framework}")
+        return handle.model_path
     
     def _get_model_instance(self, model_name: str, version: str = None, stage: str = None) -> Any:
         """Get a model instance.
@@ -324,33 +592,50 @@ class ModelManager:
         Raises:
             ValueError: If model does not exist or cannot be loaded
         """
-        if model_name not in self.model_registry:
-            raise ValueError(f"Model '{model_name}' does not exist")
-        
-        info = self.model_registry[model_name]
-        
-        # If stage is specified, get the version for that stage
-        if stage and not version:
-            if stage not in info["stage_versions"]:
-                raise ValueError(f"No version found for stage '{stage}' of model '{model_name}'")
-            version = info["stage_versions"][stage]
-        
-        # If no version is specified, use the latest
-        if not version:
-            version = info["latest_version"]
-        
-        # Create a cache key for the model
-        model_key = f"{model_name}:{version}"
+        return self._load_handle(self._resolve(model_name, version, stage))
+    
+    def _load_handle(self, handle: ModelHandle) -> Any:
+        """Get the model instance of a resolved handle from the cache.
         
-        # Check if model is already loaded
-        if model_key in self.models:
-            return self.models[model_key]
+        Args:
+            handle: The model handle
+            
+        Returns:
+            Model instance
+            
+        Raises:
+            ValueError: If the model cannot be loaded
+        """
+        # Load the model once, even if many requests miss on it concurrently
+        return self.models.get_or_load(
+            handle.model_key, lambda: self._load_model(handle.model_path, handle.framework, handle.architecture,
+                                                       handle.onnx_path))
+    
+    def _load_model(self, model_path: str, framework: str,
+                    architecture: Dict[str, Any], onnx_path: str = "") -> Tuple[Any, int]:
+        """Load a model artifact from disk.
         
-        # Get model path
-        model_path = self._get_model_path(model_name, version)
+        With the ONNX Runtime backend enabled, versions exported to ONNX are
+        loaded from their ONNX artifact; the native artifact is used when
+        there is none or it cannot be loaded.
         
-        # Get framework
-        framework = info.get("framework", "scikit-learn")
+        Args:
+            model_path: Path to the model file or directory
+            framework: Framework the model was trained with
+            architecture: PyTorch architecture description (ignored for other frameworks)
+            onnx_path: Path of the version's ONNX artifact (may not exist)
+            
+        Returns:
+            Tuple of (model, estimated size in bytes)
+            
+        Raises:
+            ValueError: If the model cannot be loaded
+        """
+        if self.onnx_backend is not None and onnx_path and os.path.exists(onnx_path):
+            try:
+                return self.onnx_backend.load(onnx_path), estimate_artifact_size(onnx_path)
+            except Exception as e:
+                print(f"Could not load ONNX model {onnx_path}, using {framework} instead: {e}")
         
         try:
             # Load model based on framework
@@ -358,12 +643,20 @@ class ModelManager:
                 if not os.path.exists(model_path):
                     raise ValueError(f"Model file not found: {model_path}")
                 
-                with open(model_path, "rb") as f:
-                    model = pickle.load(f)
+                if model_path.endswith(".joblib"):
+                    # Arrays are memory-mapped copy-on-write, so processes loading the
+                    # same artifact share its pages and nothing is copied up front
+                    # (read-only maps are rejected by Cython code such as libsvm's)
+                    model = joblib.load(model_path, mmap_mode="c")
+                else:
+                    with open(model_path, "rb") as f:
+                        model = pickle.load(f)
+                
+                # Forests are scored from flat node tables (saved compiled since the joblib format)
+                model = compile_model(model)
             
             elif framework == "tensorflow":
-                if not TENSORFLOW_AVAILABLE:
-                    raise ValueError("TensorFlow is not available")
+                tf = import_framework("tensorflow")
                 
                 if not os.path.exists(model_path):
                     raise ValueError(f"Model directory not found: {model_path}")
@@ -371,15 +664,11 @@ class ModelManager:
                 model = tf.keras.models.load_model(model_path)
             
             elif framework == "pytorch":
-                if not PYTORCH_AVAILABLE:
-                    raise ValueError("PyTorch is not available")
+                torch = import_framework("pytorch")
                 
                 if not os.path.exists(model_path):
                     raise ValueError(f"Model file not found: {model_path}")
                 
-                # Get model architecture from registry
-                architecture = info["versions"][version].get("architecture", {})
-                
                 # Create a model instance
                 model = self._create_pytorch_model(architecture)
                 
@@ -390,14 +679,12 @@ class ModelManager:
             else:
                 raise ValueError(f"Unsupported framework: {framework}")
             
-            # Cache the loaded model
-            self.models[model_key] = model
-            return model
+            return model, estimate_artifact_size(model_path)
             
         except Exception as e:
             raise ValueError(f"Failed to load model: {str(e)}")
     
-    def _create_pytorch_model(self, architecture: Dict[str, Any]) -> nn.Module:
+    def _create_pytorch_model(self, architecture: Dict[str, Any]) -> "torch.nn.Module":
         """Create a PyTorch model instance from architecture description.
         
         Args:
@@ -406,8 +693,7 @@ class ModelManager:
         Returns:
             PyTorch model instance
         """
-        if not PYTORCH_AVAILABLE:
-            raise ValueError("PyTorch is not available")
+        nn = import_framework("pytorch").nn
         
         model_type = architecture.get("type", "unknown")
         
@@ -437,51 +723,332 @@ class ModelManager:
             raise ValueError(f"Unsupported PyTorch model type: {model_type}")
     
     def process_data(self, input_data: str, model_name: str, parameters: Dict[str, str],
-                     version: str = None, stage: str = None) -> Tuple[str, float, Dict[str, str]]:
+                     version: str = None, stage: str = None,
+                     timer: InferenceTimer = NULL_TIMER) -> Tuple[str, float, Dict[str, str]]:
         """Process data using a model.
         
+        With the prediction cache enabled, a request repeating the input and
+        parameters of an earlier one for the same resolved version is
+        answered with the earlier result without parsing the input or
+        running the model. A hit only carries the metadata describing the
+        result (see RESULT_METADATA_KEYS) and its own processing time. The
+        "prediction_cache" metadata entry tells whether the result was a
+        "hit" or a "miss".
+        
         Args:
             input_data: Input data (JSON string)
             model_name: Name of the model
-            parameters: Processing parameters
+            parameters: Processing parameters ("cache" = "false" bypasses the prediction cache)
             version: Specific version to use (default: latest)
             stage: Specific stage to use (default: None)
+            timer: Optional timer recording the phases of the request
             
         Returns:
-            Tuple of (result, confidence_score, metadata)
+            Tuple of (result, confidence_score, metadata); metadata includes the
+            phase breakdown when the "profile" parameter is "true"
             
         Raises:
             ValueError: If model does not exist or input is invalid
         """
         start_time = time.time()
+        cache_key = self._prediction_cache_key(input_data, model_name, parameters, version, stage)
+        if cache_key is not None:
+            cached = self.prediction_cache.get(cache_key)
+            if cached is not None:
+                result_json, confidence, cached_metadata = cached
+                metadata = dict(cached_metadata)
+                metadata["processing_time_ms"] = str(int((time.time() - start_time) * 1000))
+                metadata[CACHE_METADATA_KEY] = "hit"
+                timer.mark("cache")
+                timer.set_result(cache_key[1], 0)
+                return result_json, confidence, metadata
+        
+        result_json, confidence, metadata = self._process_data(
+            input_data, model_name, parameters, version, stage, timer)
+        
+        # Only cache what was computed by the version the key was resolved to
+        if cache_key is not None and metadata.get("version") == cache_key[1]:
+            cached_metadata = result_metadata(metadata)
+            size_bytes = len(result_json) + sum(len(key) + len(value) for key, value in cached_metadata.items())
+            self.prediction_cache.put(cache_key, (result_json, confidence, cached_metadata), size_bytes)
+            metadata[CACHE_METADATA_KEY] = "miss"
+        
+        return result_json, confidence, metadata
+    
+    def _prediction_cache_key(self, input_data: str, model_name: str, parameters: Dict[str, str],
+                              version: Optional[str], stage: Optional[str]) -> Optional[CacheKey]:
+        """Build the prediction cache key of a request (None if the request is not cached)."""
+        if self.prediction_cache is None or not cache_requested(parameters):
+            return None
+        try:
+            handle = self._resolve(model_name, version, stage)
+        except ValueError:
+            # Reported by the uncached path
+            return None
+        return (model_name, handle.version, fingerprint(input_data, parameters))
+    
+    def _process_data(self, input_data: str, model_name: str, parameters: Dict[str, str],
+                      version: Optional[str], stage: Optional[str],
+                      timer: InferenceTimer) -> Tuple[str, float, Dict[str, str]]:
+        """Process data using a model, bypassing the prediction cache (see process_data)."""
+        # Delegate to the worker processes when a pool is configured
+        if self.worker_pool is not None:
+            return self.worker_pool.process_data(input_data, model_name, parameters, version, stage)
+        
+        profile = profile_requested(parameters)
+        if profile and timer is NULL_TIMER:
+            timer = InferenceTimer()
+        
+        with self._sample_profile(model_name):
+            start_time = time.time()
+            
+            # Parse input data
+            try:
+                data = json.loads(input_data)
+            except json.JSONDecodeError:
+                raise ValueError("Invalid JSON input data")
+            timer.mark("parse")
+            
+            y_pred, confidence, metadata = self._run_inference(
+                data, model_name, parameters, version, stage, start_time, timer)
+            
+            # Convert result to JSON string
+            result_json = json.dumps(y_pred.tolist())
+            timer.mark("serialize")
+        
+        if profile:
+            metadata[PROFILE_METADATA_KEY] = format_breakdown(timer)
+        
+        return result_json, confidence, metadata
+    
+    def process_tensor(self, X: np.ndarray, model_name: str, parameters: Dict[str, str],
+                       version: str = None, stage: str = None,
+                       timer: InferenceTimer = NULL_TIMER) -> Tuple[np.ndarray, float, Dict[str, str]]:
+        """Process a decoded tensor using a model.
+        
+        Skips JSON parsing entirely; the array is passed to the model as-is
+        (1D arrays follow the same conventions as 1D JSON lists).
+        
+        Args:
+            X: Input array
+            model_name: Name of the model
+            parameters: Processing parameters
+            version: Specific version to use (default: latest)
+            stage: Specific stage to use (default: None)
+            timer: Optional timer recording the phases of the request
+            
+        Returns:
+            Tuple of (predictions array, confidence_score, metadata); metadata
+            includes the phase breakdown when the "profile" parameter is "true"
+            
+        Raises:
+            ValueError: If model does not exist or input is invalid
+        """
+        if self.worker_pool is not None:
+            return self.worker_pool.process_tensor(X, model_name, parameters, version, stage)
         
-        # Get the model
+        profile = profile_requested(parameters)
+        if profile and timer is NULL_TIMER:
+            timer = InferenceTimer()
+        
+        with self._sample_profile(model_name):
+            y_pred, confidence, metadata = self._run_inference(
+                X, model_name, parameters, version, stage, time.time(), timer)
+        
+        if profile:
+            metadata[PROFILE_METADATA_KEY] = format_breakdown(timer)
+        
+        return y_pred, confidence, metadata
+    
+    def _sample_profile(self, model_name: str) -> ContextManager[bool]:
+        """Context manager capturing cProfile statistics if this request is sampled."""
+        if self.profiler is None:
+            return contextlib.nullcontext(False)
+        return self.profiler.sample(model_name)
+    
+    def open_session(self, model_name: str, version: str = None, stage: str = None) -> "ScoringSession":
+        """Pin a model version for scoring a sequence of batches.
+        
+        The version is resolved and the model loaded once; every batch scored
+        through the session uses that version even if the registry changes.
+        
+        Args:
+            model_name: Name of the model
+            version: Specific version to use (default: latest)
+            stage: Specific stage to use (default: None)
+            
+        Returns:
+            The scoring session
+            
+        Raises:
+            ValueError: If model does not exist
+        """
+        handle = self._resolve(model_name, version, stage)
+        
+        # Worker processes load the model themselves; only pin the version here
+        model = None
+        if self.worker_pool is None:
+            try:
+                model = self._load_handle(handle)
+            except ValueError as e:
+                raise ValueError(f"Error loading model: {str(e)}")
+        
+        return ScoringSession(self, handle, model)
+    
+    def warm_up(self, model_name: str, version: str = None, stage: str = None) -> Dict[str, Any]:
+        """Load a model version into the cache and run a synthetic prediction.
+        
+        The prediction uses one all-zero row shaped like the model's input,
+        so one-time costs (TensorFlow graph tracing, first allocations) are
+        paid before real traffic arrives.
+        
+        Args:
+            model_name: Name of the model
+            version: Specific version to warm up (default: latest)
+            stage: Specific stage to warm up (default: None)
+            
+        Returns:
+            Dictionary with model_name, version, load_ms, predict_ms and
+            warmed (False if no synthetic input could be built or scored)
+            
+        Raises:
+            ValueError: If the model does not exist or cannot be loaded
+        """
+        if self.worker_pool is not None:
+            return self.worker_pool.warm_up(model_name, version, stage)
+        
+        handle = self._resolve(model_name, version, stage)
+        start = time.perf_counter()
+        model = self._load_handle(handle)
+        loaded = time.perf_counter()
+        
+        result = {"model_name": model_name, "version": handle.version,
+                  "load_ms": (loaded - start) * 1000, "predict_ms": 0.0, "warmed": False}
+        
+        X = self._warmup_input(model, handle)
+        if X is None:
+            return result
+        
+        try:
+            prepare, predict = self._get_framework_handlers(handle.framework, model)
+            predict(model, prepare(X), handle.model_type)
+        except Exception as e:
+            # The model stays loaded; only the synthetic input did not fit it
+            print(f"Warm-up prediction failed for {handle.model_key}: {e}")
+            return result
+        
+        result["predict_ms"] = (time.perf_counter() - loaded) * 1000
+        result["warmed"] = True
+        return result
+    
+    def _warmup_input(self, model: Any, handle: ModelHandle) -> Optional[np.ndarray]:
+        """Build a single all-zero input row for a model, if its input shape is known."""
+        if isinstance(model, OnnxModel):
+            if not model.input_shape or None in model.input_shape[1:]:
+                return None
+            return np.zeros((1,) + model.input_shape[1:], dtype=model.input_dtype)
+        
+        if handle.framework == "scikit-learn":
+            n_features = getattr(model, "n_features_in_", None)
+            return np.zeros((1, n_features)) if n_features else None
+        
+        if handle.framework == "tensorflow":
+            input_shape = getattr(model, "input_shape", None)
+            if not isinstance(input_shape, tuple):
+                # Unknown or multi-input models
+                return None
+            return np.zeros((1,) + tuple(dim or 1 for dim in input_shape[1:]), dtype=np.float32)
+        
+        if handle.framework == "pytorch":
+            layers = handle.architecture.get("layers") or []
+            return np.zeros((1, layers[0]), dtype=np.float32) if layers else None
+        
+        return None
+    
+    def _run_inference(self, data: Any, model_name: str, parameters: Dict[str, str],
+                       version: Optional[str], stage: Optional[str], start_time: float,
+                       timer: InferenceTimer = NULL_TIMER) -> Tuple[np.ndarray, float, Dict[str, str]]:
+        """Score parsed input data or an array with a model.
+        
+        Args:
+            data: Parsed JSON input (list or dict) or a NumPy array
+            model_name: Name of the model
+            parameters: Processing parameters
+            version: Specific version to use (default: latest)
+            stage: Specific stage to use (default: None)
+            start_time: Time the request started (for processing_time_ms)
+            timer: Timer recording the phases of the request
+            
+        Returns:
+            Tuple of (predictions array, confidence_score, metadata)
+            
+        Raises:
+            ValueError: If model does not exist or input is invalid
+        """
+        # Resolve and get the model
         try:
-            model = self._get_model_instance(model_name, version, stage)
+            handle = self._resolve(model_name, version, stage)
+            timer.mark("resolve")
+            model = self._load_handle(handle)
+            timer.mark("load")
         except ValueError as e:
             raise ValueError(f"Error loading model: {str(e)}")
         
-        # Parse input data
-        try:
-            data = json.loads(input_data)
-        except json.JSONDecodeError:
-            raise ValueError("Invalid JSON input data")
+        return self._score(model, handle, data, parameters, start_time, timer)
+    
+    def _score(self, model: Any, handle: ModelHandle, data: Any, parameters: Dict[str, str],
+               start_time: float, timer: InferenceTimer = NULL_TIMER) -> Tuple[np.ndarray, float, Dict[str, str]]:
+        """Score input data with an already loaded model.
         
-        # Get model info
-        info = self.get_model_info(model_name, version, stage)
-        framework = info.get("framework", "scikit-learn")
-        model_type = info.get("properties", {}).get("type", "unknown")
+        Args:
+            model: Loaded model instance
+            handle: Resolved handle of the model version
+            data: Parsed JSON input (list or dict) or a NumPy array
+            parameters: Processing parameters
+            start_time: Time the request started (for processing_time_ms)
+            timer: Timer recording the prepare/predict_proba/predict phases
+            
+        Returns:
+            Tuple of (predictions array, confidence_score, metadata)
+            
+        Raises:
+            ValueError: If the input is invalid
+        """
+        framework = handle.framework
+        model_type = handle.model_type
         
         # Process based on framework and model type
         try:
-            if framework == "scikit-learn":
-                result, confidence = self._process_sklearn(model, data, model_type)
-            elif framework == "tensorflow":
-                result, confidence = self._process_tensorflow(model, data, model_type)
-            elif framework == "pytorch":
-                result, confidence = self._process_pytorch(model, data, model_type)
+            prepare, predict = self._get_framework_handlers(framework, model)
+            X = prepare(data)
+            timer.mark("prepare")
+            
+            # Array inputs can be combined with concurrent requests for the same model version
+            # (profiled requests are scored alone so their breakdown is their own)
+            batch_info = {}
+            if (self.batcher is not None and isinstance(X, np.ndarray) and X.ndim >= 1
+                    and not profile_requested(parameters)):
+                batch_key = (handle.model_key, X.shape[1:], X.dtype.str)
+                
+                def run(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+                    y, confidence, info = self.batcher.submit(
+                        batch_key, rows, lambda batch: predict(model, batch, model_type))
+                    batch_info.update(info)
+                    return y, confidence
             else:
-                raise ValueError(f"Unsupported framework: {framework}")
+                def run(rows: Any) -> Tuple[np.ndarray, np.ndarray]:
+                    return predict(model, rows, model_type, timer)
+            
+            # Repeated rows are scored once, and rows seen before not at all
+            if self.row_dedup is not None and can_dedupe(X) and dedupe_requested(parameters):
+                y_pred, row_confidence, dedup_info = self.row_dedup.score(handle.model_key, X, run)
+                batch_info.update(dedup_info)
+            else:
+                y_pred, row_confidence = run(X)
+            timer.mark("predict")
+            timer.set_result(handle.version, len(row_confidence))
+            
+            confidence = row_confidence.mean()
             
             # Calculate processing time
             processing_time = time.time() - start_time
@@ -490,157 +1057,319 @@ class ModelManager:
             metadata = {
                 "model_type": model_type,
                 "framework": framework,
-                "version": info.get("version", ""),
-                "stage": info.get("stage", ""),
+                "version": handle.version,
+                "stage": handle.stage,
                 "processing_time_ms": str(int(processing_time * 1000)),
             }
+            metadata.update(batch_info)
+            if isinstance(model, OnnxModel):
+                metadata["backend"] = "onnxruntime"
             
             # Add any additional metadata from parameters
             if "include_feature_importance" in parameters and parameters["include_feature_importance"].lower() == "true":
                 if hasattr(model, "feature_importances_"):
                     metadata["feature_importances"] = json.dumps(model.feature_importances_.tolist())
             
-            # Convert result to JSON string
-            result_json = json.dumps(result)
-            
-            return result_json, float(confidence), metadata
+            return np.asarray(y_pred), float(confidence), metadata
             
         except Exception as e:
             raise ValueError(f"Error processing data: {str(e)}")
     
+    def _get_framework_handlers(self, framework: str, model: Any = None) -> Tuple[Callable[[Any], Any], Callable[..., Tuple[np.ndarray, np.ndarray]]]:
+        """Get the input preparation and prediction functions for a framework.
+        
+        Args:
+            framework: Framework the model was trained with
+            model: The loaded model (models exported to ONNX are scored by ONNX Runtime)
+            
+        Returns:
+            Tuple of (prepare_input, predict)
+            
+        Raises:
+            ValueError: If the framework is not supported
+        """
+        if isinstance(model, OnnxModel):
+            # Input is prepared as for the framework the model was exported from
+            prepare, _ = self._get_framework_handlers(framework)
+            return prepare, self._predict_onnx
+        
+        if framework == "scikit-learn":
+            return self._prepare_sklearn_input, self._predict_sklearn
+        elif framework == "tensorflow":
+            return self._prepare_tensorflow_input, self._predict_tensorflow
+        elif framework == "pytorch":
+            return self._prepare_pytorch_input, self._predict_pytorch
+        raise ValueError(f"Unsupported framework: {framework}")
+    
     def process_data_stream(self, input_data: str, model_name: str, parameters: Dict[str, str],
                            version: str = None, stage: str = None, chunk_size: int = 1024):
         """Process data using a model and stream the results.
         
+        A JSON list of rows is parsed incrementally and scored in blocks of
+        ``chunk_size`` rows; each block's predictions are yielded as soon as
+        they are ready. Concatenating all ``result_chunk`` strings gives the
+        same JSON array that process_data returns. Other inputs (dicts, 1D
+        lists) are scored as a single block. With a worker pool, each block
+        is scored in a worker process, routed like process_data.
+        
         Args:
             input_data: Input data (JSON string)
             model_name: Name of the model
-            parameters: Processing parameters
+            parameters: Processing parameters ("chunk_size" overrides the rows per chunk)
             version: Specific version to use (default: latest)
             stage: Specific stage to use (default: None)
-            chunk_size: Size of result chunks for streaming
+            chunk_size: Number of rows scored and returned per chunk
             
         Yields:
-            Dictionaries representing chunks of the result
+            Dictionaries representing chunks of the result (total_chunks is
+            only known, and set, on the last chunk)
             
         Raises:
             ValueError: If model does not exist or input is invalid
         """
         start_time = time.time()
+        chunk_id = 0
         
         try:
-            # Process the data normally
-            result_json, confidence, metadata = self.process_data(
-                input_data, model_name, parameters, version, stage)
-            
-            # Split the result into chunks
-            result_bytes = result_json.encode('utf-8')
-            total_size = len(result_bytes)
-            total_chunks = (total_size + chunk_size - 1) // chunk_size
-            
-            for i in range(0, total_size, chunk_size):
-                chunk = result_bytes[i:i+chunk_size].decode('utf-8')
-                chunk_id = i // chunk_size
-                is_last = (i + chunk_size >= total_size)
+            chunk_rows = int(parameters.get("chunk_size", chunk_size))
+            if chunk_rows <= 0:
+                raise ValueError(f"Invalid chunk_size: {chunk_rows}")
+            
+            # Resolve the version once for the whole stream; the model is loaded
+            # here only when no worker pool scores the blocks
+            try:
+                handle = self._resolve(model_name, version, stage)
+                model = self._load_handle(handle) if self.worker_pool is None else None
+            except ValueError as e:
+                raise ValueError(f"Error loading model: {str(e)}")
+            
+            framework = handle.framework
+            model_type = handle.model_type
+            if model is not None:
+                prepare, predict = self._get_framework_handlers(framework, model)
+            
+            rows = 0
+            confidence_sum = 0.0
+            first_chunk_ms = None
+            
+            # Each block is sent as soon as it is scored; the closing bracket
+            # goes out with the final metadata in the last chunk
+            for block in self._iter_input_blocks(input_data, chunk_rows):
+                if model is None:
+                    # Routed like ProcessData, pinned to the version resolved above.
+                    # Numeric row blocks go to the worker as one array (no JSON
+                    # round trip); other inputs are sent as JSON
+                    X = np.asarray(block) if isinstance(block, list) else None
+                    if X is not None and X.dtype.kind in "biuf":
+                        y_pred, block_confidence, _ = self.worker_pool.process_tensor(
+                            X, model_name, parameters, handle.version)
+                        items = json.dumps(y_pred.tolist())[1:-1]
+                    else:
+                        result_json, block_confidence, _ = self.worker_pool.process_data(
+                            json.dumps(block), model_name, parameters, handle.version)
+                        items = result_json.strip()[1:-1]
+                    block_rows = len(block) if isinstance(block, list) else 1
+                    confidence_sum += block_confidence * block_rows
+                    rows += block_rows
+                else:
+                    y_pred, row_confidence = predict(model, prepare(block), model_type)
+                    confidence_sum += float(np.sum(row_confidence))
+                    rows += len(row_confidence)
+                    items = json.dumps(np.asarray(y_pred).tolist())[1:-1]
                 
-                yield {
-                    "result_chunk": chunk,
-                    "is_last_chunk": is_last,
-                    "success": True,
-                    "chunk_id": chunk_id,
-                    "total_chunks": total_chunks,
-                    "confidence_score": confidence if is_last else 0.0,
-                    "metadata": metadata if is_last else {}
-                }
+                yield self._stream_chunk(("[" if chunk_id == 0 else ", ") + items, chunk_id)
+                if first_chunk_ms is None:
+                    first_chunk_ms = int((time.time() - start_time) * 1000)
+                chunk_id += 1
+            
+            metadata = {
+                "model_type": model_type,
+                "framework": framework,
+                "version": handle.version,
+                "stage": handle.stage,
+                "processing_time_ms": str(int((time.time() - start_time) * 1000)),
+                "rows": str(rows),
+                "chunk_size": str(chunk_rows),
+                "time_to_first_chunk_ms": str(first_chunk_ms if first_chunk_ms is not None
+                                              else int((time.time() - start_time) * 1000)),
+            }
+            
+            last_chunk = self._stream_chunk("]" if chunk_id else "[]", chunk_id)
+            last_chunk.update({
+                "is_last_chunk": True,
+                "total_chunks": chunk_id + 1,
+                "confidence_score": (confidence_sum / rows) if rows else 0.0,
+                "metadata": metadata
+            })
+            yield last_chunk
                 
         except Exception as e:
-            # Send error in a single chunk
+            # Send error in a final chunk
             yield {
                 "result_chunk": "",
                 "is_last_chunk": True,
                 "success": False,
                 "error_message": str(e),
-                "chunk_id": 0,
-                "total_chunks": 1,
+                "chunk_id": chunk_id,
+                "total_chunks": chunk_id + 1,
                 "confidence_score": 0.0,
                 "metadata": {}
             }
     
-    def _process_sklearn(self, model: Any, data: Any, model_type: str) -> Tuple[Any, float]:
-        """Process data using a scikit-learn model.
+    def _stream_chunk(self, result_chunk: str, chunk_id: int) -> Dict[str, Any]:
+        """Build an intermediate streaming chunk."""
+        return {
+            "result_chunk": result_chunk,
+            "is_last_chunk": False,
+            "success": True,
+            "chunk_id": chunk_id,
+            "total_chunks": 0,
+            "confidence_score": 0.0,
+            "metadata": {}
+        }
+    
+    def _iter_input_blocks(self, input_data: str, chunk_rows: int):
+        """Parse JSON input incrementally into blocks of rows.
+        
+        Only a top-level list of row lists is split; anything else is parsed
+        whole and yielded as a single block.
         
         Args:
-            model: The scikit-learn model
-            data: The input data
-            model_type: The type of model
+            input_data: Input data (JSON string)
+            chunk_rows: Maximum rows per block
+            
+        Yields:
+            Parsed input blocks
+            
+        Raises:
+            ValueError: If the input is not valid JSON
+        """
+        rows = _iter_json_array(input_data)
+        
+        try:
+            first = next(rows, None) if rows is not None else None
+        except json.JSONDecodeError:
+            raise ValueError("Invalid JSON input data")
+        
+        if rows is None or not isinstance(first, (list, tuple)):
+            # Not a list of rows: score everything at once
+            try:
+                data = json.loads(input_data)
+            except json.JSONDecodeError:
+                raise ValueError("Invalid JSON input data")
+            if isinstance(data, list) and not data:
+                return
+            yield data
+            return
+        
+        block = []
+        try:
+            for row in itertools.chain([first], rows):
+                block.append(row)
+                if len(block) >= chunk_rows:
+                    yield block
+                    block = []
+        except json.JSONDecodeError:
+            raise ValueError("Invalid JSON input data")
+        
+        if block:
+            yield block
+    
+    def _prepare_sklearn_input(self, data: Any) -> Any:
+        """Convert parsed input data to a scikit-learn input.
+        
+        Args:
+            data: The parsed input data
             
         Returns:
-            Tuple of (result, confidence)
+            NumPy array (list or array input) or DataFrame (dict input)
         """
-        # Convert data to appropriate format
-        if isinstance(data, list):
+        if isinstance(data, np.ndarray):
+            return data.reshape(-1, 1) if data.ndim == 1 else data
+        elif isinstance(data, list):
             # Convert to numpy array
             if all(isinstance(item, (list, tuple)) for item in data):
                 # 2D array
-                X = np.array(data)
-            else:
-                # 1D array
-                X = np.array(data).reshape(-1, 1)
+                return np.array(data)
+            # 1D array
+            return np.array(data).reshape(-1, 1)
         elif isinstance(data, dict):
             # Convert dict to DataFrame
-            X = pd.DataFrame([data])
-        else:
-            raise ValueError("Input data must be a list or dictionary")
+            return pd.DataFrame([data])
+        raise ValueError("Input data must be a list or dictionary")
+    
+    def _predict_sklearn(self, model: Any, X: Any, model_type: str,
+                         timer: InferenceTimer = NULL_TIMER) -> Tuple[np.ndarray, np.ndarray]:
+        """Score prepared input with a scikit-learn model.
         
-        # Make prediction
-        if model_type.lower() in ["classification", "nlp", "vision"]:
-            # Classification
-            if hasattr(model, "predict_proba"):
-                proba = model.predict_proba(X)
-                y_pred = model.predict(X)
-                confidence = np.max(proba, axis=1).mean()
-            else:
-                y_pred = model.predict(X)
-                confidence = 1.0  # No probability available
+        Args:
+            model: The scikit-learn model
+            X: Prepared model input
+            model_type: The type of model
+            timer: Timer recording the predict_proba phase of classifiers
             
-            result = y_pred.tolist()
-        else:
-            # Regression
+        Returns:
+            Tuple of (predictions, per-row confidence)
+        """
+        if isinstance(model, CompiledForest):
+            if model.is_classifier and model_type.lower() in ["classification", "nlp", "vision"]:
+                # Class and confidence from a single probability computation
+                return model.predict_with_confidence(X)
             y_pred = model.predict(X)
-            confidence = 1.0  # No natural confidence for regression
-            result = y_pred.tolist()
+            return y_pred, np.ones(len(y_pred))
         
-        return result, confidence
+        if model_type.lower() in ["classification", "nlp", "vision"] and hasattr(model, "predict_proba"):
+            # Classification with probabilities
+            proba = model.predict_proba(X)
+            timer.mark("predict_proba")
+            y_pred = model.predict(X)
+            return y_pred, np.max(proba, axis=1)
+        
+        # Regression or classification without probabilities
+        y_pred = model.predict(X)
+        return y_pred, np.ones(len(y_pred))
     
-    def _process_tensorflow(self, model: Any, data: Any, model_type: str) -> Tuple[Any, float]:
-        """Process data using a TensorFlow model.
+    def _prepare_tensorflow_input(self, data: Any) -> Any:
+        """Convert parsed input data to a TensorFlow input.
         
         Args:
-            model: The TensorFlow model
-            data: The input data
-            model_type: The type of model
+            data: The parsed input data
             
         Returns:
-            Tuple of (result, confidence)
+            float32 NumPy array (list or array input) or dict of arrays (dict input)
         """
-        if not TENSORFLOW_AVAILABLE:
-            raise ValueError("TensorFlow is not available")
-        
-        # Convert data to appropriate format
-        if isinstance(data, list):
+        if isinstance(data, np.ndarray):
+            X = data.astype(np.float32, copy=False)
+            return X[np.newaxis, :] if X.ndim == 1 else X
+        elif isinstance(data, list):
             if all(isinstance(item, (list, tuple)) for item in data):
                 # 2D array
-                X = np.array(data, dtype=np.float32)
-            else:
-                # 1D array - expand to batch
-                X = np.array([data], dtype=np.float32)
+                return np.array(data, dtype=np.float32)
+            # 1D array - expand to batch
+            return np.array([data], dtype=np.float32)
         elif isinstance(data, dict):
             # For models that expect multiple inputs
             X = {}
             for key, value in data.items():
                 X[key] = np.array([value], dtype=np.float32)
-        else:
-            raise ValueError("Input data must be a list or dictionary")
+            return X
+        raise ValueError("Input data must be a list or dictionary")
+    
+    def _predict_tensorflow(self, model: Any, X: Any, model_type: str,
+                            timer: InferenceTimer = NULL_TIMER) -> Tuple[np.ndarray, np.ndarray]:
+        """Score prepared input with a TensorFlow model.
+        
+        Args:
+            model: The TensorFlow model
+            X: Prepared model input
+            model_type: The type of model
+            timer: Timer of the request (the whole prediction is one phase)
+            
+        Returns:
+            Tuple of (predictions, per-row confidence)
+        """
+        if not TENSORFLOW_AVAILABLE:
+            raise ValueError("TensorFlow is not available")
         
         # Make prediction
         predictions = model.predict(X)
@@ -653,138 +1382,426 @@ class ModelManager:
             
             if len(predictions.shape) >= 2 and predictions.shape[1] > 1:
                 # Multi-class classification
-                y_pred = np.argmax(predictions, axis=1)
-                confidence = np.max(predictions, axis=1).mean()
-            else:
-                # Binary classification
-                y_pred = (predictions > 0.5).astype(int).flatten()
-                confidence = np.mean(np.maximum(predictions, 1 - predictions))
+                return np.argmax(predictions, axis=1), np.max(predictions, axis=1)
             
-            result = y_pred.tolist()
-        else:
-            # Regression or other
-            result = predictions.tolist()
-            confidence = 1.0
+            # Binary classification
+            y_pred = (predictions > 0.5).astype(int).flatten()
+            row_confidence = np.maximum(predictions, 1 - predictions).reshape(len(predictions), -1).mean(axis=1)
+            return y_pred, row_confidence
         
-        return result, confidence
+        # Regression or other
+        return np.asarray(predictions), np.ones(len(predictions))
     
-    def _process_pytorch(self, model: Any, data: Any, model_type: str) -> Tuple[Any, float]:
-        """Process data using a PyTorch model.
+    def _prepare_pytorch_input(self, data: Any) -> np.ndarray:
+        """Convert parsed input data to a PyTorch input.
         
         Args:
-            model: The PyTorch model
-            data: The input data
-            model_type: The type of model
+            data: The parsed input data
             
         Returns:
-            Tuple of (result, confidence)
+            float32 NumPy array
         """
-        if not PYTORCH_AVAILABLE:
-            raise ValueError("PyTorch is not available")
-        
-        # Convert data to appropriate format
-        if isinstance(data, list):
+        if isinstance(data, np.ndarray):
+            X = data.astype(np.float32, copy=False)
+            return X[np.newaxis, :] if X.ndim == 1 else X
+        elif isinstance(data, list):
             if all(isinstance(item, (list, tuple)) for item in data):
                 # 2D array
-                X = torch.tensor(data, dtype=torch.float32)
-            else:
-                # 1D array - expand to batch
-                X = torch.tensor([data], dtype=torch.float32)
+                return np.array(data, dtype=np.float32)
+            # 1D array - expand to batch
+            return np.array([data], dtype=np.float32)
         elif isinstance(data, dict):
             # Not directly supported - convert to tensor
             # In practice, would need custom handling based on model
             raise ValueError("Dictionary input not supported for PyTorch models")
-        else:
-            raise ValueError("Input data must be a list")
+        raise ValueError("Input data must be a list")
+    
+    def _predict_pytorch(self, model: Any, X: np.ndarray, model_type: str,
+                         timer: InferenceTimer = NULL_TIMER) -> Tuple[np.ndarray, np.ndarray]:
+        """Score prepared input with a PyTorch model.
+        
+        Args:
+            model: The PyTorch model
+            X: Prepared model input
+            model_type: The type of model
+            timer: Timer of the request (the whole prediction is one phase)
+            
+        Returns:
+            Tuple of (predictions, per-row confidence)
+        """
+        torch = import_framework("pytorch")
         
         # Disable gradient computation for inference
         with torch.no_grad():
             # Make prediction
-            predictions = model(X)
+            predictions = model(torch.from_numpy(np.ascontiguousarray(X, dtype=np.float32)))
             
             # Convert to numpy for easier handling
             predictions_np = predictions.numpy()
             
-            # Handle different output types
-            if model_type.lower() in ["classification"]:
-                # For classification
-                if predictions_np.shape[1] > 1:
-                    # Multi-class classification
-                    y_pred = np.argmax(predictions_np, axis=1)
-                    
-                    # Apply softmax to get probabilities
-                    softmax = torch.nn.Softmax(dim=1)
-                    probs = softmax(predictions).numpy()
-                    confidence = np.max(probs, axis=1).mean()
-                else:
-                    # Binary classification
-                    y_pred = (predictions_np > 0.5).astype(int).flatten()
-                    confidence = np.mean(np.maximum(predictions_np, 1 - predictions_np))
-                
-                result = y_pred.tolist()
-            else:
-                # Regression or other
-                result = predictions_np.tolist()
-                confidence = 1.0
+            # Handle different output types
+            if model_type.lower() in ["classification"]:
+                if predictions_np.shape[1] > 1:
+                    # Multi-class classification
+                    y_pred = np.argmax(predictions_np, axis=1)
+                    
+                    # Apply softmax to get probabilities
+                    softmax = torch.nn.Softmax(dim=1)
+                    probs = softmax(predictions).numpy()
+                    return y_pred, np.max(probs, axis=1)
+                
+                # Binary classification
+                y_pred = (predictions_np > 0.5).astype(int).flatten()
+                row_confidence = np.maximum(predictions_np, 1 - predictions_np).reshape(len(predictions_np), -1).mean(axis=1)
+                return y_pred, row_confidence
+            
+            # Regression or other
+            return predictions_np, np.ones(len(predictions_np))
+    
+    def _predict_onnx(self, model: OnnxModel, X: Any, model_type: str,
+                      timer: InferenceTimer = NULL_TIMER) -> Tuple[np.ndarray, np.ndarray]:
+        """Score prepared input with a model exported to ONNX.
+        
+        The outputs are post-processed like the predictor of the framework
+        the model was exported from does, so clients get the same results.
+        
+        Args:
+            model: The ONNX model
+            X: Prepared model input
+            model_type: The type of model
+            timer: Timer of the request (the whole prediction is one phase)
+            
+        Returns:
+            Tuple of (predictions, per-row confidence)
+        """
+        if isinstance(X, dict):
+            raise ValueError("Dictionary input not supported for ONNX models")
+        
+        outputs = model.run(X)
+        
+        if model.framework == "scikit-learn":
+            # Label (and probabilities) outputs; regressors output a column per target
+            y_pred = outputs[0]
+            if y_pred.ndim == 2 and y_pred.shape[1] == 1:
+                y_pred = y_pred.ravel()
+            if model.probabilities and model_type.lower() in ["classification", "nlp", "vision"]:
+                return y_pred, np.max(outputs[1], axis=1)
+            return y_pred, np.ones(len(y_pred))
+        
+        predictions = outputs[0]
+        if model_type.lower() in ["classification"]:
+            if predictions.ndim >= 2 and predictions.shape[1] > 1:
+                # Multi-class classification (PyTorch models output logits)
+                probs = predictions
+                if model.framework == "pytorch":
+                    exp = np.exp(predictions - predictions.max(axis=1, keepdims=True))
+                    probs = exp / exp.sum(axis=1, keepdims=True)
+                return np.argmax(predictions, axis=1), np.max(probs, axis=1)
+            
+            # Binary classification
+            y_pred = (predictions > 0.5).astype(int).flatten()
+            row_confidence = np.maximum(predictions, 1 - predictions).reshape(len(predictions), -1).mean(axis=1)
+            return y_pred, row_confidence
+        
+        # Regression or other
+        return predictions, np.ones(len(predictions))
+    
+    def train_model(self, training_data: Union[str, bytes, DatasetSource], model_name: str, hyperparameters: Dict[str, str], 
+                    validate: bool, framework: str = "scikit-learn", 
+                    initial_stage: str = "development") -> Tuple[bool, str, Dict[str, float], str, str]:
+        """Train a machine learning model.
+        
+        Args:
+            training_data: Training data (JSON string, Arrow IPC stream bytes or a dataset file)
+            model_name: Name of the model
+            hyperparameters: Hyperparameters for the model
+            validate: Whether to validate the model after training
+            framework: ML framework to use (default: scikit-learn)
+            initial_stage: Initial stage for the model (default: development)
+            
+        Returns:
+            Tuple of (success, model_id, metrics, version, stage)
+            
+        Raises:
+            ValueError: If input is invalid
+        """
+        try:
+            self.check_training_options(framework, initial_stage)
+            
+            # Train and save the model
+            success, model_id, metrics, version = self.fit_and_save(
+                training_data, model_name, hyperparameters, validate, framework)
+            
+            if not success:
+                return False, "", metrics, "", ""
+            
+            self.register_version(model_name, version, framework, hyperparameters, metrics, initial_stage)
+            
+            return True, model_id, metrics, version, initial_stage
+            
+        except Exception as e:
+            print(f"Error training model: {str(e)}")
+            return False, "", {"error": str(e)}, "", ""
+    
+    def check_training_options(self, framework: str, initial_stage: str) -> None:
+        """Validate the framework and initial stage of a training request.
+        
+        Args:
+            framework: ML framework to use
+            initial_stage: Initial stage for the model
+            
+        Raises:
+            ValueError: If the framework or stage is invalid
+        """
+        # Validate framework
+        if framework not in SUPPORTED_FRAMEWORKS:
+            raise ValueError(f"Unsupported framework: {framework}. Supported frameworks: {SUPPORTED_FRAMEWORKS}")
         
-        return result, confidence
+        # Validate stage
+        if initial_stage not in VALID_STAGES:
+            raise ValueError(f"Invalid stage: {initial_stage}. Valid stages: {VALID_STAGES}")
     
-    def train_model(self, training_data: str, model_name: str, hyperparameters: Dict[str, str], 
-                    validate: bool, framework: str = "scikit-learn", 
-                    initial_stage: str = "development") -> Tuple[bool, str, Dict[str, float], str, str]:
-        """Train a machine learning model.
+    def fit_and_save(self, training_data: Union[str, bytes, DatasetSource], model_name: str, hyperparameters: Dict[str, str],
+                     validate: bool, framework: str = "scikit-learn",
+                     progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Tuple[bool, str, Dict[str, float], str]:
+        """Train a model and save it as a new version, without registering it.
+        
+        Training jobs run this in a separate process; the server process
+        then adds the version to the registry with register_version.
         
         Args:
-            training_data: Training data (JSON string)
+            training_data: Training data (see _read_training_data)
             model_name: Name of the model
             hyperparameters: Hyperparameters for the model
             validate: Whether to validate the model after training
             framework: ML framework to use (default: scikit-learn)
-            initial_stage: Initial stage for the model (default: development)
+            progress: Optional callback receiving progress updates (epoch, total_epochs, loss)
             
         Returns:
-            Tuple of (success, model_id, metrics, version, stage)
+            Tuple of (success, model_id, metrics, version)
             
         Raises:
             ValueError: If input is invalid
         """
+        data, spools = self._read_training_data(training_data, framework, hyperparameters)
         try:
-            # Validate framework
-            if framework not in SUPPORTED_FRAMEWORKS:
-                raise ValueError(f"Unsupported framework: {framework}. Supported frameworks: {SUPPORTED_FRAMEWORKS}")
-            
-            # Validate stage
-            if initial_stage not in VALID_STAGES:
-                raise ValueError(f"Invalid stage: {initial_stage}. Valid stages: {VALID_STAGES}")
+            # Train based on framework
+            success, model, metrics = self._fit_model(framework, model_name, data, hyperparameters, validate, progress)
             
-            # Parse training data
-            try:
-                data = json.loads(training_data)
-            except json.JSONDecodeError:
-                raise ValueError("Invalid JSON training data")
+            if not success:
+                return False, "", metrics, ""
             
             # Generate a new version number based on timestamp
-            version = datetime.now().strftime("%Y%m%d%H%M%S")
+            version = _new_version()
             
-            # Train based on framework
-            if framework == "scikit-learn":
-                success, model, metrics = self._train_sklearn(model_name, data, hyperparameters, validate)
-            elif framework == "tensorflow":
-                success, model, metrics = self._train_tensorflow(model_name, data, hyperparameters, validate)
-            elif framework == "pytorch":
-                success, model, metrics = self._train_pytorch(model_name, data, hyperparameters, validate)
-            else:
-                raise ValueError(f"Unsupported framework: {framework}")
+            # Save the model
+            model_id = self._save_model(model, model_name, version, framework, hyperparameters, data.get("features"))
+            
+            return True, model_id, metrics, version
+        finally:
+            for spool in spools:
+                spool.close()
+    
+    def _read_training_data(self, training_data: Union[str, bytes, DatasetSource], framework: str,
+                            hyperparameters: Dict[str, str]) -> Tuple[Dict[str, Any], List[ArraySpool]]:
+        """Decode the training data of a request.
+        
+        Args:
+            training_data: JSON string; Arrow IPC stream bytes with the feature
+                columns and the target column named by the "target_column"
+                hyperparameter; or a dataset file, read in chunks into spools
+                that spill to disk above hyperparameters["spool_threshold_mb"]
+                (default 256)
+            framework: ML framework the data is for
+            hyperparameters: Hyperparameters of the training request
+            
+        Returns:
+            Tuple of (data with 'features' and 'target', spools to close once
+            training is done)
+            
+        Raises:
+            ValueError: If the data is invalid
+        """
+        if isinstance(training_data, DatasetSource):
+            # Neural network trainers use float32, so spool in that dtype to avoid a copy
+            feature_dtype = np.float64 if framework == "scikit-learn" else np.float32
+            spool_threshold = int(float(hyperparameters.get("spool_threshold_mb", "256")) * 1024 * 1024)
+            start_time = time.time()
+            features, target = training_data.read(feature_dtype, spool_threshold)
+            print(f"Read {features.rows} rows from {training_data.describe()} in {time.time() - start_time:.2f}s"
+                  f"{' (spooled to disk)' if features.spooled else ''}")
+            return {"features": features.to_array(), "target": target.to_array()}, [features, target]
+        
+        if isinstance(training_data, bytes):
+            # Columnar upload: the feature columns are read without text parsing
+            target_column = hyperparameters.get(TARGET_COLUMN_PARAMETER, DEFAULT_TARGET_COLUMN)
+            features, target = read_training_data(training_data, target_column)
+            return {"features": features, "target": target}, []
+        
+        try:
+            return json.loads(training_data), []
+        except json.JSONDecodeError:
+            raise ValueError("Invalid JSON training data")
+    
+    def search_hyperparameters(self, training_data: Union[str, bytes, DatasetSource], model_name: str,
+                               hyperparameters: Dict[str, str], search_space: Dict[str, str],
+                               strategy: str = "grid", n_candidates: int = DEFAULT_CANDIDATES,
+                               cv_folds: int = DEFAULT_CV_FOLDS, scoring: str = "", max_workers: int = 0,
+                               seed: int = 0, validate: bool = False, initial_stage: str = "development",
+                               leaderboard_size: int = DEFAULT_LEADERBOARD_SIZE,
+                               is_active: Optional[Callable[[], bool]] = None) -> Iterator[Dict[str, Any]]:
+        """Search scikit-learn hyperparameters with cross-validation and register the best model.
+        
+        The training data is read once and shared with a pool of worker
+        processes (see hyperparameter_search). Only the best candidate is
+        refitted on all rows and registered as a new version.
+        
+        Args:
+            training_data: Training data (see _read_training_data)
+            model_name: Name of the model
+            hyperparameters: Hyperparameters shared by every candidate (model_type, algorithm, ...)
+            search_space: Searched hyperparameters (see parse_search_space)
+            strategy: "grid", "random" or "halving"
+            n_candidates: Candidates sampled by random search
+            cv_folds: Cross-validation folds
+            scoring: scikit-learn scorer name (default: accuracy or r2)
+            max_workers: Worker processes (0 uses every core)
+            seed: Seed of the sampling and the fold assignment
+            validate: Whether to validate the registered model on the training rows
+            initial_stage: Initial stage for the new version
+            leaderboard_size: Candidates in each leaderboard
+            is_active: Optional callback; the search stops when it returns False
+            
+        Yields:
+            {"candidate", "leaderboard", "evaluated", "total"} for every evaluated
+            candidate, then once {"final": True, "best", "leaderboard",
+            "model_id", "version", "stage", "metrics"}
+            
+        Raises:
+            ValueError: If the request is invalid or no candidate could be scored
+        """
+        self.check_training_options("scikit-learn", initial_stage)
+        candidates = build_candidates(parse_search_space(search_space), strategy, n_candidates, seed)
+        search = HyperparameterSearch(candidates, hyperparameters, strategy, cv_folds, scoring, max_workers, seed)
+        
+        data, spools = self._read_training_data(training_data, "scikit-learn", hyperparameters)
+        try:
+            if not isinstance(data, dict) or "features" not in data or "target" not in data:
+                raise ValueError("Training data must contain 'features' and 'target' keys")
             
+            start_time = time.time()
+            for result in search.run(data["features"], data["target"], is_active):
+                yield {
+                    "candidate": result,
+                    "leaderboard": search.leaderboard(leaderboard_size),
+                    "evaluated": search.evaluated,
+                    "total": search.total,
+                }
+            if is_active is not None and not is_active():
+                return
+            
+            best = search.best()
+            if best is None:
+                errors = {result["error"] for result in search.results if result["error"]}
+                raise ValueError(f"No candidate could be evaluated: {'; '.join(sorted(errors))}")
+            print(f"Searched {search.evaluated} candidates for {model_name} in {time.time() - start_time:.2f}s, "
+                  f"best {search.scoring} {best['mean_score']:.4f} with {best['hyperparameters']}")
+            
+            # Refit the best candidate on every row and register only that model
+            best_hyperparameters = {**hyperparameters, **best["hyperparameters"]}
+            success, model, metrics = self._fit_model("scikit-learn", model_name, data, best_hyperparameters, validate)
             if not success:
-                return False, "", metrics, "", ""
+                raise ValueError(metrics.get("error", "Training the best candidate failed"))
+            metrics["cv_score"] = best["mean_score"]
+            metrics["cv_score_std"] = best["std_score"]
             
-            # Save the model
-            model_id = self._save_model(model, model_name, version, framework, hyperparameters)
+            model_id, version = self._register_model(
+                model, model_name, "scikit-learn", best_hyperparameters, metrics, initial_stage, data["features"])
+            
+            yield {
+                "final": True,
+                "best": best,
+                "leaderboard": search.leaderboard(leaderboard_size),
+                "evaluated": search.evaluated,
+                "total": search.total,
+                "model_id": model_id,
+                "version": version,
+                "stage": initial_stage,
+                "metrics": metrics,
+            }
+        finally:
+            for spool in spools:
+                spool.close()
+    
+    def _fit_model(self, framework: str, model_name: str, data: Dict[str, Any],
+                   hyperparameters: Dict[str, str], validate: bool,
+                   progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Tuple[bool, Any, Dict[str, float]]:
+        """Train a model with the trainer of a framework.
+        
+        Args:
+            framework: ML framework to use
+            model_name: Name of the model
+            data: Training data with 'features' and 'target' (lists or arrays)
+            hyperparameters: Hyperparameters for the model
+            validate: Whether to validate the model after training
+            progress: Optional callback receiving progress updates
+            
+        Returns:
+            Tuple of (success, model, metrics)
             
-            # Update model registry
-            description = hyperparameters.get("description", f"Model {model_name}")
+        Raises:
+            ValueError: If the framework is not supported or the data is invalid
+        """
+        if framework == "scikit-learn":
+            return self._train_sklearn(model_name, data, hyperparameters, validate, progress)
+        elif framework == "tensorflow":
+            return self._train_tensorflow(model_name, data, hyperparameters, validate, progress)
+        elif framework == "pytorch":
+            return self._train_pytorch(model_name, data, hyperparameters, validate, progress)
+        raise ValueError(f"Unsupported framework: {framework}")
+    
+    def _register_model(self, model: Any, model_name: str, framework: str, hyperparameters: Dict[str, str],
+                        metrics: Dict[str, float], initial_stage: str, sample: Any = None) -> Tuple[str, str]:
+        """Save a trained model as a new version and add it to the registry.
+        
+        Args:
+            model: Trained model
+            model_name: Name of the model
+            framework: ML framework the model was trained with
+            hyperparameters: Hyperparameters used for training
+            metrics: Training metrics
+            initial_stage: Initial stage for the new version
+            sample: Training features, for checking an ONNX export
             
+        Returns:
+            Tuple of (model_id, version)
+        """
+        # Generate a new version number based on timestamp
+        version = _new_version()
+        
+        # Save the model
+        model_id = self._save_model(model, model_name, version, framework, hyperparameters, sample)
+        
+        self.register_version(model_name, version, framework, hyperparameters, metrics, initial_stage)
+        
+        return model_id, version
+    
+    def register_version(self, model_name: str, version: str, framework: str, hyperparameters: Dict[str, str],
+                         metrics: Dict[str, float], initial_stage: str) -> None:
+        """Add a saved model version to the registry.
+        
+        Args:
+            model_name: Name of the model
+            version: Version the model was saved as
+            framework: ML framework the model was trained with
+            hyperparameters: Hyperparameters used for training
+            metrics: Training metrics
+            initial_stage: Initial stage for the new version
+        """
+        # Update model registry
+        description = hyperparameters.get("description", f"Model {model_name}")
+        
+        with self._registry_lock:
             if model_name in self.model_registry:
                 # Update existing model info
                 info = self.model_registry[model_name]
@@ -848,19 +1865,16 @@ class ModelManager:
                     self.model_registry[model_name]["versions"][version][f"metric_{key}"] = value
             
             # Save registry
-            self._save_registry()
-            
-            # Clear model cache
-            self.models = {}
-            
-            return True, model_id, metrics, version, initial_stage
+            self._save_registry(model_name, [version])
             
-        except Exception as e:
-            print(f"Error training model: {str(e)}")
-            return False, "", {"error": str(e)}, "", ""
+        # Only the newly written version can be stale in the cache
+        self.models.invalidate(ModelCache.make_key(model_name, version))
+        if self.worker_pool is not None:
+            self.worker_pool.invalidate(model_name)
     
     def _train_sklearn(self, model_name: str, data: Dict[str, Any], 
-                       hyperparameters: Dict[str, str], validate: bool) -> Tuple[bool, Any, Dict[str, float]]:
+                       hyperparameters: Dict[str, str], validate: bool,
+                       progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Tuple[bool, Any, Dict[str, float]]:
         """Train a scikit-learn model.
         
         Args:
@@ -868,6 +1882,7 @@ class ModelManager:
             data: Training data
             hyperparameters: Hyperparameters for the model
             validate: Whether to validate the model after training
+            progress: Optional callback receiving progress updates
             
         Returns:
             Tuple of (success, model, metrics)
@@ -876,71 +1891,32 @@ class ModelManager:
         if not isinstance(data, dict) or "features" not in data or "target" not in data:
             raise ValueError("Training data must contain 'features' and 'target' keys")
         
-        X = np.array(data["features"])
-        y = np.array(data["target"])
+        # asarray keeps spooled (memory-mapped) training data on disk
+        X = np.asarray(data["features"])
+        y = np.asarray(data["target"])
         
         # Determine model type
         model_type = hyperparameters.get("model_type", "classification").lower()
         algorithm = hyperparameters.get("algorithm", "random_forest").lower()
         
-        # Create model based on type and algorithm
-        if model_type == "classification":
-            if algorithm == "random_forest":
-                n_estimators = int(hyperparameters.get("n_estimators", "100"))
-                max_depth = hyperparameters.get("max_depth")
-                max_depth = int(max_depth) if max_depth and max_depth.lower() != "none" else None
-                
-                model = RandomForestClassifier(
-                    n_estimators=n_estimators,
-                    max_depth=max_depth,
-                    random_state=42
-                )
-            elif algorithm == "logistic_regression":
-                C = float(hyperparameters.get("C", "1.0"))
-                model = LogisticRegression(
-                    C=C,
-                    max_iter=1000,
-                    random_state=42
-                )
-            elif algorithm == "svm":
-                C = float(hyperparameters.get("C", "1.0"))
-                kernel = hyperparameters.get("kernel", "rbf")
-                model = SVC(
-                    C=C,
-                    kernel=kernel,
-                    probability=True,
-                    random_state=42
-                )
-            else:
-                raise ValueError(f"Unsupported classification algorithm: {algorithm}")
-        
-        elif model_type == "regression":
-            if algorithm == "random_forest":
-                n_estimators = int(hyperparameters.get("n_estimators", "100"))
-                max_depth = hyperparameters.get("max_depth")
-                max_depth = int(max_depth) if max_depth and max_depth.lower() != "none" else None
-                
-                model = RandomForestRegressor(
-                    n_estimators=n_estimators,
-                    max_depth=max_depth,
-                    random_state=42
-                )
-            elif algorithm == "linear_regression":
-                model = LinearRegression()
-            elif algorithm == "svr":
-                C = float(hyperparameters.get("C", "1.0"))
-                kernel = hyperparameters.get("kernel", "rbf")
-                model = SVR(
-                    C=C,
-                    kernel=kernel
-                )
-            else:
-                raise ValueError(f"Unsupported regression algorithm: {algorithm}")
-        else:
-            raise ValueError(f"Unsupported model type: {model_type}")
+        model = create_sklearn_model(model_type, algorithm, hyperparameters)
         
         # Train the model
-        model.fit(X, y)
+        if progress is not None and isinstance(model, (RandomForestClassifier, RandomForestRegressor)):
+            # Grow the forest in steps to report progress; warm starts build the same trees
+            total = model.n_estimators
+            step = max(1, total // 10)
+            model.set_params(warm_start=True)
+            for n_estimators in range(step, total + step, step):
+                model.set_params(n_estimators=min(n_estimators, total))
+                model.fit(X, y)
+                progress({"epoch": model.n_estimators, "total_epochs": total,
+                          "message": f"{model.n_estimators}/{total} trees"})
+            model.set_params(warm_start=False)
+        else:
+            model.fit(X, y)
+            if progress is not None:
+                progress({"epoch": 1, "total_epochs": 1})
         
         # Validate the model if requested
         metrics = {}
@@ -967,7 +1943,8 @@ class ModelManager:
         return True, model, metrics
     
     def _train_tensorflow(self, model_name: str, data: Dict[str, Any], 
-                         hyperparameters: Dict[str, str], validate: bool) -> Tuple[bool, Any, Dict[str, float]]:
+                         hyperparameters: Dict[str, str], validate: bool,
+                         progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Tuple[bool, Any, Dict[str, float]]:
         """Train a TensorFlow model.
         
         Args:
@@ -975,19 +1952,19 @@ class ModelManager:
             data: Training data
             hyperparameters: Hyperparameters for the model
             validate: Whether to validate the model after training
+            progress: Optional callback receiving progress updates
             
         Returns:
             Tuple of (success, model, metrics)
         """
-        if not TENSORFLOW_AVAILABLE:
-            raise ValueError("TensorFlow is not available")
+        tf = import_framework("tensorflow")
         
         # Extract features and target
         if not isinstance(data, dict) or "features" not in data or "target" not in data:
             raise ValueError("Training data must contain 'features' and 'target' keys")
         
-        X = np.array(data["features"], dtype=np.float32)
-        y = np.array(data["target"])
+        X = np.asarray(data["features"], dtype=np.float32)
+        y = np.asarray(data["target"])
         
         # Convert target to one-hot encoding for classification if needed
         model_type = hyperparameters.get("model_type", "classification").lower()
@@ -1110,6 +2087,14 @@ class ModelManager:
         
         # Prepare callbacks
         callbacks = []
+        if progress is not None:
+            callbacks.append(tf.keras.callbacks.LambdaCallback(
+                on_epoch_end=lambda epoch, logs: progress({
+                    "epoch": epoch + 1,
+                    "total_epochs": epochs,
+                    "loss": float((logs or {}).get("loss", 0.0))
+                })
+            ))
         if int(hyperparameters.get("early_stopping", "1")):
             patience = int(hyperparameters.get("patience", "5"))
             callbacks.append(tf.keras.callbacks.EarlyStopping(
@@ -1153,7 +2138,8 @@ class ModelManager:
         return True, model, metrics
     
     def _train_pytorch(self, model_name: str, data: Dict[str, Any], 
-                      hyperparameters: Dict[str, str], validate: bool) -> Tuple[bool, Any, Dict[str, float]]:
+                      hyperparameters: Dict[str, str], validate: bool,
+                      progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Tuple[bool, Any, Dict[str, float]]:
         """Train a PyTorch model.
         
         Args:
@@ -1161,23 +2147,24 @@ class ModelManager:
             data: Training data
             hyperparameters: Hyperparameters for the model
             validate: Whether to validate the model after training
+            progress: Optional callback receiving progress updates
             
         Returns:
             Tuple of (success, model, metrics)
         """
-        if not PYTORCH_AVAILABLE:
-            raise ValueError("PyTorch is not available")
+        torch = import_framework("pytorch")
+        nn = torch.nn
         
         # Extract features and target
         if not isinstance(data, dict) or "features" not in data or "target" not in data:
             raise ValueError("Training data must contain 'features' and 'target' keys")
         
-        X = np.array(data["features"], dtype=np.float32)
-        y = np.array(data["target"], dtype=np.float32)
+        X = np.asarray(data["features"], dtype=np.float32)
+        y = np.asarray(data["target"], dtype=np.float32)
         
-        # Convert to PyTorch tensors
-        X_tensor = torch.tensor(X, dtype=torch.float32)
-        y_tensor = torch.tensor(y, dtype=torch.float32)
+        # Convert to PyTorch tensors (sharing memory, so spooled data is paged in per batch)
+        X_tensor = torch.from_numpy(X)
+        y_tensor = torch.from_numpy(y)
         
         # Determine model type and architecture
         model_type = hyperparameters.get("model_type", "classification").lower()
@@ -1294,6 +2281,9 @@ class ModelManager:
             
             losses.append(epoch_loss)
             
+            if progress is not None:
+                progress({"epoch": epoch + 1, "total_epochs": epochs, "loss": float(epoch_loss)})
+            
             # Print progress every 10 epochs
             if (epoch + 1) % 10 == 0:
                 print(f"Epoch {epoch+1}/{epochs}, Loss: {epoch_loss:.4f}")
@@ -1333,15 +2323,19 @@ class ModelManager:
         return True, model, metrics
     
     def _save_model(self, model: Any, model_name: str, version: str, 
-                   framework: str, hyperparameters: Dict[str, str]) -> str:
+                   framework: str, hyperparameters: Dict[str, str], sample: Any = None) -> str:
         """Save a model to disk.
         
+        With hyperparameters["onnx_export"] = "true" the model is also
+        converted to ONNX (see _export_onnx).
+        
         Args:
             model: The model to save
             model_name: Name of the model
             version: Version string
             framework: Framework used (scikit-learn, tensorflow, pytorch)
             hyperparameters: Model hyperparameters
+            sample: Training features, for checking an ONNX export
             
         Returns:
             Model ID string
@@ -1352,72 +2346,449 @@ class ModelManager:
         os.makedirs(os.path.join(self.models_dir, framework), exist_ok=True)
         
         if framework == "scikit-learn":
-            # Save scikit-learn model
-            model_path = os.path.join(self.models_dir, framework, f"{model_id}.pkl")
-            with open(model_path, "wb") as f:
-                pickle.dump(model, f)
+            # Save scikit-learn model uncompressed so its arrays can be memory-mapped;
+            # forests are stored as their compiled node tables
+            model_path = os.path.join(self.models_dir, framework, f"{model_id}.joblib")
+            native_model = compile_model(model)
+            joblib.dump(native_model, model_path)
         
         elif framework == "tensorflow":
             # Save TensorFlow model
             model_path = os.path.join(self.models_dir, framework, model_id)
             model.save(model_path)
+            native_model = model
         
         elif framework == "pytorch":
             # Save PyTorch model
             model_path = os.path.join(self.models_dir, framework, f"{model_id}.pt")
-            torch.save(model.state_dict(), model_path)
+            import_framework("pytorch").save(model.state_dict(), model_path)
+            native_model = model
         
         else:
             raise ValueError(f"Unsupported framework: {framework}")
         
+        if export_requested(hyperparameters):
+            self._export_onnx(model, native_model, model_id, framework,
+                              hyperparameters.get("model_type", "classification"), sample)
+        
         return model_id
     
+    def _export_onnx(self, model: Any, native_model: Any, model_id: str, framework: str,
+                     model_type: str, sample: Any) -> bool:
+        """Convert a saved model to ONNX, keeping it only if it matches the native model.
+        
+        Both models score the first training rows; the ONNX artifact is
+        written only if their predictions and confidences agree. Otherwise
+        the version is served natively.
+        
+        Args:
+            model: The trained model
+            native_model: The model as it is served natively (compiled forests for scikit-learn)
+            model_id: Model ID of the saved version
+            framework: Framework the model was trained with
+            model_type: The type of model
+            sample: Training features
+            
+        Returns:
+            True if the ONNX artifact was written
+        """
+        X = parity_sample(sample)
+        if X is None:
+            print(f"Not exporting {model_id} to ONNX: no training rows to check it against")
+            return False
+        
+        try:
+            onnx_model = convert_model(model, framework, X)
+            serialized = onnx_model.SerializeToString()
+            
+            # Check with the server's session settings (or the defaults in training jobs)
+            backend = self.onnx_backend or OnnxRuntimeBackend()
+            prepare, predict = self._get_framework_handlers(framework)
+            expected = predict(native_model, prepare(X), model_type)
+            actual = self._predict_onnx(backend.load(serialized), prepare(X), model_type)
+            mismatch = compare_outputs(expected, actual)
+            if mismatch:
+                print(f"Not exporting {model_id} to ONNX: {mismatch} on {len(X)} training rows")
+                return False
+            
+            with open(os.path.join(self.models_dir, framework, f"{model_id}{ONNX_SUFFIX}"), "wb") as f:
+                f.write(serialized)
+        except Exception as e:
+            print(f"ONNX export of {model_id} failed, it will be served by {framework}: {e}")
+            return False
+        
+        print(f"Exported {model_id} to ONNX (checked on {len(X)} training rows)")
+        return True
+    
     def train_model_stream(self, stream_processor):
         """Train a model with streaming data chunks.
         
+        Chunks are parsed as they arrive (see TrainingStream) instead of
+        being joined into one string. Settings are taken from the first
+        chunk.
+        
         Args:
             stream_processor: Generator of data chunks
             
         Returns:
             Training result
         """
+        stream = None
         try:
-            # Initialize container for streamed data chunks
-            training_data_buffer = []
-            model_name = None
-            hyperparameters = {}
-            validate = True
-            framework = "scikit-learn"
-            initial_stage = "development"
-            
-            # Process incoming chunks
-            for chunk in stream_processor:
-                if chunk.is_first_chunk:
-                    # Extract metadata from first chunk
-                    model_name = chunk.model_name
-                    hyperparameters = dict(chunk.hyperparameters)
-                    validate = chunk.validate
-                    framework = chunk.framework if chunk.framework else "scikit-learn"
-                    initial_stage = chunk.initial_stage if chunk.initial_stage else "development"
-                
-                # Add this chunk to the buffer
-                training_data_buffer.append(chunk.training_data_chunk)
-                
-                # If this is the last chunk, process the complete data
-                if chunk.is_last_chunk:
-                    # Combine all chunks
-                    training_data = "".join(training_data_buffer)
-                    
-                    # Train the model with the complete data
-                    success, model_id, metrics, version, stage = self.train_model(
-                        training_data, model_name, hyperparameters, validate, framework, initial_stage)
-                    
-                    # Return the training result
-                    return success, model_id, metrics, version, stage
+            chunks = iter(stream_processor)
+            first_chunk = next(chunks, None)
+            if first_chunk is None:
+                raise ValueError("Incomplete streaming data: no chunks received")
             
-            # If we get here, we didn't receive a chunk with is_last_chunk=True
-            raise ValueError("Incomplete streaming data: no ending chunk received")
+            stream = self.open_training_stream(first_chunk)
+            for chunk in itertools.chain([first_chunk], chunks):
+                if stream.feed(chunk):
+                    break
+            return stream.finish()
             
         except Exception as e:
             print(f"Error in train_model_stream: {str(e)}")
-            return False, "", {"error": str(e)}, "", ""
\ No newline at end of file
+            return False, "", {"error": str(e)}, "", ""
+        
+        finally:
+            if stream is not None:
+                stream.close()
+    
+    def open_training_stream(self, first_chunk: Any) -> "TrainingStream":
+        """Start training from a stream of chunks that are pushed as they arrive.
+        
+        Lets a caller that receives chunks asynchronously parse each one
+        without holding a thread while it waits for the next.
+        
+        Args:
+            first_chunk: First TrainRequestChunk (carries the settings)
+            
+        Returns:
+            The training stream (feed every chunk, including the first one)
+            
+        Raises:
+            ValueError: If the settings are invalid
+        """
+        return TrainingStream(self, first_chunk)
+    
+    def _parse_training_batch(self, text: str, feature_dtype: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Parse one self-contained training batch.
+        
+        Args:
+            text: JSON object with 'features' and 'target' keys
+            feature_dtype: dtype of the feature array
+            
+        Returns:
+            Tuple of (features, target) arrays
+            
+        Raises:
+            ValueError: If the batch is invalid
+        """
+        try:
+            batch = json.loads(text)
+        except json.JSONDecodeError:
+            raise ValueError("Invalid JSON training data")
+        
+        if not isinstance(batch, dict) or "features" not in batch or "target" not in batch:
+            raise ValueError("Training data must contain 'features' and 'target' keys")
+        
+        X = np.asarray(batch["features"], dtype=feature_dtype)
+        y = np.asarray(batch["target"])
+        if len(X) != len(y):
+            raise ValueError(f"Batch has {len(X)} feature rows but {len(y)} targets")
+        return X, y
+    
+    def _partial_fit_sklearn(self, model: Any, X: np.ndarray, y: np.ndarray, model_type: str,
+                             classes: Optional[np.ndarray], progress: Dict[str, float], validate: bool) -> None:
+        """Update an SGD model with one block of rows.
+        
+        When validating, each block is scored before the model learns from
+        it (progressive validation), so no held-out copy of the data is kept.
+        
+        Args:
+            model: SGD model
+            X: Feature block
+            y: Target block
+            model_type: classification or regression
+            classes: All class labels (classification only)
+            progress: Running totals updated in place
+            validate: Whether to accumulate validation totals
+        """
+        if len(X) == 0:
+            return
+        
+        if validate and hasattr(model, "coef_"):
+            y_pred = model.predict(X)
+            progress["evaluated"] = progress.get("evaluated", 0.0) + len(y)
+            if model_type == "classification":
+                progress["correct"] = progress.get("correct", 0.0) + float(np.sum(y_pred == y))
+            else:
+                progress["squared_error"] = progress.get("squared_error", 0.0) + float(np.sum((y_pred - y) ** 2))
+        
+        if model_type == "classification":
+            model.partial_fit(X, y, classes=classes)
+        else:
+            model.partial_fit(X, y)
+        progress["rows"] = progress.get("rows", 0.0) + len(y)
+    
+    def _partial_fit_metrics(self, model_type: str, progress: Dict[str, float], validate: bool) -> Dict[str, float]:
+        """Build training metrics from partial_fit progress totals.
+        
+        Args:
+            model_type: classification or regression
+            progress: Totals collected by _partial_fit_sklearn
+            validate: Whether validation totals were collected
+            
+        Returns:
+            Dictionary of metrics
+        """
+        if not progress.get("rows"):
+            raise ValueError("No training rows received")
+        
+        metrics = {"training_rows": float(progress["rows"])}
+        evaluated = progress.get("evaluated", 0.0)
+        if validate and evaluated:
+            if model_type == "classification":
+                metrics["accuracy"] = progress["correct"] / evaluated
+            else:
+                mse = progress["squared_error"] / evaluated
+                metrics["mean_squared_error"] = mse
+                metrics["root_mean_squared_error"] = float(np.sqrt(mse))
+        return metrics
+
+
+class ScoringSession:
+    """A model version pinned for scoring a sequence of batches.
+    
+    Created by ModelManager.open_session; holds a reference to the loaded
+    model so cache evictions do not force reloads during the session.
+    """
+    
+    def __init__(self, manager: ModelManager, handle: ModelHandle, model: Any):
+        """Initialize the session.
+        
+        Args:
+            manager: The model manager that opened the session
+            handle: Resolved handle of the pinned version
+            model: Loaded model instance (None when scoring in worker processes)
+        """
+        self.manager = manager
+        self.handle = handle
+        self.model_name = handle.model_name
+        self.model = model
+        self.version = handle.version
+        self.batches = 0
+    
+    def process_data(self, input_data: str, parameters: Dict[str, str]) -> Tuple[str, float, Dict[str, str]]:
+        """Score a JSON batch with the pinned model.
+        
+        Args:
+            input_data: Input data (JSON string)
+            parameters: Processing parameters
+            
+        Returns:
+            Tuple of (result, confidence_score, metadata)
+            
+        Raises:
+            ValueError: If the input is invalid
+        """
+        self.batches += 1
+        if self.model is None:
+            return self.manager.worker_pool.process_data(
+                input_data, self.model_name, parameters, self.version)
+        
+        start_time = time.time()
+        try:
+            data = json.loads(input_data)
+        except json.JSONDecodeError:
+            raise ValueError("Invalid JSON input data")
+        
+        y_pred, confidence, metadata = self.manager._score(
+            self.model, self.handle, data, parameters, start_time)
+        return json.dumps(y_pred.tolist()), confidence, metadata
+    
+    def process_tensor(self, X: np.ndarray, parameters: Dict[str, str]) -> Tuple[np.ndarray, float, Dict[str, str]]:
+        """Score an array batch with the pinned model.
+        
+        Args:
+            X: Input array
+            parameters: Processing parameters
+            
+        Returns:
+            Tuple of (predictions array, confidence_score, metadata)
+            
+        Raises:
+            ValueError: If the input is invalid
+        """
+        self.batches += 1
+        if self.model is None:
+            return self.manager.worker_pool.process_tensor(
+                X, self.model_name, parameters, self.version)
+        
+        return self.manager._score(self.model, self.handle, X, parameters, time.time())
+
+
+class TrainingStream:
+    """A model being trained from chunks pushed one at a time.
+    
+    Created by ModelManager.open_training_stream. With
+    hyperparameters["stream_format"] = "document" (default) the chunks
+    concatenate to the same JSON document TrainModel accepts; with
+    "batches" every chunk is a self-contained
+    ``{"features": [...], "target": [...]}`` batch.
+    
+    Rows are kept in ArraySpool buffers that spill to a memory-mapped
+    file above hyperparameters["spool_threshold_mb"] (default 256), and
+    hyperparameters["num_rows"] preallocates them. SGD models
+    (algorithm "sgd") are trained with partial_fit; in the "batches"
+    format they train on each batch as it arrives and nothing is kept.
+    """
+    
+    def __init__(self, manager: ModelManager, first_chunk: Any):
+        """Read the settings of the first chunk and prepare the buffers.
+        
+        Args:
+            manager: The model manager that opened the stream
+            first_chunk: First TrainRequestChunk
+            
+        Raises:
+            ValueError: If the settings are invalid
+        """
+        self.manager = manager
+        self.model_name = first_chunk.model_name
+        self.hyperparameters = dict(first_chunk.hyperparameters)
+        self.validate = first_chunk.validate
+        self.framework = first_chunk.framework if first_chunk.framework else "scikit-learn"
+        self.initial_stage = first_chunk.initial_stage if first_chunk.initial_stage else "development"
+        self.complete = False
+        self.features = None
+        self.target = None
+        
+        if not self.model_name:
+            raise ValueError("The first chunk must set model_name")
+        manager.check_training_options(self.framework, self.initial_stage)
+        
+        hyperparameters = self.hyperparameters
+        self.stream_format = hyperparameters.get("stream_format", "document").lower()
+        if self.stream_format not in ("document", "batches"):
+            raise ValueError(f"Unsupported stream_format: {self.stream_format}")
+        
+        self.model_type = hyperparameters.get("model_type", "classification").lower()
+        self.incremental = (self.framework == "scikit-learn"
+                            and hyperparameters.get("algorithm", "").lower() == "sgd")
+        
+        # Online training state for the "batches" format
+        self.online_model = None
+        self.classes = None
+        self.progress: Dict[str, float] = {}
+        if self.incremental and self.stream_format == "batches":
+            self.online_model = create_sklearn_model(self.model_type, "sgd", hyperparameters)
+            if self.model_type == "classification":
+                if "classes" not in hyperparameters:
+                    raise ValueError("Streaming SGD classification in the 'batches' format requires the 'classes' hyperparameter")
+                self.classes = np.asarray(json.loads(hyperparameters["classes"]))
+        
+        # Neural network trainers use float32, so spool in that dtype to avoid a copy
+        self.feature_dtype = np.float64 if self.framework == "scikit-learn" else np.float32
+        capacity = int(hyperparameters.get("num_rows", "0"))
+        spool_threshold = int(float(hyperparameters.get("spool_threshold_mb", "256")) * 1024 * 1024)
+        self.features = ArraySpool(self.feature_dtype, capacity, spool_threshold)
+        self.target = ArraySpool(None, capacity, spool_threshold)
+        
+        self.parser = None
+        if self.stream_format == "document":
+            spools = {"features": self.features, "target": self.target}
+            self.parser = TrainingDataParser(lambda key, rows: spools[key].append(rows))
+    
+    def feed(self, chunk: Any) -> bool:
+        """Parse one chunk.
+        
+        Args:
+            chunk: The next TrainRequestChunk
+            
+        Returns:
+            True if it was the last chunk
+            
+        Raises:
+            ValueError: If the chunk is invalid
+        """
+        if self.complete:
+            raise ValueError("Chunk received after the last chunk")
+        
+        if self.parser is not None:
+            self.parser.feed(chunk.training_data_chunk)
+        elif chunk.training_data_chunk.strip():
+            X_batch, y_batch = self.manager._parse_training_batch(chunk.training_data_chunk, self.feature_dtype)
+            if self.online_model is not None:
+                self.manager._partial_fit_sklearn(self.online_model, X_batch, y_batch, self.model_type,
+                                                  self.classes, self.progress, self.validate)
+            else:
+                self.features.append(X_batch)
+                self.target.append(y_batch)
+        
+        self.complete = chunk.is_last_chunk
+        return self.complete
+    
+    def finish(self) -> Tuple[bool, str, Dict[str, Any], str, str]:
+        """Fit the model on the received rows and register it.
+        
+        Returns:
+            Tuple of (success, model_id, metrics, version, stage)
+            
+        Raises:
+            ValueError: If the last chunk was not received or the data is invalid
+        """
+        if not self.complete:
+            raise ValueError("Incomplete streaming data: no ending chunk received")
+        
+        manager = self.manager
+        hyperparameters = self.hyperparameters
+        features, target = self.features, self.target
+        model_type = self.model_type
+        
+        if self.parser is not None:
+            self.parser.close()
+            missing = [key for key in ("features", "target") if key not in self.parser.seen_keys]
+            if missing:
+                raise ValueError("Training data must contain 'features' and 'target' keys")
+        
+        if self.online_model is not None:
+            model = self.online_model
+            metrics = manager._partial_fit_metrics(model_type, self.progress, self.validate)
+        elif self.incremental:
+            # Spooled rows are streamed through partial_fit block by block
+            if features.rows != target.rows:
+                raise ValueError(f"Got {features.rows} feature rows but {target.rows} targets")
+            
+            model = create_sklearn_model(model_type, "sgd", hyperparameters)
+            classes = None
+            if model_type == "classification":
+                if "classes" in hyperparameters:
+                    classes = np.asarray(json.loads(hyperparameters["classes"]))
+                else:
+                    classes = np.unique(np.asarray(target.to_array()))
+            
+            for _ in range(int(hyperparameters.get("epochs", "1"))):
+                for X_block, y_block in zip(features.iter_blocks(DEFAULT_BLOCK_ROWS),
+                                            target.iter_blocks(DEFAULT_BLOCK_ROWS)):
+                    manager._partial_fit_sklearn(model, X_block, np.asarray(y_block), model_type,
+                                                 classes, self.progress, self.validate)
+            metrics = manager._partial_fit_metrics(model_type, self.progress, self.validate)
+        else:
+            data = {"features": features.to_array(), "target": target.to_array()}
+            success, model, metrics = manager._fit_model(self.framework, self.model_name, data,
+                                                         hyperparameters, self.validate)
+            if not success:
+                return False, "", metrics, "", ""
+        
+        model_id, version = manager._register_model(
+            model, self.model_name, self.framework, hyperparameters, metrics, self.initial_stage,
+            features.to_array())
+        
+        return True, model_id, metrics, version, self.initial_stage
+    
+    def close(self) -> None:
+        """Release the row buffers (and their spill files)."""
+        for spool in (self.features, self.target):
+            if spool is not None:
+                spool.close()
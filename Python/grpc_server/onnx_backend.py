@@ -0,0 +1,244 @@
+"""ONNX export and the ONNX Runtime inference backend.
+
+Models trained with the ``onnx_export`` hyperparameter set to ``"true"``
+are also converted to ONNX when they are saved (scikit-learn models with
+skl2onnx, TensorFlow models with tf2onnx, PyTorch models with torch.onnx)
+and written next to the native artifact as ``<model_id>.onnx``. The ONNX
+model is only kept if it reproduces the native model's predictions and
+confidences on a sample of the training rows; if a converter is missing,
+the conversion fails or the outputs differ, the version is served by its
+native framework as before.
+
+With an ``OnnxRuntimeBackend`` configured, versions that have an ONNX
+artifact are loaded into an ONNX Runtime CPU session instead of their
+framework. ONNX Runtime, ONNX and the converters are optional packages,
+imported on first use like the optional frameworks.
+"""
+
+import io
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from frameworks import import_framework
+
+# Hyperparameter that requests ONNX conversion when a model is saved
+EXPORT_PARAMETER = "onnx_export"
+
+# File extension of ONNX artifacts
+ONNX_SUFFIX = ".onnx"
+
+# Name of the input of exported TensorFlow and PyTorch models
+INPUT_NAME = "input"
+
+# Training rows scored by both models before an ONNX model is kept
+PARITY_ROWS = 256
+
+# Tolerances of the parity check (ONNX Runtime computes in float32)
+PARITY_RTOL = 1e-3
+PARITY_ATOL = 1e-4
+
+
+def export_requested(hyperparameters: Dict[str, str]) -> bool:
+    """Check whether a training request asked for ONNX conversion.
+
+    Args:
+        hyperparameters: Hyperparameters of the training request
+
+    Returns:
+        True if the ``onnx_export`` hyperparameter is "true"
+    """
+    return hyperparameters.get(EXPORT_PARAMETER, "").lower() == "true"
+
+
+def parity_sample(features: Any) -> Optional[np.ndarray]:
+    """Take the rows the native and ONNX outputs are compared on.
+
+    Args:
+        features: Training features (list of rows or array), or None
+
+    Returns:
+        Up to PARITY_ROWS rows as a 2D float32 array, or None without features
+    """
+    if features is None or len(features) == 0:
+        return None
+    X = np.asarray(features[:PARITY_ROWS], dtype=np.float32)
+    return X.reshape(-1, 1) if X.ndim == 1 else X
+
+
+def convert_model(model: Any, framework: str, sample: np.ndarray) -> Any:
+    """Convert a trained model to ONNX.
+
+    Args:
+        model: The trained model (scikit-learn estimator, Keras model or torch module)
+        framework: Framework the model was trained with
+        sample: Input rows (float32), used for the input signature
+
+    Returns:
+        The ONNX ModelProto, with the framework and whether the model has
+        class probabilities recorded in its metadata
+
+    Raises:
+        ValueError: If a converter is not installed or the framework is not supported
+    """
+    probabilities = False
+
+    if framework == "scikit-learn":
+        skl2onnx = import_framework("skl2onnx")
+        estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+        options = None
+        if getattr(estimator, "_estimator_type", None) == "classifier":
+            # Probabilities as a plain tensor instead of a list of per-row dicts
+            options = {id(estimator): {"zipmap": False}}
+            probabilities = hasattr(model, "predict_proba")
+        model_proto = skl2onnx.to_onnx(model, sample[:1], options=options)
+
+    elif framework == "tensorflow":
+        tf = import_framework("tensorflow")
+        tf2onnx = import_framework("tf2onnx")
+        signature = (tf.TensorSpec((None,) + sample.shape[1:], tf.float32, name=INPUT_NAME),)
+        model_proto, _ = tf2onnx.convert.from_keras(model, input_signature=signature)
+
+    elif framework == "pytorch":
+        torch = import_framework("pytorch")
+        onnx = import_framework("onnx")
+        buffer = io.BytesIO()
+        model.eval()
+        torch.onnx.export(model, torch.from_numpy(np.ascontiguousarray(sample[:1])), buffer,
+                          input_names=[INPUT_NAME], output_names=["output"],
+                          dynamic_axes={INPUT_NAME: {0: "batch"}, "output": {0: "batch"}})
+        model_proto = onnx.load_model_from_string(buffer.getvalue())
+
+    else:
+        raise ValueError(f"Unsupported framework: {framework}")
+
+    for key, value in (("framework", framework), ("probabilities", str(probabilities).lower())):
+        entry = model_proto.metadata_props.add()
+        entry.key = key
+        entry.value = value
+    return model_proto
+
+
+def compare_outputs(expected: Tuple[np.ndarray, np.ndarray],
+                    actual: Tuple[np.ndarray, np.ndarray]) -> Optional[str]:
+    """Compare the native and ONNX predictions of the same rows.
+
+    Numeric predictions (including class indices) must agree within the
+    parity tolerances, other labels exactly; confidences within the
+    tolerances.
+
+    Args:
+        expected: (predictions, per-row confidence) of the native model
+        actual: (predictions, per-row confidence) of the ONNX model
+
+    Returns:
+        Description of the first difference found, or None if the outputs match
+    """
+    y_expected, y_actual = np.asarray(expected[0]), np.asarray(actual[0])
+    if y_expected.shape != y_actual.shape:
+        return f"prediction shape {y_actual.shape} instead of {y_expected.shape}"
+
+    if np.issubdtype(y_expected.dtype, np.number) and np.issubdtype(y_actual.dtype, np.number):
+        mismatched = ~np.isclose(y_actual, y_expected, rtol=PARITY_RTOL, atol=PARITY_ATOL)
+    else:
+        mismatched = y_actual.astype(str) != y_expected.astype(str)
+    if mismatched.any():
+        return f"{int(np.count_nonzero(mismatched))} of {mismatched.size} predictions differ"
+
+    confidence_expected, confidence_actual = np.asarray(expected[1]), np.asarray(actual[1])
+    if not np.allclose(confidence_actual, confidence_expected, rtol=PARITY_RTOL, atol=PARITY_ATOL):
+        difference = float(np.max(np.abs(confidence_actual - confidence_expected)))
+        return f"confidences differ by up to {difference:.3g}"
+    return None
+
+
+class OnnxModel:
+    """An exported model version loaded into an ONNX Runtime session.
+
+    ``InferenceSession.run`` is thread-safe, so one instance serves all
+    concurrent requests for the version.
+    """
+
+    def __init__(self, session: Any):
+        """Initialize the model.
+
+        Args:
+            session: ONNX Runtime InferenceSession of the exported model
+        """
+        self.session = session
+        model_input = session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_shape = tuple(dim if isinstance(dim, int) else None for dim in model_input.shape)
+        self.input_dtype = np.float64 if model_input.type == "tensor(double)" else np.float32
+        self.output_names = [output.name for output in session.get_outputs()]
+
+        metadata = session.get_modelmeta().custom_metadata_map
+        self.framework = metadata.get("framework", "")
+        self.probabilities = metadata.get("probabilities") == "true"
+
+    def run(self, X: Any) -> List[np.ndarray]:
+        """Score input rows.
+
+        Args:
+            X: 2D input (array, list of rows or DataFrame)
+
+        Returns:
+            The model outputs, in graph order
+        """
+        X = np.ascontiguousarray(X, dtype=self.input_dtype)
+        return self.session.run(self.output_names, {self.input_name: X})
+
+
+class OnnxRuntimeBackend:
+    """Loads ONNX artifacts into ONNX Runtime CPU sessions.
+
+    The server already scores requests concurrently, so by default every
+    session runs its operators on one thread (ONNX Runtime would otherwise
+    start a thread per core for each session). Graph optimizations are
+    applied once, when the session is created.
+    """
+
+    def __init__(self, intra_op_threads: int = 1, inter_op_threads: int = 1):
+        """Initialize the backend.
+
+        Args:
+            intra_op_threads: Threads used within one operator (0 lets ONNX Runtime use every core)
+            inter_op_threads: Threads running independent operators in parallel (1 runs them sequentially)
+        """
+        self.intra_op_threads = max(0, intra_op_threads)
+        self.inter_op_threads = max(1, inter_op_threads)
+
+    def session_options(self) -> Any:
+        """Build the session options shared by every loaded model.
+
+        Returns:
+            onnxruntime.SessionOptions
+
+        Raises:
+            ValueError: If ONNX Runtime is not installed
+        """
+        ort = import_framework("onnxruntime")
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = self.inter_op_threads
+        options.execution_mode = (ort.ExecutionMode.ORT_PARALLEL if self.inter_op_threads > 1
+                                  else ort.ExecutionMode.ORT_SEQUENTIAL)
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return options
+
+    def load(self, model: Union[str, bytes]) -> OnnxModel:
+        """Create a CPU session for an ONNX model.
+
+        Args:
+            model: Path to an ONNX artifact or the serialized model
+
+        Returns:
+            The loaded model
+
+        Raises:
+            ValueError: If ONNX Runtime is not installed
+        """
+        ort = import_framework("onnxruntime")
+        session = ort.InferenceSession(model, sess_options=self.session_options(),
+                                       providers=["CPUExecutionProvider"])
+        return OnnxModel(session)
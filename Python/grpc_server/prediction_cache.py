@@ -0,0 +1,223 @@
+"""Bounded cache of prediction results.
+
+Clients often re-score the same rows against the same model version within
+minutes. The ``PredictionCache`` keeps the serialized result of a request
+keyed by the model, the resolved version and a fingerprint of the input
+text and the parameters that affect the result, so a repeated request
+skips JSON parsing and the model entirely. Only the metadata describing
+the result is cached; per-request entries such as timings are not. Entries expire after a TTL and
+are evicted in least-recently-used order beyond the entry and byte
+budgets. Every entry of a model is dropped when its registry entry
+changes (a new version is trained or a stage is moved).
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from profiling import PROFILE_PARAMETER
+
+# Processing parameter that bypasses the cache for a request ("false")
+CACHE_PARAMETER = "cache"
+
+# Response metadata entry set to "hit" or "miss" when the cache is enabled
+CACHE_METADATA_KEY = "prediction_cache"
+
+# Parameters that do not change the result and are left out of the fingerprint
+_IGNORED_PARAMETERS = (PROFILE_PARAMETER, CACHE_PARAMETER)
+
+# Metadata describing the result itself, served again on a hit. Everything
+# else (timings, micro-batch and row deduplication counters, the worker that
+# scored the request) describes one computation and is not cached
+RESULT_METADATA_KEYS = ("model_type", "framework", "version", "stage", "backend", "feature_importances")
+
+# Removes the characters JSON treats as whitespace
+_JSON_WHITESPACE = str.maketrans("", "", " \t\n\r")
+
+# (model_name, version, fingerprint)
+CacheKey = Tuple[str, str, str]
+
+
+def cache_requested(parameters: Dict[str, str]) -> bool:
+    """Check whether a request may be served from (and stored in) the cache.
+
+    Args:
+        parameters: Processing parameters of the request
+
+    Returns:
+        False if the ``cache`` parameter is "false" or the request is profiled
+    """
+    if parameters.get(CACHE_PARAMETER, "").lower() == "false":
+        return False
+    return parameters.get(PROFILE_PARAMETER, "").lower() != "true"
+
+
+def result_metadata(metadata: Dict[str, str]) -> Dict[str, str]:
+    """Get the metadata entries of a result that are cached with it.
+
+    Args:
+        metadata: Response metadata of the computed result
+
+    Returns:
+        The entries listed in RESULT_METADATA_KEYS
+    """
+    return {key: metadata[key] for key in RESULT_METADATA_KEYS if key in metadata}
+
+
+def fingerprint(input_data: str, parameters: Dict[str, str]) -> str:
+    """Hash a request's input and result-affecting parameters.
+
+    Whitespace is insignificant in JSON outside strings, so it is removed
+    from inputs without string literals (numeric rows, the common case)
+    before hashing. The text is otherwise hashed as sent: rows spelling
+    the same numbers differently (``1`` and ``1.0``) get different
+    fingerprints, and are merely scored again. Decoding the input to hash
+    the values would cost more than a hit saves for typical batches.
+
+    Args:
+        input_data: Input data (JSON string)
+        parameters: Processing parameters
+
+    Returns:
+        Hex digest identifying the request
+    """
+    relevant = {key: value for key, value in parameters.items() if key not in _IGNORED_PARAMETERS}
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(relevant, sort_keys=True).encode("utf-8"))
+    digest.update(b"\0")
+    if '"' not in input_data:
+        input_data = input_data.translate(_JSON_WHITESPACE)
+    digest.update(input_data.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """TTL and LRU cache of prediction results.
+
+    Supports:
+    - Entry and byte budgets (0 disables a budget)
+    - Expiry of entries older than the TTL
+    - Invalidation of every entry of a model
+    - Hit, miss, expiration and eviction counters
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 0, ttl_seconds: float = 300.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results (0 for unlimited)
+            max_bytes: Maximum total size of the cached results in bytes (0 for unlimited)
+            ttl_seconds: Time a result is served for after it was computed (0 never expires)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, size_bytes, value)
+        self._entries: "OrderedDict[CacheKey, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Get a cached result and mark it as most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on a miss or if the entry expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry[0] and entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: CacheKey, value: Any, size_bytes: int = 0) -> None:
+        """Add a result to the cache, evicting older entries if needed.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+            size_bytes: Size of the result in bytes
+        """
+        if self.max_bytes and size_bytes > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, size_bytes, value)
+            self._total_bytes += size_bytes
+
+            while ((self.max_entries and len(self._entries) > self.max_entries)
+                   or (self.max_bytes and self._total_bytes > self.max_bytes)):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_model(self, model_name: str) -> int:
+        """Remove every cached result of a model.
+
+        Args:
+            model_name: Name of the model
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == model_name]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with sizes, budgets and hit/miss/expiration/eviction counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def _remove(self, key: CacheKey) -> None:
+        _, size_bytes, _ = self._entries.pop(key)
+        self._total_bytes -= size_bytes
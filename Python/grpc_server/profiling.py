@@ -0,0 +1,156 @@
+"""Per-request profiling of the inference path.
+
+Two opt-in tools for finding out where the time of a slow model goes:
+
+- Setting the ``profile`` processing parameter to ``"true"`` returns the
+  phase breakdown of that request (JSON decode, input preparation, model
+  resolution and loading, predict_proba, predict, serialization) as a JSON
+  object of milliseconds in the ``profile`` metadata entry.
+- A ``ProfileSampler`` captures full cProfile statistics for 1 in N
+  requests and keeps the newest ones as ``.prof`` files in a directory
+  (readable with ``python -m pstats``).
+"""
+
+import cProfile
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+logger = logging.getLogger("gRPC_Server")
+
+# Processing parameter that requests a phase breakdown
+PROFILE_PARAMETER = "profile"
+
+# Response metadata entry holding the phase breakdown
+PROFILE_METADATA_KEY = "profile"
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def profile_requested(parameters: Dict[str, str]) -> bool:
+    """Check whether a request asked for a phase breakdown.
+
+    Args:
+        parameters: Processing parameters of the request
+
+    Returns:
+        True if the ``profile`` parameter is "true"
+    """
+    return parameters.get(PROFILE_PARAMETER, "").lower() == "true"
+
+
+def format_breakdown(timer: Any) -> str:
+    """Render the phases recorded by an InferenceTimer.
+
+    Args:
+        timer: The request's InferenceTimer
+
+    Returns:
+        JSON object mapping ``<phase>_ms`` (and ``total_ms``) to milliseconds
+    """
+    breakdown: Dict[str, float] = {}
+    for phase, seconds in timer.phases:
+        key = f"{phase}_ms"
+        breakdown[key] = breakdown.get(key, 0.0) + seconds * 1000
+    breakdown["total_ms"] = (time.perf_counter() - timer.start) * 1000
+    return json.dumps({key: round(value, 3) for key, value in breakdown.items()})
+
+
+class ProfileSampler:
+    """Captures cProfile statistics for 1 in ``every`` requests.
+
+    Only one request is profiled at a time; a request that falls on a
+    sampling slot while another is being profiled is skipped. cProfile
+    follows the calling thread only, so time spent in a micro-batch run by
+    another request's thread is not included.
+    """
+
+    def __init__(self, directory: str, every: int, max_files: int = 50):
+        """Initialize the sampler.
+
+        Args:
+            directory: Directory the ``.prof`` files are written to
+            every: Profile one request out of this many
+            max_files: Number of newest files kept (older ones are deleted)
+        """
+        self.directory = directory
+        self.every = max(1, every)
+        self.max_files = max(1, max_files)
+        self._lock = threading.Lock()
+        self._count = 0
+        self._active = False
+        self.samples = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Sent to inference worker processes, which keep their own counters
+        return {"directory": self.directory, "every": self.every, "max_files": self.max_files}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["directory"], state["every"], state["max_files"])
+
+    @contextmanager
+    def sample(self, label: str) -> Iterator[bool]:
+        """Profile the enclosed block if this request is sampled.
+
+        Args:
+            label: Label included in the file name (usually the model name)
+
+        Yields:
+            True if the block is being profiled
+        """
+        with self._lock:
+            self._count += 1
+            take = self._count % self.every == 0 and not self._active
+            if take:
+                self._active = True
+
+        if not take:
+            yield False
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                yield True
+            finally:
+                profiler.disable()
+                self._store(profiler, label)
+        finally:
+            with self._lock:
+                self._active = False
+
+    def _store(self, profiler: cProfile.Profile, label: str) -> None:
+        """Write a profile and delete the oldest files beyond max_files."""
+        self.samples += 1
+        name = "{}-{}-{:06d}-{}.prof".format(time.strftime("%Y%m%d-%H%M%S"), os.getpid(), self.samples,
+                                             _UNSAFE_FILENAME_CHARS.sub("_", label)[:64])
+        try:
+            profiler.dump_stats(os.path.join(self.directory, name))
+            self._rotate()
+        except OSError as e:
+            logger.warning(f"Could not store request profile: {str(e)}")
+
+    def _rotate(self) -> None:
+        paths = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".prof"):
+                path = os.path.join(self.directory, name)
+                try:
+                    paths.append((os.path.getmtime(path), path))
+                except OSError:
+                    # Removed by another worker process
+                    pass
+
+        paths.sort()
+        for _, path in paths[:max(0, len(paths) - self.max_files)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
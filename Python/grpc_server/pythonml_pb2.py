@@ -13,7 +13,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0epythonml.proto\x12\x08pythonml\"\xc9\x01\n\x0eProcessRequest\x12\x12\n\ninput_data\x18\x01 \x01(\t\x12\x12\n\nmodel_name\x18\x02 \x01(\t\x12<\n\nparameters\x18\x03 \x03(\x0b\x32(.pythonml.ProcessRequest.ParametersEntry\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\r\n\x05stage\x18\x05 \x01(\t\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xcf\x01\n\x0fProcessResponse\x12\x0e\n\x06result\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x18\n\x10\x63onfidence_score\x18\x04 \x01(\x02\x12\x39\n\x08metadata\x18\x05 \x03(\x0b\x32\'.pythonml.ProcessResponse.MetadataEntry\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x9e\x02\n\x14ProcessResponseChunk\x12\x14\n\x0cresult_chunk\x18\x01 \x01(\t\x12\x15\n\ris_last_chunk\x18\x02 \x01(\x08\x12\x0f\n\x07success\x18\x03 \x01(\x08\x12\x15\n\rerror_message\x18\x04 \x01(\t\x12\x10\n\x08\x63hunk_id\x18\x05 \x01(\x05\x12\x14\n\x0ctotal_chunks\x18\x06 \x01(\x05\x12\x18\n\x10\x63onfidence_score\x18\x07 \x01(\x02\x12>\n\x08metadata\x18\x08 \x03(\x0b\x32,.pythonml.ProcessResponseChunk.MetadataEntry\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd5\x01\n\x14ProcessStreamRequest\x12\x12\n\ninput_data\x18\x01 \x01(\t\x12\x12\n\nmodel_name\x18\x02 \x01(\t\x12\x42\n\nparameters\x18\x03 \x03(\x0b\x32..pythonml.ProcessStreamRequest.ParametersEntry\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\r\n\x05stage\x18\x05 \x01(\t\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xf3\x01\n\x0cTrainRequest\x12\x15\n\rtraining_data\x18\x01 \x01(\t\x12\x12\n\nmodel_name\x18\x02 \x01(\t\x12\x44\n\x0fhyperparameters\x18\x03 \x03(\x0b\x32+.pythonml.TrainRequest.HyperparametersEntry\x12\x10\n\x08validate\x18\x04 \x01(\x08\x12\x11\n\tframework\x18\x05 \x01(\t\x12\x15\n\rinitial_stage\x18\x06 \x01(\t\x1a\x36\n\x14HyperparametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd0\x01\n\rTrainResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08model_id\x18\x02 \x01(\t\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x35\n\x07metrics\x18\x04 \x03(\x0b\x32$.pythonml.TrainResponse.MetricsEntry\x12\x0f\n\x07version\x18\x05 \x01(\t\x12\r\n\x05stage\x18\x06 \x01(\t\x1a.\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02:\x02\x38\x01\"\xc2\x02\n\x11TrainRequestChunk\x12\x1b\n\x13training_data_chunk\x18\x01 \x01(\t\x12\x15\n\ris_last_chunk\x18\x02 \x01(\x08\x12\x10\n\x08\x63hunk_id\x18\x03 \x01(\x05\x12\x14\n\x0ctotal_chunks\x18\x04 \x01(\x05\x12\x12\n\nmodel_name\x18\x05 \x01(\t\x12\x10\n\x08validate\x18\x06 \x01(\x08\x12\x11\n\tframework\x18\x07 \x01(\t\x12\x15\n\rinitial_stage\x18\x08 \x01(\t\x12I\n\x0fhyperparameters\x18\t \x03(\x0b\x32\x30.pythonml.TrainRequestChunk.HyperparametersEntry\x1a\x36\n\x14HyperparametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xc4\x02\n\x12TrainStreamRequest\x12\x1b\n\x13training_data_chunk\x18\x01 \x01(\t\x12\x15\n\ris_last_chunk\x18\x02 \x01(\x08\x12\x10\n\x08\x63hunk_id\x18\x03 \x01(\x05\x12\x14\n\x0ctotal_chunks\x18\x04 \x01(\x05\x12\x12\n\nmodel_name\x18\x05 \x01(\t\x12\x10\n\x08validate\x18\x06 \x01(\x08\x12\x11\n\tframework\x18\x07 \x01(\t\x12\x15\n\rinitial_stage\x18\x08 \x01(\t\x12J\n\x0fhyperparameters\x18\t \x03(\x0b\x32\x31.pythonml.TrainStreamRequest.HyperparametersEntry\x1a\x36\n\x14HyperparametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"F\n\x10ModelInfoRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\r\n\x05stage\x18\x03 \x01(\t\"\xc3\x03\n\x11ModelInfoResponse\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x1c\n\x14supported_operations\x18\x04 \x03(\t\x12?\n\nproperties\x18\x05 \x03(\x0b\x32+.pythonml.ModelInfoResponse.PropertiesEntry\x12\x11\n\tframework\x18\x06 \x01(\t\x12\r\n\x05stage\x18\x07 \x01(\t\x12\x12\n\ncreated_at\x18\x08 \x01(\t\x12\x12\n\nupdated_at\x18\t \x01(\t\x12\x1a\n\x12\x61vailable_versions\x18\n \x03(\t\x12\x46\n\x0estage_versions\x18\x0b \x03(\x0b\x32..pythonml.ModelInfoResponse.StageVersionsEntry\x1a\x31\n\x0fPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x34\n\x12StageVersionsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"v\n\x11ListModelsRequest\x12\x18\n\x10\x66ramework_filter\x18\x01 \x01(\t\x12\x14\n\x0cstage_filter\x18\x02 \x01(\t\x12\x13\n\x0bname_filter\x18\x03 \x01(\t\x12\x1c\n\x14include_all_versions\x18\x04 \x01(\x08\"<\n\x12ListModelsResponse\x12&\n\x06models\x18\x01 \x03(\x0b\x32\x16.pythonml.ModelSummary\"\x92\x01\n\x0cModelSummary\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x11\n\tframework\x18\x04 \x01(\t\x12\r\n\x05stage\x18\x05 \x01(\t\x12\x12\n\ncreated_at\x18\x06 \x01(\t\x12\x12\n\nupdated_at\x18\x07 \x01(\t\"b\n\x11ModelStageRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x15\n\rcurrent_stage\x18\x03 \x01(\t\x12\x11\n\tnew_stage\x18\x04 \x01(\t\"\x8c\x01\n\x12ModelStageResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\x12\x12\n\nmodel_name\x18\x03 \x01(\t\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\x16\n\x0eprevious_stage\x18\x05 \x01(\t\x12\x11\n\tnew_stage\x18\x06 \x01(\t\"\'\n\x12HealthCheckRequest\x12\x11\n\tcomponent\x18\x01 \x01(\t\"\xa6\x01\n\x13HealthCheckResponse\x12\x34\n\x06status\x18\x01 \x01(\x0e\x32$.pythonml.HealthCheckResponse.Status\x12\x0f\n\x07message\x18\x02 \x01(\t\"H\n\x06Status\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x0b\n\x07SERVING\x10\x01\x12\x0f\n\x0bNOT_SERVING\x10\x02\x12\x13\n\x0fSERVICE_UNKNOWN\x10\x03\x32\xde\x04\n\x0fPythonMLService\x12\x42\n\x0bProcessData\x12\x18.pythonml.ProcessRequest\x1a\x19.pythonml.ProcessResponse\x12O\n\x11ProcessDataStream\x12\x18.pythonml.ProcessRequest\x1a\x1e.pythonml.ProcessResponseChunk0\x01\x12=\n\nTrainModel\x12\x16.pythonml.TrainRequest\x1a\x17.pythonml.TrainResponse\x12J\n\x10TrainModelStream\x12\x1b.pythonml.TrainRequestChunk\x1a\x17.pythonml.TrainResponse(\x01\x12G\n\x0cGetModelInfo\x12\x1a.pythonml.ModelInfoRequest\x1a\x1b.pythonml.ModelInfoResponse\x12G\n\nListModels\x12\x1b.pythonml.ListModelsRequest\x1a\x1c.pythonml.ListModelsResponse\x12M\n\x10\x43hangeModelStage\x12\x1b.pythonml.ModelStageRequest\x1a\x1c.pythonml.ModelStageResponse\x12J\n\x0b\x43heckHealth\x12\x1c.pythonml.HealthCheckRequest\x1a\x1d.pythonml.HealthCheckResponseB\x17\xaa\x02\x14PPrePorter.gRPC.Coreb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0epythonml.proto\x12\x08pythonml\"4\n\x06Tensor\x12\r\n\x05\x64type\x18\x01 \x01(\t\x12\r\n\x05shape\x18\x02 \x03(\x03\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\"\x86\x02\n\x0eProcessRequest\x12\x12\n\ninput_data\x18\x01 \x01(\t\x12\x12\n\nmodel_name\x18\x02 \x01(\t\x12<\n\nparameters\x18\x03 \x03(\x0b\x32(.pythonml.ProcessRequest.ParametersEntry\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\r\n\x05stage\x18\x05 \x01(\t\x12&\n\x0cinput_tensor\x18\x06 \x01(\x0b\x32\x10.pythonml.Tensor\x12\x13\n\x0binput_arrow\x18\x07 \x01(\x0c\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x8e\x02\n\x0fProcessResponse\x12\x0e\n\x06result\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x18\n\x10\x63onfidence_score\x18\x04 \x01(\x02\x12\x39\n\x08metadata\x18\x05 \x03(\x0b\x32\'.pythonml.ProcessResponse.MetadataEntry\x12\'\n\rresult_tensor\x18\x06 \x01(\x0b\x32\x10.pythonml.Tensor\x12\x14\n\x0cresult_arrow\x18\x07 \x01(\x0c\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x9e\x02\n\x14ProcessResponseChunk\x12\x14\n\x0cresult_chunk\x18\x01 \x01(\t\x12\x15\n\ris_last_chunk\x18\x02 \x01(\x08\x12\x0f\n\x07success\x18\x03 \x01(\x08\x12\x15\n\rerror_message\x18\x04 \x01(\t\x12\x10\n\x08\x63hunk_id\x18\x05 \x01(\x05\x12\x14\n\x0ctotal_chunks\x18\x06 \x01(\x05\x12\x18\n\x10\x63onfidence_score\x18\x07 \x01(\x02\x12>\n\x08metadata\x18\x08 \x03(\x0b\x32,.pythonml.ProcessResponseChunk.MetadataEntry\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x91\x02\n\x15ProcessSessionRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\r\n\x05stage\x18\x03 \x01(\t\x12\x43\n\nparameters\x18\x04 \x03(\x0b\x32/.pythonml.ProcessSessionRequest.ParametersEntry\x12\x10\n\x08\x62\x61tch_id\x18\x05 \x01(\x03\x12\x12\n\ninput_data\x18\x06 \x01(\t\x12&\n\x0cinput_tensor\x18\x07 \x01(\x0b\x32\x10.pythonml.Tensor\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x98\x02\n\x16ProcessSessionResponse\x12\x10\n\x08\x62\x61tch_id\x18\x01 \x01(\x03\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x0e\n\x06result\x18\x04 \x01(\t\x12\'\n\rresult_tensor\x18\x05 \x01(\x0b\x32\x10.pythonml.Tensor\x12\x18\n\x10\x63onfidence_score\x18\x06 \x01(\x02\x12@\n\x08metadata\x18\x07 \x03(\x0b\x32..pythonml.ProcessSessionResponse.MetadataEntry\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd5\x01\n\x14ProcessStreamRequest\x12\x12\n\ninput_data\x18\x01 \x01(\t\x12\x12\n\nmodel_name\x18\x02 \x01(\t\x12\x42\n\nparameters\x18\x03 \x03(\x0b\x32..pythonml.ProcessStreamRequest.ParametersEntry\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\r\n\x05stage\x18\x05 \x01(\t\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xb8\x02\n\x0cTrainRequest\x12\x15\n\rtraining_data\x18\x01 \x01(\t\x12\x12\n\nmodel_name\x18\x02 \x01(\t\x12\x44\n\x0fhyperparameters\x18\x03 \x03(\x0b\x32+.pythonml.TrainRequest.HyperparametersEntry\x12\x10\n\x08validate\x18\x04 \x01(\x08\x12\x11\n\tframework\x18\x05 \x01(\t\x12\x15\n\rinitial_stage\x18\x06 \x01(\t\x12\x16\n\x0etraining_arrow\x18\x07 \x01(\x0c\x12+\n\x07\x64\x61taset\x18\x08 \x01(\x0b\x32\x1a.pythonml.DatasetReference\x1a\x36\n\x14HyperparametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xa3\x04\n\rSearchRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x15\n\rtraining_data\x18\x02 \x01(\t\x12\x16\n\x0etraining_arrow\x18\x03 \x01(\x0c\x12+\n\x07\x64\x61taset\x18\x04 \x01(\x0b\x32\x1a.pythonml.DatasetReference\x12\x45\n\x0fhyperparameters\x18\x05 \x03(\x0b\x32,.pythonml.SearchRequest.HyperparametersEntry\x12>\n\x0csearch_space\x18\x06 \x03(\x0b\x32(.pythonml.SearchRequest.SearchSpaceEntry\x12\x10\n\x08strategy\x18\x07 \x01(\t\x12\x14\n\x0cn_candidates\x18\x08 \x01(\x05\x12\x10\n\x08\x63v_folds\x18\t \x01(\x05\x12\x0f\n\x07scoring\x18\n \x01(\t\x12\x13\n\x0bmax_workers\x18\x0b \x01(\x05\x12\x0c\n\x04seed\x18\x0c \x01(\x03\x12\x10\n\x08validate\x18\r \x01(\x08\x12\x15\n\rinitial_stage\x18\x0e \x01(\t\x12\x18\n\x10leaderboard_size\x18\x0f \x01(\x05\x1a\x36\n\x14HyperparametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x32\n\x10SearchSpaceEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xb0\x02\n\x0fSearchCandidate\x12\x14\n\x0c\x63\x61ndidate_id\x18\x01 \x01(\x05\x12G\n\x0fhyperparameters\x18\x02 \x03(\x0b\x32..pythonml.SearchCandidate.HyperparametersEntry\x12\x12\n\nmean_score\x18\x03 \x01(\x01\x12\x11\n\tstd_score\x18\x04 \x01(\x01\x12\x18\n\x10\x66it_time_seconds\x18\x05 \x01(\x01\x12\x11\n\tn_samples\x18\x06 \x01(\x03\x12\r\n\x05round\x18\x07 \x01(\x05\x12\x0c\n\x04rank\x18\x08 \x01(\x05\x12\x15\n\rerror_message\x18\t \x01(\t\x1a\x36\n\x14HyperparametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xe0\x02\n\x0cSearchUpdate\x12,\n\tcandidate\x18\x01 \x01(\x0b\x32\x19.pythonml.SearchCandidate\x12.\n\x0bleaderboard\x18\x02 \x03(\x0b\x32\x19.pythonml.SearchCandidate\x12\x11\n\tevaluated\x18\x03 \x01(\x05\x12\r\n\x05total\x18\x04 \x01(\x05\x12\x10\n\x08is_final\x18\x05 \x01(\x08\x12\x0f\n\x07success\x18\x06 \x01(\x08\x12\x15\n\rerror_message\x18\x07 \x01(\t\x12\x10\n\x08model_id\x18\x08 \x01(\t\x12\x0f\n\x07version\x18\t \x01(\t\x12\r\n\x05stage\x18\n \x01(\t\x12\x34\n\x07metrics\x18\x0b \x03(\x0b\x32#.pythonml.SearchUpdate.MetricsEntry\x1a.\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"\xad\x01\n\x10\x44\x61tasetReference\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x0e\n\x06\x66ormat\x18\x02 \x01(\t\x12\x17\n\x0f\x66\x65\x61ture_columns\x18\x03 \x03(\t\x12\x15\n\rtarget_column\x18\x04 \x01(\t\x12\x17\n\x0fsample_fraction\x18\x05 \x01(\x01\x12\x10\n\x08max_rows\x18\x06 \x01(\x03\x12\x0c\n\x04seed\x18\x07 \x01(\x03\x12\x12\n\nchunk_rows\x18\x08 \x01(\x05\"\xd0\x01\n\rTrainResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08model_id\x18\x02 \x01(\t\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x35\n\x07metrics\x18\x04 \x03(\x0b\x32$.pythonml.TrainResponse.MetricsEntry\x12\x0f\n\x07version\x18\x05 \x01(\t\x12\r\n\x05stage\x18\x06 \x01(\t\x1a.\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02:\x02\x38\x01\"$\n\x12TrainingJobRequest\x12\x0e\n\x06job_id\x18\x01 \x01(\t\"\x96\x03\n\x11TrainingJobStatus\x12\x0e\n\x06job_id\x18\x01 \x01(\t\x12\r\n\x05state\x18\x02 \x01(\t\x12\x12\n\nmodel_name\x18\x03 \x01(\t\x12\r\n\x05\x65poch\x18\x04 \x01(\x05\x12\x14\n\x0ctotal_epochs\x18\x05 \x01(\x05\x12\x0c\n\x04loss\x18\x06 \x01(\x02\x12\x10\n\x08progress\x18\x07 \x01(\x02\x12\x13\n\x0b\x65ta_seconds\x18\x08 \x01(\x02\x12\x17\n\x0f\x65lapsed_seconds\x18\t \x01(\x02\x12\x16\n\x0equeue_position\x18\n \x01(\x05\x12\x0f\n\x07message\x18\x0b \x01(\t\x12\x15\n\rerror_message\x18\x0c \x01(\t\x12\x10\n\x08model_id\x18\r \x01(\t\x12\x0f\n\x07version\x18\x0e \x01(\t\x12\r\n\x05stage\x18\x0f \x01(\t\x12\x39\n\x07metrics\x18\x10 \x03(\x0b\x32(.pythonml.TrainingJobStatus.MetricsEntry\x1a.\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02:\x02\x38\x01\"\xc2\x02\n\x11TrainRequestChunk\x12\x1b\n\x13training_data_chunk\x18\x01 \x01(\t\x12\x15\n\ris_last_chunk\x18\x02 \x01(\x08\x12\x10\n\x08\x63hunk_id\x18\x03 \x01(\x05\x12\x14\n\x0ctotal_chunks\x18\x04 \x01(\x05\x12\x12\n\nmodel_name\x18\x05 \x01(\t\x12\x10\n\x08validate\x18\x06 \x01(\x08\x12\x11\n\tframework\x18\x07 \x01(\t\x12\x15\n\rinitial_stage\x18\x08 \x01(\t\x12I\n\x0fhyperparameters\x18\t \x03(\x0b\x32\x30.pythonml.TrainRequestChunk.HyperparametersEntry\x1a\x36\n\x14HyperparametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xc4\x02\n\x12TrainStreamRequest\x12\x1b\n\x13training_data_chunk\x18\x01 \x01(\t\x12\x15\n\ris_last_chunk\x18\x02 \x01(\x08\x12\x10\n\x08\x63hunk_id\x18\x03 \x01(\x05\x12\x14\n\x0ctotal_chunks\x18\x04 \x01(\x05\x12\x12\n\nmodel_name\x18\x05 \x01(\t\x12\x10\n\x08validate\x18\x06 \x01(\x08\x12\x11\n\tframework\x18\x07 \x01(\t\x12\x15\n\rinitial_stage\x18\x08 \x01(\t\x12J\n\x0fhyperparameters\x18\t \x03(\x0b\x32\x31.pythonml.TrainStreamRequest.HyperparametersEntry\x1a\x36\n\x14HyperparametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"F\n\x10ModelInfoRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\r\n\x05stage\x18\x03 \x01(\t\"\xc3\x03\n\x11ModelInfoResponse\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x1c\n\x14supported_operations\x18\x04 \x03(\t\x12?\n\nproperties\x18\x05 \x03(\x0b\x32+.pythonml.ModelInfoResponse.PropertiesEntry\x12\x11\n\tframework\x18\x06 \x01(\t\x12\r\n\x05stage\x18\x07 \x01(\t\x12\x12\n\ncreated_at\x18\x08 \x01(\t\x12\x12\n\nupdated_at\x18\t \x01(\t\x12\x1a\n\x12\x61vailable_versions\x18\n \x03(\t\x12\x46\n\x0estage_versions\x18\x0b \x03(\x0b\x32..pythonml.ModelInfoResponse.StageVersionsEntry\x1a\x31\n\x0fPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x34\n\x12StageVersionsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"v\n\x11ListModelsRequest\x12\x18\n\x10\x66ramework_filter\x18\x01 \x01(\t\x12\x14\n\x0cstage_filter\x18\x02 \x01(\t\x12\x13\n\x0bname_filter\x18\x03 \x01(\t\x12\x1c\n\x14include_all_versions\x18\x04 \x01(\x08\"<\n\x12ListModelsResponse\x12&\n\x06models\x18\x01 \x03(\x0b\x32\x16.pythonml.ModelSummary\"\x92\x01\n\x0cModelSummary\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x11\n\tframework\x18\x04 \x01(\t\x12\r\n\x05stage\x18\x05 \x01(\t\x12\x12\n\ncreated_at\x18\x06 \x01(\t\x12\x12\n\nupdated_at\x18\x07 \x01(\t\"b\n\x11ModelStageRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x15\n\rcurrent_stage\x18\x03 \x01(\t\x12\x11\n\tnew_stage\x18\x04 \x01(\t\"\x8c\x01\n\x12ModelStageResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\x12\x12\n\nmodel_name\x18\x03 \x01(\t\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\x16\n\x0eprevious_stage\x18\x05 \x01(\t\x12\x11\n\tnew_stage\x18\x06 \x01(\t\"\'\n\x12HealthCheckRequest\x12\x11\n\tcomponent\x18\x01 \x01(\t\"\xa6\x01\n\x13HealthCheckResponse\x12\x34\n\x06status\x18\x01 \x01(\x0e\x32$.pythonml.HealthCheckResponse.Status\x12\x0f\n\x07message\x18\x02 \x01(\t\"H\n\x06Status\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x0b\n\x07SERVING\x10\x01\x12\x0f\n\x0bNOT_SERVING\x10\x02\x12\x13\n\x0fSERVICE_UNKNOWN\x10\x03\"#\n\x0cStatsRequest\x12\x13\n\x0bname_prefix\x18\x01 \x01(\t\"\x8e\x01\n\x0cMetricSample\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x32\n\x06labels\x18\x02 \x03(\x0b\x32\".pythonml.MetricSample.LabelsEntry\x12\r\n\x05value\x18\x03 \x01(\x01\x1a-\n\x0bLabelsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"F\n\rStatsResponse\x12\'\n\x07samples\x18\x01 \x03(\x0b\x32\x16.pythonml.MetricSample\x12\x0c\n\x04text\x18\x02 \x01(\t2\xfd\x08\n\x0fPythonMLService\x12\x42\n\x0bProcessData\x12\x18.pythonml.ProcessRequest\x1a\x19.pythonml.ProcessResponse\x12O\n\x11ProcessDataStream\x12\x18.pythonml.ProcessRequest\x1a\x1e.pythonml.ProcessResponseChunk0\x01\x12[\n\x12ProcessDataSession\x12\x1f.pythonml.ProcessSessionRequest\x1a .pythonml.ProcessSessionResponse(\x01\x30\x01\x12=\n\nTrainModel\x12\x16.pythonml.TrainRequest\x1a\x17.pythonml.TrainResponse\x12J\n\x10TrainModelStream\x12\x1b.pythonml.TrainRequestChunk\x1a\x17.pythonml.TrainResponse(\x01\x12H\n\x11SubmitTrainingJob\x12\x16.pythonml.TrainRequest\x1a\x1b.pythonml.TrainingJobStatus\x12K\n\x0eGetTrainingJob\x12\x1c.pythonml.TrainingJobRequest\x1a\x1b.pythonml.TrainingJobStatus\x12P\n\x11StreamTrainingJob\x12\x1c.pythonml.TrainingJobRequest\x1a\x1b.pythonml.TrainingJobStatus0\x01\x12N\n\x11\x43\x61ncelTrainingJob\x12\x1c.pythonml.TrainingJobRequest\x1a\x1b.pythonml.TrainingJobStatus\x12J\n\x15SearchHyperparameters\x12\x17.pythonml.SearchRequest\x1a\x16.pythonml.SearchUpdate0\x01\x12G\n\x0cGetModelInfo\x12\x1a.pythonml.ModelInfoRequest\x1a\x1b.pythonml.ModelInfoResponse\x12G\n\nListModels\x12\x1b.pythonml.ListModelsRequest\x1a\x1c.pythonml.ListModelsResponse\x12M\n\x10\x43hangeModelStage\x12\x1b.pythonml.ModelStageRequest\x1a\x1c.pythonml.ModelStageResponse\x12J\n\x0b\x43heckHealth\x12\x1c.pythonml.HealthCheckRequest\x1a\x1d.pythonml.HealthCheckResponse\x12;\n\x08GetStats\x12\x16.pythonml.StatsRequest\x1a\x17.pythonml.StatsResponseB\x17\xaa\x02\x14PPrePorter.gRPC.Coreb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -27,12 +27,26 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _PROCESSRESPONSE_METADATAENTRY._serialized_options = b'8\001'
   _PROCESSRESPONSECHUNK_METADATAENTRY._options = None
   _PROCESSRESPONSECHUNK_METADATAENTRY._serialized_options = b'8\001'
+  _PROCESSSESSIONREQUEST_PARAMETERSENTRY._options = None
+  _PROCESSSESSIONREQUEST_PARAMETERSENTRY._serialized_options = b'8\001'
+  _PROCESSSESSIONRESPONSE_METADATAENTRY._options = None
+  _PROCESSSESSIONRESPONSE_METADATAENTRY._serialized_options = b'8\001'
   _PROCESSSTREAMREQUEST_PARAMETERSENTRY._options = None
   _PROCESSSTREAMREQUEST_PARAMETERSENTRY._serialized_options = b'8\001'
   _TRAINREQUEST_HYPERPARAMETERSENTRY._options = None
   _TRAINREQUEST_HYPERPARAMETERSENTRY._serialized_options = b'8\001'
+  _SEARCHREQUEST_HYPERPARAMETERSENTRY._options = None
+  _SEARCHREQUEST_HYPERPARAMETERSENTRY._serialized_options = b'8\001'
+  _SEARCHREQUEST_SEARCHSPACEENTRY._options = None
+  _SEARCHREQUEST_SEARCHSPACEENTRY._serialized_options = b'8\001'
+  _SEARCHCANDIDATE_HYPERPARAMETERSENTRY._options = None
+  _SEARCHCANDIDATE_HYPERPARAMETERSENTRY._serialized_options = b'8\001'
+  _SEARCHUPDATE_METRICSENTRY._options = None
+  _SEARCHUPDATE_METRICSENTRY._serialized_options = b'8\001'
   _TRAINRESPONSE_METRICSENTRY._options = None
   _TRAINRESPONSE_METRICSENTRY._serialized_options = b'8\001'
+  _TRAININGJOBSTATUS_METRICSENTRY._options = None
+  _TRAININGJOBSTATUS_METRICSENTRY._serialized_options = b'8\001'
   _TRAINREQUESTCHUNK_HYPERPARAMETERSENTRY._options = None
   _TRAINREQUESTCHUNK_HYPERPARAMETERSENTRY._serialized_options = b'8\001'
   _TRAINSTREAMREQUEST_HYPERPARAMETERSENTRY._options = None
@@ -41,62 +55,104 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _MODELINFORESPONSE_PROPERTIESENTRY._serialized_options = b'8\001'
   _MODELINFORESPONSE_STAGEVERSIONSENTRY._options = None
   _MODELINFORESPONSE_STAGEVERSIONSENTRY._serialized_options = b'8\001'
-  _globals['_PROCESSREQUEST']._serialized_start=29
-  _globals['_PROCESSREQUEST']._serialized_end=230
-  _globals['_PROCESSREQUEST_PARAMETERSENTRY']._serialized_start=181
-  _globals['_PROCESSREQUEST_PARAMETERSENTRY']._serialized_end=230
-  _globals['_PROCESSRESPONSE']._serialized_start=233
-  _globals['_PROCESSRESPONSE']._serialized_end=440
-  _globals['_PROCESSRESPONSE_METADATAENTRY']._serialized_start=393
-  _globals['_PROCESSRESPONSE_METADATAENTRY']._serialized_end=440
-  _globals['_PROCESSRESPONSECHUNK']._serialized_start=443
-  _globals['_PROCESSRESPONSECHUNK']._serialized_end=729
-  _globals['_PROCESSRESPONSECHUNK_METADATAENTRY']._serialized_start=393
-  _globals['_PROCESSRESPONSECHUNK_METADATAENTRY']._serialized_end=440
-  _globals['_PROCESSSTREAMREQUEST']._serialized_start=732
-  _globals['_PROCESSSTREAMREQUEST']._serialized_end=945
-  _globals['_PROCESSSTREAMREQUEST_PARAMETERSENTRY']._serialized_start=181
-  _globals['_PROCESSSTREAMREQUEST_PARAMETERSENTRY']._serialized_end=230
-  _globals['_TRAINREQUEST']._serialized_start=948
-  _globals['_TRAINREQUEST']._serialized_end=1191
-  _globals['_TRAINREQUEST_HYPERPARAMETERSENTRY']._serialized_start=1137
-  _globals['_TRAINREQUEST_HYPERPARAMETERSENTRY']._serialized_end=1191
-  _globals['_TRAINRESPONSE']._serialized_start=1194
-  _globals['_TRAINRESPONSE']._serialized_end=1402
-  _globals['_TRAINRESPONSE_METRICSENTRY']._serialized_start=1356
-  _globals['_TRAINRESPONSE_METRICSENTRY']._serialized_end=1402
-  _globals['_TRAINREQUESTCHUNK']._serialized_start=1405
-  _globals['_TRAINREQUESTCHUNK']._serialized_end=1727
-  _globals['_TRAINREQUESTCHUNK_HYPERPARAMETERSENTRY']._serialized_start=1137
-  _globals['_TRAINREQUESTCHUNK_HYPERPARAMETERSENTRY']._serialized_end=1191
-  _globals['_TRAINSTREAMREQUEST']._serialized_start=1730
-  _globals['_TRAINSTREAMREQUEST']._serialized_end=2054
-  _globals['_TRAINSTREAMREQUEST_HYPERPARAMETERSENTRY']._serialized_start=1137
-  _globals['_TRAINSTREAMREQUEST_HYPERPARAMETERSENTRY']._serialized_end=1191
-  _globals['_MODELINFOREQUEST']._serialized_start=2056
-  _globals['_MODELINFOREQUEST']._serialized_end=2126
-  _globals['_MODELINFORESPONSE']._serialized_start=2129
-  _globals['_MODELINFORESPONSE']._serialized_end=2580
-  _globals['_MODELINFORESPONSE_PROPERTIESENTRY']._serialized_start=2477
-  _globals['_MODELINFORESPONSE_PROPERTIESENTRY']._serialized_end=2526
-  _globals['_MODELINFORESPONSE_STAGEVERSIONSENTRY']._serialized_start=2528
-  _globals['_MODELINFORESPONSE_STAGEVERSIONSENTRY']._serialized_end=2580
-  _globals['_LISTMODELSREQUEST']._serialized_start=2582
-  _globals['_LISTMODELSREQUEST']._serialized_end=2700
-  _globals['_LISTMODELSRESPONSE']._serialized_start=2702
-  _globals['_LISTMODELSRESPONSE']._serialized_end=2762
-  _globals['_MODELSUMMARY']._serialized_start=2765
-  _globals['_MODELSUMMARY']._serialized_end=2911
-  _globals['_MODELSTAGEREQUEST']._serialized_start=2913
-  _globals['_MODELSTAGEREQUEST']._serialized_end=3011
-  _globals['_MODELSTAGERESPONSE']._serialized_start=3014
-  _globals['_MODELSTAGERESPONSE']._serialized_end=3154
-  _globals['_HEALTHCHECKREQUEST']._serialized_start=3156
-  _globals['_HEALTHCHECKREQUEST']._serialized_end=3195
-  _globals['_HEALTHCHECKRESPONSE']._serialized_start=3198
-  _globals['_HEALTHCHECKRESPONSE']._serialized_end=3364
-  _globals['_HEALTHCHECKRESPONSE_STATUS']._serialized_start=3292
-  _globals['_HEALTHCHECKRESPONSE_STATUS']._serialized_end=3364
-  _globals['_PYTHONMLSERVICE']._serialized_start=3367
-  _globals['_PYTHONMLSERVICE']._serialized_end=3973
+  _METRICSAMPLE_LABELSENTRY._options = None
+  _METRICSAMPLE_LABELSENTRY._serialized_options = b'8\001'
+  _globals['_TENSOR']._serialized_start=28
+  _globals['_TENSOR']._serialized_end=80
+  _globals['_PROCESSREQUEST']._serialized_start=83
+  _globals['_PROCESSREQUEST']._serialized_end=345
+  _globals['_PROCESSREQUEST_PARAMETERSENTRY']._serialized_start=296
+  _globals['_PROCESSREQUEST_PARAMETERSENTRY']._serialized_end=345
+  _globals['_PROCESSRESPONSE']._serialized_start=348
+  _globals['_PROCESSRESPONSE']._serialized_end=618
+  _globals['_PROCESSRESPONSE_METADATAENTRY']._serialized_start=571
+  _globals['_PROCESSRESPONSE_METADATAENTRY']._serialized_end=618
+  _globals['_PROCESSRESPONSECHUNK']._serialized_start=621
+  _globals['_PROCESSRESPONSECHUNK']._serialized_end=907
+  _globals['_PROCESSRESPONSECHUNK_METADATAENTRY']._serialized_start=571
+  _globals['_PROCESSRESPONSECHUNK_METADATAENTRY']._serialized_end=618
+  _globals['_PROCESSSESSIONREQUEST']._serialized_start=910
+  _globals['_PROCESSSESSIONREQUEST']._serialized_end=1183
+  _globals['_PROCESSSESSIONREQUEST_PARAMETERSENTRY']._serialized_start=296
+  _globals['_PROCESSSESSIONREQUEST_PARAMETERSENTRY']._serialized_end=345
+  _globals['_PROCESSSESSIONRESPONSE']._serialized_start=1186
+  _globals['_PROCESSSESSIONRESPONSE']._serialized_end=1466
+  _globals['_PROCESSSESSIONRESPONSE_METADATAENTRY']._serialized_start=571
+  _globals['_PROCESSSESSIONRESPONSE_METADATAENTRY']._serialized_end=618
+  _globals['_PROCESSSTREAMREQUEST']._serialized_start=1469
+  _globals['_PROCESSSTREAMREQUEST']._serialized_end=1682
+  _globals['_PROCESSSTREAMREQUEST_PARAMETERSENTRY']._serialized_start=296
+  _globals['_PROCESSSTREAMREQUEST_PARAMETERSENTRY']._serialized_end=345
+  _globals['_TRAINREQUEST']._serialized_start=1685
+  _globals['_TRAINREQUEST']._serialized_end=1997
+  _globals['_TRAINREQUEST_HYPERPARAMETERSENTRY']._serialized_start=1943
+  _globals['_TRAINREQUEST_HYPERPARAMETERSENTRY']._serialized_end=1997
+  _globals['_SEARCHREQUEST']._serialized_start=2000
+  _globals['_SEARCHREQUEST']._serialized_end=2547
+  _globals['_SEARCHREQUEST_HYPERPARAMETERSENTRY']._serialized_start=1943
+  _globals['_SEARCHREQUEST_HYPERPARAMETERSENTRY']._serialized_end=1997
+  _globals['_SEARCHREQUEST_SEARCHSPACEENTRY']._serialized_start=2497
+  _globals['_SEARCHREQUEST_SEARCHSPACEENTRY']._serialized_end=2547
+  _globals['_SEARCHCANDIDATE']._serialized_start=2550
+  _globals['_SEARCHCANDIDATE']._serialized_end=2854
+  _globals['_SEARCHCANDIDATE_HYPERPARAMETERSENTRY']._serialized_start=1943
+  _globals['_SEARCHCANDIDATE_HYPERPARAMETERSENTRY']._serialized_end=1997
+  _globals['_SEARCHUPDATE']._serialized_start=2857
+  _globals['_SEARCHUPDATE']._serialized_end=3209
+  _globals['_SEARCHUPDATE_METRICSENTRY']._serialized_start=3163
+  _globals['_SEARCHUPDATE_METRICSENTRY']._serialized_end=3209
+  _globals['_DATASETREFERENCE']._serialized_start=3212
+  _globals['_DATASETREFERENCE']._serialized_end=3385
+  _globals['_TRAINRESPONSE']._serialized_start=3388
+  _globals['_TRAINRESPONSE']._serialized_end=3596
+  _globals['_TRAINRESPONSE_METRICSENTRY']._serialized_start=3550
+  _globals['_TRAINRESPONSE_METRICSENTRY']._serialized_end=3596
+  _globals['_TRAININGJOBREQUEST']._serialized_start=3598
+  _globals['_TRAININGJOBREQUEST']._serialized_end=3634
+  _globals['_TRAININGJOBSTATUS']._serialized_start=3637
+  _globals['_TRAININGJOBSTATUS']._serialized_end=4043
+  _globals['_TRAININGJOBSTATUS_METRICSENTRY']._serialized_start=3550
+  _globals['_TRAININGJOBSTATUS_METRICSENTRY']._serialized_end=3596
+  _globals['_TRAINREQUESTCHUNK']._serialized_start=4046
+  _globals['_TRAINREQUESTCHUNK']._serialized_end=4368
+  _globals['_TRAINREQUESTCHUNK_HYPERPARAMETERSENTRY']._serialized_start=1943
+  _globals['_TRAINREQUESTCHUNK_HYPERPARAMETERSENTRY']._serialized_end=1997
+  _globals['_TRAINSTREAMREQUEST']._serialized_start=4371
+  _globals['_TRAINSTREAMREQUEST']._serialized_end=4695
+  _globals['_TRAINSTREAMREQUEST_HYPERPARAMETERSENTRY']._serialized_start=1943
+  _globals['_TRAINSTREAMREQUEST_HYPERPARAMETERSENTRY']._serialized_end=1997
+  _globals['_MODELINFOREQUEST']._serialized_start=4697
+  _globals['_MODELINFOREQUEST']._serialized_end=4767
+  _globals['_MODELINFORESPONSE']._serialized_start=4770
+  _globals['_MODELINFORESPONSE']._serialized_end=5221
+  _globals['_MODELINFORESPONSE_PROPERTIESENTRY']._serialized_start=5118
+  _globals['_MODELINFORESPONSE_PROPERTIESENTRY']._serialized_end=5167
+  _globals['_MODELINFORESPONSE_STAGEVERSIONSENTRY']._serialized_start=5169
+  _globals['_MODELINFORESPONSE_STAGEVERSIONSENTRY']._serialized_end=5221
+  _globals['_LISTMODELSREQUEST']._serialized_start=5223
+  _globals['_LISTMODELSREQUEST']._serialized_end=5341
+  _globals['_LISTMODELSRESPONSE']._serialized_start=5343
+  _globals['_LISTMODELSRESPONSE']._serialized_end=5403
+  _globals['_MODELSUMMARY']._serialized_start=5406
+  _globals['_MODELSUMMARY']._serialized_end=5552
+  _globals['_MODELSTAGEREQUEST']._serialized_start=5554
+  _globals['_MODELSTAGEREQUEST']._serialized_end=5652
+  _globals['_MODELSTAGERESPONSE']._serialized_start=5655
+  _globals['_MODELSTAGERESPONSE']._serialized_end=5795
+  _globals['_HEALTHCHECKREQUEST']._serialized_start=5797
+  _globals['_HEALTHCHECKREQUEST']._serialized_end=5836
+  _globals['_HEALTHCHECKRESPONSE']._serialized_start=5839
+  _globals['_HEALTHCHECKRESPONSE']._serialized_end=6005
+  _globals['_HEALTHCHECKRESPONSE_STATUS']._serialized_start=5933
+  _globals['_HEALTHCHECKRESPONSE_STATUS']._serialized_end=6005
+  _globals['_STATSREQUEST']._serialized_start=6007
+  _globals['_STATSREQUEST']._serialized_end=6042
+  _globals['_METRICSAMPLE']._serialized_start=6045
+  _globals['_METRICSAMPLE']._serialized_end=6187
+  _globals['_METRICSAMPLE_LABELSENTRY']._serialized_start=6142
+  _globals['_METRICSAMPLE_LABELSENTRY']._serialized_end=6187
+  _globals['_STATSRESPONSE']._serialized_start=6189
+  _globals['_STATSRESPONSE']._serialized_end=6259
+  _globals['_PYTHONMLSERVICE']._serialized_start=6262
+  _globals['_PYTHONMLSERVICE']._serialized_end=7411
 # @@protoc_insertion_point(module_scope)
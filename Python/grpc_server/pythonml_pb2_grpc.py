@@ -25,6 +25,11 @@ class PythonMLServiceStub(object):
                 request_serializer=pythonml__pb2.ProcessRequest.SerializeToString,
                 response_deserializer=pythonml__pb2.ProcessResponseChunk.FromString,
                 )
+        self.ProcessDataSession = channel.stream_stream(
+                '/pythonml.PythonMLService/ProcessDataSession',
+                request_serializer=pythonml__pb2.ProcessSessionRequest.SerializeToString,
+                response_deserializer=pythonml__pb2.ProcessSessionResponse.FromString,
+                )
         self.TrainModel = channel.unary_unary(
                 '/pythonml.PythonMLService/TrainModel',
                 request_serializer=pythonml__pb2.TrainRequest.SerializeToString,
@@ -35,6 +40,31 @@ class PythonMLServiceStub(object):
                 request_serializer=pythonml__pb2.TrainRequestChunk.SerializeToString,
                 response_deserializer=pythonml__pb2.TrainResponse.FromString,
                 )
+        self.SubmitTrainingJob = channel.unary_unary(
+                '/pythonml.PythonMLService/SubmitTrainingJob',
+                request_serializer=pythonml__pb2.TrainRequest.SerializeToString,
+                response_deserializer=pythonml__pb2.TrainingJobStatus.FromString,
+                )
+        self.GetTrainingJob = channel.unary_unary(
+                '/pythonml.PythonMLService/GetTrainingJob',
+                request_serializer=pythonml__pb2.TrainingJobRequest.SerializeToString,
+                response_deserializer=pythonml__pb2.TrainingJobStatus.FromString,
+                )
+        self.StreamTrainingJob = channel.unary_stream(
+                '/pythonml.PythonMLService/StreamTrainingJob',
+                request_serializer=pythonml__pb2.TrainingJobRequest.SerializeToString,
+                response_deserializer=pythonml__pb2.TrainingJobStatus.FromString,
+                )
+        self.CancelTrainingJob = channel.unary_unary(
+                '/pythonml.PythonMLService/CancelTrainingJob',
+                request_serializer=pythonml__pb2.TrainingJobRequest.SerializeToString,
+                response_deserializer=pythonml__pb2.TrainingJobStatus.FromString,
+                )
+        self.SearchHyperparameters = channel.unary_stream(
+                '/pythonml.PythonMLService/SearchHyperparameters',
+                request_serializer=pythonml__pb2.SearchRequest.SerializeToString,
+                response_deserializer=pythonml__pb2.SearchUpdate.FromString,
+                )
         self.GetModelInfo = channel.unary_unary(
                 '/pythonml.PythonMLService/GetModelInfo',
                 request_serializer=pythonml__pb2.ModelInfoRequest.SerializeToString,
@@ -55,6 +85,11 @@ class PythonMLServiceStub(object):
                 request_serializer=pythonml__pb2.HealthCheckRequest.SerializeToString,
                 response_deserializer=pythonml__pb2.HealthCheckResponse.FromString,
                 )
+        self.GetStats = channel.unary_unary(
+                '/pythonml.PythonMLService/GetStats',
+                request_serializer=pythonml__pb2.StatsRequest.SerializeToString,
+                response_deserializer=pythonml__pb2.StatsResponse.FromString,
+                )
 
 
 class PythonMLServiceServicer(object):
@@ -75,6 +110,13 @@ class PythonMLServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ProcessDataSession(self, request_iterator, context):
+        """Score a continuous sequence of batches with a model version pinned for the whole stream
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def TrainModel(self, request, context):
         """Train ML model with provided data
         """
@@ -89,6 +131,42 @@ class PythonMLServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SubmitTrainingJob(self, request, context):
+        """Queue a training job and return immediately
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTrainingJob(self, request, context):
+        """Get the current status of a training job
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamTrainingJob(self, request, context):
+        """Stream status updates of a training job until it finishes
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CancelTrainingJob(self, request, context):
+        """Cancel a queued or running training job
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SearchHyperparameters(self, request, context):
+        """Search hyperparameters with cross-validation in parallel, stream the leaderboard
+        and register the best model
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetModelInfo(self, request, context):
         """Get model information and capabilities
         """
@@ -117,6 +195,13 @@ class PythonMLServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetStats(self, request, context):
+        """Get server metrics (request counts, latencies, cache and queue statistics)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_PythonMLServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -130,6 +215,11 @@ def add_PythonMLServiceServicer_to_server(servicer, server):
                     request_deserializer=pythonml__pb2.ProcessRequest.FromString,
                     response_serializer=pythonml__pb2.ProcessResponseChunk.SerializeToString,
             ),
+            'ProcessDataSession': grpc.stream_stream_rpc_method_handler(
+                    servicer.ProcessDataSession,
+                    request_deserializer=pythonml__pb2.ProcessSessionRequest.FromString,
+                    response_serializer=pythonml__pb2.ProcessSessionResponse.SerializeToString,
+            ),
             'TrainModel': grpc.unary_unary_rpc_method_handler(
                     servicer.TrainModel,
                     request_deserializer=pythonml__pb2.TrainRequest.FromString,
@@ -140,6 +230,31 @@ def add_PythonMLServiceServicer_to_server(servicer, server):
                     request_deserializer=pythonml__pb2.TrainRequestChunk.FromString,
                     response_serializer=pythonml__pb2.TrainResponse.SerializeToString,
             ),
+            'SubmitTrainingJob': grpc.unary_unary_rpc_method_handler(
+                    servicer.SubmitTrainingJob,
+                    request_deserializer=pythonml__pb2.TrainRequest.FromString,
+                    response_serializer=pythonml__pb2.TrainingJobStatus.SerializeToString,
+            ),
+            'GetTrainingJob': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTrainingJob,
+                    request_deserializer=pythonml__pb2.TrainingJobRequest.FromString,
+                    response_serializer=pythonml__pb2.TrainingJobStatus.SerializeToString,
+            ),
+            'StreamTrainingJob': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamTrainingJob,
+                    request_deserializer=pythonml__pb2.TrainingJobRequest.FromString,
+                    response_serializer=pythonml__pb2.TrainingJobStatus.SerializeToString,
+            ),
+            'CancelTrainingJob': grpc.unary_unary_rpc_method_handler(
+                    servicer.CancelTrainingJob,
+                    request_deserializer=pythonml__pb2.TrainingJobRequest.FromString,
+                    response_serializer=pythonml__pb2.TrainingJobStatus.SerializeToString,
+            ),
+            'SearchHyperparameters': grpc.unary_stream_rpc_method_handler(
+                    servicer.SearchHyperparameters,
+                    request_deserializer=pythonml__pb2.SearchRequest.FromString,
+                    response_serializer=pythonml__pb2.SearchUpdate.SerializeToString,
+            ),
             'GetModelInfo': grpc.unary_unary_rpc_method_handler(
                     servicer.GetModelInfo,
                     request_deserializer=pythonml__pb2.ModelInfoRequest.FromString,
@@ -160,6 +275,11 @@ def add_PythonMLServiceServicer_to_server(servicer, server):
                     request_deserializer=pythonml__pb2.HealthCheckRequest.FromString,
                     response_serializer=pythonml__pb2.HealthCheckResponse.SerializeToString,
             ),
+            'GetStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetStats,
+                    request_deserializer=pythonml__pb2.StatsRequest.FromString,
+                    response_serializer=pythonml__pb2.StatsResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'pythonml.PythonMLService', rpc_method_handlers)
@@ -205,6 +325,23 @@ class PythonMLService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def ProcessDataSession(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/pythonml.PythonMLService/ProcessDataSession',
+            pythonml__pb2.ProcessSessionRequest.SerializeToString,
+            pythonml__pb2.ProcessSessionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def TrainModel(request,
             target,
@@ -239,6 +376,91 @@ class PythonMLService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def SubmitTrainingJob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pythonml.PythonMLService/SubmitTrainingJob',
+            pythonml__pb2.TrainRequest.SerializeToString,
+            pythonml__pb2.TrainingJobStatus.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetTrainingJob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pythonml.PythonMLService/GetTrainingJob',
+            pythonml__pb2.TrainingJobRequest.SerializeToString,
+            pythonml__pb2.TrainingJobStatus.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StreamTrainingJob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/pythonml.PythonMLService/StreamTrainingJob',
+            pythonml__pb2.TrainingJobRequest.SerializeToString,
+            pythonml__pb2.TrainingJobStatus.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def CancelTrainingJob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pythonml.PythonMLService/CancelTrainingJob',
+            pythonml__pb2.TrainingJobRequest.SerializeToString,
+            pythonml__pb2.TrainingJobStatus.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SearchHyperparameters(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/pythonml.PythonMLService/SearchHyperparameters',
+            pythonml__pb2.SearchRequest.SerializeToString,
+            pythonml__pb2.SearchUpdate.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def GetModelInfo(request,
             target,
@@ -306,3 +528,20 @@ class PythonMLService(object):
             pythonml__pb2.HealthCheckResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pythonml.PythonMLService/GetStats',
+            pythonml__pb2.StatsRequest.SerializeToString,
+            pythonml__pb2.StatsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
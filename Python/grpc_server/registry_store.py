@@ -0,0 +1,341 @@
+"""Persistent storage backends for the model registry.
+
+The registry is held in memory by ``ModelManager`` as
+``{model_name: {..., "versions": {version: {...}}, "stage_versions": {...}}}``.
+A store persists that structure and answers list queries:
+
+- ``SqliteRegistryStore`` writes one row per model, per version and per
+  stage assignment inside a single transaction, with indexes on model
+  name, framework and stage. An existing ``model_registry.json`` is
+  imported automatically the first time the database is opened.
+- ``JsonRegistryStore`` keeps the original ``model_registry.json`` format,
+  written atomically through a temporary file and a rename.
+"""
+
+import abc
+import copy
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+# Registry backends selectable with --registry-backend
+REGISTRY_BACKENDS = ["sqlite", "json"]
+
+JSON_REGISTRY_FILE = "model_registry.json"
+SQLITE_REGISTRY_FILE = "model_registry.db"
+
+# Model entry keys stored in dedicated columns or tables
+_MODEL_COLUMNS = ("name", "description", "framework", "created_at", "updated_at", "latest_version")
+_VERSION_COLUMNS = ("stage", "description", "created_at", "updated_at")
+
+
+def _summary(model_name: str, info: Dict[str, Any], version: str, version_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a list_models entry for one model version."""
+    return {
+        "model_name": model_name,
+        "version": version,
+        "description": version_info.get("description", info.get("description", "")),
+        "framework": info.get("framework", "unknown"),
+        "stage": version_info.get("stage", "unknown"),
+        "created_at": version_info.get("created_at", ""),
+        "updated_at": version_info.get("updated_at", "")
+    }
+
+
+class RegistryStore(abc.ABC):
+    """Interface of a model registry storage backend."""
+
+    @abc.abstractmethod
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the complete registry.
+
+        Returns:
+            Registry dictionary keyed by model name
+        """
+
+    @abc.abstractmethod
+    def save_model(self, model_name: str, info: Dict[str, Any], versions: List[str]) -> None:
+        """Persist a model entry after a change, atomically.
+
+        Args:
+            model_name: Name of the model
+            info: Complete registry entry of the model
+            versions: Versions whose entries changed (the stage mapping is always saved)
+        """
+
+    @abc.abstractmethod
+    def list_versions(self, framework_filter: Optional[str] = None, stage_filter: Optional[str] = None,
+                      include_all_versions: bool = False) -> List[Dict[str, Any]]:
+        """List model versions, as ModelManager.list_models.
+
+        Args:
+            framework_filter: Only include models of this framework
+            stage_filter: Only include versions in this stage
+            include_all_versions: Include every version instead of one per model
+
+        Returns:
+            List of model summary dictionaries
+        """
+
+    def close(self) -> None:
+        """Release the backend's resources."""
+
+
+class JsonRegistryStore(RegistryStore):
+    """Registry stored as a single JSON document, replaced atomically on every write."""
+
+    def __init__(self, models_dir: str):
+        """Initialize the store.
+
+        Args:
+            models_dir: Directory holding model_registry.json
+        """
+        self.path = os.path.join(models_dir, JSON_REGISTRY_FILE)
+        self._registry: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    self._registry = json.load(f)
+            return copy.deepcopy(self._registry)
+
+    def save_model(self, model_name: str, info: Dict[str, Any], versions: List[str]) -> None:
+        with self._lock:
+            registry = dict(self._registry)
+            registry[model_name] = copy.deepcopy(info)
+
+            # Write a complete new file and swap it in, so a crash never leaves a partial registry
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(registry, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self._registry = registry
+
+    def list_versions(self, framework_filter: Optional[str] = None, stage_filter: Optional[str] = None,
+                      include_all_versions: bool = False) -> List[Dict[str, Any]]:
+        result = []
+        with self._lock:
+            for model_name, info in self._registry.items():
+                if framework_filter and info.get("framework") != framework_filter:
+                    continue
+
+                if include_all_versions:
+                    for version, version_info in info["versions"].items():
+                        if stage_filter and version_info.get("stage") != stage_filter:
+                            continue
+                        result.append(_summary(model_name, info, version, version_info))
+                else:
+                    if stage_filter:
+                        if stage_filter not in info.get("stage_versions", {}):
+                            continue
+                        version = info["stage_versions"][stage_filter]
+                    else:
+                        version = info["latest_version"]
+                    result.append(_summary(model_name, info, version, info["versions"][version]))
+        return result
+
+
+class SqliteRegistryStore(RegistryStore):
+    """Registry stored in SQLite with one row per model, version and stage assignment."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS models (
+            name TEXT PRIMARY KEY,
+            description TEXT,
+            framework TEXT,
+            created_at TEXT,
+            updated_at TEXT,
+            latest_version TEXT,
+            extra TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE TABLE IF NOT EXISTS versions (
+            model_name TEXT NOT NULL REFERENCES models(name),
+            version TEXT NOT NULL,
+            stage TEXT,
+            description TEXT,
+            created_at TEXT,
+            updated_at TEXT,
+            extra TEXT NOT NULL DEFAULT '{}',
+            PRIMARY KEY (model_name, version)
+        );
+        CREATE TABLE IF NOT EXISTS stage_versions (
+            model_name TEXT NOT NULL REFERENCES models(name),
+            stage TEXT NOT NULL,
+            version TEXT NOT NULL,
+            PRIMARY KEY (model_name, stage)
+        );
+        CREATE INDEX IF NOT EXISTS idx_models_framework ON models(framework);
+        CREATE INDEX IF NOT EXISTS idx_versions_stage ON versions(stage);
+        CREATE INDEX IF NOT EXISTS idx_stage_versions_stage ON stage_versions(stage);
+    """
+
+    def __init__(self, models_dir: str):
+        """Open (and create or migrate) the registry database.
+
+        Args:
+            models_dir: Directory holding model_registry.db
+        """
+        self.path = os.path.join(models_dir, SQLITE_REGISTRY_FILE)
+        self.json_path = os.path.join(models_dir, JSON_REGISTRY_FILE)
+        self._lock = threading.Lock()
+
+        # One shared connection; worker processes open their own
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(self.SCHEMA)
+
+        self._migrate_json()
+
+    def _migrate_json(self) -> None:
+        """Import model_registry.json into an empty database and retire the file."""
+        if not os.path.exists(self.json_path):
+            return
+
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM models LIMIT 1").fetchone() is not None:
+                return
+
+            with open(self.json_path, "r") as f:
+                registry = json.load(f)
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for model_name, info in registry.items():
+                    self._write_model(model_name, info, list(info.get("versions", {}).keys()))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        # Keep the old file for reference, but never read it again
+        os.replace(self.json_path, f"{self.json_path}.migrated")
+        print(f"Migrated {len(registry)} models from {JSON_REGISTRY_FILE} to {SQLITE_REGISTRY_FILE}")
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            registry: Dict[str, Dict[str, Any]] = {}
+            for row in self._conn.execute("SELECT * FROM models"):
+                info = json.loads(row["extra"])
+                for column in _MODEL_COLUMNS:
+                    if row[column] is not None:
+                        info[column] = row[column]
+                info["versions"] = {}
+                info["stage_versions"] = {}
+                registry[row["name"]] = info
+
+            for row in self._conn.execute("SELECT * FROM versions ORDER BY model_name, version"):
+                version_info = json.loads(row["extra"])
+                for column in _VERSION_COLUMNS:
+                    if row[column] is not None:
+                        version_info[column] = row[column]
+                registry[row["model_name"]]["versions"][row["version"]] = version_info
+
+            for row in self._conn.execute("SELECT * FROM stage_versions"):
+                registry[row["model_name"]]["stage_versions"][row["stage"]] = row["version"]
+
+            return registry
+
+    def save_model(self, model_name: str, info: Dict[str, Any], versions: List[str]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._write_model(model_name, info, versions)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _write_model(self, model_name: str, info: Dict[str, Any], versions: List[str]) -> None:
+        """Write a model row, the given version rows and its stage mapping (inside a transaction)."""
+        extra = {key: value for key, value in info.items()
+                 if key not in _MODEL_COLUMNS and key not in ("versions", "stage_versions")}
+        self._conn.execute(
+            "INSERT OR REPLACE INTO models (name, description, framework, created_at, updated_at, latest_version, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (model_name, info.get("description"), info.get("framework"), info.get("created_at"),
+             info.get("updated_at"), info.get("latest_version"), json.dumps(extra))
+        )
+
+        rows = []
+        for version in versions:
+            version_info = info["versions"][version]
+            version_extra = {key: value for key, value in version_info.items() if key not in _VERSION_COLUMNS}
+            rows.append((model_name, version, version_info.get("stage"), version_info.get("description"),
+                         version_info.get("created_at"), version_info.get("updated_at"), json.dumps(version_extra)))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO versions (model_name, version, stage, description, created_at, updated_at, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+        self._conn.execute("DELETE FROM stage_versions WHERE model_name = ?", (model_name,))
+        self._conn.executemany(
+            "INSERT INTO stage_versions (model_name, stage, version) VALUES (?, ?, ?)",
+            [(model_name, stage, version) for stage, version in info.get("stage_versions", {}).items()]
+        )
+
+    def list_versions(self, framework_filter: Optional[str] = None, stage_filter: Optional[str] = None,
+                      include_all_versions: bool = False) -> List[Dict[str, Any]]:
+        conditions = []
+        params: List[Any] = []
+        if framework_filter:
+            conditions.append("m.framework = ?")
+            params.append(framework_filter)
+
+        columns = ("SELECT m.name AS model_name, v.version, COALESCE(v.description, m.description, '') AS description, "
+                   "COALESCE(m.framework, 'unknown') AS framework, COALESCE(v.stage, 'unknown') AS stage, "
+                   "COALESCE(v.created_at, '') AS created_at, COALESCE(v.updated_at, '') AS updated_at "
+                   "FROM models m ")
+        if include_all_versions:
+            if stage_filter:
+                conditions.append("v.stage = ?")
+                params.append(stage_filter)
+            query = columns + "JOIN versions v ON v.model_name = m.name"
+        elif stage_filter:
+            # The version currently assigned to the stage
+            conditions.append("s.stage = ?")
+            params.append(stage_filter)
+            query = columns + ("JOIN stage_versions s ON s.model_name = m.name "
+                               "JOIN versions v ON v.model_name = s.model_name AND v.version = s.version")
+        else:
+            query = columns + "JOIN versions v ON v.model_name = m.name AND v.version = m.latest_version"
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY m.name, v.version"
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params)]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_registry_store(backend: str, models_dir: str) -> RegistryStore:
+    """Create the registry store for a backend name.
+
+    Args:
+        backend: "sqlite" or "json"
+        models_dir: Directory holding the registry
+
+    Returns:
+        The registry store
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "sqlite":
+        return SqliteRegistryStore(models_dir)
+    elif backend == "json":
+        return JsonRegistryStore(models_dir)
+    raise ValueError(f"Unsupported registry backend: {backend}. Supported backends: {REGISTRY_BACKENDS}")
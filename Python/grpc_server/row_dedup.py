@@ -0,0 +1,219 @@
+"""Row-level deduplication and caching of predictions.
+
+Inputs often repeat rows (e.g. players with identical daily aggregates),
+within a request and across requests. The ``RowDeduplicator`` finds the
+distinct rows of an input with one vectorized ``np.unique`` pass over the
+raw row bytes, looks them up in a per-model-version row cache, runs the
+model only on the distinct rows it has not seen and scatters the results
+back to every row. Models score rows independently, so the result is the
+same as scoring the whole input.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+# Processing parameter that turns deduplication off for a request ("false")
+DEDUPE_PARAMETER = "dedupe_rows"
+
+PredictFn = Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+
+def dedupe_requested(parameters: Dict[str, str]) -> bool:
+    """Check whether a request's rows may be deduplicated.
+
+    Args:
+        parameters: Processing parameters of the request
+
+    Returns:
+        False if the ``dedupe_rows`` parameter is "false"
+    """
+    return parameters.get(DEDUPE_PARAMETER, "").lower() != "false"
+
+
+def can_dedupe(X: Any) -> bool:
+    """Check whether an input can be deduplicated by its row bytes.
+
+    Args:
+        X: Prepared model input
+
+    Returns:
+        True for numeric or boolean arrays with at least two dimensions and rows
+    """
+    return (isinstance(X, np.ndarray) and X.ndim >= 2 and len(X) > 1
+            and X.dtype.kind in "biuf")
+
+
+def unique_rows(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find the distinct rows of an array.
+
+    Rows are compared by their bytes, so e.g. 0.0 and -0.0 count as different.
+
+    Args:
+        X: Array with rows along the first axis
+
+    Returns:
+        Tuple of (distinct rows, their bytes as a 1D void array, inverse
+        indices mapping every input row to its distinct row)
+    """
+    X = np.ascontiguousarray(X)
+    row_bytes = X.dtype.itemsize * int(np.prod(X.shape[1:]))
+    keys = X.reshape(len(X), -1).view(np.dtype((np.void, row_bytes))).ravel()
+    unique_keys, index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return X[index], unique_keys, inverse.ravel()
+
+
+class RowDeduplicator:
+    """Scores the distinct rows of an input, serving previously seen rows from a cache.
+
+    Supports:
+    - Per model version (and input dtype/shape) LRU row caches of bounded size
+    - Invalidation of every cached row of a model
+    - Row, distinct row, cache hit and scored row counters
+    """
+
+    def __init__(self, max_rows: int = 10000, max_models: int = 32):
+        """Initialize the deduplicator.
+
+        Args:
+            max_rows: Rows cached per model version (0 deduplicates without caching)
+            max_models: Model versions with a row cache (least recently used are dropped)
+        """
+        self.max_rows = max(0, max_rows)
+        self.max_models = max(1, max_models)
+        self._caches: "OrderedDict[Hashable, OrderedDict[bytes, Tuple[Any, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.unique_rows = 0
+        self.cache_hits = 0
+        self.scored_rows = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Sent to inference worker processes, which keep their own caches
+        return {"max_rows": self.max_rows, "max_models": self.max_models}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["max_rows"], state["max_models"])
+
+    def score(self, model_key: str, X: np.ndarray,
+              predict_fn: PredictFn) -> Tuple[np.ndarray, np.ndarray, Dict[str, str]]:
+        """Score the rows of an input, running the model on unseen distinct rows only.
+
+        Args:
+            model_key: Cache key of the model version
+            X: Input rows (see can_dedupe)
+            predict_fn: Callable scoring an array of rows, returning (y_pred, row_confidence)
+
+        Returns:
+            Tuple of (y_pred, row_confidence, metadata) for all rows of X; the
+            metadata has the unique_rows, scored_rows and row_cache_hit_ratio entries
+        """
+        distinct, keys, inverse = unique_rows(X)
+        cache_key = (model_key, X.dtype.str, X.shape[1:])
+        n_distinct = len(distinct)
+
+        # Look the distinct rows up in the row cache of the model version
+        row_keys: List[bytes] = []
+        cached: List[Optional[Tuple[Any, Any]]] = [None] * n_distinct
+        if self.max_rows:
+            row_keys = [key.tobytes() for key in keys]
+            with self._lock:
+                cache = self._caches.get(cache_key)
+                if cache is not None:
+                    self._caches.move_to_end(cache_key)
+                    for i, row_key in enumerate(row_keys):
+                        entry = cache.get(row_key)
+                        if entry is not None:
+                            cache.move_to_end(row_key)
+                            cached[i] = entry
+        missing = [i for i, entry in enumerate(cached) if entry is None]
+        hits = n_distinct - len(missing)
+
+        if hits == 0:
+            y_distinct, confidence_distinct = predict_fn(distinct)
+            y_distinct = np.asarray(y_distinct)
+            confidence_distinct = np.asarray(confidence_distinct)
+            computed = (y_distinct, confidence_distinct)
+        else:
+            computed = None
+            if missing:
+                y_missing, confidence_missing = predict_fn(distinct[missing])
+                computed = (np.asarray(y_missing), np.asarray(confidence_missing))
+                for j, i in enumerate(missing):
+                    cached[i] = (computed[0][j], computed[1][j])
+            y_distinct = np.asarray([entry[0] for entry in cached])
+            confidence_distinct = np.asarray([entry[1] for entry in cached])
+
+        if self.max_rows and computed is not None:
+            # Copies, so cached rows of multi-output predictions do not keep the whole batch alive
+            self._store(cache_key, [(row_keys[i], (np.copy(computed[0][j]), np.copy(computed[1][j])))
+                                    for j, i in enumerate(missing)])
+
+        with self._lock:
+            self.rows += len(X)
+            self.unique_rows += n_distinct
+            self.cache_hits += hits
+            self.scored_rows += len(missing)
+
+        metadata = {
+            "unique_rows": str(n_distinct),
+            "scored_rows": str(len(missing)),
+            "row_cache_hit_ratio": f"{hits / n_distinct:.3f}",
+        }
+        return y_distinct[inverse], confidence_distinct[inverse], metadata
+
+    def invalidate_model(self, model_name: str) -> int:
+        """Drop the cached rows of every version of a model.
+
+        Args:
+            model_name: Name of the model
+
+        Returns:
+            Number of row caches dropped
+        """
+        prefix = f"{model_name}:"
+        with self._lock:
+            keys = [key for key in self._caches if key[0].startswith(prefix)]
+            for key in keys:
+                del self._caches[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all cached rows (counters are kept)."""
+        with self._lock:
+            self._caches.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get deduplication statistics.
+
+        Returns:
+            Dictionary with row counters, cached rows and the cache hit ratio
+        """
+        with self._lock:
+            return {
+                "rows": self.rows,
+                "unique_rows": self.unique_rows,
+                "cache_hits": self.cache_hits,
+                "scored_rows": self.scored_rows,
+                "cached_rows": sum(len(cache) for cache in self._caches.values()),
+                "cached_models": len(self._caches),
+                "hit_ratio": (self.cache_hits / self.unique_rows) if self.unique_rows else 0.0,
+            }
+
+    def _store(self, cache_key: Hashable, entries: List[Tuple[bytes, Tuple[Any, Any]]]) -> None:
+        with self._lock:
+            cache = self._caches.get(cache_key)
+            if cache is None:
+                cache = OrderedDict()
+                self._caches[cache_key] = cache
+                while len(self._caches) > self.max_models:
+                    self._caches.popitem(last=False)
+            else:
+                self._caches.move_to_end(cache_key)
+
+            for row_key, entry in entries:
+                cache[row_key] = entry
+            while len(cache) > self.max_rows:
+                cache.popitem(last=False)
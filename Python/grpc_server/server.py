@@ -3,13 +3,21 @@
 import os
 import sys
 import json
+import asyncio
 import time
+import queue
 import logging
 import signal
 import threading
 import concurrent.futures
 from concurrent import futures
-from typing import Dict, Any, Iterator
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from frameworks import CORE_MODULES, format_import_report, import_times, timed_import
+
+# Import the heavy dependencies one at a time so the startup report can show where the time went
+for _module in CORE_MODULES:
+    timed_import(_module)
 
 import grpc
 
@@ -18,20 +26,39 @@ import grpc
 from pythonml_pb2 import (
     ProcessRequest, ProcessResponse, 
     ProcessResponseChunk,
+    ProcessSessionRequest, ProcessSessionResponse,
     TrainRequest, TrainResponse,
     TrainRequestChunk,
+    TrainingJobRequest, TrainingJobStatus,
+    SearchRequest, SearchUpdate, SearchCandidate,
     ModelInfoRequest, ModelInfoResponse,
     ListModelsRequest, ListModelsResponse,
     ModelSummary,
     ModelStageRequest, ModelStageResponse,
-    HealthCheckRequest, HealthCheckResponse
+    HealthCheckRequest, HealthCheckResponse,
+    StatsRequest, StatsResponse
 )
 from pythonml_pb2_grpc import (
     PythonMLServiceServicer,
     add_PythonMLServiceServicer_to_server
 )
 
-from model_manager import ModelManager
+from aio_server import serve_async
+from arrow_codec import read_features, write_predictions
+from batching import MicroBatcher
+from dataset_source import DatasetSource, resolve_dataset_path
+from metrics import (ServerMetrics, InferenceTimer, NULL_TIMER, MetricsInterceptor, CountingThreadPoolExecutor,
+                     format_exposition, start_metrics_server)
+from model_manager import ModelManager, SUPPORTED_FRAMEWORKS
+from onnx_backend import OnnxRuntimeBackend
+from prediction_cache import PredictionCache
+from profiling import PROFILE_METADATA_KEY, ProfileSampler, format_breakdown, profile_requested
+from registry_store import REGISTRY_BACKENDS
+from row_dedup import RowDeduplicator
+from tensor_codec import tensor_to_array, array_to_tensor, can_encode
+from training_jobs import TrainingJobScheduler, SUCCEEDED, FAILED
+from warmup import DEFAULT_PRELOAD_STAGES, ModelPreloader
+from worker_pool import InferenceWorkerPool
 
 # Configure logging
 logging.basicConfig(
@@ -46,13 +73,27 @@ logger = logging.getLogger("gRPC_Server")
 class PythonMLServicer(PythonMLServiceServicer):
     """Implementation of the PythonML gRPC service."""
 
-    def __init__(self, model_manager: ModelManager):
+    def __init__(self, model_manager: ModelManager, session_max_in_flight: int = 4,
+                 training_jobs: Optional[TrainingJobScheduler] = None,
+                 metrics: Optional[ServerMetrics] = None,
+                 preloader: Optional[ModelPreloader] = None,
+                 dataset_dirs: Optional[List[str]] = None):
         """Initialize the servicer.
         
         Args:
             model_manager: The model manager to use
+            session_max_in_flight: Maximum batches a ProcessDataSession stream may have queued
+            training_jobs: Optional scheduler that runs training in worker processes
+            metrics: Optional server metrics recording per-model inference and training timings
+            preloader: Optional model preloader; health checks report NOT_SERVING until it is done
+            dataset_dirs: Directories TrainRequest.dataset may reference (none disables dataset files)
         """
         self.model_manager = model_manager
+        self.session_max_in_flight = max(1, session_max_in_flight)
+        self.training_jobs = training_jobs
+        self.metrics = metrics
+        self.preloader = preloader
+        self.dataset_dirs = dataset_dirs or []
         self.start_time = time.time()
         logger.info("PythonML Servicer initialized")
 
@@ -67,43 +108,100 @@ class PythonMLServicer(PythonMLServiceServicer):
             The process response
         """
         start_time = time.time()
+        profile = profile_requested(request.parameters)
+        timer = InferenceTimer() if self.metrics is not None or profile else NULL_TIMER
         logger.info(f"Processing data with model: {request.model_name}")
         
         try:
             # Convert parameters map to dictionary
             parameters = dict(request.parameters)
             
-            # Process the data
-            result, confidence, metadata = self.model_manager.process_data(
-                request.input_data,
-                request.model_name,
-                parameters,
-                request.version if request.version else None,
-                request.stage if request.stage else None
-            )
-            
-            # Create response
-            response = ProcessResponse(
-                result=result,
-                success=True,
-                confidence_score=confidence
-            )
+            if request.HasField("input_tensor") or request.input_arrow:
+                # Binary tensor or Arrow input: decode without copying and skip JSON entirely
+                if request.input_arrow:
+                    X = read_features(request.input_arrow)
+                else:
+                    X = tensor_to_array(request.input_tensor)
+                timer.mark("parse")
+                y_pred, confidence, metadata = self.model_manager.process_tensor(
+                    X,
+                    request.model_name,
+                    parameters,
+                    request.version if request.version else None,
+                    request.stage if request.stage else None,
+                    timer
+                )
+                
+                response = ProcessResponse(success=True, confidence_score=confidence)
+                if request.input_arrow:
+                    response.result_arrow = write_predictions(y_pred)
+                    metadata["result_encoding"] = "arrow"
+                else:
+                    self._set_tensor_result(response, y_pred, metadata)
+                timer.mark("serialize")
+                if profile and self.model_manager.worker_pool is None:
+                    # Include the result encoding (worker processes report their own breakdown)
+                    metadata[PROFILE_METADATA_KEY] = format_breakdown(timer)
+            else:
+                # Process the data
+                result, confidence, metadata = self.model_manager.process_data(
+                    request.input_data,
+                    request.model_name,
+                    parameters,
+                    request.version if request.version else None,
+                    request.stage if request.stage else None,
+                    timer
+                )
+                
+                # Create response
+                response = ProcessResponse(
+                    result=result,
+                    success=True,
+                    confidence_score=confidence
+                )
             
             # Add metadata
             for key, value in metadata.items():
                 response.metadata[key] = value
             
+            if self.metrics is not None:
+                # Worker processes time their own phases; only the version is known here
+                if not timer.version:
+                    timer.set_result(metadata.get("version", ""), 0)
+                self.metrics.observe_inference(request.model_name, timer, True)
+            
             logger.info(f"Successfully processed data with model {request.model_name} in {time.time() - start_time:.2f}s")
             return response
             
         except Exception as e:
             logger.error(f"Error processing data: {str(e)}")
+            if self.metrics is not None:
+                # Only registered names become label values, so unknown names
+                # sent by clients cannot grow the number of series
+                model_label = request.model_name if self.model_manager.has_model(request.model_name) else "unknown"
+                self.metrics.observe_inference(model_label, timer, False)
             return ProcessResponse(
                 success=False,
                 error_message=str(e),
                 confidence_score=0.0
             )
 
+    def _set_tensor_result(self, response: Any, y_pred: Any, metadata: Dict[str, str]) -> None:
+        """Fill the result of a response to a tensor request.
+        
+        Args:
+            response: Response with ``result`` and ``result_tensor`` fields
+            y_pred: Predictions array
+            metadata: Response metadata (result_encoding is added)
+        """
+        # Non-numeric predictions (e.g. string labels) fall back to JSON
+        if can_encode(y_pred):
+            array_to_tensor(y_pred, response.result_tensor)
+            metadata["result_encoding"] = "tensor"
+        else:
+            response.result = json.dumps(y_pred.tolist())
+            metadata["result_encoding"] = "json"
+
     def ProcessDataStream(self, request: ProcessRequest, context: grpc.ServicerContext) -> Iterator[ProcessResponseChunk]:
         """Process data using a model and stream the results.
         
@@ -167,6 +265,137 @@ class PythonMLServicer(PythonMLServiceServicer):
                 total_chunks=1
             )
 
+    def ProcessDataSession(self, request_iterator: Iterator[ProcessSessionRequest],
+                           context: grpc.ServicerContext) -> Iterator[ProcessSessionResponse]:
+        """Score a continuous stream of batches with a pinned model version.
+        
+        The first request selects the model, version, stage and parameters
+        for the whole session. Batches are read ahead into a bounded queue
+        (parameters["max_in_flight"], capped by the server limit); when it
+        is full the server stops reading and gRPC flow control pushes back
+        on the client. Responses are sent in request order.
+        
+        Args:
+            request_iterator: Iterator of session requests
+            context: The gRPC context
+            
+        Yields:
+            One response per batch
+        """
+        first = next(request_iterator, None)
+        if first is None:
+            return
+        
+        start_time = time.time()
+        parameters = dict(first.parameters)
+        logger.info(f"Opening scoring session with model: {first.model_name}")
+        
+        try:
+            session, max_in_flight = self._open_session(first, parameters)
+        except Exception as e:
+            logger.error(f"Error opening scoring session: {str(e)}")
+            yield ProcessSessionResponse(batch_id=first.batch_id, success=False, error_message=str(e))
+            return
+        
+        # Read ahead on a separate thread so decoding overlaps with scoring
+        pending: "queue.Queue[Any]" = queue.Queue(maxsize=max_in_flight)
+        stopped = threading.Event()
+        end_of_stream = object()
+        
+        def read_requests():
+            try:
+                for request in request_iterator:
+                    while not stopped.is_set():
+                        try:
+                            pending.put(request, timeout=0.5)
+                            break
+                        except queue.Full:
+                            continue
+                    if stopped.is_set():
+                        return
+            except Exception as e:
+                # Cancelled or broken stream: nothing more will arrive
+                logger.info(f"Scoring session request stream ended: {str(e)}")
+            finally:
+                while not stopped.is_set():
+                    try:
+                        pending.put(end_of_stream, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+        
+        reader = threading.Thread(target=read_requests, name="session-reader", daemon=True)
+        reader.start()
+        
+        try:
+            request = first
+            while request is not end_of_stream:
+                yield self._score_session_batch(session, request, parameters, pending.qsize())
+                request = pending.get()
+            
+            logger.info(f"Closed scoring session with model {first.model_name} after "
+                        f"{session.batches} batches in {time.time() - start_time:.2f}s")
+        finally:
+            stopped.set()
+
+    def _open_session(self, first: ProcessSessionRequest, parameters: Dict[str, str]) -> Tuple[Any, int]:
+        """Open the scoring session selected by the first request of a stream.
+        
+        Args:
+            first: The first session request
+            parameters: Session processing parameters
+            
+        Returns:
+            Tuple of (session, max_in_flight)
+        """
+        session = self.model_manager.open_session(
+            first.model_name,
+            first.version if first.version else None,
+            first.stage if first.stage else None
+        )
+        max_in_flight = int(parameters.get("max_in_flight", self.session_max_in_flight))
+        return session, max(1, min(max_in_flight, self.session_max_in_flight))
+
+    def _score_session_batch(self, session: Any, request: ProcessSessionRequest,
+                             parameters: Dict[str, str], queued: int) -> ProcessSessionResponse:
+        """Score one batch of a scoring session.
+        
+        Args:
+            session: The ScoringSession of the stream
+            request: The batch request
+            parameters: Session processing parameters
+            queued: Number of batches waiting behind this one
+            
+        Returns:
+            The batch response (errors are reported in-band and keep the session open)
+        """
+        try:
+            if request.HasField("input_tensor"):
+                y_pred, confidence, metadata = session.process_tensor(
+                    tensor_to_array(request.input_tensor), parameters)
+                response = ProcessSessionResponse(batch_id=request.batch_id, success=True,
+                                                  confidence_score=confidence)
+                self._set_tensor_result(response, y_pred, metadata)
+            else:
+                result, confidence, metadata = session.process_data(request.input_data, parameters)
+                response = ProcessSessionResponse(batch_id=request.batch_id, success=True,
+                                                  result=result, confidence_score=confidence)
+            
+            metadata["session_batches"] = str(session.batches)
+            metadata["queued_batches"] = str(queued)
+            for key, value in metadata.items():
+                response.metadata[key] = value
+            return response
+            
+        except Exception as e:
+            logger.error(f"Error scoring session batch {request.batch_id}: {str(e)}")
+            return ProcessSessionResponse(
+                batch_id=request.batch_id,
+                success=False,
+                error_message=str(e),
+                confidence_score=0.0
+            )
+
     def TrainModel(self, request: TrainRequest, context: grpc.ServicerContext) -> TrainResponse:
         """Train a machine learning model.
         
@@ -184,15 +413,38 @@ class PythonMLServicer(PythonMLServiceServicer):
             # Convert hyperparameters map to dictionary
             hyperparameters = dict(request.hyperparameters)
             
+            # Run the training in a job process and wait for it
+            if self.training_jobs is not None:
+                job = self._submit_training_job(request)
+                job = self.training_jobs.wait(job["job_id"])
+                
+                response = TrainResponse(
+                    success=job["state"] == SUCCEEDED,
+                    model_id=job["model_id"],
+                    version=job["version"],
+                    stage=job["stage"],
+                    error_message=job["error_message"]
+                )
+                for key, value in job["metrics"].items():
+                    response.metrics[key] = value
+                
+                if response.success:
+                    logger.info(f"Successfully trained model {request.model_name} in {time.time() - start_time:.2f}s")
+                else:
+                    logger.error(f"Failed to train model {request.model_name}")
+                return response
+            
             # Train the model
+            framework = request.framework if request.framework else 'scikit-learn'
             success, model_id, metrics, version, stage = self.model_manager.train_model(
-                request.training_data,
+                self._training_data(request),
                 request.model_name,
                 hyperparameters,
                 request.validate,
-                request.framework if request.framework else 'scikit-learn',
+                framework,
                 request.initial_stage if request.initial_stage else 'development'
             )
+            self._observe_training(framework, success, start_time)
             
             # Create response
             response = TrainResponse(
@@ -202,9 +454,10 @@ class PythonMLServicer(PythonMLServiceServicer):
                 stage=stage
             )
             
-            # Add metrics
+            # Add metrics (failures report the error text through error_message)
             for key, value in metrics.items():
-                response.metrics[key] = value
+                if isinstance(value, (int, float)):
+                    response.metrics[key] = value
             
             if success:
                 logger.info(f"Successfully trained model {request.model_name} in {time.time() - start_time:.2f}s")
@@ -235,36 +488,288 @@ class PythonMLServicer(PythonMLServiceServicer):
         start_time = time.time()
         logger.info("Training model with streaming data")
         
+        # The framework is only sent with the first chunk
+        settings = {}
+        
+        def chunks() -> Iterator[TrainRequestChunk]:
+            for chunk in request_iterator:
+                if not settings:
+                    settings["framework"] = chunk.framework if chunk.framework else 'scikit-learn'
+                yield chunk
+        
         try:
             # Train the model with streaming data
-            success, model_id, metrics, version, stage = self.model_manager.train_model_stream(request_iterator)
+            result = self.model_manager.train_model_stream(chunks())
+            return self._train_stream_response(settings.get("framework", "unknown"), result, start_time)
             
-            # Create response
-            response = TrainResponse(
-                success=success,
-                model_id=model_id,
-                version=version,
-                stage=stage
+        except Exception as e:
+            logger.error(f"Error training model with streaming data: {str(e)}")
+            return TrainResponse(
+                success=False,
+                error_message=str(e)
             )
+
+    def _train_stream_response(self, framework: str, result: Tuple[bool, str, Dict[str, Any], str, str],
+                               start_time: float) -> TrainResponse:
+        """Build the response of a streaming training run.
+        
+        Args:
+            framework: Framework named by the first chunk
+            result: Tuple of (success, model_id, metrics, version, stage)
+            start_time: When the stream was opened
             
-            # Add metrics
-            for key, value in metrics.items():
+        Returns:
+            The train response
+        """
+        success, model_id, metrics, version, stage = result
+        self._observe_training(framework, success, start_time)
+        
+        # Create response
+        response = TrainResponse(
+            success=success,
+            model_id=model_id,
+            version=version,
+            stage=stage
+        )
+        
+        # Add metrics (failures report the error text through error_message)
+        for key, value in metrics.items():
+            if isinstance(value, (int, float)):
                 response.metrics[key] = value
+        
+        if success:
+            logger.info(f"Successfully trained model with streaming data in {time.time() - start_time:.2f}s")
+        else:
+            logger.error("Failed to train model with streaming data")
+            response.error_message = metrics.get("error", "Unknown error")
+        
+        return response
+
+    def _observe_training(self, framework: str, success: bool, start_time: float) -> None:
+        """Record the duration of a training run done in the RPC thread."""
+        if self.metrics is not None:
+            self.metrics.observe_training(framework, SUCCEEDED if success else FAILED, time.time() - start_time)
+
+    def _training_data(self, request: Any) -> Any:
+        """Get the training data of a TrainRequest or SearchRequest: a dataset file, Arrow IPC bytes or the JSON text."""
+        if request.HasField("dataset"):
+            dataset = request.dataset
+            return DatasetSource(
+                resolve_dataset_path(dataset.path, self.dataset_dirs),
+                dataset.format,
+                list(dataset.feature_columns),
+                dataset.target_column,
+                dataset.sample_fraction,
+                dataset.max_rows,
+                dataset.seed,
+                dataset.chunk_rows
+            )
+        return request.training_arrow if request.training_arrow else request.training_data
+
+    def _submit_training_job(self, request: TrainRequest) -> Dict[str, Any]:
+        """Queue a training request with the job scheduler."""
+        return self.training_jobs.submit(
+            self._training_data(request),
+            request.model_name,
+            dict(request.hyperparameters),
+            request.validate,
+            request.framework if request.framework else 'scikit-learn',
+            request.initial_stage if request.initial_stage else 'development'
+        )
+
+    def _job_status(self, job: Dict[str, Any]) -> TrainingJobStatus:
+        """Convert a job snapshot to a TrainingJobStatus message."""
+        status = TrainingJobStatus(
+            job_id=job["job_id"],
+            state=job["state"],
+            model_name=job["model_name"],
+            epoch=job["epoch"],
+            total_epochs=job["total_epochs"],
+            loss=job["loss"] if job["loss"] is not None else 0.0,
+            progress=job["progress"],
+            eta_seconds=job["eta_seconds"],
+            elapsed_seconds=job["elapsed_seconds"],
+            queue_position=job["queue_position"],
+            message=job["message"],
+            error_message=job["error_message"],
+            model_id=job["model_id"],
+            version=job["version"],
+            stage=job["stage"]
+        )
+        for key, value in job["metrics"].items():
+            status.metrics[key] = value
+        return status
+
+    def _training_jobs_disabled(self, context: grpc.ServicerContext) -> TrainingJobStatus:
+        context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+        context.set_details("Training jobs are disabled (start the server with --training-processes > 0)")
+        return TrainingJobStatus()
+
+    def SubmitTrainingJob(self, request: TrainRequest, context: grpc.ServicerContext) -> TrainingJobStatus:
+        """Queue a training job without waiting for it.
+        
+        Args:
+            request: The train request
+            context: The gRPC context
             
-            if success:
-                logger.info(f"Successfully trained model with streaming data in {time.time() - start_time:.2f}s")
-            else:
-                logger.error("Failed to train model with streaming data")
-                response.error_message = metrics.get("error", "Unknown error")
+        Returns:
+            The status of the queued job
+        """
+        if self.training_jobs is None:
+            return self._training_jobs_disabled(context)
+        
+        logger.info(f"Submitting training job for model: {request.model_name}")
+        
+        try:
+            return self._job_status(self._submit_training_job(request))
+        except Exception as e:
+            logger.error(f"Error submitting training job: {str(e)}")
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED if "queue is full" in str(e)
+                             else grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return TrainingJobStatus(state="rejected", model_name=request.model_name, error_message=str(e))
+
+    def GetTrainingJob(self, request: TrainingJobRequest, context: grpc.ServicerContext) -> TrainingJobStatus:
+        """Get the status of a training job.
+        
+        Args:
+            request: The training job request
+            context: The gRPC context
             
-            return response
+        Returns:
+            The job status
+        """
+        if self.training_jobs is None:
+            return self._training_jobs_disabled(context)
+        
+        try:
+            return self._job_status(self.training_jobs.get(request.job_id))
+        except Exception as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return TrainingJobStatus()
+
+    def StreamTrainingJob(self, request: TrainingJobRequest,
+                          context: grpc.ServicerContext) -> Iterator[TrainingJobStatus]:
+        """Stream status updates of a training job until it finishes.
+        
+        Args:
+            request: The training job request
+            context: The gRPC context
             
+        Yields:
+            Job status on every progress update (at least once per second)
+        """
+        if self.training_jobs is None:
+            self._training_jobs_disabled(context)
+            return
+        
+        try:
+            for job in self.training_jobs.watch(request.job_id, is_active=context.is_active):
+                yield self._job_status(job)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+
+    def CancelTrainingJob(self, request: TrainingJobRequest, context: grpc.ServicerContext) -> TrainingJobStatus:
+        """Cancel a queued or running training job.
+        
+        Args:
+            request: The training job request
+            context: The gRPC context
+            
+        Returns:
+            The job status after cancellation
+        """
+        if self.training_jobs is None:
+            return self._training_jobs_disabled(context)
+        
+        try:
+            return self._job_status(self.training_jobs.cancel(request.job_id))
         except Exception as e:
-            logger.error(f"Error training model with streaming data: {str(e)}")
-            return TrainResponse(
-                success=False,
-                error_message=str(e)
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return TrainingJobStatus()
+
+    def SearchHyperparameters(self, request: SearchRequest,
+                              context: grpc.ServicerContext) -> Iterator[SearchUpdate]:
+        """Search hyperparameters in parallel and register the best model.
+        
+        Args:
+            request: The search request
+            context: The gRPC context
+            
+        Yields:
+            An update with the leaderboard for every evaluated candidate, then
+            a final update with the registered version
+        """
+        start_time = time.time()
+        logger.info(f"Searching hyperparameters for model: {request.model_name}")
+        success = False
+        
+        try:
+            if not request.model_name:
+                raise ValueError("model_name is required")
+            
+            updates = self.model_manager.search_hyperparameters(
+                self._training_data(request),
+                request.model_name,
+                dict(request.hyperparameters),
+                dict(request.search_space),
+                request.strategy.lower() if request.strategy else "grid",
+                request.n_candidates,
+                request.cv_folds if request.cv_folds else 5,
+                request.scoring,
+                request.max_workers,
+                request.seed,
+                request.validate,
+                request.initial_stage if request.initial_stage else 'development',
+                request.leaderboard_size if request.leaderboard_size else 10,
+                is_active=context.is_active
             )
+            
+            for update in updates:
+                response = SearchUpdate(
+                    evaluated=update["evaluated"],
+                    total=update["total"],
+                    is_final=update.get("final", False)
+                )
+                for entry in update["leaderboard"]:
+                    self._set_search_candidate(response.leaderboard.add(), entry)
+                
+                if response.is_final:
+                    success = True
+                    response.success = True
+                    response.model_id = update["model_id"]
+                    response.version = update["version"]
+                    response.stage = update["stage"]
+                    for key, value in update["metrics"].items():
+                        if isinstance(value, (int, float)):
+                            response.metrics[key] = value
+                    logger.info(f"Registered {update['model_id']} after searching {update['evaluated']} candidates "
+                                f"in {time.time() - start_time:.2f}s")
+                else:
+                    self._set_search_candidate(response.candidate, update["candidate"])
+                yield response
+            
+        except Exception as e:
+            logger.error(f"Error searching hyperparameters: {str(e)}")
+            yield SearchUpdate(is_final=True, success=False, error_message=str(e))
+        
+        finally:
+            self._observe_training("scikit-learn", success, start_time)
+
+    def _set_search_candidate(self, message: SearchCandidate, result: Dict[str, Any]) -> None:
+        """Fill a SearchCandidate message from a candidate result."""
+        message.candidate_id = result["candidate_id"]
+        message.hyperparameters.update(result["hyperparameters"])
+        message.mean_score = result["mean_score"]
+        message.std_score = result["std_score"]
+        message.fit_time_seconds = result["fit_time"]
+        message.n_samples = result["n_samples"]
+        message.round = result["round"]
+        message.rank = result.get("rank", 0)
+        message.error_message = result["error"]
 
     def GetModelInfo(self, request: ModelInfoRequest, context: grpc.ServicerContext) -> ModelInfoResponse:
         """Get information about a machine learning model.
@@ -430,21 +935,69 @@ class PythonMLServicer(PythonMLServiceServicer):
             # Check uptime
             uptime = time.time() - self.start_time
             
+            # Not ready for traffic until the models are warmed up
+            if self.preloader is not None and not self.preloader.done:
+                progress = self.preloader.stats()
+                logger.info("Health check: models are still warming up")
+                return HealthCheckResponse(
+                    status=HealthCheckResponse.Status.NOT_SERVING,
+                    message=f"Warming up models: {progress['completed']}/{progress['total']} loaded. "
+                            f"Uptime: {uptime:.2f}s"
+                )
+            
             # Check if model manager is functioning
             models = self.model_manager.list_models()
             
             # Get framework information
             frameworks = []
             for framework in ["scikit-learn", "tensorflow", "pytorch"]:
-                if framework in self.model_manager.SUPPORTED_FRAMEWORKS:
+                if framework in SUPPORTED_FRAMEWORKS:
                     frameworks.append(framework)
             
+            # Get model cache statistics
+            cache_stats = self.model_manager.get_cache_stats()
+            
             # Create response
             response = HealthCheckResponse(
                 status=HealthCheckResponse.Status.SERVING,
-                message=f"Service is healthy. Uptime: {uptime:.2f}s. Models: {len(models)}. Frameworks: {', '.join(frameworks)}"
+                message=f"Service is healthy. Uptime: {uptime:.2f}s. Models: {len(models)}. Frameworks: {', '.join(frameworks)}. "
+                        f"Model cache: {cache_stats['entries']} loaded, {cache_stats['hits']} hits, "
+                        f"{cache_stats['misses']} misses, {cache_stats['evictions']} evictions"
             )
             
+            # Add micro-batching statistics when enabled
+            batching_stats = self.model_manager.get_batching_stats()
+            if batching_stats:
+                response.message += (f". Batching: queue depth {batching_stats['queue_depth']}, "
+                                     f"{batching_stats['batches']} batches, "
+                                     f"{batching_stats['avg_requests_per_batch']:.2f} requests/batch, "
+                                     f"avg wait {batching_stats['avg_wait_ms']:.2f}ms")
+            
+            # Add prediction cache statistics when enabled
+            if self.model_manager.prediction_cache is not None:
+                prediction_stats = self.model_manager.prediction_cache.stats()
+                response.message += (f". Prediction cache: {prediction_stats['entries']} results, "
+                                     f"hit ratio {prediction_stats['hit_ratio']:.2f}")
+            
+            # Add inference worker process status when enabled
+            if self.model_manager.worker_pool is not None:
+                workers = self.model_manager.worker_pool.stats()["workers"]
+                alive = sum(1 for worker in workers if worker["alive"])
+                restarts = sum(worker["restarts"] for worker in workers)
+                response.message += f". Inference workers: {alive}/{len(workers)} alive, {restarts} restarts"
+            
+            # Add training job queue status when enabled
+            if self.training_jobs is not None:
+                jobs = self.training_jobs.stats()
+                response.message += (f". Training jobs: {jobs['running']}/{jobs['max_workers']} running, "
+                                     f"{jobs['queued']}/{jobs['max_queued']} queued")
+            
+            # Add warm-up results
+            if self.preloader is not None:
+                progress = self.preloader.stats()
+                response.message += (f". Preloaded models: {progress['completed'] - progress['failed']}/"
+                                     f"{progress['total']} in {progress['elapsed']:.2f}s")
+            
             logger.info("Health check passed")
             return response
             
@@ -455,28 +1008,261 @@ class PythonMLServicer(PythonMLServiceServicer):
                 message=f"Service is unhealthy: {str(e)}"
             )
 
+    def GetStats(self, request: StatsRequest, context: grpc.ServicerContext) -> StatsResponse:
+        """Get server metrics.
+        
+        Args:
+            request: The stats request (name_prefix filters metric families)
+            context: The gRPC context
+            
+        Returns:
+            The metric samples and their Prometheus text rendering
+        """
+        if self.metrics is None:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details("Metrics are disabled")
+            return StatsResponse()
+        
+        collected = self.metrics.collect(request.name_prefix)
+        response = StatsResponse(text=format_exposition(collected))
+        for _, samples in collected:
+            for name, labels, value in samples:
+                sample = response.samples.add(name=name, value=value)
+                sample.labels.update(labels)
+        return response
+
 
-def serve(port: int = 50051, max_workers: int = 10):
+def create_model_manager(cache_max_entries: int = 32, cache_max_mb: int = 0,
+                         batch_max_size: int = 0, batch_max_wait_ms: float = 2.0,
+                         inference_processes: int = 0, process_replicas: int = 1,
+                         registry_backend: str = "sqlite", profile_every: int = 0,
+                         profile_dir: str = "profiles", profile_max_files: int = 50,
+                         onnx_runtime: bool = False, onnx_intra_op_threads: int = 1,
+                         onnx_inter_op_threads: int = 1, prediction_cache_entries: int = 0,
+                         prediction_cache_mb: int = 0, prediction_cache_ttl: float = 300.0,
+                         row_dedup: bool = False, row_cache_rows: int = 10000) -> ModelManager:
+    """Create the model manager shared by the threaded and async servers.
+    
+    Args:
+        cache_max_entries: Maximum number of loaded models kept in memory (0 for unlimited)
+        cache_max_mb: Maximum estimated size of loaded models in MB (0 for unlimited)
+        batch_max_size: Maximum rows per micro-batch (0 disables micro-batching)
+        batch_max_wait_ms: Maximum time a request waits for a micro-batch to fill
+        inference_processes: Number of inference worker processes (0 predicts in-process)
+        process_replicas: Number of worker processes each model may be routed to
+        registry_backend: Registry storage backend ("sqlite" or "json")
+        profile_every: Capture cProfile statistics for 1 in this many requests (0 disables sampling)
+        profile_dir: Directory the sampled profiles are written to
+        profile_max_files: Number of newest sampled profiles kept
+        onnx_runtime: Serve versions exported to ONNX with ONNX Runtime
+        onnx_intra_op_threads: ONNX Runtime threads per operator (0 uses every core)
+        onnx_inter_op_threads: ONNX Runtime threads running independent operators
+        prediction_cache_entries: Maximum number of cached ProcessData results (0 disables the cache)
+        prediction_cache_mb: Maximum size of the cached results in MB (0 for unlimited)
+        prediction_cache_ttl: Seconds a cached result is served for (0 never expires)
+        row_dedup: Score only the distinct rows of array inputs
+        row_cache_rows: Rows cached per model version when deduplicating (0 disables the row cache)
+        
+    Returns:
+        The model manager
+    """
+    models_dir = "models"
+    
+    # Create the optional request profile sampler
+    profiler = None
+    if profile_every > 0:
+        profiler = ProfileSampler(profile_dir, profile_every, max_files=profile_max_files)
+        logger.info(f"Profiling 1 in {profile_every} requests into {profile_dir}")
+    
+    # Create the optional ONNX Runtime backend
+    onnx_backend = None
+    if onnx_runtime:
+        onnx_backend = OnnxRuntimeBackend(intra_op_threads=onnx_intra_op_threads,
+                                          inter_op_threads=onnx_inter_op_threads)
+        logger.info(f"Serving ONNX exports with ONNX Runtime ({onnx_intra_op_threads} intra-op, "
+                    f"{onnx_inter_op_threads} inter-op threads)")
+    
+    # Create the optional row deduplicator
+    deduplicator = None
+    if row_dedup:
+        deduplicator = RowDeduplicator(max_rows=row_cache_rows)
+        logger.info(f"Row deduplication enabled: {row_cache_rows} rows cached per model version")
+    
+    # Create the optional inference worker pool (each worker gets the same cache budget)
+    worker_pool = None
+    if inference_processes > 0:
+        worker_pool = InferenceWorkerPool(
+            models_dir=models_dir,
+            num_workers=inference_processes,
+            replicas=process_replicas,
+            cache_max_entries=cache_max_entries,
+            cache_max_bytes=cache_max_mb * 1024 * 1024,
+            registry_backend=registry_backend,
+            profiler=profiler,
+            onnx_backend=onnx_backend,
+            row_dedup=deduplicator
+        )
+        if batch_max_size > 0:
+            logger.warning("Micro-batching is not applied when inference runs in worker processes")
+            batch_max_size = 0
+    
+    # Create the optional prediction result cache
+    prediction_cache = None
+    if prediction_cache_entries > 0:
+        prediction_cache = PredictionCache(max_entries=prediction_cache_entries,
+                                           max_bytes=prediction_cache_mb * 1024 * 1024,
+                                           ttl_seconds=prediction_cache_ttl)
+        logger.info(f"Prediction cache enabled: max {prediction_cache_entries} results, "
+                    f"TTL {prediction_cache_ttl:g}s")
+    
+    # Create the optional micro-batcher
+    batcher = None
+    if batch_max_size > 0:
+        batcher = MicroBatcher(max_batch_size=batch_max_size, max_wait_ms=batch_max_wait_ms)
+        logger.info(f"Micro-batching enabled: max {batch_max_size} rows, max wait {batch_max_wait_ms}ms")
+    
+    # Create the model manager
+    return ModelManager(
+        models_dir=models_dir,
+        cache_max_entries=cache_max_entries,
+        cache_max_bytes=cache_max_mb * 1024 * 1024,
+        batcher=batcher,
+        worker_pool=worker_pool,
+        registry_backend=registry_backend,
+        profiler=profiler,
+        onnx_backend=onnx_backend,
+        prediction_cache=prediction_cache,
+        row_dedup=deduplicator
+    )
+
+
+def serve(port: int = 50051, max_workers: int = 10, cache_max_entries: int = 32,
+          cache_max_mb: int = 0, batch_max_size: int = 0, batch_max_wait_ms: float = 2.0,
+          max_message_size_mb: int = 100, use_async: bool = False, training_workers: int = 2,
+          inference_processes: int = 0, process_replicas: int = 1, session_max_in_flight: int = 4,
+          training_processes: int = 2, training_queue_size: int = 16, registry_backend: str = "sqlite",
+          metrics_port: int = 0, metrics_host: str = "127.0.0.1", profile_every: int = 0, profile_dir: str = "profiles",
+          profile_max_files: int = 50, preload_stages: Optional[List[str]] = None,
+          preload_models: Optional[List[str]] = None, preload_workers: int = 4,
+          onnx_runtime: bool = False, onnx_intra_op_threads: int = 1, onnx_inter_op_threads: int = 1,
+          prediction_cache_entries: int = 0, prediction_cache_mb: int = 0, prediction_cache_ttl: float = 300.0,
+          row_dedup: bool = False, row_cache_rows: int = 10000, dataset_dirs: Optional[List[str]] = None):
     """Start the gRPC server.
     
     Args:
         port: The port to listen on
-        max_workers: The maximum number of workers
+        max_workers: The maximum number of workers (inference threads in async mode)
+        cache_max_entries: Maximum number of loaded models kept in memory (0 for unlimited)
+        cache_max_mb: Maximum estimated size of loaded models in MB (0 for unlimited)
+        batch_max_size: Maximum rows per micro-batch (0 disables micro-batching)
+        batch_max_wait_ms: Maximum time a request waits for a micro-batch to fill
+        max_message_size_mb: Maximum gRPC message size in MB
+        use_async: Host the service on grpc.aio instead of a thread-per-RPC server
+        training_workers: Threads reserved for training calls in async mode
+        inference_processes: Number of inference worker processes (0 predicts in-process)
+        process_replicas: Number of worker processes each model may be routed to
+        session_max_in_flight: Maximum batches a ProcessDataSession stream may have queued
+        training_processes: Training jobs run at once in worker processes (0 trains in the RPC thread)
+        training_queue_size: Maximum number of training jobs waiting to run
+        registry_backend: Registry storage backend ("sqlite" or "json")
+        metrics_port: Port of the HTTP metrics endpoint (0 disables it; GetStats is always available)
+        metrics_host: Interface the metrics endpoint binds to
+        profile_every: Capture cProfile statistics for 1 in this many requests (0 disables sampling)
+        profile_dir: Directory the sampled profiles are written to
+        profile_max_files: Number of newest sampled profiles kept
+        preload_stages: Stages whose versions are loaded and warmed up at startup
+            (default: production and staging; empty disables preloading)
+        preload_models: Models to preload instead (``name``, ``name:version`` or ``name@stage``)
+        preload_workers: Models loaded at once during preloading
+        onnx_runtime: Serve versions exported to ONNX with ONNX Runtime
+        onnx_intra_op_threads: ONNX Runtime threads per operator (0 uses every core)
+        onnx_inter_op_threads: ONNX Runtime threads running independent operators
+        prediction_cache_entries: Maximum number of cached ProcessData results (0 disables the cache)
+        prediction_cache_mb: Maximum size of the cached results in MB (0 for unlimited)
+        prediction_cache_ttl: Seconds a cached result is served for (0 never expires)
+        row_dedup: Score only the distinct rows of array inputs
+        row_cache_rows: Rows cached per model version when deduplicating (0 disables the row cache)
+        dataset_dirs: Directories training requests may read dataset files from (none disables them)
     """
-    # Create the model manager
-    model_manager = ModelManager(models_dir="models")
+    model_manager = create_model_manager(
+        cache_max_entries=cache_max_entries,
+        cache_max_mb=cache_max_mb,
+        batch_max_size=batch_max_size,
+        batch_max_wait_ms=batch_max_wait_ms,
+        inference_processes=inference_processes,
+        process_replicas=process_replicas,
+        registry_backend=registry_backend,
+        profile_every=profile_every,
+        profile_dir=profile_dir,
+        profile_max_files=profile_max_files,
+        onnx_runtime=onnx_runtime,
+        onnx_intra_op_threads=onnx_intra_op_threads,
+        onnx_inter_op_threads=onnx_inter_op_threads,
+        prediction_cache_entries=prediction_cache_entries,
+        prediction_cache_mb=prediction_cache_mb,
+        prediction_cache_ttl=prediction_cache_ttl,
+        row_dedup=row_dedup,
+        row_cache_rows=row_cache_rows
+    )
+    
+    metrics = ServerMetrics()
+    metrics.watch_model_manager(model_manager)
+    metrics.watch_imports(import_times)
+    logger.info(format_import_report())
+    
+    # Create the training job scheduler (isolates training from inference)
+    training_jobs = None
+    if training_processes > 0:
+        training_jobs = TrainingJobScheduler(model_manager, max_workers=training_processes,
+                                             max_queued=training_queue_size, metrics=metrics)
+        metrics.watch_training_jobs(training_jobs)
+    
+    # Warm up the serving models in the background; health checks report NOT_SERVING meanwhile
+    preloader = None
+    if preload_models or preload_stages is None or preload_stages:
+        preloader = ModelPreloader(model_manager, models=preload_models, stages=preload_stages,
+                                   max_workers=preload_workers)
+        preloader.start()
+    
+    servicer = PythonMLServicer(model_manager, session_max_in_flight=session_max_in_flight,
+                                training_jobs=training_jobs, metrics=metrics, preloader=preloader,
+                                dataset_dirs=dataset_dirs)
+    
+    # Serve the metrics over HTTP for Prometheus scrapes
+    metrics_server = None
+    if metrics_port > 0:
+        metrics_server = start_metrics_server(metrics, metrics_port, metrics_host)
+    
+    options = [
+        ('grpc.max_send_message_length', max_message_size_mb * 1024 * 1024),
+        ('grpc.max_receive_message_length', max_message_size_mb * 1024 * 1024),
+    ]
+    
+    if use_async:
+        try:
+            asyncio.run(serve_async(servicer, port, options,
+                                    inference_workers=max_workers,
+                                    training_workers=training_workers,
+                                    metrics=metrics))
+        finally:
+            if metrics_server is not None:
+                metrics_server.shutdown()
+            if training_jobs is not None:
+                training_jobs.shutdown()
+            if model_manager.worker_pool is not None:
+                model_manager.worker_pool.shutdown()
+        return
     
     # Create a gRPC server
+    executor = CountingThreadPoolExecutor(max_workers=max_workers)
+    metrics.watch_executor("rpc", executor)
     server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=max_workers),
-        options=[
-            ('grpc.max_send_message_length', 100 * 1024 * 1024),  # 100 MB
-            ('grpc.max_receive_message_length', 100 * 1024 * 1024),  # 100 MB
-        ]
+        executor,
+        options=options,
+        interceptors=[MetricsInterceptor(metrics)]
     )
     
     # Add the servicer to the server
-    servicer = PythonMLServicer(model_manager)
     add_PythonMLServiceServicer_to_server(servicer, server)
     
     # Add a port for the server to listen on
@@ -491,6 +1277,12 @@ def serve(port: int = 50051, max_workers: int = 10):
     def graceful_shutdown(signum, frame):
         logger.info("Received shutdown signal, stopping server...")
         server.stop(grace=5)  # 5 seconds grace period
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        if training_jobs is not None:
+            training_jobs.shutdown()
+        if model_manager.worker_pool is not None:
+            model_manager.worker_pool.shutdown()
         logger.info("Server stopped")
         sys.exit(0)
     
@@ -514,7 +1306,97 @@ if __name__ == "__main__":
     parser.add_argument("--workers", type=int, default=10, help="Maximum number of workers")
     parser.add_argument("--max-message-size", type=int, default=100, 
                        help="Maximum message size in MB (for streaming large datasets)")
+    parser.add_argument("--model-cache-entries", type=int, default=32,
+                       help="Maximum number of loaded models kept in memory (0 for unlimited)")
+    parser.add_argument("--model-cache-mb", type=int, default=0,
+                       help="Maximum estimated size of loaded models in MB (0 for unlimited)")
+    parser.add_argument("--batch-max-size", type=int, default=0,
+                       help="Maximum rows per micro-batch for ProcessData (0 disables micro-batching)")
+    parser.add_argument("--batch-max-wait-ms", type=float, default=2.0,
+                       help="Maximum time in ms a request waits for its micro-batch to fill")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                       help="Host the service on grpc.aio (asyncio) instead of a thread-per-RPC server")
+    parser.add_argument("--training-workers", type=int, default=2,
+                       help="Threads reserved for training calls in --async mode")
+    parser.add_argument("--inference-processes", type=int, default=0,
+                       help="Run predictions in this many worker processes (0 predicts in the server process)")
+    parser.add_argument("--process-replicas", type=int, default=1,
+                       help="Number of worker processes each model may be routed to")
+    parser.add_argument("--session-max-in-flight", type=int, default=4,
+                       help="Maximum batches a ProcessDataSession stream may have queued on the server")
+    parser.add_argument("--training-processes", type=int, default=2,
+                       help="Training jobs run at once, each in its own process (0 trains in the RPC thread)")
+    parser.add_argument("--training-queue-size", type=int, default=16,
+                       help="Maximum number of training jobs waiting to run")
+    parser.add_argument("--registry-backend", choices=REGISTRY_BACKENDS, default="sqlite",
+                       help="Model registry storage (sqlite migrates an existing model_registry.json)")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                       help="Serve Prometheus metrics on this HTTP port (0 disables the endpoint)")
+    parser.add_argument("--metrics-host", default="127.0.0.1",
+                       help="Interface the unauthenticated metrics endpoint binds to (0.0.0.0 exposes it externally)")
+    parser.add_argument("--profile-every", type=int, default=0,
+                       help="Capture cProfile statistics for 1 in this many ProcessData requests (0 disables sampling)")
+    parser.add_argument("--profile-dir", default="profiles",
+                       help="Directory sampled request profiles are written to")
+    parser.add_argument("--profile-max-files", type=int, default=50,
+                       help="Number of newest sampled request profiles kept on disk")
+    parser.add_argument("--preload-stages", default=",".join(DEFAULT_PRELOAD_STAGES),
+                       help="Comma-separated stages whose versions are loaded and warmed up at startup "
+                            "(empty disables preloading)")
+    parser.add_argument("--preload-models", default="",
+                       help="Comma-separated models to preload instead of stages (name, name:version or name@stage)")
+    parser.add_argument("--preload-workers", type=int, default=4,
+                       help="Models loaded at once during preloading")
+    parser.add_argument("--onnx-runtime", action="store_true",
+                       help="Serve model versions exported to ONNX (onnx_export hyperparameter) with ONNX Runtime")
+    parser.add_argument("--onnx-intra-op-threads", type=int, default=1,
+                       help="ONNX Runtime threads used within one operator (0 uses every core)")
+    parser.add_argument("--onnx-inter-op-threads", type=int, default=1,
+                       help="ONNX Runtime threads running independent operators (1 runs them sequentially)")
+    parser.add_argument("--prediction-cache-entries", type=int, default=0,
+                       help="Maximum number of ProcessData results kept in the prediction cache (0 disables it)")
+    parser.add_argument("--prediction-cache-mb", type=int, default=0,
+                       help="Maximum size of the cached prediction results in MB (0 for unlimited)")
+    parser.add_argument("--prediction-cache-ttl", type=float, default=300.0,
+                       help="Seconds a cached prediction result is served for (0 never expires)")
+    parser.add_argument("--row-dedup", action="store_true",
+                       help="Score only the distinct rows of array inputs (dedupe_rows=false opts a request out)")
+    parser.add_argument("--row-cache-rows", type=int, default=10000,
+                       help="Rows cached per model version with --row-dedup (0 deduplicates without caching)")
+    parser.add_argument("--dataset-dirs", default="",
+                       help="Comma-separated directories TrainModel may read Parquet, CSV or NPY datasets from "
+                            "(empty disables dataset files)")
     args = parser.parse_args()
     
     # Start the server
-    serve(port=args.port, max_workers=args.workers)
\ No newline at end of file
+    serve(port=args.port, max_workers=args.workers,
+          cache_max_entries=args.model_cache_entries,
+          cache_max_mb=args.model_cache_mb,
+          batch_max_size=args.batch_max_size,
+          batch_max_wait_ms=args.batch_max_wait_ms,
+          max_message_size_mb=args.max_message_size,
+          use_async=args.use_async,
+          training_workers=args.training_workers,
+          inference_processes=args.inference_processes,
+          process_replicas=args.process_replicas,
+          session_max_in_flight=args.session_max_in_flight,
+          training_processes=args.training_processes,
+          training_queue_size=args.training_queue_size,
+          registry_backend=args.registry_backend,
+          metrics_port=args.metrics_port,
+          metrics_host=args.metrics_host,
+          profile_every=args.profile_every,
+          profile_dir=args.profile_dir,
+          profile_max_files=args.profile_max_files,
+          preload_stages=[stage for stage in args.preload_stages.split(",") if stage],
+          preload_models=[model for model in args.preload_models.split(",") if model],
+          preload_workers=args.preload_workers,
+          onnx_runtime=args.onnx_runtime,
+          onnx_intra_op_threads=args.onnx_intra_op_threads,
+          onnx_inter_op_threads=args.onnx_inter_op_threads,
+          prediction_cache_entries=args.prediction_cache_entries,
+          prediction_cache_mb=args.prediction_cache_mb,
+          prediction_cache_ttl=args.prediction_cache_ttl,
+          row_dedup=args.row_dedup,
+          row_cache_rows=args.row_cache_rows,
+          dataset_dirs=[directory for directory in args.dataset_dirs.split(",") if directory])
\ No newline at end of file
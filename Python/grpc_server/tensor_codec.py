@@ -0,0 +1,68 @@
+"""Conversion between NumPy arrays and packed ``Tensor`` messages.
+
+Tensor data is carried as raw little-endian values in row-major order, so
+decoding is a zero-copy ``np.frombuffer`` view over the message bytes.
+"""
+
+from typing import Any
+
+import numpy as np
+
+# dtypes accepted on the wire
+SUPPORTED_DTYPES = {"float32", "float64", "int32", "int64", "uint8", "bool"}
+
+
+def tensor_to_array(tensor: Any) -> np.ndarray:
+    """Decode a Tensor message into a read-only NumPy array.
+
+    Args:
+        tensor: Message with ``dtype``, ``shape`` and ``data`` fields
+
+    Returns:
+        Array viewing the message bytes (no copy on little-endian hosts)
+
+    Raises:
+        ValueError: If the dtype is unsupported or the data does not match the shape
+    """
+    if tensor.dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported tensor dtype '{tensor.dtype}'. Supported dtypes: {sorted(SUPPORTED_DTYPES)}")
+
+    dtype = np.dtype(tensor.dtype).newbyteorder("<")
+    shape = tuple(int(dim) for dim in tensor.shape)
+
+    expected_size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    if len(tensor.data) != expected_size:
+        raise ValueError(f"Tensor data has {len(tensor.data)} bytes, expected {expected_size} for shape {shape} and dtype {tensor.dtype}")
+
+    array = np.frombuffer(tensor.data, dtype=dtype).reshape(shape)
+
+    # Only big-endian hosts need to convert to native byte order
+    if not dtype.isnative:
+        array = array.astype(dtype.newbyteorder("="))
+    return array
+
+
+def array_to_tensor(array: np.ndarray, tensor: Any) -> None:
+    """Encode a NumPy array into a Tensor message.
+
+    Args:
+        array: Array with a numeric or boolean dtype
+        tensor: Message to fill (``dtype``, ``shape`` and ``data`` fields)
+
+    Raises:
+        ValueError: If the array dtype cannot be represented on the wire
+    """
+    array = np.asarray(array)
+    if array.dtype.name not in SUPPORTED_DTYPES:
+        raise ValueError(f"Cannot encode array with dtype '{array.dtype.name}' as a tensor")
+
+    little_endian = array.astype(array.dtype.newbyteorder("<"), copy=False)
+    tensor.dtype = array.dtype.name
+    del tensor.shape[:]
+    tensor.shape.extend(array.shape)
+    tensor.data = np.ascontiguousarray(little_endian).tobytes()
+
+
+def can_encode(array: np.ndarray) -> bool:
+    """Check whether an array can be encoded as a Tensor message."""
+    return np.asarray(array).dtype.name in SUPPORTED_DTYPES
@@ -0,0 +1,7 @@
+"""Test configuration of the gRPC server modules."""
+
+import os
+import sys
+
+# The server modules are imported by name, as server.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
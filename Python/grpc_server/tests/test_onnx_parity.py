@@ -0,0 +1,118 @@
+"""Parity of models exported to ONNX with their native scikit-learn models.
+
+Every test trains through ModelManager with ``onnx_export`` set, then
+scores rows the export check never saw with both ONNX Runtime and the
+native artifact.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("skl2onnx")
+
+import model_manager
+from model_manager import ModelManager
+from onnx_backend import ONNX_SUFFIX, PARITY_ATOL, PARITY_RTOL, OnnxModel, OnnxRuntimeBackend
+
+# (model_type, algorithm) pairs exported to ONNX
+MODELS = [
+    ("classification", "random_forest"),
+    ("classification", "logistic_regression"),
+    ("classification", "svm"),
+    ("regression", "random_forest"),
+    ("regression", "linear_regression"),
+    ("regression", "svr"),
+]
+
+
+def _training_data(model_type: str, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(300, 5))
+    if model_type == "classification":
+        y = (X[:, 0] + 0.5 * X[:, 1] > 0).astype(int) + (X[:, 2] > 1).astype(int)
+    else:
+        y = 2.0 * X[:, 0] - X[:, 3] + 0.1 * rng.normal(size=len(X))
+    return X, y
+
+
+def _train(manager: ModelManager, model_name: str, model_type: str, algorithm: str) -> str:
+    X, y = _training_data(model_type)
+    data = json.dumps({"features": X.tolist(), "target": y.tolist()})
+    hyperparameters = {"model_type": model_type, "algorithm": algorithm, "onnx_export": "true",
+                       "n_estimators": "20"}
+    success, model_id, _, _, _ = manager.train_model(data, model_name, hyperparameters, validate=False)
+    assert success
+    return model_id
+
+
+def _load(manager: ModelManager, model_name: str):
+    return manager._load_handle(manager._resolve(model_name, None, None))
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    return str(tmp_path / "models")
+
+
+@pytest.mark.parametrize("model_type, algorithm", MODELS)
+def test_onnx_matches_native_model(models_dir, model_type, algorithm):
+    model_name = f"{algorithm}_{model_type}"
+    model_id = _train(ModelManager(models_dir=models_dir), model_name, model_type, algorithm)
+    assert os.path.exists(os.path.join(models_dir, "scikit-learn", model_id + ONNX_SUFFIX))
+
+    onnx_manager = ModelManager(models_dir=models_dir, onnx_backend=OnnxRuntimeBackend())
+    native_manager = ModelManager(models_dir=models_dir)
+    onnx_model = _load(onnx_manager, model_name)
+    native_model = _load(native_manager, model_name)
+    assert isinstance(onnx_model, OnnxModel)
+    assert not isinstance(native_model, OnnxModel)
+
+    # Rows the export check did not score
+    X, _ = _training_data(model_type, seed=1)
+    y_onnx, confidence_onnx = onnx_manager._predict_onnx(onnx_model, X, model_type)
+    y_native, confidence_native = native_manager._predict_sklearn(native_model, X, model_type)
+
+    if model_type == "classification":
+        np.testing.assert_array_equal(y_onnx, y_native)
+        probabilities = onnx_model.run(X)[1]
+        np.testing.assert_allclose(probabilities, native_model.predict_proba(X),
+                                   rtol=PARITY_RTOL, atol=PARITY_ATOL)
+    else:
+        np.testing.assert_allclose(y_onnx, y_native, rtol=PARITY_RTOL, atol=PARITY_ATOL)
+    np.testing.assert_allclose(confidence_onnx, confidence_native, rtol=PARITY_RTOL, atol=PARITY_ATOL)
+
+    # Served by ONNX Runtime end to end
+    _, _, metadata = onnx_manager.process_tensor(X, model_name, {})
+    assert metadata["backend"] == "onnxruntime"
+
+
+def test_failed_conversion_is_served_natively(models_dir, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("converter crashed")
+
+    monkeypatch.setattr(model_manager, "convert_model", fail)
+    model_id = _train(ModelManager(models_dir=models_dir), "rf", "classification", "random_forest")
+    assert not os.path.exists(os.path.join(models_dir, "scikit-learn", model_id + ONNX_SUFFIX))
+
+    manager = ModelManager(models_dir=models_dir, onnx_backend=OnnxRuntimeBackend())
+    X, _ = _training_data("classification", seed=1)
+    y_pred, _, metadata = manager.process_tensor(X, "rf", {})
+    assert "backend" not in metadata
+    np.testing.assert_array_equal(y_pred, _load(ModelManager(models_dir=models_dir), "rf").predict(X))
+
+
+def test_unloadable_onnx_artifact_is_served_natively(models_dir):
+    model_id = _train(ModelManager(models_dir=models_dir), "lr", "classification", "logistic_regression")
+    with open(os.path.join(models_dir, "scikit-learn", model_id + ONNX_SUFFIX), "wb") as f:
+        f.write(b"not an onnx model")
+
+    manager = ModelManager(models_dir=models_dir, onnx_backend=OnnxRuntimeBackend())
+    X, _ = _training_data("classification", seed=1)
+    y_pred, _, metadata = manager.process_tensor(X, "lr", {})
+    assert "backend" not in metadata
+    assert not isinstance(_load(manager, "lr"), OnnxModel)
+    np.testing.assert_array_equal(y_pred, _load(ModelManager(models_dir=models_dir), "lr").predict(X))
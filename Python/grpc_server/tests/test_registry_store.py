@@ -0,0 +1,154 @@
+"""Registry storage backends and the JSON to SQLite migration."""
+
+import json
+import os
+
+import pytest
+
+from registry_store import (JSON_REGISTRY_FILE, SQLITE_REGISTRY_FILE, JsonRegistryStore,
+                            SqliteRegistryStore, create_registry_store)
+
+
+def _registry():
+    def version(stage, day):
+        return {"stage": stage, "description": f"trained on day {day}",
+                "created_at": f"2024-01-0{day}T00:00:00", "updated_at": f"2024-01-0{day}T00:00:00",
+                "hyperparameters": {"n_estimators": "10"}, "metric_accuracy": 0.9}
+
+    return {
+        "churn": {
+            "name": "churn", "description": "Churn model", "framework": "scikit-learn",
+            "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-03T00:00:00",
+            "latest_version": "v3", "supported_operations": ["predict"],
+            "versions": {"v1": version("archived", 1), "v2": version("production", 2),
+                         "v3": version("staging", 3)},
+            "stage_versions": {"production": "v2", "staging": "v3"},
+        },
+        "images": {
+            "name": "images", "description": "Image model", "framework": "pytorch",
+            "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-02T00:00:00",
+            "latest_version": "v2",
+            "versions": {"v1": version("production", 1), "v2": version("development", 2)},
+            "stage_versions": {"production": "v1", "development": "v2"},
+        },
+    }
+
+
+def _write_json_registry(models_dir, registry):
+    with open(os.path.join(models_dir, JSON_REGISTRY_FILE), "w") as f:
+        json.dump(registry, f)
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    store = create_registry_store(request.param, str(tmp_path))
+    for model_name, info in _registry().items():
+        store.save_model(model_name, info, list(info["versions"]))
+    yield store
+    store.close()
+
+
+def test_migration_imports_the_json_registry_and_retires_the_file(tmp_path):
+    registry = _registry()
+    _write_json_registry(str(tmp_path), registry)
+
+    store = SqliteRegistryStore(str(tmp_path))
+    try:
+        assert store.load() == registry
+    finally:
+        store.close()
+
+    assert not os.path.exists(tmp_path / JSON_REGISTRY_FILE)
+    assert os.path.exists(tmp_path / f"{JSON_REGISTRY_FILE}.migrated")
+    assert os.path.exists(tmp_path / SQLITE_REGISTRY_FILE)
+
+
+def test_migration_keeps_the_stage_mapping(tmp_path):
+    _write_json_registry(str(tmp_path), _registry())
+
+    store = SqliteRegistryStore(str(tmp_path))
+    try:
+        loaded = store.load()
+        assert loaded["churn"]["stage_versions"] == {"production": "v2", "staging": "v3"}
+        assert loaded["images"]["stage_versions"] == {"production": "v1", "development": "v2"}
+        assert {version: info["stage"] for version, info in loaded["churn"]["versions"].items()} == {
+            "v1": "archived", "v2": "production", "v3": "staging"}
+    finally:
+        store.close()
+
+
+def test_migration_does_not_overwrite_an_existing_database(tmp_path):
+    store = SqliteRegistryStore(str(tmp_path))
+    info = _registry()["images"]
+    store.save_model("images", info, list(info["versions"]))
+    store.close()
+
+    # A JSON registry showing up later is left alone
+    _write_json_registry(str(tmp_path), _registry())
+    store = SqliteRegistryStore(str(tmp_path))
+    try:
+        assert list(store.load()) == ["images"]
+    finally:
+        store.close()
+    assert os.path.exists(tmp_path / JSON_REGISTRY_FILE)
+
+
+def test_reopened_store_returns_what_was_saved(tmp_path):
+    for store_class in (JsonRegistryStore, SqliteRegistryStore):
+        models_dir = tmp_path / store_class.__name__
+        models_dir.mkdir()
+        store = store_class(str(models_dir))
+        for model_name, info in _registry().items():
+            store.save_model(model_name, info, list(info["versions"]))
+        store.close()
+
+        store = store_class(str(models_dir))
+        try:
+            assert store.load() == _registry()
+        finally:
+            store.close()
+
+
+def _listed(store, **filters):
+    return sorted((entry["model_name"], entry["version"], entry["stage"])
+                  for entry in store.list_versions(**filters))
+
+
+def test_list_latest_versions(store):
+    assert _listed(store) == [("churn", "v3", "staging"), ("images", "v2", "development")]
+
+
+def test_list_filtered_by_framework(store):
+    assert _listed(store, framework_filter="pytorch") == [("images", "v2", "development")]
+    assert _listed(store, framework_filter="tensorflow") == []
+
+
+def test_list_version_assigned_to_stage(store):
+    assert _listed(store, stage_filter="production") == [("churn", "v2", "production"),
+                                                         ("images", "v1", "production")]
+
+
+def test_list_all_versions(store):
+    assert len(_listed(store, include_all_versions=True)) == 5
+    assert _listed(store, include_all_versions=True, stage_filter="archived") == [("churn", "v1", "archived")]
+    assert _listed(store, include_all_versions=True, framework_filter="scikit-learn",
+                   stage_filter="production") == [("churn", "v2", "production")]
+
+
+def test_list_entries_match_between_backends(tmp_path):
+    entries = []
+    for backend in ("json", "sqlite"):
+        models_dir = tmp_path / backend
+        models_dir.mkdir()
+        store = create_registry_store(backend, str(models_dir))
+        for model_name, info in _registry().items():
+            store.save_model(model_name, info, list(info["versions"]))
+        entries.append(sorted(store.list_versions(include_all_versions=True),
+                              key=lambda entry: (entry["model_name"], entry["version"])))
+        store.close()
+    assert entries[0] == entries[1]
+
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported registry backend"):
+        create_registry_store("postgres", str(tmp_path))
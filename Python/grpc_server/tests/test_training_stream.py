@@ -0,0 +1,118 @@
+"""Incremental parsing and spooling of streamed training data.
+
+Documents are fed to TrainingDataParser split at arbitrary points and
+must produce exactly the rows json.loads gives for the joined text.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from training_stream import ArraySpool, TrainingDataParser
+
+
+def _document(rows: int = 50, seed: int = 0) -> str:
+    rng = np.random.default_rng(seed)
+    features = rng.normal(size=(rows, 3)).round(6).tolist()
+    target = rng.integers(0, 3, size=rows).tolist()
+    return json.dumps({"features": features, "epochs": {"note": "a \"quoted\" ] value"},
+                       "target": target})
+
+
+def _parse(text: str, split_points, block_rows: int = 7):
+    spools = {"features": ArraySpool(np.float64), "target": ArraySpool()}
+    parser = TrainingDataParser(lambda key, rows: spools[key].append(rows), block_rows=block_rows)
+    start = 0
+    for end in sorted(split_points) + [len(text)]:
+        parser.feed(text[start:end])
+        start = end
+    parser.close()
+    return parser, spools
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_split_points_give_the_same_rows(seed):
+    text = _document(seed=seed)
+    rng = np.random.default_rng(seed)
+    splits = rng.choice(np.arange(1, len(text)), size=int(rng.integers(1, 40)), replace=False).tolist()
+
+    parser, spools = _parse(text, splits)
+    expected = json.loads(text)
+
+    np.testing.assert_array_equal(spools["features"].to_array(), np.asarray(expected["features"]))
+    np.testing.assert_array_equal(spools["target"].to_array(), np.asarray(expected["target"]))
+    assert parser.extra == {"epochs": expected["epochs"]}
+    assert parser.seen_keys == ["features", "epochs", "target"]
+
+
+def test_one_character_chunks():
+    text = _document(rows=10)
+    _, spools = _parse(text, range(1, len(text)))
+    np.testing.assert_array_equal(spools["features"].to_array(), np.asarray(json.loads(text)["features"]))
+
+
+def test_number_split_across_chunks_is_not_truncated():
+    _, spools = _parse('{"features": [[1.25, 2]], "target": [12345]}', [39, 40])
+    assert spools["target"].to_array().tolist() == [12345]
+
+
+@pytest.mark.parametrize("text", [
+    '[[1, 2]]',
+    '{"features": [[1, 2]], "target": [1]',
+    '{"features": [[1, 2] [3, 4]], "target": [1, 2]}',
+    '{"features" [[1, 2]], "target": [1]}',
+    '{"features": [[1, 2]], "target": [1]} extra',
+    '{"features": [[1, 2]], "target": [1, }',
+    '{features: [[1, 2]], "target": [1]}',
+])
+def test_malformed_documents_are_rejected(text):
+    with pytest.raises(ValueError):
+        _parse(text, [len(text) // 2])
+
+
+def test_inconsistent_rows_are_rejected():
+    with pytest.raises(ValueError, match="Inconsistent row shape"):
+        _parse('{"features": [[1, 2], [3]], "target": [0, 1]}', [], block_rows=1)
+
+
+def test_spool_spills_to_a_file_above_the_threshold():
+    spool = ArraySpool(np.float64, spool_threshold=1024 * 8 * 2)
+    blocks = [np.full((500, 2), i, dtype=np.float64) for i in range(5)]
+    for block in blocks:
+        spool.append(block)
+
+    assert spool.spooled
+    path = spool._path
+    assert os.path.exists(path)
+    np.testing.assert_array_equal(spool.to_array(), np.concatenate(blocks))
+    assert [len(block) for block in spool.iter_blocks(1000)] == [1000, 1000, 500]
+
+    spool.close()
+    assert not os.path.exists(path)
+
+
+def test_integer_column_is_upcast_when_floats_arrive():
+    spool = ArraySpool()
+    spool.append([1, 2, 3])
+    assert spool.dtype == np.int64
+    spool.append([0.5])
+
+    array = spool.to_array()
+    assert array.dtype == np.float64
+    assert array.tolist() == [1.0, 2.0, 3.0, 0.5]
+
+
+def test_spooled_integer_column_cannot_be_upcast():
+    spool = ArraySpool(spool_threshold=8 * 100)
+    spool.append(list(range(200)))
+    assert spool.spooled
+    with pytest.raises(ValueError, match="Cannot mix integer and float"):
+        spool.append([0.5])
+    spool.close()
+
+
+def test_string_labels_are_kept_as_objects():
+    _, spools = _parse('{"features": [[1], [2], [3]], "target": ["a", "b", "a"]}', [40])
+    assert spools["target"].to_array() == ["a", "b", "a"]
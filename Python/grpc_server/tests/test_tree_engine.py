@@ -0,0 +1,154 @@
+"""Exact parity of CompiledForest with the scikit-learn forests it compiles.
+
+Predictions are compared with assert_array_equal, not a tolerance: the
+compiled tables must reproduce sklearn bit for bit, through the node
+tables (batches up to max_rows), the sklearn fallback and a joblib
+memory-mapped reload.
+"""
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import (ExtraTreesClassifier, ExtraTreesRegressor,
+                              RandomForestClassifier, RandomForestRegressor)
+
+from tree_engine import CompiledForest, compile_model
+
+CLASSIFIERS = [RandomForestClassifier, ExtraTreesClassifier]
+REGRESSORS = [RandomForestRegressor, ExtraTreesRegressor]
+
+
+def _data(n_samples: int = 300, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_samples, 6))
+    # Integer-valued features put many samples right next to split thresholds
+    X[:, 4] = rng.integers(0, 5, size=n_samples)
+    X[:, 5] = rng.integers(0, 3, size=n_samples)
+    return X
+
+
+def _fit(forest_class, y, X, **params):
+    return forest_class(n_estimators=25, random_state=0, **params).fit(X, y)
+
+
+def _threshold_samples(forest, X):
+    """Rows with features set exactly on, just below and just above split thresholds."""
+    rows = []
+    for tree in forest.estimators_[:4]:
+        t = tree.tree_
+        for node in np.flatnonzero(t.children_left != -1)[:20]:
+            threshold = np.float32(t.threshold[node])
+            for value in (threshold, np.nextafter(threshold, np.float32(-np.inf)),
+                          np.nextafter(threshold, np.float32(np.inf))):
+                row = X[node % len(X)].copy()
+                row[t.feature[node]] = value
+                rows.append(row)
+    return np.asarray(rows)
+
+
+def _assert_same_predictions(compiled, forest, X):
+    if hasattr(forest, "classes_"):
+        np.testing.assert_array_equal(compiled.predict_proba(X), forest.predict_proba(X))
+        np.testing.assert_array_equal(compiled.predict(X), forest.predict(X))
+        labels, confidence = compiled.predict_with_confidence(X)
+        np.testing.assert_array_equal(labels, forest.predict(X))
+        np.testing.assert_array_equal(confidence, forest.predict_proba(X).max(axis=1))
+    else:
+        np.testing.assert_array_equal(compiled.predict(X), forest.predict(X))
+
+
+@pytest.mark.parametrize("forest_class", CLASSIFIERS)
+def test_classifier_parity(forest_class):
+    X = _data()
+    y = (X[:, 0] + X[:, 4] > 2).astype(int) + (X[:, 1] > 1).astype(int)
+    forest = _fit(forest_class, y, X)
+    compiled = compile_model(forest)
+    assert isinstance(compiled, CompiledForest)
+
+    X_test = _data(200, seed=1)
+    _assert_same_predictions(compiled, forest, X_test)
+    _assert_same_predictions(compiled, forest, X_test[:1])
+
+
+@pytest.mark.parametrize("forest_class", REGRESSORS)
+def test_regressor_parity(forest_class):
+    X = _data()
+    y = 2.0 * X[:, 0] - X[:, 4] + 0.1 * X[:, 2]
+    forest = _fit(forest_class, y, X)
+    compiled = compile_model(forest)
+    assert isinstance(compiled, CompiledForest)
+
+    _assert_same_predictions(compiled, forest, _data(200, seed=1))
+
+
+@pytest.mark.parametrize("forest_class", CLASSIFIERS + REGRESSORS)
+def test_samples_on_split_thresholds(forest_class):
+    X = _data()
+    if forest_class in CLASSIFIERS:
+        y = (X[:, 4] >= 2).astype(int) + (X[:, 5] == 1).astype(int)
+    else:
+        y = X[:, 4] * 1.5 - X[:, 5]
+    forest = _fit(forest_class, y, X)
+    compiled = CompiledForest(forest)
+
+    edges = _threshold_samples(forest, X)
+    assert 0 < len(edges) <= compiled.max_rows
+    _assert_same_predictions(compiled, forest, edges)
+
+
+@pytest.mark.parametrize("forest_class", CLASSIFIERS)
+def test_string_labels(forest_class):
+    X = _data()
+    y = np.where(X[:, 0] > 0.3, "high", np.where(X[:, 0] < -0.3, "low", "mid"))
+    forest = _fit(forest_class, y, X)
+    compiled = CompiledForest(forest)
+
+    X_test = _data(100, seed=2)
+    _assert_same_predictions(compiled, forest, X_test)
+    assert compiled.predict(X_test).dtype == forest.predict(X_test).dtype
+
+
+@pytest.mark.parametrize("forest_class", CLASSIFIERS + REGRESSORS)
+def test_large_batches_use_the_forest(forest_class):
+    X = _data()
+    y = (X[:, 0] > 0).astype(int) if forest_class in CLASSIFIERS else X[:, 0]
+    forest = _fit(forest_class, y, X)
+    compiled = CompiledForest(forest, max_rows=16)
+
+    _assert_same_predictions(compiled, forest, _data(64, seed=3))
+
+
+@pytest.mark.parametrize("forest_class", CLASSIFIERS + REGRESSORS)
+def test_memory_mapped_reload(forest_class, tmp_path):
+    X = _data()
+    if forest_class in CLASSIFIERS:
+        y = np.where(X[:, 0] + X[:, 4] > 2, "yes", "no")
+    else:
+        y = 2.0 * X[:, 0] - X[:, 4]
+    forest = _fit(forest_class, y, X)
+    path = str(tmp_path / "forest.joblib")
+    joblib.dump(CompiledForest(forest, max_rows=100), path)
+
+    loaded = joblib.load(path, mmap_mode="c")
+    assert isinstance(loaded, CompiledForest)
+    assert not loaded.estimator_loaded
+
+    X_test = _data(100, seed=4)
+    _assert_same_predictions(loaded, forest, X_test)
+    # Scoring through the node tables does not rebuild the sklearn trees
+    assert not loaded.estimator_loaded
+
+    # Larger batches rebuild the trees from the memory-mapped arrays
+    X_large = _data(250, seed=5)
+    _assert_same_predictions(loaded, forest, X_large)
+    assert loaded.estimator_loaded
+    for rebuilt, original in zip(loaded.estimator.estimators_, forest.estimators_):
+        np.testing.assert_array_equal(rebuilt.tree_.threshold, original.tree_.threshold)
+        np.testing.assert_array_equal(rebuilt.tree_.value, original.tree_.value)
+
+
+def test_other_models_are_not_compiled():
+    X = _data()
+    y = X[:, 0]
+    multi_output = RandomForestRegressor(n_estimators=3, random_state=0).fit(X, np.c_[y, y])
+    assert compile_model(multi_output) is multi_output
@@ -0,0 +1,426 @@
+"""Asynchronous training jobs.
+
+Training requests are queued in a bounded ``TrainingJobScheduler`` and run
+in dedicated worker processes, one process per job, so ``model.fit`` never
+competes with inference for the server's threads or GIL. The job process
+trains and saves the model; the server process then registers the new
+version, so the registry is only ever written by the server.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("gRPC_Server")
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+def _job_main(conn: Any, models_dir: str, registry_backend: str, request: Dict[str, Any]) -> None:
+    """Entry point of a training job process.
+
+    Args:
+        conn: Pipe connection to the server process
+        models_dir: Directory to save the model to
+        registry_backend: Registry storage backend of the server
+        request: Training request (see TrainingJobScheduler.submit)
+    """
+    # Imported here so the job builds its own manager inside the child process
+    from model_manager import ModelManager
+
+    try:
+        manager = ModelManager(models_dir=models_dir, registry_backend=registry_backend)
+        success, model_id, metrics, version = manager.fit_and_save(
+            request["training_data"],
+            request["model_name"],
+            request["hyperparameters"],
+            request["validate"],
+            request["framework"],
+            progress=lambda update: conn.send(("progress", update))
+        )
+        if success:
+            conn.send(("done", model_id, version, metrics))
+        else:
+            conn.send(("error", metrics.get("error", "Training failed")))
+    except Exception as e:
+        conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+
+class TrainingJob:
+    """State and progress of one training job."""
+
+    def __init__(self, job_id: str, request: Dict[str, Any]):
+        self.job_id = job_id
+        self.request: Optional[Dict[str, Any]] = request
+        self.model_name = request["model_name"]
+        self.framework = request["framework"]
+        self.state = QUEUED
+        self.epoch = 0
+        self.total_epochs = 0
+        self.loss: Optional[float] = None
+        self.message = ""
+        self.error_message = ""
+        self.model_id = ""
+        self.version = ""
+        self.stage = ""
+        self.metrics: Dict[str, float] = {}
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.process: Any = None
+        self.revision = 0
+
+    def to_dict(self, queue_position: int = 0) -> Dict[str, Any]:
+        """Get a snapshot of the job.
+
+        Args:
+            queue_position: Number of jobs ahead of this one (queued jobs only)
+
+        Returns:
+            Dictionary with state, progress, ETA and result of the job, and
+            its revision (incremented on every change)
+        """
+        now = time.time()
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or now) - self.started_at
+
+        progress = 0.0
+        eta = 0.0
+        if self.state == SUCCEEDED:
+            progress = 1.0
+        elif self.total_epochs > 0 and self.epoch > 0:
+            progress = min(1.0, self.epoch / self.total_epochs)
+            if self.state == RUNNING:
+                eta = elapsed / self.epoch * (self.total_epochs - self.epoch)
+
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "model_name": self.model_name,
+            "framework": self.framework,
+            "epoch": self.epoch,
+            "total_epochs": self.total_epochs,
+            "loss": self.loss,
+            "progress": progress,
+            "eta_seconds": eta,
+            "elapsed_seconds": elapsed,
+            "queue_position": queue_position,
+            "message": self.message,
+            "error_message": self.error_message,
+            "model_id": self.model_id,
+            "version": self.version,
+            "stage": self.stage,
+            "metrics": dict(self.metrics),
+            "revision": self.revision,
+        }
+
+
+class TrainingJobScheduler:
+    """Bounded queue of training jobs executed in worker processes.
+
+    Supports:
+    - A fixed number of concurrently running job processes
+    - A bounded queue of waiting jobs (submissions beyond it are rejected)
+    - Epoch, loss and ETA progress reported by the trainers
+    - Cancellation of queued and running jobs
+    """
+
+    def __init__(self, model_manager: Any, max_workers: int = 2, max_queued: int = 16,
+                 history: int = 100, metrics: Any = None):
+        """Initialize the scheduler.
+
+        Args:
+            model_manager: Server ModelManager that registers finished models
+            max_workers: Maximum number of training processes running at once
+            max_queued: Maximum number of jobs waiting to run
+            history: Number of finished jobs kept for polling
+            metrics: Optional ServerMetrics recording training durations
+        """
+        self.model_manager = model_manager
+        self.metrics = metrics
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max_queued
+        self.history = history
+
+        # Spawn (rather than fork) so job processes never inherit gRPC threads
+        self._context = multiprocessing.get_context("spawn")
+        self._changed = threading.Condition()
+        self._jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+        self._queue: "deque[TrainingJob]" = deque()
+        self._running = 0
+        self._closed = False
+
+    def submit(self, training_data: Any, model_name: str, hyperparameters: Dict[str, str],
+               validate: bool, framework: str = "scikit-learn",
+               initial_stage: str = "development") -> Dict[str, Any]:
+        """Queue a training job.
+
+        Args:
+            training_data: Training data (JSON string, Arrow IPC stream bytes or a DatasetSource)
+            model_name: Name of the model
+            hyperparameters: Hyperparameters for the model
+            validate: Whether to validate the model after training
+            framework: ML framework to use
+            initial_stage: Initial stage for the new version
+
+        Returns:
+            Snapshot of the queued job
+
+        Raises:
+            ValueError: If the request is invalid or the queue is full
+        """
+        if not model_name:
+            raise ValueError("model_name is required")
+        self.model_manager.check_training_options(framework, initial_stage)
+
+        request = {
+            "training_data": training_data,
+            "model_name": model_name,
+            "hyperparameters": hyperparameters,
+            "validate": validate,
+            "framework": framework,
+            "initial_stage": initial_stage,
+        }
+
+        with self._changed:
+            if self._closed:
+                raise ValueError("Training job scheduler is shut down")
+            if len(self._queue) >= self.max_queued:
+                raise ValueError(f"Training queue is full ({self.max_queued} jobs waiting)")
+
+            job = TrainingJob(uuid.uuid4().hex, request)
+            self._jobs[job.job_id] = job
+            self._queue.append(job)
+            logger.info(f"Queued training job {job.job_id} for model {model_name}")
+            self._dispatch()
+            return self._snapshot(job)
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        """Get a snapshot of a job.
+
+        Raises:
+            ValueError: If the job does not exist
+        """
+        with self._changed:
+            return self._snapshot(self._find(job_id))
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait until a job has finished.
+
+        Args:
+            job_id: Job to wait for
+            timeout: Maximum time to wait in seconds (None waits forever)
+
+        Returns:
+            Snapshot of the job (still running if the timeout expired)
+        """
+        with self._changed:
+            job = self._find(job_id)
+            self._changed.wait_for(lambda: job.state in FINISHED_STATES, timeout)
+            return self._snapshot(job)
+
+    def watch(self, job_id: str, is_active: Any = None, interval: float = 1.0) -> Iterator[Dict[str, Any]]:
+        """Yield job snapshots whenever the job changes, until it has finished.
+
+        Args:
+            job_id: Job to watch
+            is_active: Optional callable; watching stops when it returns False
+            interval: Maximum time between snapshots (keeps the ETA fresh)
+
+        Yields:
+            Job snapshots, the last one in a finished state
+        """
+        revision = -1
+        while True:
+            with self._changed:
+                job = self._find(job_id)
+                self._changed.wait_for(lambda: job.revision != revision, interval)
+                revision = job.revision
+                snapshot = self._snapshot(job)
+
+            yield snapshot
+            if snapshot["state"] in FINISHED_STATES:
+                return
+            if is_active is not None and not is_active():
+                return
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a queued or running job (finished jobs are left unchanged).
+
+        Raises:
+            ValueError: If the job does not exist
+        """
+        with self._changed:
+            job = self._find(job_id)
+            if job.state == QUEUED:
+                self._queue.remove(job)
+                self._finish(job, CANCELLED, message="Cancelled before it started")
+            elif job.state == RUNNING:
+                # The monitor thread finishes the bookkeeping once the process exits
+                self._finish(job, CANCELLED, message="Cancelled while running")
+                if job.process is not None:
+                    job.process.terminate()
+            logger.info(f"Cancelled training job {job_id}")
+            return self._snapshot(job)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Get snapshots of all known jobs, oldest first."""
+        with self._changed:
+            return [self._snapshot(job) for job in self._jobs.values()]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics.
+
+        Returns:
+            Dictionary with queued and running job counts and limits
+        """
+        with self._changed:
+            return {
+                "queued": len(self._queue),
+                "running": self._running,
+                "max_workers": self.max_workers,
+                "max_queued": self.max_queued,
+            }
+
+    def shutdown(self) -> None:
+        """Cancel all jobs and stop the running job processes."""
+        with self._changed:
+            self._closed = True
+            while self._queue:
+                self._finish(self._queue.popleft(), CANCELLED, message="Server shutting down")
+            processes = [job.process for job in self._jobs.values() if job.process is not None]
+
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout=5)
+
+    def _find(self, job_id: str) -> TrainingJob:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"Training job '{job_id}' does not exist")
+        return job
+
+    def _snapshot(self, job: TrainingJob) -> Dict[str, Any]:
+        position = 0
+        if job.state == QUEUED:
+            position = self._queue.index(job)
+        return job.to_dict(queue_position=position)
+
+    def _finish(self, job: TrainingJob, state: str, message: str = "", error_message: str = "") -> None:
+        """Move a job to a finished state (caller holds the lock)."""
+        job.state = state
+        job.message = message or job.message
+        job.error_message = error_message
+        job.finished_at = time.time()
+        job.request = None
+        job.revision += 1
+        self._changed.notify_all()
+
+        if self.metrics is not None and job.started_at is not None:
+            self.metrics.observe_training(job.framework, state, job.finished_at - job.started_at)
+
+        # Forget the oldest finished jobs beyond the history limit
+        finished = [key for key, other in self._jobs.items() if other.state in FINISHED_STATES]
+        for key in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[key]
+
+    def _dispatch(self) -> None:
+        """Start queued jobs while worker slots are free (caller holds the lock)."""
+        while self._queue and self._running < self.max_workers and not self._closed:
+            job = self._queue.popleft()
+            request = job.request
+
+            parent_conn, child_conn = self._context.Pipe(duplex=False)
+            process = self._context.Process(
+                target=_job_main,
+                args=(child_conn, self.model_manager.models_dir, self.model_manager.registry_backend, request),
+                name=f"training-job-{job.job_id[:8]}",
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+
+            job.process = process
+            job.state = RUNNING
+            job.started_at = time.time()
+            job.revision += 1
+            self._running += 1
+            self._changed.notify_all()
+
+            monitor = threading.Thread(target=self._monitor, args=(job, request, parent_conn),
+                                       name=f"training-job-{job.job_id[:8]}-monitor", daemon=True)
+            monitor.start()
+            logger.info(f"Started training job {job.job_id} (pid {process.pid})")
+
+    def _monitor(self, job: TrainingJob, request: Dict[str, Any], conn: Any) -> None:
+        """Apply progress messages of a job process and register its result."""
+        outcome = None
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+
+            if message[0] == "progress":
+                with self._changed:
+                    update = message[1]
+                    job.epoch = int(update.get("epoch", job.epoch))
+                    job.total_epochs = int(update.get("total_epochs", job.total_epochs))
+                    if update.get("loss") is not None:
+                        job.loss = float(update["loss"])
+                    job.message = update.get("message", job.message)
+                    job.revision += 1
+                    self._changed.notify_all()
+            else:
+                outcome = message
+                break
+
+        conn.close()
+        job.process.join()
+
+        with self._changed:
+            self._running -= 1
+            # A job cancelled in the meantime keeps its cancelled state
+            if job.state == RUNNING:
+                if outcome is None:
+                    self._finish(job, FAILED, error_message=f"Training process exited with code {job.process.exitcode}")
+                elif outcome[0] == "error":
+                    self._finish(job, FAILED, error_message=outcome[1])
+                else:
+                    self._register(job, request, outcome)
+            job.process = None
+            self._dispatch()
+
+        logger.info(f"Training job {job.job_id} finished: {job.state}")
+
+    def _register(self, job: TrainingJob, request: Dict[str, Any], outcome: Any) -> None:
+        """Register the model saved by a successful job (caller holds the lock)."""
+        _, model_id, version, metrics = outcome
+        try:
+            self.model_manager.register_version(
+                job.model_name, version, job.framework, request["hyperparameters"],
+                metrics, request["initial_stage"])
+        except Exception as e:
+            self._finish(job, FAILED, error_message=f"Error registering model: {str(e)}")
+            return
+
+        job.model_id = model_id
+        job.version = version
+        job.stage = request["initial_stage"]
+        job.metrics = {key: float(value) for key, value in metrics.items()}
+        self._finish(job, SUCCEEDED, message="Training completed")
@@ -0,0 +1,396 @@
+"""Incremental ingestion of streamed training data.
+
+Training chunks are parsed as they arrive instead of being joined into one
+string: rows are decoded one at a time and appended to ``ArraySpool``
+buffers, which grow in memory up to a threshold and then continue in a
+memory-mapped file, so peak memory stays bounded by the spool threshold
+rather than by the size of the dataset.
+"""
+
+import json
+import os
+import re
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Datasets larger than this are spooled to a memory-mapped file
+DEFAULT_SPOOL_THRESHOLD = 256 * 1024 * 1024
+
+# Rows decoded per block before they are converted to an array
+DEFAULT_BLOCK_ROWS = 4096
+
+# Keys of the training document that are parsed row by row
+ROW_KEYS = ("features", "target")
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class ArraySpool:
+    """Append-only array that spills to a memory-mapped file when it grows large.
+
+    Rows are stored in a preallocated buffer that doubles when full. Once
+    the buffer would exceed the spool threshold, its contents move to a
+    temporary file and later rows are appended to that file.
+    """
+
+    def __init__(self, dtype: Any = None, capacity: int = 0,
+                 spool_threshold: int = DEFAULT_SPOOL_THRESHOLD):
+        """Initialize the spool.
+
+        Args:
+            dtype: Row dtype (None infers it from the first block)
+            capacity: Expected number of rows, used to preallocate the buffer
+            spool_threshold: Maximum in-memory size in bytes before spilling to disk
+        """
+        self.dtype = np.dtype(dtype) if dtype is not None else None
+        self.infer_dtype = dtype is None
+        self.capacity = capacity
+        self.spool_threshold = spool_threshold
+        self.row_shape: Optional[Tuple[int, ...]] = None
+        self.rows = 0
+        self._buffer: Optional[np.ndarray] = None
+        self._objects: Optional[List[Any]] = None
+        self._file: Any = None
+        self._path: Optional[str] = None
+
+    @property
+    def spooled(self) -> bool:
+        """Whether the rows are stored in a file."""
+        return self._path is not None
+
+    def append(self, block: Any) -> None:
+        """Append a block of rows.
+
+        Args:
+            block: Rows as a list or array (first axis is the row axis)
+
+        Raises:
+            ValueError: If the rows do not match the shape of earlier rows
+        """
+        if self._objects is not None:
+            self._objects.extend(block)
+            self.rows += len(block)
+            return
+
+        array = np.asarray(block) if self.infer_dtype else np.asarray(block, dtype=self.dtype)
+        if len(array) == 0:
+            return
+
+        if self.row_shape is None:
+            if self.infer_dtype:
+                # Non-numeric values (e.g. string labels) are kept as Python objects
+                if array.dtype.kind not in "biuf":
+                    self._objects = list(block)
+                    self.rows = len(block)
+                    return
+                self.dtype = np.dtype(np.float64) if array.dtype.kind == "f" else array.dtype
+            self.row_shape = array.shape[1:]
+        elif array.shape[1:] != self.row_shape:
+            raise ValueError(f"Inconsistent row shape {array.shape[1:]}, expected {self.row_shape}")
+
+        if self.infer_dtype:
+            if array.dtype.kind == "f" and self.dtype.kind != "f":
+                self._upcast()
+            array = array.astype(self.dtype, copy=False)
+
+        if self._path is not None:
+            self._file.write(np.ascontiguousarray(array).tobytes())
+            self.rows += len(array)
+            return
+
+        self._reserve(self.rows + len(array))
+        if self._path is not None:
+            self._file.write(np.ascontiguousarray(array).tobytes())
+        else:
+            self._buffer[self.rows:self.rows + len(array)] = array
+        self.rows += len(array)
+
+    def _upcast(self) -> None:
+        """Switch integer rows to float64 when float values show up."""
+        if self._path is not None:
+            raise ValueError("Cannot mix integer and float values in a spooled column")
+        self.dtype = np.dtype(np.float64)
+        if self._buffer is not None:
+            self._buffer = self._buffer.astype(self.dtype)
+
+    def _reserve(self, rows: int) -> None:
+        """Make room for ``rows`` rows, spilling to disk above the threshold."""
+        if self._buffer is not None and rows <= len(self._buffer):
+            return
+
+        capacity = max(rows, self.capacity, 2 * (len(self._buffer) if self._buffer is not None else 0), 1024)
+        if self.spool_threshold:
+            row_bytes = max(1, self.dtype.itemsize * int(np.prod(self.row_shape, dtype=np.int64)))
+            max_rows = self.spool_threshold // row_bytes
+            if rows > max_rows:
+                self._spill()
+                return
+            capacity = min(capacity, max_rows)
+
+        buffer = np.empty((capacity,) + self.row_shape, dtype=self.dtype)
+        if self._buffer is not None:
+            buffer[:self.rows] = self._buffer[:self.rows]
+        self._buffer = buffer
+
+    def _spill(self) -> None:
+        """Move the buffered rows to a temporary file."""
+        fd, self._path = tempfile.mkstemp(prefix="train-spool-", suffix=".bin")
+        self._file = os.fdopen(fd, "wb")
+        if self._buffer is not None:
+            self._file.write(np.ascontiguousarray(self._buffer[:self.rows]).tobytes())
+        self._buffer = None
+
+    def to_array(self) -> Any:
+        """Get all rows.
+
+        Returns:
+            An array (a read-write memmap when spooled), or a list for non-numeric values
+        """
+        if self._objects is not None:
+            return self._objects
+        if self.row_shape is None:
+            return np.empty((0,), dtype=self.dtype or np.float64)
+
+        if self._path is not None:
+            self._file.flush()
+            if self.rows == 0:
+                return np.empty((0,) + self.row_shape, dtype=self.dtype)
+            return np.memmap(self._path, dtype=self.dtype, mode="r+", shape=(self.rows,) + self.row_shape)
+
+        return self._buffer[:self.rows]
+
+    def iter_blocks(self, block_rows: int):
+        """Iterate over the rows in blocks.
+
+        Args:
+            block_rows: Rows per block
+
+        Yields:
+            Consecutive row blocks
+        """
+        array = self.to_array()
+        for start in range(0, len(array), block_rows):
+            yield array[start:start + block_rows]
+
+    def close(self) -> None:
+        """Release the buffer and delete the spool file."""
+        self._buffer = None
+        self._objects = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._path is not None:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+            self._path = None
+
+
+class TrainingDataParser:
+    """Incremental parser for a training document split across chunks.
+
+    Parses ``{"features": [...], "target": [...], ...}`` as text arrives.
+    Elements of the ``features`` and ``target`` arrays are decoded one at a
+    time and handed to ``on_rows`` in blocks; other keys are decoded whole
+    into ``extra``. Only the undecoded tail of the text is kept in memory.
+    """
+
+    def __init__(self, on_rows: Callable[[str, List[Any]], None], block_rows: int = DEFAULT_BLOCK_ROWS):
+        """Initialize the parser.
+
+        Args:
+            on_rows: Callback receiving (key, rows) for each decoded block
+            block_rows: Rows per block passed to on_rows
+        """
+        self.on_rows = on_rows
+        self.block_rows = block_rows
+        self.extra: Dict[str, Any] = {}
+        self.seen_keys: List[str] = []
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._rows: List[Any] = []
+        self._retry_at = 0
+
+    def feed(self, text: str) -> None:
+        """Parse the next piece of the document.
+
+        Args:
+            text: Next chunk of the JSON text
+
+        Raises:
+            ValueError: If the text is not a valid training document
+        """
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+
+        # Incomplete values are retried once enough new text has arrived
+        if len(self._buffer) < self._retry_at:
+            return
+        self._retry_at = 0
+        self._parse(final=False)
+
+    def close(self) -> None:
+        """Finish parsing once all chunks were fed.
+
+        Raises:
+            ValueError: If the document is incomplete or invalid
+        """
+        self._parse(final=True)
+        if self._state != "end":
+            raise ValueError("Invalid JSON training data: unexpected end of data")
+        if self._buffer[self._skip(self._pos):]:
+            raise ValueError("Invalid JSON training data: extra data after the document")
+
+    def _skip(self, pos: int) -> int:
+        return _WHITESPACE.match(self._buffer, pos).end()
+
+    def _decode(self, pos: int, final: bool) -> Optional[Tuple[Any, int]]:
+        """Decode one JSON value, or return None if more text is needed."""
+        try:
+            value, end = _DECODER.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError as e:
+            incomplete = e.pos >= len(self._buffer) - 64 or e.msg.startswith("Unterminated string")
+            if final or not incomplete:
+                raise ValueError(f"Invalid JSON training data: {e.msg}")
+            return None
+
+        # A number at the very end of the text may continue in the next chunk
+        if not final and end == len(self._buffer) and isinstance(value, (int, float)):
+            return None
+        return value, end
+
+    def _wait(self) -> None:
+        """Wait for more text before retrying an incomplete value."""
+        self._retry_at = 2 * (len(self._buffer) - self._pos)
+
+    def _flush(self) -> None:
+        if self._rows:
+            self.on_rows(self._key, self._rows)
+            self._rows = []
+
+    def _read_rows(self, final: bool) -> None:
+        """Fast path decoding ``, row`` pairs until anything unusual shows up.
+
+        Incomplete or invalid rows are left to the general state machine.
+        """
+        buffer = self._buffer
+        size = len(buffer)
+        match = _WHITESPACE.match
+        decode = _DECODER.raw_decode
+        rows = self._rows
+
+        while True:
+            pos = match(buffer, self._pos).end()
+            if pos >= size or buffer[pos] != ",":
+                return
+            try:
+                row, end = decode(buffer, match(buffer, pos + 1).end())
+            except json.JSONDecodeError:
+                return
+            if end == size and not final and isinstance(row, (int, float)):
+                return
+
+            rows.append(row)
+            self._pos = end
+            if len(rows) >= self.block_rows:
+                self._flush()
+                rows = self._rows
+
+    def _parse(self, final: bool) -> None:
+        buffer = self._buffer
+        while True:
+            pos = self._skip(self._pos)
+            if pos >= len(buffer):
+                self._pos = pos
+                if final:
+                    self._flush()
+                return
+            char = buffer[pos]
+
+            if self._state == "start":
+                if char != "{":
+                    raise ValueError("Training data must be a JSON object with 'features' and 'target' keys")
+                self._pos = pos + 1
+                self._state = "key"
+
+            elif self._state == "key":
+                if char == "}" and not self.seen_keys:
+                    self._pos = pos + 1
+                    self._state = "end"
+                    continue
+                if char != '"':
+                    raise ValueError("Invalid JSON training data: expecting a key")
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    self._pos = pos
+                    self._wait()
+                    return
+                self._key, self._pos = decoded
+                self.seen_keys.append(self._key)
+                self._state = "colon"
+
+            elif self._state == "colon":
+                if char != ":":
+                    raise ValueError("Invalid JSON training data: expecting ':'")
+                self._pos = pos + 1
+                self._state = "value"
+
+            elif self._state == "value":
+                if self._key in ROW_KEYS and char == "[":
+                    self._pos = pos + 1
+                    self._state = "first_row"
+                    continue
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    self._pos = pos
+                    self._wait()
+                    return
+                self.extra[self._key], self._pos = decoded
+                self._state = "next_key"
+
+            elif self._state in ("first_row", "row"):
+                if char == "]" and self._state == "first_row":
+                    self._pos = pos + 1
+                    self._state = "next_key"
+                    continue
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    self._pos = pos
+                    self._wait()
+                    return
+                row, self._pos = decoded
+                self._rows.append(row)
+                if len(self._rows) >= self.block_rows:
+                    self._flush()
+                self._state = "row_separator"
+                self._read_rows(final)
+
+            elif self._state == "row_separator":
+                if char == ",":
+                    self._state = "row"
+                elif char == "]":
+                    self._flush()
+                    self._state = "next_key"
+                else:
+                    raise ValueError("Invalid JSON training data: expecting ',' or ']'")
+                self._pos = pos + 1
+
+            elif self._state == "next_key":
+                if char == ",":
+                    self._state = "key"
+                elif char == "}":
+                    self._state = "end"
+                else:
+                    raise ValueError("Invalid JSON training data: expecting ',' or '}'")
+                self._pos = pos + 1
+
+            else:
+                # Trailing text is reported by close()
+                self._pos = pos
+                return
@@ -0,0 +1,334 @@
+"""Vectorized inference for fitted scikit-learn tree ensembles.
+
+``CompiledForest`` packs every tree of a fitted random forest (or extra
+trees ensemble) into flat node tables (feature, threshold, children and
+leaf values) when the model is loaded. A batch is scored by walking all
+trees at once: each step advances every (row, tree) pair that is still at
+a split node, so the work is one NumPy pass per tree level instead of one
+Python call per tree. Classifiers compute the class probabilities once
+and derive both the predicted class and the confidence from them.
+
+The flat tables avoid sklearn's per-call overhead, which dominates small
+and medium batches. Above ``max_rows`` rows sklearn's compiled traversal
+is faster, so large batches use the forest's own predict_proba (still
+computed only once).
+
+Results match scikit-learn exactly: inputs are compared as float32 like
+sklearn's tree code, leaf probabilities are normalized the same way, and
+tree outputs are accumulated in estimator order.
+
+A pickled ``CompiledForest`` holds no pickled trees: the node tables, the
+remaining node fields of sklearn's trees (impurity, sample counts, ...)
+and the raw leaf values are all plain arrays, plus the forest's
+parameters without its trees. Loaded with ``joblib.load(path,
+mmap_mode="c")`` every array is memory-mapped, so loading is near-instant
+and processes loading the same artifact share its pages. The sklearn
+trees are only rebuilt from those arrays when the original forest is
+actually needed (sklearn's Tree copies its nodes into private memory).
+"""
+
+import copy
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from sklearn.ensemble import (ExtraTreesClassifier, ExtraTreesRegressor,
+                              RandomForestClassifier, RandomForestRegressor)
+
+# Ensembles that can be compiled
+COMPILABLE_FORESTS = (RandomForestClassifier, RandomForestRegressor,
+                      ExtraTreesClassifier, ExtraTreesRegressor)
+
+# Upper bound on (row, tree) pairs traversed at once
+MAX_PAIRS_PER_BLOCK = 1 << 20
+
+# Largest batch scored with the node tables (measured crossover with sklearn
+# for 100-tree forests)
+DEFAULT_MAX_ROWS = 256
+
+_LEAF = -1
+
+# Feature and threshold sklearn stores for leaves
+_UNDEFINED = -2
+
+# Node fields stored in the node tables (every other field is kept for rebuilding the trees)
+_TABLE_FIELDS = ("left_child", "right_child", "feature", "threshold")
+
+# Node table attributes (memory-mapped when loaded with joblib mmap_mode)
+_TABLES = ("feature", "threshold", "left", "right", "value", "normalizer", "roots", "node_counts")
+
+
+class CompiledForest:
+    """Tree ensemble compiled into flat node tables.
+
+    Attributes not defined here are read from the original estimator,
+    which is also used for batches above ``max_rows`` and for any input
+    the compiled tables do not handle (sparse, non-numeric or non-finite
+    values, wrong feature count) so errors stay sklearn's own. After
+    unpickling, the estimator's trees are rebuilt from the node arrays on
+    first use.
+    """
+
+    def __init__(self, estimator: Any, max_rows: int = DEFAULT_MAX_ROWS):
+        """Compile a fitted forest.
+
+        Args:
+            estimator: Fitted forest (see COMPILABLE_FORESTS) with a single output
+            max_rows: Largest batch scored with the node tables
+        """
+        self._estimator = estimator
+        self._estimator_lock = threading.Lock()
+        self.max_rows = max_rows
+        self.is_classifier = hasattr(estimator, "classes_")
+        if self.is_classifier:
+            self.classes_ = estimator.classes_
+        self.n_trees = len(estimator.estimators_)
+        self.n_features = estimator.n_features_in_
+        self.feature_importances_ = estimator.feature_importances_
+
+        features, thresholds, lefts, rights, values, roots, node_counts = [], [], [], [], [], [], []
+        states = []
+        offset = 0
+        for tree in estimator.estimators_:
+            t = tree.tree_
+            state = t.__getstate__()
+            states.append(state)
+            roots.append(offset)
+            node_counts.append(t.node_count)
+            is_leaf = t.children_left == _LEAF
+
+            # Children become indices into the packed tables; leaves keep -1
+            features.append(np.where(is_leaf, 0, t.feature))
+            thresholds.append(t.threshold)
+            lefts.append(np.where(is_leaf, _LEAF, t.children_left + offset))
+            rights.append(np.where(is_leaf, _LEAF, t.children_right + offset))
+
+            # Raw leaf values: class weights of classifiers, predictions of regressors
+            values.append(state["values"][:, 0, :])
+            offset += t.node_count
+
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds).astype(np.float64)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.node_counts = np.asarray(node_counts, dtype=np.intp)
+        self.node_count = offset
+        self.max_depths = [state["max_depth"] for state in states]
+        self.max_depth = max(self.max_depths)
+
+        value = np.concatenate(values)
+        if self.is_classifier:
+            # Same normalization as DecisionTreeClassifier.predict_proba, applied when scoring
+            self.value = value[:, :estimator.n_classes_]
+            self.normalizer = self.value.sum(axis=1)
+            self.normalizer[self.normalizer == 0.0] = 1.0
+        else:
+            self.value = value[:, 0]
+            self.normalizer = np.ones(0)
+
+        # Everything else needed to rebuild the sklearn trees, also as plain arrays
+        self._node_dtype = states[0]["nodes"].dtype
+        self._node_fields = {name: np.concatenate([state["nodes"][name] for state in states])
+                             for name in self._node_dtype.names if name not in _TABLE_FIELDS}
+        self._tree_args = estimator.estimators_[0].tree_.__reduce__()[1]
+
+        # The forest and one tree without node data; the trees of a forest only
+        # differ in their random_state, so one stripped tree stands for all of them
+        self._shell = copy.copy(estimator)
+        self._shell.estimators_ = []
+        self._tree_shell = copy.copy(estimator.estimators_[0])
+        del self._tree_shell.tree_
+        self._random_states = [tree.random_state for tree in estimator.estimators_]
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing on the compiled forest; private
+        # names are never delegated (they are looked up while unpickling)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.estimator, name)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_estimator_lock"]
+        state["_estimator"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._estimator_lock = threading.Lock()
+        # np.memmap adds per-operation overhead; plain views of the mapping share the same pages
+        for name in _TABLES:
+            setattr(self, name, np.asarray(getattr(self, name)))
+        self._node_fields = {name: np.asarray(array) for name, array in self._node_fields.items()}
+
+    @property
+    def estimator(self) -> Any:
+        """The original forest (rebuilt from the node arrays on first use after loading)."""
+        if self._estimator is None:
+            with self._estimator_lock:
+                if self._estimator is None:
+                    self._estimator = self._rebuild_estimator()
+        return self._estimator
+
+    def _rebuild_estimator(self) -> Any:
+        """Rebuild the sklearn forest from the node arrays."""
+        from sklearn.tree._tree import Tree
+
+        forest = copy.copy(self._shell)
+        forest.estimators_ = []
+        n_features, n_classes, n_outputs = self._tree_args
+        for index, random_state in enumerate(self._random_states):
+            start = self.roots[index]
+            stop = start + self.node_counts[index]
+            is_leaf = self.left[start:stop] == _LEAF
+
+            # Back to sklearn's layout: children local to the tree, undefined split of leaves
+            nodes = np.empty(stop - start, dtype=self._node_dtype)
+            nodes["left_child"] = np.where(is_leaf, _LEAF, self.left[start:stop] - start)
+            nodes["right_child"] = np.where(is_leaf, _LEAF, self.right[start:stop] - start)
+            nodes["feature"] = np.where(is_leaf, _UNDEFINED, self.feature[start:stop])
+            nodes["threshold"] = self.threshold[start:stop]
+            for name, array in self._node_fields.items():
+                nodes[name] = array[start:stop]
+
+            values = np.ascontiguousarray(self.value[start:stop].reshape(stop - start, 1, -1), dtype=np.float64)
+
+            tree = Tree(n_features, np.asarray(n_classes, dtype=np.intp), n_outputs)
+            tree.__setstate__({"max_depth": self.max_depths[index], "node_count": int(stop - start),
+                               "nodes": nodes, "values": values})
+            estimator = copy.copy(self._tree_shell)
+            estimator.random_state = random_state
+            estimator.tree_ = tree
+            forest.estimators_.append(estimator)
+        return forest
+
+    @property
+    def estimator_loaded(self) -> bool:
+        """Whether the original forest is in memory."""
+        return self._estimator is not None
+
+    @property
+    def n_features_in_(self) -> int:
+        """Number of input features."""
+        return self.n_features
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the node tables."""
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right,
+                                      self.value, self.normalizer))
+
+    def _as_input(self, X: Any) -> Optional[np.ndarray]:
+        """Convert input to float32 rows, or None if sklearn should handle it."""
+        try:
+            X = np.asarray(X, dtype=np.float32)
+        except (TypeError, ValueError):
+            return None
+        if X.ndim != 2 or X.shape[1] != self.n_features or not np.isfinite(X).all():
+            return None
+        return np.ascontiguousarray(X)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Find the leaf every row reaches in every tree.
+
+        Args:
+            X: Float32 input rows (n_samples, n_features)
+
+        Returns:
+            Packed leaf node indices (n_samples, n_trees)
+        """
+        n_samples = X.shape[0]
+        flat_X = X.ravel()
+        nodes = np.tile(self.roots, n_samples)
+        offsets = np.repeat(np.arange(n_samples, dtype=np.intp) * self.n_features, self.n_trees)
+
+        # Advance only the (row, tree) pairs that are still at a split node
+        active = np.flatnonzero(self.left[nodes] != _LEAF)
+        while active.size:
+            current = nodes[active]
+            go_left = flat_X[offsets[active] + self.feature[current]] <= self.threshold[current]
+            following = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = following
+            active = active[self.left[following] != _LEAF]
+
+        return nodes.reshape(n_samples, self.n_trees)
+
+    def _aggregate(self, X: np.ndarray) -> np.ndarray:
+        """Average the leaf values of all trees (probabilities or predictions)."""
+        block_rows = max(1, MAX_PAIRS_PER_BLOCK // max(1, self.n_trees))
+        shape = (X.shape[0],) + self.value.shape[1:]
+        result = np.zeros(shape, dtype=np.float64)
+
+        for start in range(0, X.shape[0], block_rows):
+            leaves = self.apply(X[start:start + block_rows])
+            out = result[start:start + block_rows]
+
+            leaf_values = self.value[leaves]
+            if self.is_classifier:
+                leaf_values /= self.normalizer[leaves][..., np.newaxis]
+
+            # Accumulate in estimator order, as the forest's own predict does
+            for tree in range(self.n_trees):
+                out += leaf_values[:, tree]
+
+        result /= self.n_trees
+        return result
+
+    def _output(self, X: Any) -> np.ndarray:
+        """Averaged tree outputs: class probabilities or regression predictions."""
+        rows = self._as_input(X) if len(X) <= self.max_rows else None
+        if rows is None:
+            return self.estimator.predict_proba(X) if self.is_classifier else self.estimator.predict(X)
+        return self._aggregate(rows)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Predict class probabilities, as the forest's predict_proba.
+
+        Args:
+            X: Input rows
+
+        Returns:
+            Class probabilities (n_samples, n_classes)
+        """
+        return self._output(X)
+
+    def predict(self, X: Any) -> np.ndarray:
+        """Predict classes or values, as the forest's predict.
+
+        Args:
+            X: Input rows
+
+        Returns:
+            Predictions (n_samples,)
+        """
+        if self.is_classifier:
+            return self.classes_.take(np.argmax(self._output(X), axis=1), axis=0)
+        return self._output(X)
+
+    def predict_with_confidence(self, X: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Predict classes and their probabilities from one probability computation.
+
+        Args:
+            X: Input rows
+
+        Returns:
+            Tuple of (predicted classes, probability of the predicted class)
+        """
+        proba = self._output(X)
+        return self.classes_.take(np.argmax(proba, axis=1), axis=0), np.max(proba, axis=1)
+
+
+def compile_model(model: Any) -> Any:
+    """Compile a model for faster inference when supported.
+
+    Args:
+        model: A loaded scikit-learn model
+
+    Returns:
+        A CompiledForest for single-output forests, otherwise the model itself
+    """
+    if (isinstance(model, COMPILABLE_FORESTS) and getattr(model, "n_outputs_", 1) == 1
+            and getattr(model, "estimators_", None)):
+        return CompiledForest(model)
+    return model
@@ -0,0 +1,179 @@
+"""Model preloading and warm-up at server startup.
+
+Without preloading, the first request to every model pays for unpickling
+or loading the artifact (and TensorFlow's first-call graph tracing). The
+``ModelPreloader`` loads the models that will serve traffic (the versions
+in the production and staging stages by default, or a configured list)
+concurrently and runs a synthetic prediction through each of them. The
+server reports NOT_SERVING from CheckHealth until the preloader is done.
+"""
+
+import logging
+import threading
+import time
+from concurrent import futures
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("gRPC_Server")
+
+# Stages whose versions are preloaded by default
+DEFAULT_PRELOAD_STAGES = ["production", "staging"]
+
+
+def parse_model_spec(spec: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """Parse a preload target of the form ``name``, ``name:version`` or ``name@stage``.
+
+    Args:
+        spec: Target specification
+
+    Returns:
+        Tuple of (model_name, version, stage)
+    """
+    if "@" in spec:
+        model_name, stage = spec.split("@", 1)
+        return model_name, None, stage
+    if ":" in spec:
+        model_name, version = spec.split(":", 1)
+        return model_name, version, None
+    return spec, None, None
+
+
+class ModelPreloader:
+    """Loads and warms up models in the background before the server reports SERVING.
+
+    Supports:
+    - Preloading by stage or from an explicit list of models
+    - Concurrent loading on a small thread pool
+    - Progress and per-model results for health checks
+    """
+
+    def __init__(self, model_manager: Any, models: Optional[List[str]] = None,
+                 stages: Optional[List[str]] = None, max_workers: int = 4):
+        """Initialize the preloader.
+
+        Args:
+            model_manager: The server's ModelManager
+            models: Models to preload (``name``, ``name:version`` or ``name@stage``);
+                overrides stages when given
+            stages: Stages whose versions are preloaded (default: production and staging)
+            max_workers: Models loaded at once
+        """
+        self.model_manager = model_manager
+        self.models = models or []
+        self.stages = DEFAULT_PRELOAD_STAGES if stages is None else stages
+        self.max_workers = max(1, max_workers)
+        self.results: List[Dict[str, Any]] = []
+        self.total = 0
+        self.completed = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        """Whether preloading has finished (successfully or not)."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for preloading to finish.
+
+        Args:
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+
+        Returns:
+            True if preloading finished
+        """
+        return self._done.wait(timeout)
+
+    def targets(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """Get the model versions to preload.
+
+        Returns:
+            List of (model_name, version, stage) tuples without duplicate versions
+        """
+        if self.models:
+            return [parse_model_spec(spec) for spec in self.models]
+
+        targets = []
+        seen = set()
+        for stage in self.stages:
+            for summary in self.model_manager.list_models(stage_filter=stage):
+                key = (summary["model_name"], summary["version"])
+                if key not in seen:
+                    seen.add(key)
+                    targets.append((summary["model_name"], summary["version"], None))
+
+        # Preloading more versions than the cache holds would only evict earlier ones
+        max_entries = self.model_manager.models.max_entries
+        if max_entries and len(targets) > max_entries:
+            logger.warning(f"Preloading only {max_entries} of {len(targets)} model versions "
+                           f"(model cache limit)")
+            targets = targets[:max_entries]
+        return targets
+
+    def start(self) -> threading.Thread:
+        """Run the preloader on a background thread.
+
+        Returns:
+            The started thread
+        """
+        thread = threading.Thread(target=self.run, name="model-preloader", daemon=True)
+        thread.start()
+        return thread
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Preload and warm up every target, then mark the preloader done.
+
+        Returns:
+            One result dictionary per target (see ModelManager.warm_up; failed
+            targets have an "error" entry instead of timings)
+        """
+        start = time.perf_counter()
+        try:
+            targets = self.targets()
+            with self._lock:
+                self.total = len(targets)
+            logger.info(f"Preloading {len(targets)} model versions")
+
+            with futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="preload") as executor:
+                for result in executor.map(self._warm_up, targets):
+                    with self._lock:
+                        self.results.append(result)
+                        self.completed += 1
+        except Exception as e:
+            logger.error(f"Model preloading failed: {str(e)}")
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self._done.set()
+
+        failed = sum(1 for result in self.results if "error" in result)
+        logger.info(f"Preloaded {len(self.results) - failed} model versions in {self.elapsed:.2f}s"
+                    f" ({failed} failed)")
+        return self.results
+
+    def _warm_up(self, target: Tuple[str, Optional[str], Optional[str]]) -> Dict[str, Any]:
+        model_name, version, stage = target
+        try:
+            result = self.model_manager.warm_up(model_name, version, stage)
+            logger.info(f"Warmed up {model_name}:{result['version']} "
+                        f"(load {result['load_ms']:.1f}ms, predict {result['predict_ms']:.1f}ms)")
+            return result
+        except Exception as e:
+            logger.error(f"Could not preload model {model_name}: {str(e)}")
+            return {"model_name": model_name, "version": version or "", "error": str(e)}
+
+    def stats(self) -> Dict[str, Any]:
+        """Get preloading progress.
+
+        Returns:
+            Dictionary with done, total, completed and failed counts and elapsed seconds
+        """
+        with self._lock:
+            return {
+                "done": self.done,
+                "total": self.total,
+                "completed": self.completed,
+                "failed": sum(1 for result in self.results if "error" in result),
+                "elapsed": self.elapsed,
+            }
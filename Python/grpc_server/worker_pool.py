@@ -0,0 +1,448 @@
+"""Multi-process inference worker pool.
+
+Predictions are executed in separate worker processes so JSON parsing,
+array construction and model scoring are not limited by the GIL of the
+gRPC server process. Each worker owns a ``ModelManager`` with its own warm
+model cache, and requests are routed to workers by model name so those
+caches stay hot. Large inputs and outputs are exchanged through shared
+memory; only small control messages go through the worker pipes.
+"""
+
+import json
+import logging
+import multiprocessing
+import threading
+import zlib
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("gRPC_Server")
+
+# Payloads smaller than this are sent through the pipe instead of shared memory
+SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+
+def _pack(payload: bytes) -> Tuple[str, Any, Optional[shared_memory.SharedMemory]]:
+    """Prepare a payload for transfer, using shared memory for large payloads.
+
+    Returns:
+        Tuple of (transport, value, block): ("inline", bytes, None) or
+        ("shm", (name, size), block); the caller owns the returned block
+    """
+    if len(payload) < SHARED_MEMORY_THRESHOLD:
+        return "inline", payload, None
+
+    shm = shared_memory.SharedMemory(create=True, size=len(payload))
+    shm.buf[:len(payload)] = payload
+    return "shm", (shm.name, len(payload)), shm
+
+
+def _unpack(transport: str, value: Any, release: bool, decode: Callable[[Any], Any]) -> Any:
+    """Decode a payload produced by _pack.
+
+    Shared memory payloads are decoded straight from the mapped block,
+    without first copying them into a bytes object.
+
+    Args:
+        transport: "inline" or "shm"
+        value: The packed value
+        release: Unlink the shared memory block after reading it
+        decode: Builds the result from the payload buffer; it must not keep
+            a reference to the buffer
+
+    Returns:
+        The decoded payload
+    """
+    if transport == "inline":
+        return decode(value)
+
+    # Workers share the server's resource tracker, so the block stays tracked
+    # until whichever side owns it unlinks it
+    name, size = value
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf[:size]
+    try:
+        return decode(view)
+    finally:
+        view.release()
+        shm.close()
+        if release:
+            shm.unlink()
+
+
+def _decode_text(buffer: Any) -> str:
+    """Decode a UTF-8 payload buffer."""
+    return str(buffer, "utf-8")
+
+
+def _array_decoder(spec: Tuple[str, Tuple[int, ...]]) -> Callable[[Any], np.ndarray]:
+    """Get a decoder copying a payload buffer into an array of the given (dtype, shape)."""
+    dtype, shape = spec
+    return lambda buffer: np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape).copy()
+
+
+def _worker_main(conn: Any, models_dir: str, cache_max_entries: int, cache_max_bytes: int,
+                 registry_backend: str, profiler: Any, onnx_backend: Any, row_dedup: Any) -> None:
+    """Entry point of an inference worker process.
+
+    Args:
+        conn: Pipe connection to the server process
+        models_dir: Directory to load models from
+        cache_max_entries: Model cache entry budget of this worker
+        cache_max_bytes: Model cache byte budget of this worker
+        registry_backend: Registry storage backend of the server
+        profiler: Optional ProfileSampler (the worker samples its own requests)
+        onnx_backend: Optional OnnxRuntimeBackend (the worker creates its own sessions)
+        row_dedup: Optional RowDeduplicator (the worker keeps its own row caches)
+    """
+    # Imported here so the worker builds its own manager (and never a nested pool)
+    from model_manager import ModelManager
+
+    manager = ModelManager(models_dir=models_dir, cache_max_entries=cache_max_entries,
+                           cache_max_bytes=cache_max_bytes, registry_backend=registry_backend,
+                           profiler=profiler, onnx_backend=onnx_backend, row_dedup=row_dedup)
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+
+        command = message[0]
+        if command == "stop":
+            break
+
+        if command == "reload":
+            _, model_name = message
+            manager._load_registry()
+            if model_name:
+                manager.models.invalidate_model(model_name)
+                if manager.row_dedup is not None:
+                    manager.row_dedup.invalidate_model(model_name)
+            else:
+                manager.models.clear()
+                if manager.row_dedup is not None:
+                    manager.row_dedup.clear()
+            continue
+
+        if command == "warmup":
+            _, request_id, model_name, version, stage = message
+            try:
+                conn.send(("ok", request_id, manager.warm_up(model_name, version, stage)))
+            except Exception as e:
+                conn.send(("error", request_id, str(e)))
+            continue
+
+        # ("process", request_id, input_kind, transport, value, array_spec,
+        #  model_name, parameters, version, stage)
+        _, request_id, input_kind, transport, value, array_spec, model_name, parameters, version, stage = message
+        try:
+            if input_kind == "json":
+                input_data = _unpack(transport, value, False, _decode_text)
+                result, confidence, metadata = manager.process_data(
+                    input_data, model_name, parameters, version, stage)
+                output_spec = None
+                output = result.encode("utf-8")
+            else:
+                X = _unpack(transport, value, False, _array_decoder(array_spec))
+                y_pred, confidence, metadata = manager.process_tensor(X, model_name, parameters, version, stage)
+                if y_pred.dtype.kind in "biuf":
+                    y_pred = np.ascontiguousarray(y_pred)
+                    output_spec = (y_pred.dtype.str, y_pred.shape)
+                    output = y_pred.tobytes()
+                else:
+                    output_spec = None
+                    output = json.dumps(y_pred.tolist()).encode("utf-8")
+
+            # The server process unlinks the output block after reading it
+            out_transport, out_value, out_shm = _pack(output)
+            if out_shm is not None:
+                out_shm.close()
+            conn.send(("ok", request_id, out_transport, out_value, output_spec, confidence, metadata))
+        except Exception as e:
+            conn.send(("error", request_id, str(e)))
+
+
+class _Worker:
+    """Server-side handle of one worker process."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self.conn: Any = None
+        self.pending: Dict[int, Future] = {}
+        self.send_lock = threading.Lock()
+        self.restarts = 0
+
+
+class InferenceWorkerPool:
+    """Pool of inference worker processes with sticky per-model routing.
+
+    Supports:
+    - One warm model cache per worker process
+    - Rendezvous routing by model name to ``replicas`` preferred workers
+    - Shared memory transfer of large inputs and outputs
+    - Automatic replacement of crashed workers
+    """
+
+    def __init__(self, models_dir: str, num_workers: int, replicas: int = 1,
+                 cache_max_entries: int = 32, cache_max_bytes: int = 0, registry_backend: str = "sqlite",
+                 profiler: Any = None, onnx_backend: Any = None, row_dedup: Any = None):
+        """Start the worker processes.
+
+        Args:
+            models_dir: Directory to load models from
+            num_workers: Number of worker processes
+            replicas: Number of workers a model may be routed to
+            cache_max_entries: Model cache entry budget per worker
+            cache_max_bytes: Model cache byte budget per worker
+            registry_backend: Registry storage backend of the server
+            profiler: Optional ProfileSampler used by every worker
+            onnx_backend: Optional OnnxRuntimeBackend used by every worker
+            row_dedup: Optional RowDeduplicator used by every worker
+        """
+        self.models_dir = models_dir
+        self.registry_backend = registry_backend
+        self.profiler = profiler
+        self.onnx_backend = onnx_backend
+        self.row_dedup = row_dedup
+        self.replicas = max(1, min(replicas, num_workers))
+        self.cache_max_entries = cache_max_entries
+        self.cache_max_bytes = cache_max_bytes
+
+        # Spawn (rather than fork) so workers never inherit gRPC threads
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._next_request_id = 0
+        self._closed = False
+
+        self._workers = [_Worker(i) for i in range(num_workers)]
+        for worker in self._workers:
+            self._start(worker)
+
+        logger.info(f"Started {num_workers} inference worker processes")
+
+    def _start(self, worker: _Worker) -> None:
+        """Start (or restart) a worker process and its response reader."""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.models_dir, self.cache_max_entries, self.cache_max_bytes,
+                  self.registry_backend, self.profiler, self.onnx_backend, self.row_dedup),
+            name=f"inference-worker-{worker.index}",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+
+        worker.process = process
+        worker.conn = parent_conn
+
+        reader = threading.Thread(target=self._read_responses, args=(worker, parent_conn, process),
+                                  name=f"inference-worker-{worker.index}-reader", daemon=True)
+        reader.start()
+
+    def _read_responses(self, worker: _Worker, conn: Any, process: Any) -> None:
+        """Deliver worker responses to waiting callers; recycle the worker if it dies."""
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+
+            with self._lock:
+                future = worker.pending.pop(message[1], None)
+            if future is not None:
+                future.set_result(message)
+
+        # The worker exited: fail its in-flight requests and replace it
+        with self._lock:
+            pending = list(worker.pending.values())
+            worker.pending.clear()
+            replace = not self._closed and worker.process is process
+
+        for future in pending:
+            future.set_exception(ValueError(f"Inference worker {worker.index} crashed"))
+
+        if replace:
+            process.join(timeout=1)
+            logger.error(f"Inference worker {worker.index} exited with code {process.exitcode}, restarting")
+            worker.restarts += 1
+            self._start(worker)
+
+    def _preferred(self, model_name: str) -> List[_Worker]:
+        """Get the workers a model is routed to."""
+        ranked = sorted(self._workers,
+                        key=lambda w: zlib.crc32(f"{model_name}:{w.index}".encode("utf-8")),
+                        reverse=True)
+        return ranked[:self.replicas]
+
+    def _route(self, model_name: str) -> _Worker:
+        """Pick the least busy of the model's preferred workers."""
+        return min(self._preferred(model_name), key=lambda w: len(w.pending))
+
+    def _submit(self, model_name: str, input_kind: str, payload: bytes,
+                array_spec: Optional[Tuple[str, Tuple[int, ...]]], parameters: Dict[str, str],
+                version: Optional[str], stage: Optional[str]) -> Tuple[Any, float, Dict[str, str]]:
+        """Send a request to a worker and wait for its response.
+
+        Returns:
+            Tuple of (output, confidence_score, metadata); output is an array
+            for numeric tensor results and JSON text otherwise
+        """
+        transport, value, shm = _pack(payload)
+        try:
+            with self._lock:
+                worker = self._route(model_name)
+                request_id = self._next_request_id
+                self._next_request_id += 1
+                future: Future = Future()
+                worker.pending[request_id] = future
+
+            try:
+                with worker.send_lock:
+                    worker.conn.send(("process", request_id, input_kind, transport, value, array_spec,
+                                      model_name, parameters, version, stage))
+            except (OSError, ValueError) as e:
+                # The worker is gone; nothing will ever complete the future
+                with self._lock:
+                    worker.pending.pop(request_id, None)
+                raise ValueError(f"Inference worker {worker.index} is unavailable: {str(e)}")
+
+            response = future.result()
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+        if response[0] == "error":
+            raise ValueError(response[2])
+
+        _, _, out_transport, out_value, output_spec, confidence, metadata = response
+        # Numeric outputs come back as raw arrays, everything else as JSON text
+        decode = _decode_text if output_spec is None else _array_decoder(output_spec)
+        output = _unpack(out_transport, out_value, True, decode)
+        metadata["worker"] = str(worker.index)
+        return output, confidence, metadata
+
+    def process_data(self, input_data: str, model_name: str, parameters: Dict[str, str],
+                     version: str = None, stage: str = None) -> Tuple[str, float, Dict[str, str]]:
+        """Process JSON input data in a worker process.
+
+        Returns:
+            Tuple of (result, confidence_score, metadata), as ModelManager.process_data
+        """
+        return self._submit(model_name, "json", input_data.encode("utf-8"), None, parameters, version, stage)
+
+    def process_tensor(self, X: np.ndarray, model_name: str, parameters: Dict[str, str],
+                       version: str = None, stage: str = None) -> Tuple[np.ndarray, float, Dict[str, str]]:
+        """Process an array in a worker process.
+
+        Returns:
+            Tuple of (predictions array, confidence_score, metadata), as ModelManager.process_tensor
+        """
+        X = np.ascontiguousarray(X)
+        output, confidence, metadata = self._submit(
+            model_name, "tensor", X.tobytes(), (X.dtype.str, X.shape), parameters, version, stage)
+
+        if isinstance(output, str):
+            return np.asarray(json.loads(output)), confidence, metadata
+        return output, confidence, metadata
+
+    def warm_up(self, model_name: str, version: str = None, stage: str = None) -> Dict[str, Any]:
+        """Warm up a model version in every worker the model is routed to.
+
+        Returns:
+            Dictionary as ModelManager.warm_up, with the slowest worker's timings
+
+        Raises:
+            ValueError: If a worker could not load the model
+        """
+        futures = []
+        with self._lock:
+            workers = self._preferred(model_name)
+            for worker in workers:
+                request_id = self._next_request_id
+                self._next_request_id += 1
+                future: Future = Future()
+                worker.pending[request_id] = future
+                futures.append((worker, request_id, future))
+
+        for index, (worker, request_id, _) in enumerate(futures):
+            try:
+                with worker.send_lock:
+                    worker.conn.send(("warmup", request_id, model_name, version, stage))
+            except (OSError, ValueError) as e:
+                # Nothing will complete the requests that were not sent
+                with self._lock:
+                    for unsent, unsent_id, _ in futures[index:]:
+                        unsent.pending.pop(unsent_id, None)
+                raise ValueError(f"Inference worker {worker.index} is unavailable: {str(e)}")
+
+        results = []
+        for _, _, future in futures:
+            response = future.result()
+            if response[0] == "error":
+                raise ValueError(response[2])
+            results.append(response[2])
+
+        result = dict(results[0])
+        result["load_ms"] = max(r["load_ms"] for r in results)
+        result["predict_ms"] = max(r["predict_ms"] for r in results)
+        result["warmed"] = all(r["warmed"] for r in results)
+        result["workers"] = ",".join(str(worker.index) for worker in workers)
+        return result
+
+    def invalidate(self, model_name: Optional[str] = None) -> None:
+        """Make every worker reload the registry and drop cached versions of a model.
+
+        Args:
+            model_name: Model whose cached versions are dropped (None drops all)
+        """
+        for worker in self._workers:
+            try:
+                with worker.send_lock:
+                    worker.conn.send(("reload", model_name))
+            except (OSError, ValueError):
+                # A dead worker reloads everything when it is restarted
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Get worker pool statistics.
+
+        Returns:
+            Dictionary with per-worker in-flight requests and restart counts
+        """
+        with self._lock:
+            workers: List[Dict[str, Any]] = [
+                {
+                    "index": worker.index,
+                    "pid": worker.process.pid if worker.process else None,
+                    "alive": bool(worker.process and worker.process.is_alive()),
+                    "in_flight": len(worker.pending),
+                    "restarts": worker.restarts,
+                }
+                for worker in self._workers
+            ]
+        return {"workers": workers, "replicas": self.replicas}
+
+    def shutdown(self) -> None:
+        """Stop all worker processes."""
+        with self._lock:
+            self._closed = True
+
+        for worker in self._workers:
+            try:
+                with worker.send_lock:
+                    worker.conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+
+        for worker in self._workers:
+            if worker.process is not None:
+                worker.process.join(timeout=5)
+                if worker.process.is_alive():
+                    worker.process.terminate()